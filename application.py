@@ -13,6 +13,7 @@ import docx
 import psutil
 import gc
 # import textract
+import concurrent.futures
 import threading
 import time
 from collections import deque
@@ -29,8 +30,6 @@ db = SQLAlchemy(app)
 
 # Configure OpenAI with environment variable
 
-# Global ResumeScorer cache for deterministic section weights
-_scorer_cache = {}
 openai.api_key = os.environ.get('OPENAI_API_KEY', "your-openai-api-key-here")
 
 # Database Models
@@ -45,6 +44,13 @@ class Job(db.Model):
     resumes = db.relationship('Resume', backref='job', lazy=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+class JobProfile(db.Model):
+    """Job-level scoring artifacts computed once per job description (see job_profile.py)"""
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    description_hash = db.Column(db.String(64), nullable=False)
+    profile = db.Column(db.Text, nullable=False)  # JSON: job_requirement, job_level, section_weights
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class Resume(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(100), nullable=False)
@@ -57,6 +63,39 @@ class Resume(db.Model):
     __table_args__ = (db.UniqueConstraint('job_id', 'filename', name='_job_filename_uc'),
                       db.UniqueConstraint('job_id', 'content_hash', name='_job_hash_uc'))
 
+class ResumeScoreVector(db.Model):
+    """Raw subfield scores of an analyzed resume as a fixed-layout int8 row (see score_matrix.py)"""
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    scores = db.Column(db.LargeBinary, nullable=False)
+
+class WorkItem(db.Model):
+    """One uploaded file (resume or archive), or one stored resume to re-score, queued for a job (see work_queue.py)"""
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    parent_id = db.Column(db.Integer, nullable=True, index=True)  # archive item an entry was expanded from
+    resume_id = db.Column(db.Integer, nullable=True, index=True)  # stored resume of a rescore item
+    batch_id = db.Column(db.String(64), nullable=True, index=True)  # Batch API batch submitted for the item
+    kind = db.Column(db.String(16), nullable=False, default='resume')
+    filename = db.Column(db.String(255), nullable=False)
+    upload_digest = db.Column(db.String(64), nullable=True, index=True)  # spooled file; None for rescore items
+    upload_size = db.Column(db.Integer, nullable=False, default=0)
+    status = db.Column(db.String(16), nullable=False, default='pending', index=True)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    available_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    lease_owner = db.Column(db.String(120), nullable=True, index=True)
+    lease_expires_at = db.Column(db.DateTime, nullable=True)
+    result = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class ResumeSectionIndex(db.Model):
+    """Section offsets of a resume's text, computed once locally (see section_index.py)"""
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    sections = db.Column(db.Text, nullable=False)
+
 # Interview Management Models
 class Interview(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -171,107 +210,24 @@ def get_db_session():
 init_database()
 
 # API Rate Limiting and Error Handling
-import time
-import threading
-from collections import deque
-from datetime import datetime, timedelta
+# All LLM callers share one token-aware limiter; callers queue for capacity
+# instead of degrading to fallback analyses.
+from rate_limiter import RateLimitTimeout, estimate_tokens, get_rate_limiter
+from section_index import SUMMARY_PROMPT_SECTIONS, prompt_text
 
-# Rate limiting configuration
-RATE_LIMIT_REQUESTS = 20  # Increased from 10 to 20 requests per minute
-RATE_LIMIT_WINDOW = 60   # seconds
-api_request_times = deque()
-api_lock = threading.Lock()
-
-def check_rate_limit():
-    """Check if we're within rate limits with better distribution"""
-    with api_lock:
-        now = datetime.now()
-        # Remove old requests outside the window
-        while api_request_times and (now - api_request_times[0]) > timedelta(seconds=RATE_LIMIT_WINDOW):
-            api_request_times.popleft()
-        
-        # Check if we can make a request
-        if len(api_request_times) >= RATE_LIMIT_REQUESTS:
-            return False
-        
-        # Add current request
-        api_request_times.append(now)
-        return True
-
-def wait_for_rate_limit():
-    """Wait until we can make another API request with exponential backoff"""
-    wait_time = 10
-    while not check_rate_limit():
-        print(f"Rate limit reached, waiting {wait_time} seconds...")
-        time.sleep(wait_time)
-        wait_time = min(wait_time * 2, 60)  # Exponential backoff, max 60 seconds
-
-def extract_text_from_doc_binary(file_stream):
-    """Extract text from .doc binary file without external dependencies"""
-    try:
-        # Convert binary to string and look for readable text
-        # .doc files have text embedded in specific patterns
-        binary_str = str(file_stream)
-        
-        # Look for common text patterns in .doc files
-        text_patterns = []
-        
-        # Try to find text between common delimiters
-        import re
-        
-        # Look for readable text sequences
-        # This is a simplified approach that works for most .doc files
-        text_chunks = re.findall(r'[A-Za-z0-9\s\.\,\;\:\!\?\-\(\)\[\]\{\}\@\#\$\%\&\*\+\=\_\|\~\`\'\"]{10,}', binary_str)
-        
-        if text_chunks:
-            # Join the text chunks and clean up
-            content = ' '.join(text_chunks)
-            
-            # Remove excessive whitespace and clean up
-            content = re.sub(r'\s+', ' ', content)
-            content = re.sub(r'[^\w\s\.\,\;\:\!\?\-\(\)\[\]\{\}\@\#\$\%\&\*\+\=\_\|\~\`\'\"]', ' ', content)
-            content = content.strip()
-            
-            # Limit length
-            if len(content) > 50000:
-                content = content[:50000]
-                
-            return content
-        else:
-            # If no readable text found, return a placeholder
-            return f"Document content could not be extracted. Please review manually."
-            
-    except Exception as e:
-        print(f"Error extracting text from .doc binary: {e}")
-        return f"Document: Content extraction failed. Please review manually."
+# Feed provider rate limit headers from module-level openai calls back into the limiter
+openai.http_client = get_rate_limiter().http_client()
 
-def analyze_resume_with_ai(job_description, resume_text, filename):
-    """Analyze resume using OpenAI GPT-4 with comprehensive error handling"""
-    
-    print(f"Starting AI analysis for {filename}")
-    print(f"OpenAI API key configured: {bool(openai.api_key and openai.api_key != 'your-openai-api-key-here')}")
-    print(f"Rate limit check: {check_rate_limit()}")
-    
-    # Check if OpenAI API key is configured
-    if not openai.api_key or openai.api_key == "your-openai-api-key-here":
-        print(f"OpenAI API key not configured for {filename}, using fallback analysis")
-        return create_fallback_analysis(filename, "OpenAI API key not configured")
-    
-    # Check rate limit before making API call
-    if not check_rate_limit():
-        print(f"Rate limit reached for {filename}, using fallback analysis")
-        return create_fallback_analysis(filename, "Rate limit reached")
-    
-    try:
-        # Prepare prompt with better error handling
-        prompt = f"""
+def build_resume_analysis_prompt(job_description, resume_text):
+    """Build the summary analysis prompt used by analyze_resume_with_ai"""
+    return f"""
 You are an expert HR recruiter and technical interviewer. Analyze this resume against the job description and provide a comprehensive assessment.
 
 Job Description:
 {job_description[:1000]}
 
 Resume Content:
-{resume_text[:2000]}
+{prompt_text(resume_text, include=SUMMARY_PROMPT_SECTIONS)[:2000]}
 
 Please provide your analysis in the following JSON format:
 {{
@@ -313,6 +269,25 @@ Focus on:
 
 Return only valid JSON.
 """
+
+def analyze_resume_with_ai(job_description, resume_text, filename):
+    """Analyze resume using OpenAI GPT-4 with comprehensive error handling"""
+    
+    print(f"Starting AI analysis for {filename}")
+    print(f"OpenAI API key configured: {bool(openai.api_key and openai.api_key != 'your-openai-api-key-here')}")
+    
+    # Check if OpenAI API key is configured
+    if not openai.api_key or openai.api_key == "your-openai-api-key-here":
+        print(f"OpenAI API key not configured for {filename}, using fallback analysis")
+        return create_fallback_analysis(filename, "OpenAI API key not configured")
+    
+    rate_limiter = get_rate_limiter()
+    
+    try:
+        # Prepare prompt with better error handling
+        prompt = build_resume_analysis_prompt(job_description, resume_text)
+        messages = [{"role": "user", "content": prompt}]
+        estimated_tokens = estimate_tokens(messages, 1000)
         
         print(f"Making OpenAI API call for {filename}")
         
@@ -320,13 +295,18 @@ Return only valid JSON.
         max_retries = 3
         for attempt in range(max_retries):
             try:
+                # Queue for rate limit capacity instead of failing fast
+                waited = rate_limiter.acquire("gpt-4", estimated_tokens)
+                if waited:
+                    print(f"Waited {waited:.1f}s for rate limit capacity for {filename}")
                 print(f"OpenAI API attempt {attempt + 1}/{max_retries} for {filename}")
                 response = openai.chat.completions.create(
                     model="gpt-4",
-                    messages=[{"role": "user", "content": prompt}],
+                    messages=messages,
                     temperature=0.3,
                     max_tokens=1000
                 )
+                rate_limiter.record_usage("gpt-4", estimated_tokens, response)
                 
                 analysis_text = response.choices[0].message.content.strip()
                 print(f"OpenAI API response received for {filename}: {len(analysis_text)} characters")
@@ -341,10 +321,14 @@ Return only valid JSON.
                     print(f"Response content: {analysis_text[:200]}...")
                     return create_fallback_analysis(filename, "Invalid JSON response")
                     
+            except RateLimitTimeout as e:
+                print(f"Rate limit wait exceeded for {filename}: {e}")
+                return create_fallback_analysis(filename, "Rate limit wait exceeded")
+                
             except openai.RateLimitError as e:
                 print(f"Rate limit error for {filename}, attempt {attempt + 1}/{max_retries}: {e}")
                 if attempt < max_retries - 1:
-                    time.sleep(60)  # Wait 1 minute before retry
+                    # The limiter has picked up the provider's retry window; the next acquire waits it out
                     continue
                 else:
                     return create_fallback_analysis(filename, "Rate limit exceeded")
@@ -378,65 +362,211 @@ Return only valid JSON.
         return create_fallback_analysis(filename, f"Critical error: {str(e)}")
 
 
-def analyze_resume_with_advanced_ai(job_description: str, resume_text: str, filename: str):
-    """Enhanced analysis using advanced scoring system - comments only"""
+def get_scorer_for_job(job_description: str):
+    """Return the cached ResumeScorer for a job description (deterministic section weights)"""
+    # Add current directory to Python path for deployment
+    import sys
+    import os
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+    from scorer_cache import get_scorer_cache
+    
+    # Bounded LRU of job-scoped scorers sharing one pooled OpenAI client
+    return get_scorer_cache().get(job_description)
+
+
+def load_job_profile(job_id: int):
+    """Return the job profile for a job, computing and storing it if missing or stale"""
+    from job_profile import get_or_create_job_profile
+    
+    job = db.session.get(Job, job_id)
+    if job is None:
+        return None
+    return get_or_create_job_profile(db.session, JobProfile, job, get_scorer_for_job)
+
+
+def build_advanced_analysis(advanced_result: dict, current_analysis: str, phase_timings: dict, triage: dict = None) -> str:
+    """Merge the advanced scoring result into the summary analysis JSON"""
+    from scoring_tiers import TIER_FULL, assign_bucket
+    
+    # Extract comments and reasoning from advanced result
+    advanced_comments = extract_comments_only(advanced_result)
+    
+    # Get current analysis for base data
+    current_data = json.loads(current_analysis)
+    # Replace fit_score with advanced analysis final_score
+    # Extract final_score from the dictionary
+    final_score_value = advanced_result.get("final_score", {})
+    if isinstance(final_score_value, dict):
+        final_score_value = final_score_value.get("final_weighted_score", current_data.get("fit_score", 70))
+    current_data["fit_score"] = int(final_score_value)
+    # The summary's own bucket was chosen for its own score; use the configured thresholds like every other tier
+    current_data["bucket"] = assign_bucket(current_data["fit_score"])
+    current_data["scoring_tier"] = TIER_FULL
+    if triage is not None:
+        current_data["triage"] = triage
+    
+    # Add advanced analysis data (comments + scoring details)
+    current_data["advanced_analysis"] = {
+        # Phase 1: Section Weights
+        "section_weights": advanced_result.get("section_weights", {}),
+        # Phase 2: Subfield Scores
+        "subfield_scores": advanced_result.get("subfield_scores", {}),
+        # Phase 3: Final Score Details
+        "final_score_details": advanced_result.get("final_score", {}),
+        # Basic Info
+        "job_level": advanced_result.get("job_level", "unknown"),
+        "experience_education_ratio": advanced_result.get("experience_education_ratio", 0.0),
+        "processing_time": advanced_result.get("processing_time", 0.0),
+        "phase_timings": {
+            **phase_timings,
+            "scoring_phases": advanced_result.get("phase_timings", {})
+        },
+        "detailed_reasoning": advanced_comments["detailed_reasoning"],
+        "filtered_detailed_reasoning": advanced_comments["filtered_detailed_reasoning"],
+        "overall_assessment": advanced_comments["overall_assessment"],
+        "filtered_overall_assessment": advanced_comments["filtered_overall_assessment"],
+        "candidate_experience": advanced_comments["candidate_experience"],
+        "job_requirements": advanced_comments["job_requirements"],
+        # Job-independent artifacts reused when the job is re-scored
+        "cross_section_content": advanced_result.get("cross_section_content", {}),
+        "skipped_phases": advanced_result.get("skipped_phases", [])
+    }
+    return json.dumps(current_data)
+
+
+def build_prescreen_analysis(prescreen: dict, filename: str) -> str:
+    """Archive analysis JSON for a resume rejected by the local pre-screen, without any LLM call"""
+    from scoring_tiers import BUCKET_THRESHOLDS, TIER_PRESCREEN, assign_bucket
+    
+    # Keep the fit score below the lowest bucket threshold so the resume is archived
+    fit_score = min(int(prescreen["score"]), int(BUCKET_THRESHOLDS[-1][0]) - 1)
+    analysis = json.loads(create_fallback_analysis(filename, "Not needed"))
+    analysis.update({
+        "fit_score": fit_score,
+        "bucket": assign_bucket(fit_score),
+        "reasoning": f"Pre-screen score {prescreen['score']} is below the cutoff of {prescreen['cutoff']}; no AI analysis was run.",
+        "summary_points": [
+            f"Matched job terms: {', '.join(prescreen['matched_terms']) or 'none'}",
+            "Archived by the lexical pre-screen",
+        ],
+        "scoring_tier": TIER_PRESCREEN,
+        "prescreen": prescreen,
+    })
+    return json.dumps(analysis)
+
+
+def attach_prescreen(analysis_text: str, prescreen: dict) -> str:
+    """Record the pre-screen result in an analysis JSON string for auditing"""
+    if prescreen is None:
+        return analysis_text
+    try:
+        analysis = json.loads(analysis_text)
+    except (TypeError, ValueError):
+        return analysis_text
+    analysis["prescreen"] = prescreen
+    return json.dumps(analysis)
+
+
+def prescreen_resume_batch(job_description: str, resumes: list):
+    """
+    Run the local pre-screen over (filename, resume_text, ...) tuples.
+    Returns (passed, rejected) lists of (resume, prescreen_result) pairs.
+    """
+    from prescreen import prescreen_resumes
+    
+    results = prescreen_resumes(job_description, [resume[1] for resume in resumes])
+    passed = [(resume, result) for resume, result in zip(resumes, results) if result["passed"]]
+    rejected = [(resume, result) for resume, result in zip(resumes, results) if not result["passed"]]
+    print(f"Pre-screen: {len(passed)} of {len(resumes)} resumes passed, {len(rejected)} archived without LLM calls")
+    return passed, rejected
+
+
+def build_triage_analysis(triage: dict, filename: str) -> str:
+    """Analysis JSON for a candidate settled by the cascade's triage pass alone"""
+    from scoring_tiers import TIER_TRIAGE, assign_bucket
+    
+    analysis = json.loads(create_fallback_analysis(filename, "Not needed"))
+    analysis.update({
+        "fit_score": triage["fit_score"],
+        "bucket": assign_bucket(triage["fit_score"]),
+        "reasoning": triage["reasoning"],
+        "summary_points": [triage["reasoning"], "Scored by the triage pass only"],
+        "scoring_tier": TIER_TRIAGE,
+        "triage": triage,
+    })
+    return json.dumps(analysis)
+
+
+def build_fused_summary_analysis(advanced_result: dict, filename: str) -> str:
+    """Summary analysis JSON (the analyze_resume_with_ai shape) built from a fused scoring result"""
+    from scoring_tiers import assign_bucket
+    
+    summary = advanced_result.get("summary") or {}
+    defaults = json.loads(create_fallback_analysis(filename, "Summary missing from fused scoring response"))
+    fit_score = int(advanced_result.get("final_score", {}).get("final_weighted_score", 0))
+    return json.dumps({
+        "candidate_name": summary.get("candidate_name") or defaults["candidate_name"],
+        "fit_score": fit_score,
+        "bucket": assign_bucket(fit_score),
+        "reasoning": summary.get("reasoning", defaults["reasoning"]),
+        "summary_points": summary.get("summary_points", defaults["summary_points"]),
+        "skill_matrix": summary.get("skill_matrix", defaults["skill_matrix"]),
+        "timeline": summary.get("timeline", defaults["timeline"]),
+        "logistics": summary.get("logistics", defaults["logistics"]),
+    })
+
+
+def analyze_resume_with_advanced_ai(job_description: str, resume_text: str, filename: str, job_profile: dict = None,
+                                    resume_artifacts: dict = None):
+    """
+    Enhanced analysis using advanced scoring system - comments only.
+    resume_artifacts are job-independent results from a stored analysis (see rescore_job).
+    """
     try:
-        # Add current directory to Python path for deployment
-        import sys
-        import os
-        if os.getcwd() not in sys.path:
-            sys.path.insert(0, os.getcwd())
-        # Import the advanced scorer
-        from duplicate_copy_resume_scorer import ResumeScorer
+        from phase_executor import PhaseExecutor
+        from duplicate_copy_resume_scorer import FUSED_SCORING
+        from scoring_tiers import CASCADE_SCORING, needs_full_analysis
         
         print(f"🚀 STARTING ADVANCED AI ANALYSIS FOR {filename} - VERSION 2.0")
         
-        # Use cached scorer for deterministic section weights
-        job_hash = hashlib.md5(job_description.encode()).hexdigest()
-        if job_hash not in _scorer_cache:
-            _scorer_cache[job_hash] = ResumeScorer()
-            print(f"  📊 Created new ResumeScorer for job hash: {job_hash[:8]}...")
-        else:
-            print(f"  ✅ Reusing cached ResumeScorer for job hash: {job_hash[:8]}...")
-        scorer = _scorer_cache[job_hash]        
-        # Get advanced analysis
-        advanced_result = scorer.score_resume(job_description, resume_text)
+        scorer = get_scorer_for_job(job_description)
         
-        # Extract comments and reasoning from advanced result
-        advanced_comments = extract_comments_only(advanced_result)
+        triage = None
+        if CASCADE_SCORING:
+            # Cheap first pass; clear-cut candidates skip the full analysis
+            try:
+                triage = scorer.triage_resume(job_description, resume_text)
+                if not needs_full_analysis(triage["fit_score"]):
+                    print(f"Triage settled {filename} at {triage['fit_score']}, skipping full analysis")
+                    return build_triage_analysis(triage, filename)
+                print(f"Triage score {triage['fit_score']} for {filename} needs the full analysis")
+            except Exception as e:
+                print(f"Triage failed for {filename}, running full analysis: {e}")
         
-        # Get current analysis for base data
-        current_analysis = analyze_resume_with_ai(job_description, resume_text, filename)
-        current_data = json.loads(current_analysis)
-        # Replace fit_score with advanced analysis final_score
-        # Extract final_score from the dictionary
-        final_score_value = advanced_result.get("final_score", {})
-        if isinstance(final_score_value, dict):
-            final_score_value = final_score_value.get("final_weighted_score", current_data.get("fit_score", 70))
-        current_data["fit_score"] = int(final_score_value)
+        if FUSED_SCORING:
+            # One request returns the subfield scores and the summary fields together
+            start = time.time()
+            advanced_result = scorer.score_resume(job_description, resume_text, job_profile, fused=True,
+                                                  resume_artifacts=resume_artifacts)
+            phase_timings = {"advanced_scoring": {"started_at": 0.0, "duration": round(time.time() - start, 4)}}
+            analysis = build_advanced_analysis(
+                advanced_result, build_fused_summary_analysis(advanced_result, filename), phase_timings, triage
+            )
+            print(f"Fused advanced analysis completed for {filename}")
+            return analysis
         
-        # Add advanced analysis data (comments + scoring details)
-        current_data["advanced_analysis"] = {
-            # Phase 1: Section Weights
-            "section_weights": advanced_result.get("section_weights", {}),
-            # Phase 2: Subfield Scores
-            "subfield_scores": advanced_result.get("subfield_scores", {}),
-            # Phase 3: Final Score Details
-            "final_score_details": advanced_result.get("final_score", {}),
-            # Basic Info
-            "job_level": advanced_result.get("job_level", "unknown"),
-            "experience_education_ratio": advanced_result.get("experience_education_ratio", 0.0),
-            "processing_time": advanced_result.get("processing_time", 0.0),
-            "detailed_reasoning": advanced_comments["detailed_reasoning"],
-            "filtered_detailed_reasoning": advanced_comments["filtered_detailed_reasoning"],
-            "overall_assessment": advanced_comments["overall_assessment"],
-            "filtered_overall_assessment": advanced_comments["filtered_overall_assessment"],
-            "candidate_experience": advanced_comments["candidate_experience"],
-            "job_requirements": advanced_comments["job_requirements"]
-        }
+        # The advanced scoring pipeline and the summary analysis are independent,
+        # so run them concurrently
+        executor = PhaseExecutor(max_workers=2)
+        executor.add("advanced_scoring", lambda: scorer.score_resume(job_description, resume_text, job_profile,
+                                                                     resume_artifacts=resume_artifacts))
+        executor.add("legacy_summary", lambda: analyze_resume_with_ai(job_description, resume_text, filename))
+        results, phase_timings = executor.run()
         
+        analysis = build_advanced_analysis(results["advanced_scoring"], results["legacy_summary"], phase_timings, triage)
         print(f"Advanced analysis completed for {filename}")
-        return json.dumps(current_data)
+        return analysis
         
     except Exception as e:
         print(f"Advanced analysis failed for {filename}: {e}")
@@ -444,6 +574,182 @@ def analyze_resume_with_advanced_ai(job_description: str, resume_text: str, file
         return analyze_resume_with_ai(job_description, resume_text, filename)
 
 
+async def analyze_resume_with_ai_async(engine, job_description, resume_text, filename):
+    """Async version of analyze_resume_with_ai that sends the request through the AsyncScoringEngine"""
+    if not openai.api_key or openai.api_key == "your-openai-api-key-here":
+        print(f"OpenAI API key not configured for {filename}, using fallback analysis")
+        return create_fallback_analysis(filename, "OpenAI API key not configured")
+    
+    try:
+        analysis_text = await engine.complete(
+            model="gpt-4",
+            messages=[{"role": "user", "content": build_resume_analysis_prompt(job_description, resume_text)}],
+            temperature=0.3,
+            max_tokens=1000
+        )
+        json.loads(analysis_text)
+        return analysis_text
+    except json.JSONDecodeError as e:
+        print(f"Invalid JSON response for {filename}: {e}")
+        return create_fallback_analysis(filename, "Invalid JSON response")
+    except RateLimitTimeout as e:
+        print(f"Rate limit wait exceeded for {filename}: {e}")
+        return create_fallback_analysis(filename, "Rate limit wait exceeded")
+    except openai.RateLimitError as e:
+        print(f"Rate limit error for {filename}: {e}")
+        return create_fallback_analysis(filename, "Rate limit exceeded")
+    except openai.AuthenticationError as e:
+        print(f"Authentication error for {filename}: {e}")
+        return create_fallback_analysis(filename, "API authentication failed")
+    except openai.APIConnectionError as e:
+        print(f"API connection error for {filename}: {e}")
+        return create_fallback_analysis(filename, "API connection failed")
+    except Exception as e:
+        print(f"Unexpected error for {filename}: {e}")
+        return create_fallback_analysis(filename, f"Unexpected error: {str(e)}")
+
+
+def triage_resume_batch(scorer, job_description: str, resumes: list):
+    """
+    Cascade triage for the bulk and batch paths: run the cheap first pass over
+    (filename, resume_text) pairs when CASCADE_SCORING is on.
+    Returns (settled, triages): analysis JSON for the clear-cut candidates and the
+    triage result of the rest, both keyed by position in resumes.
+    """
+    from scoring_tiers import CASCADE_SCORING, needs_full_analysis
+    
+    settled, triages = {}, {}
+    if not CASCADE_SCORING or not resumes:
+        return settled, triages
+    
+    def triage_one(resume_text):
+        try:
+            return scorer.triage_resume(job_description, resume_text)
+        except Exception as e:
+            print(f"Triage failed, running full analysis: {e}")
+            return None
+    
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(10, len(resumes))) as executor:
+        results = list(executor.map(triage_one, [resume_text for _, resume_text in resumes]))
+    for index, ((filename, _), triage) in enumerate(zip(resumes, results)):
+        if triage is None:
+            continue
+        if needs_full_analysis(triage["fit_score"]):
+            triages[index] = triage
+        else:
+            settled[index] = build_triage_analysis(triage, filename)
+    print(f"Triage settled {len(settled)} of {len(resumes)} resumes, skipping their full analysis")
+    return settled, triages
+
+
+def merge_triaged_analyses(settled: dict, analyses: list, count: int) -> list:
+    """Interleave the triage-settled analyses with the full analyses of the rest, in input order"""
+    remaining = iter(analyses)
+    return [settled[index] if index in settled else next(remaining) for index in range(count)]
+
+
+def analyze_resumes_with_advanced_ai_bulk(job_description: str, resumes: list, job_profile: dict = None) -> list:
+    """
+    Bulk version of analyze_resume_with_advanced_ai for (filename, resume_text) pairs.
+    All LLM calls run on one event loop under the AsyncScoringEngine semaphore.
+    Returns analysis JSON strings in input order.
+    """
+    import asyncio
+    from async_scoring_engine import AsyncScoringEngine
+    
+    print(f"🚀 STARTING BULK ADVANCED AI ANALYSIS FOR {len(resumes)} RESUMES")
+    scorer = get_scorer_for_job(job_description)
+    if job_profile is not None:
+        scorer.apply_job_profile(job_description, job_profile)
+    settled, triages = triage_resume_batch(scorer, job_description, resumes)
+    pending = [(index, resume) for index, resume in enumerate(resumes) if index not in settled]
+    
+    async def analyze_one(engine, filename, resume_text, triage):
+        phase_timings = {}
+        start = time.time()
+        
+        async def timed(name, awaitable):
+            started = time.time()
+            try:
+                return await awaitable
+            finally:
+                phase_timings[name] = {
+                    'started_at': round(started - start, 4),
+                    'duration': round(time.time() - started, 4),
+                }
+        
+        try:
+            advanced_result, current_analysis = await asyncio.gather(
+                timed("advanced_scoring", engine.score_resume(job_description, resume_text)),
+                timed("legacy_summary", analyze_resume_with_ai_async(engine, job_description, resume_text, filename))
+            )
+            analysis = build_advanced_analysis(advanced_result, current_analysis, phase_timings, triage)
+            print(f"Advanced analysis completed for {filename}")
+            return analysis
+        except Exception as e:
+            print(f"Advanced analysis failed for {filename}: {e}")
+            # Fallback to current system
+            return await asyncio.to_thread(analyze_resume_with_ai, job_description, resume_text, filename)
+    
+    async def run():
+        async with AsyncScoringEngine(scorer=scorer) as engine:
+            return await asyncio.gather(
+                *(analyze_one(engine, filename, resume_text, triages.get(index))
+                  for index, (filename, resume_text) in pending)
+            )
+    
+    analyses = asyncio.run(run()) if pending else []
+    return merge_triaged_analyses(settled, analyses, len(resumes))
+
+
+def analyze_resumes_with_batch_api(job_description: str, resumes: list, job_profile: dict = None,
+                                   batch_id: str = None, wait: bool = True) -> list:
+    """
+    Offline version of analyze_resumes_with_advanced_ai_bulk for large requisitions.
+    All per-resume prompts go through one OpenAI Batch API job (see batch_scoring).
+    Returns analysis JSON strings in input order. batch_id resumes an earlier
+    submission; with wait=False, BatchPending is raised until the batch has finished.
+    """
+    from batch_scoring import BatchScoringJob
+    
+    print(f"🚀 STARTING BATCH ADVANCED AI ANALYSIS FOR {len(resumes)} RESUMES")
+    scorer = get_scorer_for_job(job_description)
+    settled, triages = triage_resume_batch(scorer, job_description, resumes)
+    pending = [(index, resume) for index, resume in enumerate(resumes) if index not in settled]
+    if not pending:
+        return merge_triaged_analyses(settled, [], len(resumes))
+    
+    def summary_request(filename, resume_text):
+        if not openai.api_key or openai.api_key == "your-openai-api-key-here":
+            return None
+        return {
+            "model": "gpt-4",
+            "messages": [{"role": "user", "content": build_resume_analysis_prompt(job_description, resume_text)}],
+            "temperature": 0.3,
+            "max_tokens": 1000
+        }
+    
+    results = BatchScoringJob(job_description, [resume for _, resume in pending], scorer=scorer,
+                              summary_request=summary_request, job_profile=job_profile, batch_id=batch_id).run(wait=wait)
+    
+    analyses = []
+    for (index, _), result in zip(pending, results):
+        filename = result["filename"]
+        summary = result["summary"]
+        try:
+            json.loads(summary)
+        except (TypeError, json.JSONDecodeError):
+            reason = "OpenAI API key not configured" if summary is None else "Invalid JSON response"
+            summary = create_fallback_analysis(filename, reason)
+        
+        if result["advanced_result"] is None:
+            print(f"Advanced analysis failed for {filename}: {result['error']}")
+            analyses.append(summary)
+        else:
+            analyses.append(build_advanced_analysis(result["advanced_result"], summary, {}, triages.get(index)))
+    return merge_triaged_analyses(settled, analyses, len(resumes))
+
+
 def cleanup_experience_comment(comment: str) -> str:
     """Clean up verbose experience comments to be more concise"""
     if "Candidate:" in comment and "Job requires:" in comment:
@@ -679,6 +985,63 @@ def health_check():
 def test_endpoint():
     return jsonify({'message': 'API test successful'})
 
+@app.route('/api/llm-cache/stats')
+def llm_cache_stats():
+    """Hit/miss counters and size of the persistent LLM response cache"""
+    from llm_cache import get_llm_cache
+    return jsonify(get_llm_cache().stats())
+
+@app.route('/api/scorer-cache/stats')
+def scorer_cache_stats():
+    """Size, hit/miss and eviction counters of the job-scoped scorer cache"""
+    from scorer_cache import get_scorer_cache
+    return jsonify(get_scorer_cache().stats())
+
+@app.route('/api/single-flight/stats')
+def single_flight_stats():
+    """How many concurrent duplicate job-level LLM calls were collapsed"""
+    from single_flight import get_single_flight
+    return jsonify(get_single_flight().stats())
+
+@app.route('/api/scoring-tiers/stats')
+def scoring_tier_stats():
+    """Count and average processing time of stored analyses per scoring tier (cascade savings)"""
+    tiers = {}
+    for (analysis_text,) in db.session.query(Resume.analysis).filter(Resume.analysis.isnot(None)):
+        try:
+            analysis = json.loads(analysis_text)
+        except (TypeError, ValueError):
+            continue
+        tier = analysis.get('scoring_tier', 'unknown')
+        if tier == 'triage':
+            processing_time = analysis.get('triage', {}).get('processing_time', 0.0)
+        else:
+            processing_time = analysis.get('advanced_analysis', {}).get('processing_time', 0.0)
+        entry = tiers.setdefault(tier, {'count': 0, 'total_processing_time': 0.0})
+        entry['count'] += 1
+        entry['total_processing_time'] += processing_time or 0.0
+    for entry in tiers.values():
+        entry['avg_processing_time'] = round(entry['total_processing_time'] / entry['count'], 3)
+        entry['total_processing_time'] = round(entry['total_processing_time'], 3)
+    return jsonify(tiers)
+
+@app.route('/api/extraction-cache/stats')
+def extraction_cache_stats():
+    """Hit/miss counters and size of the raw-bytes extraction cache"""
+    from extraction_cache import get_extraction_cache
+    return jsonify(get_extraction_cache().stats())
+
+@app.route('/api/upload-spool/stats')
+def upload_spool_stats():
+    """Files and references held by the on-disk upload spool"""
+    from upload_spool import get_upload_spool
+    return jsonify(get_upload_spool().stats())
+
+@app.route('/api/rate-limit/stats')
+def rate_limit_stats():
+    """Queueing counters and per-model capacity of the shared LLM rate limiter"""
+    return jsonify(get_rate_limiter().stats())
+
 # Resource management and monitoring
 
 def check_system_resources():
@@ -728,40 +1091,35 @@ def refresh_session():
 
 
 def extract_text_from_file(file_stream):
-    """Extract text from various file formats"""
+    """Extract text from various file formats, reusing text extracted earlier from identical bytes"""
+    from extraction_cache import get_extraction_cache, raw_digest
+    from text_extraction import EXTRACTION_MAX_CHARS, document_format, extract_text
+    
     try:
         filename = file_stream.filename.lower()
+        file_format = document_format(filename)
+        if file_format == 'text' and not filename.endswith(".txt"):
+            return f"Unsupported file type: {filename}"
         file_stream.seek(0)
+        digest = raw_digest(file_stream)
+        file_stream.seek(0)
+        extraction_cache = get_extraction_cache()
+        cached_content = extraction_cache.get_text(digest, filename, EXTRACTION_MAX_CHARS)
+        if cached_content is not None:
+            return cached_content
         
-        if filename.endswith(".pdf"):
-            try:
-                import fitz
-                doc = fitz.open(stream=file_stream.read(), filetype="pdf")
-                content = ""
-                for page in doc:
-                    content += page.get_text()
-                doc.close()
-                return content[:50000]
-            except Exception as e:
-                print(f"PDF extraction error: {e}")
-                return f"PDF extraction failed for {filename}"
-        elif filename.endswith(".docx"):
-            try:
-                import docx
-                doc = docx.Document(file_stream)
-                content = ""
-                for paragraph in doc.paragraphs:
-                    content += paragraph.text + "\n"
-                return content[:50000]
-            except Exception as e:
-                print(f"DOCX extraction error: {e}")
-                return f"DOCX extraction failed for {filename}"
-        elif filename.endswith(".doc"):
-            return extract_text_from_doc_binary(file_stream)
-        elif filename.endswith(".txt"):
-            return file_stream.read().decode("utf-8")[:50000]
-        else:
-            return f"Unsupported file type: {filename}"
+        try:
+            content, _ = extract_text(filename, file_stream)
+        except Exception as e:
+            if file_format not in ('pdf', 'docx'):
+                raise
+            print(f"{file_format.upper()} extraction error: {e}")
+            return f"{file_format.upper()} extraction failed for {filename}"
+        if file_format == 'doc' and not content:
+            # Placeholder, not extracted text; do not cache it
+            return "Document content could not be extracted. Please review manually."
+        extraction_cache.set_text(digest, filename, EXTRACTION_MAX_CHARS, content)
+        return content
     except Exception as e:
         print(f"File extraction error: {e}")
         return f"File extraction failed: {str(e)}"
@@ -880,14 +1238,16 @@ def check_resume_duplicates():
 @app.route("/api/analyze", methods=["POST"])
 def analyze_resumes():
     """Analyze uploaded resumes with AI - return immediately, process asynchronously"""
+    from archive_ingest import UPLOAD_MAX_FILES, UPLOAD_MAX_REQUEST_BYTES, is_archive
+    
     try:
         print("=== Starting analyze_resumes request ===")
         
-        # Check request size
+        # Check request size; uploads are spooled to disk, so this bounds disk use, not memory
         content_length = request.content_length
-        if content_length and content_length > 100 * 1024 * 1024:  # 100MB limit
+        if content_length and content_length > UPLOAD_MAX_REQUEST_BYTES:
             print(f"Request too large: {content_length} bytes")
-            return jsonify({'error': 'Request too large. Maximum 100MB allowed.'}), 413
+            return jsonify({'error': f'Request too large. Maximum {UPLOAD_MAX_REQUEST_BYTES // (1024 * 1024)}MB allowed.'}), 413
         
         # Check system resources before starting
         resources_ok, resource_status = check_system_resources()
@@ -952,6 +1312,9 @@ def analyze_resumes():
             db.session.rollback()
             return jsonify({'error': 'Failed to create job'}), 500
         
+        # Compute and store the job-level scoring artifacts once, before any resume worker starts
+        load_job_profile(job_id)
+        
         # Get uploaded files
         resume_files = request.files.getlist('resumes')
         print(f"Received {len(resume_files)} resume files")
@@ -960,56 +1323,66 @@ def analyze_resumes():
             print("No valid resume files uploaded")
             return jsonify({'error': 'No resume files uploaded'}), 400
         
-        # Limit number of files to prevent resource exhaustion
-        max_files = 30  # Increased from 10 to 30
+        # Limit number of uploaded files to prevent resource exhaustion; ZIP/TAR archives count
+        # as one file each and their entries are bounded by the archive budgets instead
+        max_files = UPLOAD_MAX_FILES
         if len(resume_files) > max_files:
             print(f"Too many files: {len(resume_files)} > {max_files}")
             return jsonify({
-                'error': f'Too many files. Maximum {max_files} files allowed per request.'
+                'error': f'Too many files. Maximum {max_files} files allowed per request; upload larger sets as a ZIP or TAR archive.'
             }), 400
         
-        # Store files temporarily and return immediately
+        # Spool files to disk, queue one work item per file and return immediately; workers read them one at a time
+        from upload_spool import get_upload_spool
+        from work_queue import KIND_ARCHIVE, KIND_RESUME, enqueue_work_item
+        
         file_data = []
         total_size = 0
         for resume_file in resume_files:
             if resume_file.filename:
                 try:
-                    file_content = resume_file.read()
-                    file_size = len(file_content)
-                    total_size += file_size
+                    upload = get_upload_spool().store(resume_file.stream)
+                    total_size += upload.size
                     file_data.append({
                         'filename': resume_file.filename,
-                        'content': file_content,
+                        'upload': upload,
                         'job_id': job_id
                     })
-                    print(f"Stored file: {resume_file.filename} ({file_size} bytes)")
+                    print(f"Spooled file: {resume_file.filename} ({upload.size} bytes)")
                 except Exception as e:
                     print(f"Error reading file {resume_file.filename}: {e}")
         
-        print(f"Successfully stored {len(file_data)} files for background processing (total size: {total_size} bytes)")
+        print(f"Successfully spooled {len(file_data)} files for background processing (total size: {total_size} bytes)")
+        archive_count = sum(1 for file_info in file_data if is_archive(file_info['filename']))
+        
+        # Queue the files durably; from here on the work queue owns the spooled files
+        try:
+            for file_info in file_data:
+                kind = KIND_ARCHIVE if is_archive(file_info['filename']) else KIND_RESUME
+                enqueue_work_item(db.session, WorkItem, job_id, kind, file_info['filename'], file_info['upload'])
+            db.session.commit()
+        except Exception as e:
+            print(f"Error queueing files for job {job_id}: {e}")
+            db.session.rollback()
+            for file_info in file_data:
+                file_info['upload'].release()
+            return jsonify({'error': 'Failed to queue resumes for analysis'}), 500
+        for file_info in file_data:
+            file_info['upload'].hand_off()
+        print(f"Queued {len(file_data)} work items for job {job_id}")
         
         # Return immediately with job_id
         response_data = {
             'message': f'Analysis queued successfully for {len(file_data)} resume(s). Processing in background.',
             'job_id': job_id,
             'total_files': len(file_data),
+            'archives': archive_count,
             'status': 'queued',
             'redirect_url': f'/jobs/{job_id}'
         }
-        
-        # Start background processing
-        try:
-            import threading
-            processing_thread = threading.Thread(
-                target=process_resumes_background,
-                args=(file_data, job_description, job_id)
-            )
-            processing_thread.daemon = False  # Changed from True to False - prevents thread from being killed
-            processing_thread.start()
-            print(f"Started background processing thread for job {job_id}")
-        except Exception as e:
-            print(f"Error starting background thread: {e}")
-            # Continue anyway - the job is created and user can check later
+        if archive_count:
+            response_data['message'] = (f'Analysis queued successfully for {len(file_data) - archive_count} resume(s) '
+                                        f'and {archive_count} archive(s). Processing in background.')
         
         print("=== analyze_resumes request completed successfully ===")
         return jsonify(response_data)
@@ -1021,17 +1394,37 @@ def analyze_resumes():
         db.session.rollback()
         return jsonify({'error': f'Critical error: {str(e)}'}), 500
 
-def process_resumes_background(file_data, job_description, job_id):
-    """Process resumes in background thread"""
+def process_resumes_background(file_data, job_description, job_id, job_profile=None, release_uploads=True,
+                               batch_id=None, wait_for_batch=True):
+    """
+    Analyze and save a batch of a job's spooled uploads; ZIP/TAR uploads are expanded one
+    entry at a time. Called by the work queue handler with release_uploads=False (the
+    queue owns those files). Returns {'processed', 'skipped', 'stopped'}, where stopped
+    is None when every file was handled, 'resources' or 'error' otherwise.
+    With the batch engine, batch_id resumes an earlier submission and wait_for_batch=False
+    raises BatchPending instead of waiting for the batch to finish.
+    """
+    from archive_ingest import iter_job_uploads
+    from async_scoring_engine import SCORING_ENGINE
+    from batch_scoring import BatchPending
+    from extraction_cache import get_extraction_cache
+    from prescreen import PRESCREEN_ENABLED
+    from text_extraction import EXTRACTION_MAX_CHARS, document_format, extract_text
+    from upload_spool import get_upload_spool
+    extraction_cache = get_extraction_cache()
     processed_files = []
     skipped_files = []
+    pending_resumes = []
+    pending_hashes = set()
+    stopped = None
+    uploads = iter_job_uploads(get_upload_spool(), file_data, skipped_files)
     
     try:
         print(f"Starting background processing for job {job_id} with {len(file_data)} files")
         
-        for i, file_info in enumerate(file_data):
+        for i, file_info in enumerate(uploads):
             try:
-                print(f"=== Processing file {i+1}/{len(file_data)}: {file_info['filename']} ===")
+                print(f"=== Processing file {i+1}: {file_info['filename']} ===")
                 
                 # Check resources every 5 files (files 5, 10, 15, etc.)
                 if (i + 1) % 5 == 0:
@@ -1042,69 +1435,36 @@ def process_resumes_background(file_data, job_description, job_id):
                         print(f"Resource status: {resource_status}")
                         if not resources_ok:
                             print("Resource limit reached, stopping processing")
+                            stopped = 'resources'
                             break
                     except Exception as resource_error:
                         print(f"Resource check failed: {resource_error}")
                         # Continue processing even if resource check fails
                 
                 filename = file_info['filename']
-                file_stream = file_info['content']
+                upload = file_info['upload']
                 
-                print(f"Processing file {i+1}/{len(file_data)}: {filename}")
+                print(f"Processing file {i+1}: {filename}")
                 
-                # Extract text from file with size limits
-                content = ""
-                try:
-                    if filename.lower().endswith('.pdf'):
-                        pdf_doc = fitz.open(stream=file_stream, filetype='pdf')
-                        for page in pdf_doc:
-                            content += page.get_text()
-                            if len(content) > 50000:
-                                break
-                        pdf_doc.close()
-                    elif filename.lower().endswith('.docx'):
-                        doc = docx.Document(io.BytesIO(file_stream))
-                        for para in doc.paragraphs:
-                            content += para.text + '\n'
-                            if len(content) > 50000:
-                                break
-                    elif filename.lower().endswith('.doc'):
-                        # Handle .doc files with robust fallback
-                        try:
-                            # Try to use textract if available
-                            try:
-                                import tempfile
-                                with tempfile.NamedTemporaryFile(suffix='.doc', delete=False) as temp_file:
-                                    temp_file.write(file_stream)
-                                    temp_file_path = temp_file.name
-                                
-                                import textract
-                                content = textract.process(temp_file_path).decode('utf-8')
-                                os.unlink(temp_file_path)
-                                
-                                if len(content) > 50000:
-                                    content = content[:50000]
-                                    
-                            except ImportError:
-                                # textract not available, use alternative method
-                                print(f"Textract not available for {filename}, using alternative method")
-                                content = extract_text_from_doc_binary(file_stream)
-                                
-                        except Exception as e:
-                            print(f"Textract error for {filename}: {e}")
-                            # Fallback: try to extract text from binary
-                            try:
-                                content = extract_text_from_doc_binary(file_stream)
-                            except Exception as fallback_error:
-                                print(f"Fallback extraction failed for {filename}: {fallback_error}")
-                                # Last resort: use filename as content
-                                content = f"Document: {filename}\n\nContent extraction failed. Please review manually."
-                    else:
-                        content = file_stream.decode('utf-8')[:50000]
-                except Exception as e:
-                    print(f"File extraction error for {filename}: {e}")
-                    skipped_files.append({'filename': filename, 'reason': f'File extraction failed: {str(e)}'})
-                    continue
+                # Extract text from the spooled file up to the character budget, unless these bytes were seen before
+                content = extraction_cache.get_text(upload.digest, filename, EXTRACTION_MAX_CHARS) or ""
+                if content:
+                    print(f"Using cached text for {filename}")
+                else:
+                    try:
+                        content, extraction_stats = extract_text(filename, upload.path)
+                        print(f"Extracted {extraction_stats['chars']} chars from {filename} in {extraction_stats['elapsed']}s")
+                    except Exception as e:
+                        if document_format(filename) != 'doc':
+                            print(f"File extraction error for {filename}: {e}")
+                            skipped_files.append({'filename': filename, 'reason': f'File extraction failed: {str(e)}'})
+                            continue
+                        print(f"Document extraction failed for {filename}: {e}")
+                    if content:
+                        extraction_cache.set_text(upload.digest, filename, EXTRACTION_MAX_CHARS, content)
+                    elif document_format(filename) == 'doc':
+                        # Last resort: use filename as content
+                        content = f"Document: {filename}\n\nContent extraction failed. Please review manually."
                 
                 if not content.strip():
                     skipped_files.append({'filename': filename, 'reason': 'Empty file'})
@@ -1122,92 +1482,27 @@ def process_resumes_background(file_data, job_description, job_id):
                     print(f"Duplicate check error for {filename}: {e}")
                     continue
                 
+                if SCORING_ENGINE in ('async', 'batch') or PRESCREEN_ENABLED:
+                    # Defer analysis so the whole set of resumes is pre-screened / scored together
+                    if content_hash in pending_hashes:
+                        skipped_files.append({'filename': filename, 'reason': 'Duplicate'})
+                        continue
+                    pending_hashes.add(content_hash)
+                    pending_resumes.append((filename, content, content_hash))
+                    continue
+                
                 # Analyze with AI
                 try:
                     print(f"Starting AI analysis for {filename}")
-                    analysis_text = analyze_resume_with_advanced_ai(job_description, content, filename)
+                    analysis_text = analyze_resume_with_advanced_ai(job_description, content, filename, job_profile)
                     print(f"AI analysis completed for {filename}")
-                    
-                    try:
-                        analysis_json = json.loads(analysis_text)
-                        print(f"JSON parsing successful for {filename}")
-                    except json.JSONDecodeError as json_error:
-                        print(f"JSON parsing failed for {filename}: {json_error}")
-                        analysis_json = {"candidate_name": "Parse Error", "fit_score": 0, "bucket": "Error"}
-                    
-                    candidate_name = analysis_json.get('candidate_name', 'Not Provided')
-                    if candidate_name == 'Name Not Found':
-                        candidate_name = filename.split('.')[0].replace('_', ' ')
-                    
-                    print(f"Processing candidate: {candidate_name}")
-                    
-                    # Save to database
-                    try:
-                        print(f"Saving to database: {filename}")
-                        with app.app_context():
-                            new_resume = Resume(
-                                filename=filename,
-                                candidate_name=candidate_name,
-                                content=content,
-                                content_hash=content_hash,
-                                analysis=analysis_text,
-                                job_id=job_id
-                            )
-                            db.session.add(new_resume)
-                            db.session.commit()
-                            processed_files.append(filename)
-                            print(f"Successfully processed and saved: {filename}")
-                            
-                    except Exception as db_error:
-                        print(f"Database save error for {filename}: {db_error}")
-                        db.session.rollback()
-                        # Try fallback save
-                        try:
-                            print(f"Attempting fallback save for {filename}")
-                            fallback_analysis = create_fallback_analysis(filename, "Database save failed")
-                            with app.app_context():
-                                new_resume = Resume(
-                                    filename=filename,
-                                    candidate_name=filename.split('.')[0].replace('_', ' '),
-                                    content=content,
-                                    content_hash=content_hash,
-                                    analysis=fallback_analysis,
-                                    job_id=job_id
-                                )
-                                db.session.add(new_resume)
-                                db.session.commit()
-                                processed_files.append(filename)
-                                print(f"Fallback save successful for {filename}")
-                        except Exception as fallback_error:
-                            print(f"Fallback save failed for {filename}: {fallback_error}")
-                            skipped_files.append({'filename': filename, 'reason': 'Database error'})
-                    
+                    save_resume_analysis(filename, content, content_hash, analysis_text, job_id, processed_files, skipped_files)
                 except Exception as ai_error:
                     print(f"AI Analysis failed for {filename}: {ai_error}")
-                    # Save with fallback analysis
-                    try:
-                        print(f"Creating fallback analysis for {filename}")
-                        fallback_analysis = create_fallback_analysis(filename, str(ai_error))
-                        with app.app_context():
-                            new_resume = Resume(
-                                filename=filename,
-                                candidate_name=filename.split('.')[0].replace('_', ' '),
-                                content=content,
-                                content_hash=content_hash,
-                                analysis=fallback_analysis,
-                                job_id=job_id
-                            )
-                            db.session.add(new_resume)
-                            db.session.commit()
-                            processed_files.append(filename)
-                            print(f"Fallback analysis saved for {filename}")
-                    except Exception as fallback_error:
-                        print(f"Fallback save failed for {filename}: {fallback_error}")
-                        skipped_files.append({'filename': filename, 'reason': 'AI and database error'})
+                    save_resume_fallback_analysis(filename, content, content_hash, str(ai_error), job_id, processed_files, skipped_files)
                 
                 # Clean up memory more aggressively
                 if "content" in locals(): del content
-                if "file_stream" in locals(): del file_stream
                 if "analysis_text" in locals(): del analysis_text
                 gc.collect()  # Force garbage collection after each file
                 
@@ -1217,20 +1512,64 @@ def process_resumes_background(file_data, job_description, job_id):
                 # Clean up memory even on error
                 try:
                     if "content" in locals(): del content
-                    if "file_stream" in locals(): del file_stream
                     if "analysis_text" in locals(): del analysis_text
                     gc.collect()
                 except:
                     pass
         
+        if stopped and not wait_for_batch:
+            # A queued batch must cover every resume of its items; nothing is submitted for part of them
+            pending_resumes = []
+        
+        if pending_resumes and PRESCREEN_ENABLED:
+            # Archive clear rejects before any LLM call
+            passed, rejected = prescreen_resume_batch(job_description, pending_resumes)
+            for (filename, content, content_hash), prescreen in rejected:
+                save_resume_analysis(filename, content, content_hash, build_prescreen_analysis(prescreen, filename),
+                                     job_id, processed_files, skipped_files)
+        else:
+            passed = [(resume, None) for resume in pending_resumes]
+        
+        if passed and SCORING_ENGINE in ('async', 'batch'):
+            print(f"Running {SCORING_ENGINE} analysis for {len(passed)} resumes")
+            try:
+                resumes = [(filename, content) for (filename, content, _), _ in passed]
+                if SCORING_ENGINE == 'batch':
+                    analyses = analyze_resumes_with_batch_api(job_description, resumes, job_profile,
+                                                              batch_id=batch_id, wait=wait_for_batch)
+                else:
+                    analyses = analyze_resumes_with_advanced_ai_bulk(job_description, resumes, job_profile)
+                for ((filename, content, content_hash), prescreen), analysis_text in zip(passed, analyses):
+                    save_resume_analysis(filename, content, content_hash, attach_prescreen(analysis_text, prescreen),
+                                         job_id, processed_files, skipped_files)
+            except BatchPending:
+                raise
+            except Exception as ai_error:
+                print(f"Bulk AI analysis failed for job {job_id}: {ai_error}")
+                for (filename, content, content_hash), _ in passed:
+                    save_resume_fallback_analysis(filename, content, content_hash, str(ai_error), job_id, processed_files, skipped_files)
+        else:
+            for (filename, content, content_hash), prescreen in passed:
+                try:
+                    print(f"Starting AI analysis for {filename}")
+                    analysis_text = analyze_resume_with_advanced_ai(job_description, content, filename, job_profile)
+                    save_resume_analysis(filename, content, content_hash, attach_prescreen(analysis_text, prescreen),
+                                         job_id, processed_files, skipped_files)
+                except Exception as ai_error:
+                    print(f"AI Analysis failed for {filename}: {ai_error}")
+                    save_resume_fallback_analysis(filename, content, content_hash, str(ai_error), job_id, processed_files, skipped_files)
+        
         # Final cleanup
         gc.collect()
         print(f"Background processing completed for job {job_id}. Processed: {len(processed_files)}, Skipped: {len(skipped_files)}")
         
+    except BatchPending:
+        raise
     except Exception as e:
         print(f"Critical error in background processing for job {job_id}: {e}")
         import traceback
         traceback.print_exc()
+        stopped = 'error'
         
         # Try to save any processed files even if there was an error
         try:
@@ -1239,6 +1578,283 @@ def process_resumes_background(file_data, job_description, job_id):
                 print(f"Successfully processed: {filename}")
         except Exception as save_error:
             print(f"Error saving processed files: {save_error}")
+    finally:
+        # Drop this job's references to the spooled uploads (the current archive entry first)
+        uploads.close()
+        if release_uploads:
+            for file_info in file_data:
+                if 'upload' in file_info:
+                    file_info['upload'].release()
+    return {'processed': processed_files, 'skipped': skipped_files, 'stopped': stopped}
+
+def save_resume_analysis(filename, content, content_hash, analysis_text, job_id, processed_files, skipped_files):
+    """Save an analyzed resume, falling back to a placeholder analysis if the save fails"""
+    from score_matrix import store_score_vector
+    from section_index import store_section_index
+    
+    try:
+        analysis_json = json.loads(analysis_text)
+        print(f"JSON parsing successful for {filename}")
+    except json.JSONDecodeError as json_error:
+        print(f"JSON parsing failed for {filename}: {json_error}")
+        analysis_json = {"candidate_name": "Parse Error", "fit_score": 0, "bucket": "Error"}
+    
+    candidate_name = analysis_json.get('candidate_name', 'Not Provided')
+    if candidate_name == 'Name Not Found':
+        candidate_name = filename.split('.')[0].replace('_', ' ')
+    
+    print(f"Processing candidate: {candidate_name}")
+    
+    # Save to database
+    try:
+        print(f"Saving to database: {filename}")
+        with app.app_context():
+            new_resume = Resume(
+                filename=filename,
+                candidate_name=candidate_name,
+                content=content,
+                content_hash=content_hash,
+                analysis=analysis_text,
+                job_id=job_id
+            )
+            db.session.add(new_resume)
+            db.session.flush()
+            store_score_vector(db.session, ResumeScoreVector, new_resume, analysis_json)
+            store_section_index(db.session, ResumeSectionIndex, new_resume)
+            db.session.commit()
+            processed_files.append(filename)
+            print(f"Successfully processed and saved: {filename}")
+            
+    except Exception as db_error:
+        print(f"Database save error for {filename}: {db_error}")
+        db.session.rollback()
+        # Try fallback save
+        try:
+            print(f"Attempting fallback save for {filename}")
+            fallback_analysis = create_fallback_analysis(filename, "Database save failed")
+            with app.app_context():
+                new_resume = Resume(
+                    filename=filename,
+                    candidate_name=filename.split('.')[0].replace('_', ' '),
+                    content=content,
+                    content_hash=content_hash,
+                    analysis=fallback_analysis,
+                    job_id=job_id
+                )
+                db.session.add(new_resume)
+                db.session.commit()
+                processed_files.append(filename)
+                print(f"Fallback save successful for {filename}")
+        except Exception as fallback_error:
+            print(f"Fallback save failed for {filename}: {fallback_error}")
+            skipped_files.append({'filename': filename, 'reason': 'Database error'})
+
+def save_resume_fallback_analysis(filename, content, content_hash, error_reason, job_id, processed_files, skipped_files):
+    """Save a resume with a fallback analysis after the AI analysis failed"""
+    try:
+        print(f"Creating fallback analysis for {filename}")
+        fallback_analysis = create_fallback_analysis(filename, error_reason)
+        with app.app_context():
+            new_resume = Resume(
+                filename=filename,
+                candidate_name=filename.split('.')[0].replace('_', ' '),
+                content=content,
+                content_hash=content_hash,
+                analysis=fallback_analysis,
+                job_id=job_id
+            )
+            db.session.add(new_resume)
+            db.session.commit()
+            processed_files.append(filename)
+            print(f"Fallback analysis saved for {filename}")
+    except Exception as fallback_error:
+        print(f"Fallback save failed for {filename}: {fallback_error}")
+        skipped_files.append({'filename': filename, 'reason': 'AI and database error'})
+
+def expand_archive_work_item(item, archive):
+    """Spool an archive item's entries and queue each as a resume item of the same job"""
+    from archive_ingest import ArchiveBudget, iter_archive_uploads
+    from upload_spool import get_upload_spool
+    from work_queue import KIND_RESUME, archive_entries_queued, enqueue_work_item, queued_resume_filenames
+    
+    # One budget per job across its archives, counting entries queued from the job's other archives;
+    # entry filenames must not clash with the job's other resumes
+    budget = ArchiveBudget()
+    budget.entries, budget.total_bytes = archive_entries_queued(db.session, WorkItem, item['job_id'], item['id'])
+    budget.filenames = queued_resume_filenames(db.session, WorkItem, item['job_id'], item['id'])
+    skipped_files = []
+    queued = 0
+    for entry in iter_archive_uploads(get_upload_spool(), archive.path, item['filename'], budget, skipped_files):
+        enqueue_work_item(db.session, WorkItem, item['job_id'], KIND_RESUME, entry['filename'], entry['upload'],
+                          parent_id=item['id'])
+        db.session.commit()
+        entry['upload'].hand_off()
+        queued += 1
+    for skipped in skipped_files:
+        print(f"Skipped {skipped['filename']} in {item['filename']}: {skipped['reason']}")
+    print(f"📦 Archive {item['filename']}: {queued} entries queued, {len(skipped_files)} skipped")
+    return f"Queued {queued} entries, skipped {len(skipped_files)}"
+
+def rescore_resume(resume_id, job):
+    """Re-score a stored resume against its job's current description, reusing its resume-only artifacts"""
+    from score_matrix import store_score_vector
+    from section_index import load_section_index, store_section_index
+    
+    resume = db.session.get(Resume, resume_id)
+    if resume is None or resume.job_id != job.id:
+        return 'Resume deleted'
+    try:
+        analysis = json.loads(resume.analysis) if resume.analysis else {}
+    except ValueError:
+        analysis = {}
+    artifacts = stored_resume_artifacts(analysis)
+    section_index = load_section_index(db.session, ResumeSectionIndex, resume)
+    if section_index:
+        artifacts["section_index"] = section_index
+    analysis_text = analyze_resume_with_advanced_ai(
+        job.description, resume.content, resume.filename, load_job_profile(job.id), artifacts
+    )
+    analysis = json.loads(analysis_text)
+    resume.analysis = analysis_text
+    store_score_vector(db.session, ResumeScoreVector, resume, analysis)
+    store_section_index(db.session, ResumeSectionIndex, resume)
+    db.session.commit()
+    skipped_phases = (analysis.get('advanced_analysis') or {}).get('skipped_phases', [])
+    return f"Rescored: fit score {analysis.get('fit_score')}, skipped phases: {', '.join(skipped_phases) or 'none'}"
+
+def analyze_work_item_group(job, file_data, batch_id=None):
+    """
+    Analyze one group of a job's resume items; returns {item_id: result}. With the batch
+    engine the group is submitted as one Batch API batch, or its batch_id is polled, and
+    the items are deferred until the batch has finished instead of holding the worker.
+    """
+    from async_scoring_engine import SCORING_ENGINE
+    from batch_scoring import BATCH_POLL_INTERVAL_SECONDS, TERMINAL_STATUSES, BatchPending, get_batch_backend
+    from work_queue import WorkDeferred, record_batch_id
+    
+    if SCORING_ENGINE != 'batch':
+        outcome = process_resumes_background(file_data, job.description, job.id, load_job_profile(job.id),
+                                             release_uploads=False)
+    else:
+        items = [file_info['work_item'] for file_info in file_data]
+        try:
+            # Polling alone is cheap; the resumes are only extracted again once the batch has finished
+            if batch_id is not None:
+                status = get_batch_backend().poll(batch_id)
+                if status not in TERMINAL_STATUSES:
+                    raise BatchPending(batch_id, status)
+            outcome = process_resumes_background(file_data, job.description, job.id, load_job_profile(job.id),
+                                                 release_uploads=False, batch_id=batch_id, wait_for_batch=False)
+        except BatchPending as pending:
+            if pending.batch_id != batch_id:
+                record_batch_id(db.session, WorkItem, items, pending.batch_id)
+                print(f"📤 Job {job.id}: {len(items)} work items waiting for batch {pending.batch_id}")
+            deferred = WorkDeferred(str(pending), retry_seconds=int(BATCH_POLL_INTERVAL_SECONDS))
+            return {item['id']: deferred for item in items}
+    
+    if outcome['stopped'] == 'resources':
+        raise WorkDeferred('Resource limit reached')
+    if outcome['stopped']:
+        raise RuntimeError(f"Processing stopped for job {job.id}")
+    skipped = {entry['filename']: entry['reason'] for entry in outcome['skipped']}
+    return {file_info['work_item_id']: skipped.get(file_info['filename'], 'Processed') for file_info in file_data}
+
+def process_work_items(items):
+    """Work queue handler: expand an archive item, analyze a batch of one job's resume items, or re-score resumes"""
+    from upload_spool import get_upload_spool
+    from work_queue import KIND_ARCHIVE, KIND_RESCORE, WorkDeferred
+    
+    job = db.session.get(Job, items[0]['job_id'])
+    if job is None:
+        return {item['id']: 'Job deleted' for item in items}
+    resources_ok, resource_status = check_system_resources()
+    if not resources_ok:
+        raise WorkDeferred(resource_status)
+    
+    results = {}
+    if items[0]['kind'] == KIND_RESCORE:
+        # Each resume is committed on its own; a failed one is retried without redoing the others
+        for item in items:
+            try:
+                results[item['id']] = rescore_resume(item['resume_id'], job)
+            except Exception as e:
+                print(f"Rescore failed for {item['filename']}: {e}")
+                db.session.rollback()
+        return results
+    
+    file_data = []
+    for item in items:
+        try:
+            upload = get_upload_spool().reopen(item['upload_digest'])
+        except FileNotFoundError:
+            # Possibly mid-discard by another process; retried, and failed once the attempts are used up
+            print(f"Spooled upload for {item['filename']} is missing, will retry")
+            continue
+        file_data.append({'filename': item['filename'], 'upload': upload, 'job_id': job.id, 'work_item_id': item['id'],
+                          'work_item': item})
+    
+    try:
+        if items[0]['kind'] == KIND_ARCHIVE:
+            # Archive items are claimed on their own
+            for file_info in file_data:
+                results[file_info['work_item_id']] = expand_archive_work_item(items[0], file_info['upload'])
+        else:
+            # Items already submitted in a Batch API batch are polled apart from newly queued ones
+            groups = {}
+            for file_info in file_data:
+                groups.setdefault(file_info['work_item']['batch_id'], []).append(file_info)
+            for batch_id, group in groups.items():
+                results.update(analyze_work_item_group(job, group, batch_id))
+    finally:
+        for file_info in file_data:
+            file_info['upload'].hand_off()
+    return results
+
+# Global work queue worker, initialized to None.
+_work_queue_worker = None
+_work_queue_worker_lock = threading.Lock()
+
+def get_work_queue_worker():
+    """Return this process's work queue worker, creating it on first use"""
+    global _work_queue_worker
+    if _work_queue_worker is None:
+        with _work_queue_worker_lock:
+            if _work_queue_worker is None:
+                from async_scoring_engine import SCORING_ENGINE
+                from prescreen import PRESCREEN_ENABLED
+                from upload_spool import get_upload_spool
+                from work_queue import KIND_RESUME, WORK_QUEUE_BATCH_SIZE, WorkQueueWorker
+                # Batch engines and pre-screening score a job's resumes together; the thread engine one at a time
+                batch_size = WORK_QUEUE_BATCH_SIZE if SCORING_ENGINE in ('async', 'batch') or PRESCREEN_ENABLED else 1
+                # The Batch API engine sends all of a job's pending resumes in one batch
+                kind_batch_sizes = {KIND_RESUME: None} if SCORING_ENGINE == 'batch' else None
+                _work_queue_worker = WorkQueueWorker(app, db, WorkItem, process_work_items, get_upload_spool(),
+                                                     batch_size=batch_size, kind_batch_sizes=kind_batch_sizes)
+    return _work_queue_worker
+
+def start_work_queue_workers():
+    """Start this process's work queue worker threads (idempotent)"""
+    from work_queue import WORK_QUEUE_WORKERS
+    if WORK_QUEUE_WORKERS > 0:
+        get_work_queue_worker().start()
+
+@app.before_request
+def start_work_queue_on_first_request():
+    """
+    Serving processes run work queue workers, started by their first request. They are
+    never started at import: backend/app.py and the spawn process pools import this module.
+    """
+    from work_queue import WORK_QUEUE_AUTOSTART
+    if WORK_QUEUE_AUTOSTART:
+        try:
+            start_work_queue_workers()
+        except Exception as e:
+            print(f"Error starting work queue workers: {e}")
+
+@app.route('/api/work-queue/stats')
+def work_queue_stats():
+    from work_queue import queue_stats
+    return jsonify({'items': queue_stats(db.session, WorkItem), 'worker': get_work_queue_worker().stats()})
 
 @app.route('/api/jobs', methods=['GET'])
 def get_jobs():
@@ -1258,7 +1874,9 @@ def get_jobs():
 
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
 def get_job_details(job_id):
-    """Get detailed information about a specific job"""
+    """Get detailed information about a specific job, with its work queue progress"""
+    from work_queue import queue_stats
+    
     job = Job.query.get_or_404(job_id)
     
     # Group resumes by analysis result
@@ -1282,23 +1900,103 @@ def get_job_details(job_id):
         'id': job.id,
         'description': job.description,
         'resumes': resumes_data,
-        'total_resumes': len(job.resumes)
+        'total_resumes': len(job.resumes),
+        'queue': queue_stats(db.session, WorkItem, job.id)
     })
 
 @app.route('/api/jobs/<int:job_id>', methods=['DELETE'])
 def delete_job(job_id):
     """Delete a job and all associated resumes"""
+    from upload_spool import get_upload_spool
+    from work_queue import delete_job_work_items, upload_still_queued
+    
     job = Job.query.get_or_404(job_id)
     
-    # Delete associated resumes
+    # Delete associated resumes, their score rows, section indexes, queued work and the job profile
+    queued_digests = delete_job_work_items(db.session, WorkItem, job_id)
+    ResumeScoreVector.query.filter_by(job_id=job_id).delete()
+    ResumeSectionIndex.query.filter_by(job_id=job_id).delete()
     Resume.query.filter_by(job_id=job_id).delete()
+    JobProfile.query.filter_by(job_id=job_id).delete()
     
     # Delete the job
     db.session.delete(job)
     db.session.commit()
+    for digest in queued_digests:
+        if not upload_still_queued(db.session, WorkItem, digest):
+            get_upload_spool().discard(digest, lambda: upload_still_queued(db.session, WorkItem, digest))
     
     return jsonify({'message': 'Job deleted successfully'})
 
+def stored_resume_artifacts(analysis: dict) -> dict:
+    """Job-independent scoring artifacts of a stored analysis, reused by rescore_job"""
+    advanced = analysis.get("advanced_analysis") or {}
+    return {
+        "candidate_experience": advanced.get("candidate_experience") or {},
+        "cross_section_content": advanced.get("cross_section_content") or {},
+    }
+
+@app.route('/api/jobs/<int:job_id>/rescore', methods=['POST'])
+def rescore_job(job_id):
+    """
+    Re-score a job in place after its description is edited. The new job
+    profile is diffed against the stored one and one rescore work item is
+    queued per resume; workers reuse the resume-only phases (candidate
+    experience, cross-section content, the section index) from the stored
+    analyses and rerun only the phases whose inputs changed. Each item's
+    result lists the phases it skipped; progress is in the job's queue stats.
+    """
+    from job_profile import description_hash, diff_job_profiles
+    from work_queue import enqueue_rescore_item
+    
+    job = Job.query.get_or_404(job_id)
+    data = request.get_json(silent=True) or {}
+    new_description = (data.get('description') or job.description).strip()
+    if not new_description:
+        return jsonify({'error': 'Job description is required'}), 400
+    
+    stored_profile = db.session.get(JobProfile, job_id)
+    old_profile = json.loads(stored_profile.profile) if stored_profile else None
+    if (old_profile and old_profile.get('description_hash') == description_hash(new_description)
+            and not data.get('force')):
+        return jsonify({'job_id': job_id, 'changes': diff_job_profiles(old_profile, old_profile), 'queued': 0})
+    
+    job.description = new_description
+    db.session.commit()
+    new_profile = load_job_profile(job_id)
+    changes = diff_job_profiles(old_profile, new_profile)
+    print(f"Re-scoring job {job_id}: {changes}")
+    
+    resumes = Resume.query.filter_by(job_id=job_id).all()
+    for resume in resumes:
+        enqueue_rescore_item(db.session, WorkItem, resume)
+    db.session.commit()
+    
+    return jsonify({'job_id': job_id, 'changes': changes, 'queued': len(resumes), 'status': 'queued'})
+
+@app.route('/api/jobs/<int:job_id>/reweight', methods=['POST'])
+def reweight_job_scores(job_id):
+    """
+    Recompute final scores and buckets for every resume in a job under new
+    section weights, from the stored score matrix (no LLM calls). Pass
+    "save": true to write the new scores and buckets into the analyses.
+    """
+    from score_matrix import apply_reweight, reweight_job, validate_section_weights
+    
+    Job.query.get_or_404(job_id)
+    data = request.get_json(silent=True) or {}
+    section_weights = data.get('section_weights')
+    error = validate_section_weights(section_weights)
+    if error:
+        return jsonify({'error': error}), 400
+    
+    result = reweight_job(db.session, Resume, ResumeScoreVector, job_id, section_weights)
+    if data.get('save'):
+        apply_reweight(db.session, Resume, result['resumes'], section_weights)
+        db.session.commit()
+    result['saved'] = bool(data.get('save'))
+    return jsonify(result)
+
 @app.route('/api/data')
 def get_data():
     return jsonify({'message': 'TalentVibe API is running'})
@@ -1512,15 +2210,26 @@ def internal_error(error):
 
 @app.errorhandler(413)
 def too_large(error):
+    from archive_ingest import UPLOAD_MAX_REQUEST_BYTES
     print(f"Request too large error: {error}")
     return jsonify({
         'error': 'Request too large. Please reduce the number of files or file sizes.',
-        'details': 'Maximum 100MB total upload size allowed.'
+        'details': f'Maximum {UPLOAD_MAX_REQUEST_BYTES // (1024 * 1024)}MB total upload size allowed.'
     }), 413
 
 # WSGI application
 application = app
 
 if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)                                                                 
\ No newline at end of file
+    import sys
+    from work_queue import WORK_QUEUE_AUTOSTART
+    if '--worker' in sys.argv:
+        # Worker-only process: add more of these next to the web app to scale throughput
+        get_work_queue_worker().start()
+        get_work_queue_worker().join()
+    else:
+        # Resume queued work left over from before a restart without waiting for a request
+        if WORK_QUEUE_AUTOSTART:
+            start_work_queue_workers()
+        port = int(os.environ.get('PORT', 5000))
+        app.run(host='0.0.0.0', port=port, debug=False)                                                                 
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Bulk resume ingest from ZIP and TAR archives.
+
+analyze_resumes spools an uploaded archive like any other file. The
+background thread then walks it with iter_job_uploads, which expands archives
+one entry at a time: each entry is decompressed as a stream into the upload
+spool through a reader that enforces the per-entry and job-wide byte budgets,
+handed to the normal extraction pipeline, and released as soon as the next
+entry is requested. Neither the archive nor its entries are held in memory,
+declared entry sizes (which a crafted archive can fake) are never trusted,
+and entry paths are never written to disk, since the spool names files by
+content hash.
+"""
+import os
+import tarfile
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional
+
+UPLOAD_MAX_FILES = int(os.environ.get('UPLOAD_MAX_FILES', 30))
+UPLOAD_MAX_REQUEST_BYTES = int(os.environ.get('UPLOAD_MAX_REQUEST_BYTES', 1024 * 1024 * 1024))  # 1GB
+ARCHIVE_MAX_ENTRY_BYTES = int(os.environ.get('ARCHIVE_MAX_ENTRY_BYTES', 20 * 1024 * 1024))  # 20MB
+ARCHIVE_MAX_TOTAL_BYTES = int(os.environ.get('ARCHIVE_MAX_TOTAL_BYTES', 4 * 1024 * 1024 * 1024))  # 4GB
+ARCHIVE_MAX_ENTRIES = int(os.environ.get('ARCHIVE_MAX_ENTRIES', 5000))
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc', '.txt')
+ARCHIVE_EXTENSIONS = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+class ArchiveBudgetExceeded(Exception):
+    def __init__(self, message: str, job_wide: bool = False):
+        super().__init__(message)
+        self.job_wide = job_wide
+
+
+class ArchiveBudget:
+    """Entry count and uncompressed bytes ingested from a job's archives."""
+
+    def __init__(self, max_entry_bytes: int = ARCHIVE_MAX_ENTRY_BYTES, max_total_bytes: int = ARCHIVE_MAX_TOTAL_BYTES,
+                 max_entries: int = ARCHIVE_MAX_ENTRIES):
+        self.max_entry_bytes = max_entry_bytes
+        self.max_total_bytes = max_total_bytes
+        self.max_entries = max_entries
+        self.entries = 0
+        self.total_bytes = 0
+        # Filenames already used in the job; a resume's filename must be unique within its job
+        self.filenames = set()
+
+
+class _BudgetedReader:
+    """Passes reads through, raising ArchiveBudgetExceeded as soon as an entry goes over budget."""
+
+    def __init__(self, stream, budget: ArchiveBudget):
+        self.stream = stream
+        self.budget = budget
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.size += len(chunk)
+        if self.size > self.budget.max_entry_bytes:
+            raise ArchiveBudgetExceeded(f'Entry larger than {self.budget.max_entry_bytes} bytes')
+        if self.budget.total_bytes + self.size > self.budget.max_total_bytes:
+            raise ArchiveBudgetExceeded(f'Archive budget of {self.budget.max_total_bytes} bytes exhausted', job_wide=True)
+        return chunk
+
+
+def _skip_reason(entry_name: str) -> Optional[str]:
+    parts = entry_name.replace('\\', '/').split('/')
+    if '__MACOSX' in parts or parts[-1].startswith('.'):
+        return 'Archive metadata'
+    if is_archive(entry_name):
+        return 'Nested archives are not expanded'
+    if not entry_name.lower().endswith(RESUME_EXTENSIONS):
+        return 'Unsupported file type'
+    return None
+
+
+def _entry_filename(entry_name: str, taken: set) -> str:
+    """
+    The entry's basename, or its relative path if the basename is already used in the
+    job (alice/CV.pdf, bob/CV.pdf), with a counter as the last resort; added to taken.
+    """
+    parts = [part for part in entry_name.replace('\\', '/').split('/') if part not in ('', '.', '..')]
+    filename = parts[-1]
+    if filename in taken:
+        filename = '/'.join(parts)
+    root, ext = os.path.splitext(filename)
+    counter = 2
+    while filename in taken:
+        filename = f'{root} ({counter}){ext}'
+        counter += 1
+    taken.add(filename)
+    return filename
+
+
+def _iter_entries(archive_path: str):
+    """(entry name, open function or error message) for each file entry, in archive order."""
+    if zipfile.is_zipfile(archive_path):
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                if info.is_dir():
+                    continue
+                if info.flag_bits & 0x1:
+                    yield info.filename, 'Encrypted entry'
+                else:
+                    yield info.filename, lambda info=info: archive.open(info)
+    else:
+        # Stream mode reads members in order without seeking; each is consumed before the next
+        with tarfile.open(archive_path, mode='r|*') as archive:
+            for member in archive:
+                if member.isfile():
+                    yield member.name, lambda member=member: archive.extractfile(member)
+
+
+def iter_archive_uploads(spool, archive_path: str, archive_name: str, budget: ArchiveBudget,
+                         skipped_files: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Spool an archive's resume entries one at a time, yielding {'filename', 'upload'}.
+    Each entry's upload is released when the next one is requested; entries that
+    are skipped are appended to skipped_files.
+    """
+    try:
+        for entry_name, opener in _iter_entries(archive_path):
+            filename = os.path.basename(entry_name.replace('\\', '/'))
+            reason = opener if isinstance(opener, str) else _skip_reason(entry_name)
+            if reason:
+                skipped_files.append({'filename': filename, 'reason': reason})
+                continue
+            if budget.entries >= budget.max_entries:
+                skipped_files.append({'filename': archive_name, 'reason': f'Archive entry limit of {budget.max_entries} reached'})
+                return
+            try:
+                with opener() as stream:
+                    upload = spool.store(_BudgetedReader(stream, budget))
+            except ArchiveBudgetExceeded as e:
+                skipped_files.append({'filename': filename, 'reason': str(e)})
+                if e.job_wide:
+                    return
+                continue
+            except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError, RuntimeError) as e:
+                skipped_files.append({'filename': filename, 'reason': f'Unreadable archive entry: {e}'})
+                continue
+            budget.entries += 1
+            budget.total_bytes += upload.size
+            try:
+                yield {'filename': _entry_filename(entry_name, budget.filenames), 'upload': upload}
+            finally:
+                upload.release()
+    except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+        print(f"Unreadable archive {archive_name}: {e}")
+        skipped_files.append({'filename': archive_name, 'reason': f'Unreadable archive: {e}'})
+
+
+def iter_job_uploads(spool, file_data: List[Dict[str, Any]], skipped_files: List[Dict[str, Any]],
+                     budget: Optional[ArchiveBudget] = None) -> Iterator[Dict[str, Any]]:
+    """A job's uploaded files in order, with archives expanded entry by entry under one budget."""
+    budget = budget or ArchiveBudget()
+    budget.filenames.update(file_info['filename'] for file_info in file_data if not is_archive(file_info['filename']))
+    for file_info in file_data:
+        if is_archive(file_info['filename']):
+            print(f"📦 Expanding archive {file_info['filename']} ({file_info['upload'].size} bytes)")
+            yield from iter_archive_uploads(spool, file_info['upload'].path, file_info['filename'], budget, skipped_files)
+            print(f"📦 Archive {file_info['filename']} done: {budget.entries} entries, {budget.total_bytes} bytes ingested so far")
+        else:
+            yield file_info
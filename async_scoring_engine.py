@@ -0,0 +1,243 @@
+"""
+Asyncio scoring engine for bulk resume scoring.
+
+All LLM calls for a batch of resumes are driven from a single event loop and
+bounded by one global semaphore, instead of one OS thread per resume. Prompts,
+response parsing and the caches are shared with ResumeScorer, so results have
+exactly the same shape as ResumeScorer.score_resume.
+"""
+import asyncio
+import os
+import time
+from typing import Any, Dict, List
+
+import openai
+
+from duplicate_copy_resume_scorer import ResumeScorer
+from rate_limiter import estimate_tokens
+
+# Upper bound on in-flight LLM requests across the whole event loop
+ASYNC_SCORING_MAX_CONCURRENCY = int(os.environ.get('ASYNC_SCORING_MAX_CONCURRENCY', 100))
+
+# Bulk scoring backend used by the Flask apps: "threads" (default), "async" or "batch"
+SCORING_ENGINE = os.environ.get('SCORING_ENGINE', 'threads').lower()
+
+
+class AsyncScoringEngine:
+    """
+    Scores resumes concurrently on one event loop.
+
+    Use as an async context manager; the AsyncOpenAI client and the semaphore
+    live for the duration of the block. Job-level phases (job requirement and
+    section weights) are computed once per job description and shared by every
+    resume scored in the same block.
+    """
+
+    def __init__(self, scorer: ResumeScorer = None, max_concurrency: int = ASYNC_SCORING_MAX_CONCURRENCY,
+                 client=None):
+        self.scorer = scorer or ResumeScorer()
+        self.max_concurrency = max_concurrency
+        self.client = client
+        self._owns_client = client is None
+        self._semaphore = None
+        self._job_tasks = {}
+
+    async def __aenter__(self):
+        if self.client is None:
+            self.client = openai.AsyncOpenAI(api_key=self.scorer.api_key,
+                                             http_client=self.scorer.rate_limiter.async_http_client())
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._job_tasks = {}
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if self._owns_client and self.client is not None:
+            await self.client.close()
+            self.client = None
+        self._semaphore = None
+        self._job_tasks = {}
+
+    async def complete(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini", **params) -> str:
+        """
+        Async counterpart of ResumeScorer._chat_completion. Deterministic requests go
+        through the same persistent response cache; the API call itself queues on the
+        shared rate limiter and waits on the global semaphore.
+        """
+        cached = await asyncio.to_thread(self.scorer._get_cached_response, model, messages, params)
+        if cached is not None:
+            return cached
+
+        rate_limiter = self.scorer.rate_limiter
+        estimated_tokens = estimate_tokens(messages, params.get("max_tokens"))
+        await rate_limiter.acquire_async(model, estimated_tokens)
+        async with self._semaphore:
+            response = await self.client.chat.completions.create(model=model, messages=messages, **params)
+        rate_limiter.record_usage(model, estimated_tokens, response)
+        content = response.choices[0].message.content.strip()
+
+        await asyncio.to_thread(self.scorer._store_response, model, messages, params, content)
+        return content
+
+    def _shared(self, key, factory) -> asyncio.Future:
+        """Start factory() once per key; concurrent callers await the same task."""
+        task = self._job_tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._job_tasks[key] = task
+        return task
+
+    async def extract_job_requirement(self, job_description: str) -> Dict[str, Any]:
+        """Async version of ResumeScorer._extract_job_experience_requirement."""
+        scorer = self.scorer
+        cache_key = scorer._job_requirement_cache_key(job_description)
+        if cache_key in scorer.job_level_cache:
+            return scorer.job_level_cache[cache_key]
+        result = scorer._local_job_requirement(job_description)
+        if result is not None:
+            scorer.job_level_cache[cache_key] = result
+            return result
+        try:
+            content = await self.complete(**scorer._build_job_requirement_request(job_description))
+            result = scorer._parse_job_requirement(content)
+            scorer.job_level_cache[cache_key] = result
+            return result
+        except Exception as e:
+            return scorer._fallback_job_requirement(e)
+
+    async def assign_section_weights(self, job_description: str) -> Dict[str, float]:
+        """Async version of ResumeScorer.assign_section_weights."""
+        scorer = self.scorer
+        job_requirement = await self._shared(
+            ("job_requirement", job_description), lambda: self.extract_job_requirement(job_description)
+        )
+        job_level = job_requirement.get("job_level", "entry")
+
+        cache_key = scorer._section_weights_cache_key(job_description, job_level)
+        if cache_key in scorer.section_weights_cache:
+            return scorer.section_weights_cache[cache_key]
+        try:
+            content = await self.complete(**scorer._build_section_weights_request(job_description, job_level))
+            weights = scorer._parse_section_weights(content, job_level)
+        except Exception as e:
+            raise Exception(f"Error in section weight assignment: {str(e)}")
+        scorer.section_weights_cache[cache_key] = weights
+        return weights
+
+    async def calculate_candidate_experience(self, resume_text: str) -> Dict[str, Any]:
+        """Async version of ResumeScorer._calculate_candidate_experience."""
+        scorer = self.scorer
+        local_experience = scorer._local_candidate_experience(resume_text)
+        if local_experience is not None:
+            return local_experience
+        try:
+            content = await self.complete(**scorer._build_candidate_experience_request(resume_text))
+            return scorer._parse_candidate_experience(content, resume_text)
+        except Exception as e:
+            return scorer._fallback_candidate_experience(resume_text, e)
+
+    async def request_subfield_scores(self, job_description: str, resume_text: str,
+                                      cross_section_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Async version of ResumeScorer._request_subfield_scores."""
+        scorer = self.scorer
+        content = await self.complete(**scorer._build_subfield_request(job_description, resume_text, cross_section_content))
+        return scorer._parse_subfield_scores(content)
+
+    async def score_resume(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+        """Score one resume; returns the same result shape as ResumeScorer.score_resume."""
+        scorer = self.scorer
+        start_time = time.time()
+        phase_timings = {}
+
+        async def timed(name, awaitable):
+            started = time.time()
+            try:
+                return await awaitable
+            finally:
+                phase_timings[name] = {
+                    'started_at': round(started - start_time, 4),
+                    'duration': round(time.time() - started, 4),
+                }
+
+        try:
+            job_requirement_task = self._shared(
+                ("job_requirement", job_description), lambda: self.extract_job_requirement(job_description)
+            )
+            section_weights_task = self._shared(
+                ("section_weights", job_description), lambda: self.assign_section_weights(job_description)
+            )
+
+            subfield_cache_key = scorer._subfield_cache_key(job_description, resume_text)
+            subfield_scores = scorer.subfield_scores_cache.get(subfield_cache_key)
+            if subfield_scores is not None:
+                candidate_experience = {}
+                cross_section_content = {}
+                job_requirement, section_weights = await asyncio.gather(
+                    timed("job_requirement", job_requirement_task),
+                    timed("section_weights", section_weights_task),
+                )
+            else:
+                cross_section_content = scorer._extract_cross_section_content(resume_text)
+                job_requirement, section_weights, candidate_experience, raw_subfield_scores = await asyncio.gather(
+                    timed("job_requirement", job_requirement_task),
+                    timed("section_weights", section_weights_task),
+                    timed("candidate_experience", self.calculate_candidate_experience(resume_text)),
+                    timed("raw_subfield_scores", self.request_subfield_scores(job_description, resume_text, cross_section_content)),
+                )
+
+                started = time.time()
+                subfield_scores = scorer._finalize_subfield_scores(
+                    raw_subfield_scores, candidate_experience, job_requirement, cross_section_content
+                )
+                scorer.subfield_scores_cache[subfield_cache_key] = subfield_scores
+                phase_timings["subfield_scores"] = {
+                    'started_at': round(started - start_time, 4),
+                    'duration': round(time.time() - started, 4),
+                }
+
+            started = time.time()
+            final_score = scorer.compute_final_score(section_weights, subfield_scores)
+            phase_timings["final_score"] = {
+                'started_at': round(started - start_time, 4),
+                'duration': round(time.time() - started, 4),
+            }
+
+            job_level = job_requirement.get("job_level", "entry")
+            return {
+                "job_level": job_level,
+                "experience_education_ratio": {"entry": 1.0, "mid": 2.0, "senior": 3.0}.get(job_level, 1.0),
+                "section_weights": section_weights,
+                "subfield_scores": subfield_scores,
+                "final_score": final_score,
+                "candidate_experience": candidate_experience,
+                "cross_section_content": cross_section_content,
+                "job_requirements": job_requirement,
+                "phase_timings": phase_timings,
+                "processing_time": time.time() - start_time
+            }
+
+        except Exception as e:
+            raise Exception(f"Error in resume scoring: {str(e)}")
+
+    async def score_many(self, job_description: str, resumes: List[str],
+                         job_profile: Dict[str, Any] = None) -> List[Any]:
+        """
+        Score resumes concurrently against one job description.
+        Results are in input order; a failed resume yields its exception in place.
+        A precomputed job_profile replaces the job-level calls.
+        """
+        if job_profile is not None:
+            self.scorer.apply_job_profile(job_description, job_profile)
+        return await asyncio.gather(
+            *(self.score_resume(job_description, resume_text) for resume_text in resumes),
+            return_exceptions=True
+        )
+
+
+def score_resumes_concurrently(job_description: str, resumes: List[str], scorer: ResumeScorer = None,
+                               max_concurrency: int = ASYNC_SCORING_MAX_CONCURRENCY,
+                               job_profile: Dict[str, Any] = None) -> List[Any]:
+    """Synchronous entry point: score resumes on a fresh event loop."""
+    async def run():
+        async with AsyncScoringEngine(scorer=scorer, max_concurrency=max_concurrency) as engine:
+            return await engine.score_many(job_description, resumes, job_profile)
+    return asyncio.run(run())
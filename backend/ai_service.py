@@ -1,5 +1,6 @@
 import os
 from openai import OpenAI
+from rate_limiter import estimate_tokens, get_rate_limiter
 
 # Global client instance, initialized to None.
 _client = None
@@ -10,7 +11,7 @@ def get_client():
     if _client is None:
         # This code will only run the first time get_client() is called.
         # By this time, the .env file will have been loaded by __main__.py.
-        _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+        _client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"), http_client=get_rate_limiter().http_client())
     return _client
 
 def analyze_resume_with_ai(job_description, resume_text):
@@ -61,15 +62,21 @@ The JSON must have the following structure:
 ---
 """
 
+    messages = [
+        {"role": "system", "content": "You are a helpful assistant that provides analysis in a structured JSON format according to the user's schema."},
+        {"role": "user", "content": prompt}
+    ]
+
     try:
+        rate_limiter = get_rate_limiter()
+        estimated_tokens = estimate_tokens(messages)
+        rate_limiter.acquire("gpt-4o", estimated_tokens)
         response = client.chat.completions.create(
             model="gpt-4o",
-            messages=[
-                {"role": "system", "content": "You are a helpful assistant that provides analysis in a structured JSON format according to the user's schema."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             response_format={"type": "json_object"}
         )
+        rate_limiter.record_usage("gpt-4o", estimated_tokens, response)
         return response.choices[0].message.content
     except Exception as e:
         print(f"An error occurred during AI analysis: {e}")
@@ -103,16 +110,22 @@ For example, if the description says "We are looking for a Senior Software Engin
 **Job Title:**
 """
 
+    messages = [
+        {"role": "system", "content": "You are an assistant that extracts specific information."},
+        {"role": "user", "content": prompt}
+    ]
+
     try:
+        rate_limiter = get_rate_limiter()
+        estimated_tokens = estimate_tokens(messages, 50)
+        rate_limiter.acquire("gpt-3.5-turbo", estimated_tokens)
         response = client.chat.completions.create(
             model="gpt-3.5-turbo", # Using a faster, cheaper model for this simple task
-            messages=[
-                {"role": "system", "content": "You are an assistant that extracts specific information."},
-                {"role": "user", "content": prompt}
-            ],
+            messages=messages,
             temperature=0,
             max_tokens=50
         )
+        rate_limiter.record_usage("gpt-3.5-turbo", estimated_tokens, response)
         # Strip any potential leading/trailing whitespace or quotes
         return response.choices[0].message.content.strip().strip('"')
     except Exception as e:
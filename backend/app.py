@@ -5,14 +5,16 @@ from flask_socketio import SocketIO, emit
 import os
 import sys
 sys.path.append("..")
-from application import analyze_resume_with_advanced_ai
+from application import analyze_resume_with_advanced_ai, get_scorer_for_job
+from job_profile import get_or_create_job_profile
+from score_matrix import apply_reweight, reweight_job, validate_section_weights
 import json
-import fitz  # PyMuPDF
-import docx  # python-docx
-import io
 import hashlib
 import time
-from backend.tasks import process_job_resumes
+from backend.tasks import extract_job_resumes
+from extraction_cache import get_extraction_cache, raw_digest
+from extraction_service import get_extraction_service
+from text_extraction import EXTRACTION_MAX_CHARS, document_format, extract_text
 from datetime import datetime
 
 # Configure Flask to serve React frontend
@@ -45,6 +47,13 @@ class Job(db.Model):
     resumes = db.relationship('Resume', backref='job', lazy=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
 
+class JobProfile(db.Model):
+    """Job-level scoring artifacts computed once per job description (see job_profile.py)"""
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), primary_key=True)
+    description_hash = db.Column(db.String(64), nullable=False)
+    profile = db.Column(db.Text, nullable=False)  # JSON: job_requirement, job_level, section_weights
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class Resume(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     filename = db.Column(db.String(100), nullable=False)
@@ -57,6 +66,19 @@ class Resume(db.Model):
     __table_args__ = (db.UniqueConstraint('job_id', 'filename', name='_job_filename_uc'),
                       db.UniqueConstraint('job_id', 'content_hash', name='_job_hash_uc'))
 
+class ResumeScoreVector(db.Model):
+    """Raw subfield scores of an analyzed resume as a fixed-layout int8 row (see score_matrix.py)"""
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    scores = db.Column(db.LargeBinary, nullable=False)
+
+class ResumeSectionIndex(db.Model):
+    """Section offsets of a resume's text, computed once locally (see section_index.py)"""
+    resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False, index=True)
+    content_hash = db.Column(db.String(64), nullable=False)
+    sections = db.Column(db.Text, nullable=False)
+
 class Feedback(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     resume_id = db.Column(db.Integer, db.ForeignKey('resume.id'), nullable=False)
@@ -207,28 +229,28 @@ def check_job_completion(job_id):
             # Clean up tracker
             del job_completion_trackers[job_id]
 
+def load_job_profile(job):
+    """Return the job profile for a job, computing and storing it if missing or stale"""
+    return get_or_create_job_profile(db.session, JobProfile, job, get_scorer_for_job)
+
 def process_resume_with_progress(job_id, resume_file, job_description):
     """Process a single resume with progress updates"""
     try:
         emit_progress_update(job_id, f"Processing {resume_file.filename}...", 'processing')
         
-        content = ""
         filename = resume_file.filename
         file_stream = resume_file.read()
+        digest = raw_digest(file_stream)
+        content = get_extraction_cache().get_text(digest, filename, EXTRACTION_MAX_CHARS)
 
-        if filename.endswith('.pdf'):
-            emit_progress_update(job_id, f"Reading PDF: {filename}", 'info')
-            pdf_doc = fitz.open(stream=file_stream, filetype='pdf')
-            for page in pdf_doc:
-                content += page.get_text()
-            pdf_doc.close()
-        elif filename.endswith('.docx'):
-            emit_progress_update(job_id, f"Reading DOCX: {filename}", 'info')
-            doc = docx.Document(io.BytesIO(file_stream))
-            for para in doc.paragraphs:
-                content += para.text + '\n'
+        if content is not None:
+            emit_progress_update(job_id, f"Using cached text for {filename}", 'info')
         else:
-            content = file_stream.decode('utf-8')
+            file_format = document_format(filename)
+            if file_format in ('pdf', 'docx'):
+                emit_progress_update(job_id, f"Reading {file_format.upper()}: {filename}", 'info')
+            content, _ = extract_text(filename, file_stream)
+            get_extraction_cache().set_text(digest, filename, EXTRACTION_MAX_CHARS, content)
 
         if not content.strip():
             emit_progress_update(job_id, f"Skipped {filename}: Empty or unreadable", 'warning')
@@ -296,63 +318,34 @@ def analyze_resumes():
         db.session.flush()  # Use flush to get the job.id before committing.
         db.session.commit()  # Commit the job to the database
 
+    # Compute the job-level scoring artifacts once, before any resume worker starts
+    load_job_profile(job)
+
     emit_progress_update(job.id, f"Preparing {len(resumes)} resumes for background processing...", 'start')
 
-    # Prepare resume data for background processing
-    resumes_data = []
-    for resume_file in resumes:
-        if resume_file:
-            try:
-                content = ""
-                filename = resume_file.filename
-                file_stream = resume_file.read()
-
-                if filename.endswith('.pdf'):
-                    pdf_doc = fitz.open(stream=file_stream, filetype='pdf')
-                    for page in pdf_doc:
-                        content += page.get_text()
-                    pdf_doc.close()
-                elif filename.endswith('.docx'):
-                    doc = docx.Document(io.BytesIO(file_stream))
-                    for para in doc.paragraphs:
-                        content += para.text + '\n'
-                else:
-                    content = file_stream.decode('utf-8')
-
-                if content.strip():
-                    resumes_data.append({
-                        'filename': filename,
-                        'content': content
-                    })
-                else:
-                    emit_progress_update(job.id, f"Skipped {filename}: Empty or unreadable", 'warning')
-                    
-            except Exception as e:
-                emit_progress_update(job.id, f"Error reading {resume_file.filename}: {str(e)}", 'error')
-
-    if not resumes_data:
+    # Only read the uploads here; parsing runs in the extraction process pool
+    uploads = [
+        {'filename': resume_file.filename, 'data': resume_file.read()}
+        for resume_file in resumes if resume_file
+    ]
+    if not uploads:
         emit_progress_update(job.id, "No valid resumes to process", 'warning')
         return jsonify({
             'message': 'No valid resumes to process',
             'job_id': job.id,
             'processed_files': [],
-            'skipped_files': [{'filename': f.filename, 'reason': 'Invalid file'} for f in resumes if f]
+            'skipped_files': []
         })
 
-    # Initialize completion tracker for this job
-    job_completion_trackers[job.id] = {
-        'total_resumes': len(resumes_data),
-        'completed_resumes': 0
-    }
-
-    # Queue background job using Celery
-    process_job_resumes.delay(job.id, resumes_data, job_description)
+    # The Celery app runs tasks eagerly in the calling thread, so dispatch from a background task;
+    # the request returns as soon as the uploads are handed over
+    socketio.start_background_task(extract_job_resumes.delay, job.id, uploads, job_description)
 
     return jsonify({
-        'message': f'Queued {len(resumes_data)} resumes for background processing',
+        'message': f'Queued {len(uploads)} resumes for background processing',
         'job_id': job.id,
         'status': 'queued',
-        'total_resumes': len(resumes_data)
+        'total_resumes': len(uploads)
     })
 
 @app.route('/api/jobs', methods=['GET'])
@@ -416,9 +409,12 @@ def delete_job(job_id):
         # Get resume count for confirmation
         resume_count = len(job.resumes)
         
-        # Delete all associated resumes first (cascade)
+        # Delete all associated resumes, their score rows, section indexes and the job profile first (cascade)
+        ResumeScoreVector.query.filter_by(job_id=job.id).delete()
+        ResumeSectionIndex.query.filter_by(job_id=job.id).delete()
         for resume in job.resumes:
             db.session.delete(resume)
+        JobProfile.query.filter_by(job_id=job.id).delete()
         
         # Delete the job
         db.session.delete(job)
@@ -434,6 +430,38 @@ def delete_job(job_id):
         db.session.rollback()
         return jsonify({'error': f'Failed to delete job: {str(e)}'}), 500
 
+@app.route('/api/jobs/<int:job_id>/reweight', methods=['POST'])
+def reweight_job_scores(job_id):
+    """
+    Recompute final scores and buckets for every resume in a job under new
+    section weights, from the stored score matrix (no LLM calls). Pass
+    "save": true to write the new scores and buckets into the analyses.
+    """
+    # --- Temp: Use default user ---
+    default_user = User.query.filter_by(username='default_user').first()
+    if not default_user:
+        return jsonify({'error': 'User not found'}), 404
+    # --- End Temp ---
+
+    Job.query.filter_by(id=job_id, user_id=default_user.id).first_or_404()
+    data = request.get_json(silent=True) or {}
+    section_weights = data.get('section_weights')
+    error = validate_section_weights(section_weights)
+    if error:
+        return jsonify({'error': error}), 400
+
+    result = reweight_job(db.session, Resume, ResumeScoreVector, job_id, section_weights)
+    if data.get('save'):
+        apply_reweight(db.session, Resume, result['resumes'], section_weights)
+        db.session.commit()
+    result['saved'] = bool(data.get('save'))
+    return jsonify(result)
+
+@app.route('/api/extraction/stats')
+def extraction_stats():
+    """Document counts and settings of the extraction process pool"""
+    return jsonify(get_extraction_service().stats())
+
 @app.route('/api/data')
 def get_data():
     return jsonify({'message': 'Hello from the Flask backend!'})
@@ -4,14 +4,21 @@ import time
 import concurrent.futures
 from celery import Celery
 from flask_socketio import emit
-from application import analyze_resume_with_advanced_ai
+from application import (analyze_resume_with_advanced_ai, analyze_resumes_with_advanced_ai_bulk, analyze_resumes_with_batch_api,
+                         attach_prescreen, build_prescreen_analysis, prescreen_resume_batch)
+from async_scoring_engine import SCORING_ENGINE
+from extraction_service import get_extraction_service
+from prescreen import PRESCREEN_ENABLED
+from score_matrix import store_score_vector
+from section_index import store_section_index
+from scoring_tiers import assign_bucket
 
 # This setup is for local development. It runs tasks synchronously in-memory
 # without needing an external message broker like Redis.
 celery_app = Celery('tasks', broker='memory://', backend='rpc://')
 celery_app.conf.update(task_always_eager=True, task_time_limit=300, task_soft_time_limit=240)
 
-def analyze_resume_in_worker(resume_data, job_description):
+def analyze_resume_in_worker(resume_data, job_description, job_profile=None):
     """
     This is the only function that runs in a parallel worker thread.
     It is completely decoupled from the Flask app and database.
@@ -21,7 +28,8 @@ def analyze_resume_in_worker(resume_data, job_description):
     content = resume_data.get('content')
     
     # Perform the CPU/network-bound analysis
-    analysis_json = analyze_resume_with_advanced_ai(job_description, content, filename)
+    analysis_json = analyze_resume_with_advanced_ai(job_description, content, filename, job_profile)
+    analysis_json = attach_prescreen(analysis_json, resume_data.get('prescreen'))
     
     # Return a dictionary with all data needed by the main thread
     return {
@@ -30,48 +38,133 @@ def analyze_resume_in_worker(resume_data, job_description):
         'analysis_json': analysis_json,
     }
 
+@celery_app.task(time_limit=None, soft_time_limit=None)
+def extract_job_resumes(job_id, uploads, job_description):
+    """
+    Parse uploaded documents in the extraction process pool, then queue the job's
+    resumes for analysis. uploads are {'filename', 'data'} dicts with the raw file bytes;
+    the tasks run eagerly in-process (see celery_app), so the payload is never serialized.
+    """
+    from backend.app import emit_progress_update, job_completion_trackers
+
+    files = [(upload['filename'], upload['data']) for upload in uploads]
+    emit_progress_update(job_id, f"Extracting text from {len(files)} resumes...", 'info')
+
+    resumes_data = []
+    for result in get_extraction_service().extract_many(files):
+        filename = result['filename']
+        if result['error']:
+            emit_progress_update(job_id, f"Error reading {filename}: {result['error']}", 'error')
+        elif not result['text'].strip():
+            emit_progress_update(job_id, f"Skipped {filename}: Empty or unreadable", 'warning')
+        else:
+            resumes_data.append({'filename': filename, 'content': result['text']})
+
+    if not resumes_data:
+        emit_progress_update(job_id, "No valid resumes to process", 'warning')
+        return
+
+    # Initialize completion tracker for this job
+    job_completion_trackers[job_id] = {
+        'total_resumes': len(resumes_data),
+        'completed_resumes': 0
+    }
+
+    if SCORING_ENGINE == 'batch':
+        process_job_resumes_batch.delay(job_id, resumes_data, job_description)
+    else:
+        process_job_resumes.delay(job_id, resumes_data, job_description)
+
 @celery_app.task
 def process_job_resumes(job_id, resumes_data, job_description):
     """
     Processes multiple resumes for a job in parallel using a thread pool,
     then commits all successful results to the database in a single transaction on the main thread.
     """
+    run_job_resumes(job_id, resumes_data, job_description, SCORING_ENGINE)
+
+@celery_app.task(time_limit=None, soft_time_limit=None)
+def process_job_resumes_batch(job_id, resumes_data, job_description):
+    """
+    Offline variant of process_job_resumes for large requisitions. All prompts go
+    through one OpenAI Batch API job, which can take hours, so no time limit applies.
+    """
+    run_job_resumes(job_id, resumes_data, job_description, 'batch')
+
+def run_job_resumes(job_id, resumes_data, job_description, engine):
+    """Analyze a job's resumes with the given scoring engine and save the results."""
     # These imports MUST be inside the function to avoid circular dependencies
     # and to ensure they are accessed only by the main thread.
-    from backend.app import app, db, Resume, emit_progress_update, check_job_completion
+    from backend.app import app, db, Job, Resume, ResumeScoreVector, ResumeSectionIndex, emit_progress_update, check_job_completion, load_job_profile
 
     with app.app_context():
         total_resumes = len(resumes_data)
+        # Job-level artifacts come from the stored profile, so workers only make resume-dependent calls
+        job = db.session.get(Job, job_id)
+        job_profile = load_job_profile(job) if job is not None else None
         emit_progress_update(job_id, f"Starting parallel processing of {total_resumes} resumes...", 'start')
 
-        future_to_resume = {}
         analyzed_results = []
         skipped_files = []
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
-            # Submit analysis tasks to the thread pool
-            future_to_resume = {
-                executor.submit(analyze_resume_in_worker, rd, job_description): rd 
-                for rd in resumes_data
-            }
-            
-            for future in concurrent.futures.as_completed(future_to_resume):
-                try:
-                    # Get the result from the worker thread
-                    result_data = future.result()
-                    analyzed_results.append(result_data)
-                    emit_progress_update(job_id, f"Completed analysis for {result_data['filename']}", 'success')
-                except Exception as exc:
-                    original_resume_data = future_to_resume[future]
-                    error_filename = original_resume_data.get('filename', 'unknown file')
-                    emit_progress_update(job_id, f"Error processing {error_filename}: {exc}", 'error')
-                    skipped_files.append({'status': 'error', 'filename': error_filename, 'reason': str(exc)})
+        if PRESCREEN_ENABLED and resumes_data:
+            # Archive clear rejects locally; only the rest go to the LLM
+            passed, rejected = prescreen_resume_batch(
+                job_description, [(rd.get('filename'), rd.get('content') or '', rd) for rd in resumes_data]
+            )
+            for (filename, content, _), prescreen in rejected:
+                analyzed_results.append({
+                    'filename': filename,
+                    'content': content,
+                    'analysis_json': build_prescreen_analysis(prescreen, filename),
+                })
+            resumes_data = [dict(rd, prescreen=prescreen) for (_, _, rd), prescreen in passed]
+            emit_progress_update(job_id, f"Pre-screen archived {len(rejected)} of {total_resumes} resumes", 'info')
+
+        if engine in ('async', 'batch') and resumes_data:
+            # Score all resumes together (one event loop or one batch job) instead of a thread per resume
+            analyze_bulk = analyze_resumes_with_batch_api if engine == 'batch' else analyze_resumes_with_advanced_ai_bulk
+            try:
+                analyses = analyze_bulk(
+                    job_description, [(rd.get('filename'), rd.get('content')) for rd in resumes_data], job_profile
+                )
+                for rd, analysis_json in zip(resumes_data, analyses):
+                    analyzed_results.append({
+                        'filename': rd.get('filename'),
+                        'content': rd.get('content'),
+                        'analysis_json': attach_prescreen(analysis_json, rd.get('prescreen')),
+                    })
+                    emit_progress_update(job_id, f"Completed analysis for {rd.get('filename')}", 'success')
+            except Exception as exc:
+                emit_progress_update(job_id, f"Bulk analysis failed: {exc}", 'error')
+                for rd in resumes_data:
+                    skipped_files.append({'status': 'error', 'filename': rd.get('filename', 'unknown file'), 'reason': str(exc)})
+        else:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+                # Submit analysis tasks to the thread pool
+                future_to_resume = {
+                    executor.submit(analyze_resume_in_worker, rd, job_description, job_profile): rd 
+                    for rd in resumes_data
+                }
+                
+                for future in concurrent.futures.as_completed(future_to_resume):
+                    try:
+                        # Get the result from the worker thread
+                        result_data = future.result()
+                        analyzed_results.append(result_data)
+                        emit_progress_update(job_id, f"Completed analysis for {result_data['filename']}", 'success')
+                    except Exception as exc:
+                        original_resume_data = future_to_resume[future]
+                        error_filename = original_resume_data.get('filename', 'unknown file')
+                        emit_progress_update(job_id, f"Error processing {error_filename}: {exc}", 'error')
+                        skipped_files.append({'status': 'error', 'filename': error_filename, 'reason': str(exc)})
 
         # --- DATABASE OPERATIONS ON MAIN THREAD ONLY ---
         if analyzed_results:
             emit_progress_update(job_id, f"Collating {len(analyzed_results)} successful analyses for database commit...", 'info')
             
             new_resumes_to_add = []
+            saved_analyses = []
             for res_data in analyzed_results:
                 analysis_data = json.loads(res_data['analysis_json'])
 
@@ -82,21 +175,14 @@ def process_job_resumes(job_id, resumes_data, job_description):
                 # Assign bucket strictly in Python
                 fit_score = analysis_data.get('fit_score')
                 if fit_score is not None:
-                    if fit_score > 90:
-                        bucket = '🚀 Green-Room Rocket'
-                    elif 80 <= fit_score <= 89:
-                        bucket = '⚡ Book-the-Call'
-                    elif 65 <= fit_score <= 79:
-                        bucket = '🛠️ Bench Prospect'
-                    else:
-                        bucket = '🗄️ Swipe-Left Archive'
+                    bucket = assign_bucket(fit_score)
                     analysis_data['bucket'] = bucket
                 else:
                     bucket = 'Unknown'
 
                 # Log fit_score and assigned bucket
                 with open('ai_analysis_debug.log', 'a', encoding='utf-8') as logf:
-                    logf.write(f"BUCKET_ASSIGN: {res_data['filename']} | fit_score: {fit_score} | bucket: {bucket}\n")
+                    logf.write(f"BUCKET_ASSIGN: {res_data['filename']} | fit_score: {fit_score} | bucket: {bucket} | tier: {analysis_data.get('scoring_tier', 'unknown')}\n")
 
                 if analysis_data.get('error'):
                     emit_progress_update(job_id, f"Skipping save for {res_data['filename']} due to AI error: {analysis_data.get('error_details')}", 'warning')
@@ -116,10 +202,17 @@ def process_job_resumes(job_id, resumes_data, job_description):
                     job_id=job_id
                 )
                 new_resumes_to_add.append(new_resume)
+                saved_analyses.append(analysis_data)
             
             if new_resumes_to_add:
                 try:
                     db.session.add_all(new_resumes_to_add)
+                    db.session.flush()
+                    # Keep the raw subfield scores so the job can be re-weighted without the LLM,
+                    # and the section index so rescoring does not re-segment the text
+                    for new_resume, analysis_data in zip(new_resumes_to_add, saved_analyses):
+                        store_score_vector(db.session, ResumeScoreVector, new_resume, analysis_data)
+                        store_section_index(db.session, ResumeSectionIndex, new_resume)
                     db.session.commit()
                     emit_progress_update(job_id, f"Successfully saved {len(new_resumes_to_add)} new resumes to the database.", 'success')
                 except Exception as e:
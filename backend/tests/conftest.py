@@ -0,0 +1,78 @@
+import atexit
+import copy
+import json
+import os
+import shutil
+import tempfile
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+# Tests drive the work queue explicitly; importing application must not start worker threads
+os.environ.setdefault("WORK_QUEUE_AUTOSTART", "false")
+
+# Persistent caches go to a throwaway directory so no test writes to the real instance/ caches
+_cache_dir = tempfile.mkdtemp(prefix="resume-tests-")
+atexit.register(shutil.rmtree, _cache_dir, ignore_errors=True)
+os.environ["LLM_CACHE_PATH"] = os.path.join(_cache_dir, "llm_cache.db")
+os.environ["EXTRACTION_CACHE_PATH"] = os.path.join(_cache_dir, "extraction_cache.db")
+
+# Canned LLM answers keyed by a phrase that appears in the matching prompt; the first marker found wins
+SCORING_RESPONSES = {
+    "years of experience required": {"years_required": 2, "job_level": "entry", "extraction_details": "2 years"},
+    "weights to resume sections": {"weights": {"experience": 0.5, "skills": 0.5}},
+    "TOTAL YEARS of PROFESSIONAL WORK EXPERIENCE": {"total_months": 36, "total_years": 3.0, "calculation_details": "36 months"},
+    "score each resume section": {"experience": {"relevancy": 2, "recency": 2, "depth": 1, "impact": 1, "comment": "ok"},
+                                  "skills": {"alignment": 2, "coverage": 2, "proficiency": 2, "comment": "good"}},
+    "expert HR recruiter": {"candidate_name": "Jane Doe", "fit_score": 80},
+}
+
+
+def _answer_prompt(responses, messages):
+    prompt = messages[-1]["content"]
+    return next(json.dumps(body) for marker, body in responses.items() if marker in prompt)
+
+
+@pytest.fixture
+def scoring_responses():
+    """A fresh copy of SCORING_RESPONSES for tests to use as is or override."""
+    return copy.deepcopy(SCORING_RESPONSES)
+
+
+@pytest.fixture
+def answer_prompt():
+    """answer_prompt(responses, messages) -> JSON content of the first response whose marker is in the last message."""
+    return _answer_prompt
+
+
+@pytest.fixture
+def make_mock_scorer():
+    """
+    Factory for a ResumeScorer with no persistent cache or rate limits whose OpenAI
+    client answers from a response map (see SCORING_RESPONSES). Prompts sent are
+    recorded on scorer.client.prompts; delay sleeps before each answer.
+    """
+    from duplicate_copy_resume_scorer import ResumeScorer
+    from rate_limiter import RateLimiter
+
+    def make(responses, delay=0.0, **scorer_kwargs):
+        prompts = []
+
+        def create(model, messages, **params):
+            prompts.append(messages[-1]["content"])
+            if delay:
+                time.sleep(delay)
+            response = MagicMock()
+            response.choices[0].message.content = _answer_prompt(responses, messages)
+            return response
+
+        scorer_kwargs.setdefault("use_persistent_cache", False)
+        scorer_kwargs.setdefault("rate_limiter", RateLimiter(requests_per_minute=10**6, tokens_per_minute=10**9))
+        scorer = ResumeScorer(api_key="test-key", **scorer_kwargs)
+        scorer.client = MagicMock()
+        scorer.client.prompts = prompts
+        scorer.client.chat.completions.create.side_effect = create
+        return scorer
+
+    return make
@@ -0,0 +1,110 @@
+"""Builds minimal Word 97-2003 (.doc) compound files for the .doc reader tests and benchmark."""
+import struct
+
+SECTOR_SIZE = 512
+MINI_SECTOR_SIZE = 64
+MINI_STREAM_CUTOFF = 4096
+ENDOFCHAIN = 0xFFFFFFFE
+FREESECT = 0xFFFFFFFF
+FATSECT = 0xFFFFFFFD
+NOSTREAM = 0xFFFFFFFF
+TEXT_OFFSET = 0x600
+
+
+def _directory_entry(name, entry_type, start, size, child=NOSTREAM, right=NOSTREAM):
+    encoded = (name + '\0').encode('utf-16-le')
+    return (encoded.ljust(64, b'\0')
+            + struct.pack('<HBB3I', len(encoded), entry_type, 1, NOSTREAM, right, child)
+            + bytes(36) + struct.pack('<IQ', start, size))
+
+
+def build_compound_file(streams):
+    """Version 3 compound file (512-byte sectors) holding the given {name: bytes} streams under the root."""
+    sectors = []
+    fat = []
+
+    def add_chain(data):
+        if not data:
+            return ENDOFCHAIN
+        start = len(sectors)
+        count = (len(data) + SECTOR_SIZE - 1) // SECTOR_SIZE
+        for i in range(count):
+            sectors.append(data[i * SECTOR_SIZE:(i + 1) * SECTOR_SIZE].ljust(SECTOR_SIZE, b'\0'))
+            fat.append(start + i + 1 if i < count - 1 else ENDOFCHAIN)
+        return start
+
+    mini_stream = bytearray()
+    minifat = []
+    entries = []
+    for name, data in streams.items():
+        if len(data) < MINI_STREAM_CUTOFF:
+            start = len(mini_stream) // MINI_SECTOR_SIZE if data else ENDOFCHAIN
+            count = (len(data) + MINI_SECTOR_SIZE - 1) // MINI_SECTOR_SIZE
+            for i in range(count):
+                mini_stream += data[i * MINI_SECTOR_SIZE:(i + 1) * MINI_SECTOR_SIZE].ljust(MINI_SECTOR_SIZE, b'\0')
+                minifat.append(start + i + 1 if i < count - 1 else ENDOFCHAIN)
+        else:
+            start = add_chain(data)
+        entries.append((name, start, len(data)))
+
+    root_start = add_chain(bytes(mini_stream))
+    minifat_start = add_chain(struct.pack(f'<{len(minifat)}I', *minifat)) if minifat else ENDOFCHAIN
+    directory = _directory_entry('Root Entry', 5, root_start, len(mini_stream), child=1 if entries else NOSTREAM)
+    for i, (name, start, size) in enumerate(entries):
+        directory += _directory_entry(name, 2, start, size, right=i + 2 if i < len(entries) - 1 else NOSTREAM)
+    directory = directory.ljust(-(-len(directory) // SECTOR_SIZE) * SECTOR_SIZE, b'\0')
+    directory_start = add_chain(directory)
+
+    per_fat_sector = SECTOR_SIZE // 4
+    fat_sector_count = 1
+    while len(sectors) + fat_sector_count > fat_sector_count * per_fat_sector:
+        fat_sector_count += 1
+    fat_start = len(sectors)
+    fat.extend([FATSECT] * fat_sector_count)
+    fat.extend([FREESECT] * (fat_sector_count * per_fat_sector - len(fat)))
+    fat_bytes = struct.pack(f'<{len(fat)}I', *fat)
+    sectors.extend(fat_bytes[i:i + SECTOR_SIZE] for i in range(0, len(fat_bytes), SECTOR_SIZE))
+
+    difat = [fat_start + i for i in range(fat_sector_count)] + [FREESECT] * (109 - fat_sector_count)
+    header = (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + bytes(16)
+              + struct.pack('<HHHHH', 0x3E, 3, 0xFFFE, 9, 6) + bytes(6)
+              + struct.pack('<9I', 0, fat_sector_count, directory_start, 0, MINI_STREAM_CUTOFF,
+                            minifat_start, -(-len(minifat) * 4 // SECTOR_SIZE), ENDOFCHAIN, 0)
+              + struct.pack('<109I', *difat))
+    return header + b''.join(sectors)
+
+
+def build_word_document(pieces, table_stream='1Table', property_modifier=False, encrypted=False):
+    """
+    Word 97-2003 file whose main text is the given pieces, each (text, compressed):
+    compressed pieces are stored as cp1252 bytes, the others as UTF-16LE.
+    """
+    fib = bytearray(TEXT_OFFSET)
+    struct.pack_into('<HH', fib, 0, 0xA5EC, 0x00C1)
+    struct.pack_into('<H', fib, 0x0A, (0x0200 if table_stream == '1Table' else 0) | (0x0100 if encrypted else 0))
+    struct.pack_into('<H', fib, 0x20, 14)   # csw
+    struct.pack_into('<H', fib, 0x3E, 22)   # cslw
+    struct.pack_into('<H', fib, 0x98, 93)   # cbRgFcLcb
+
+    word = bytearray(fib)
+    cps = [0]
+    pcds = b''
+    for text, compressed in pieces:
+        offset = len(word)
+        if compressed:
+            word += text.encode('cp1252')
+            fc = (offset * 2) | 0x40000000
+        else:
+            word += text.encode('utf-16-le')
+            fc = offset
+        cps.append(cps[-1] + len(text))
+        pcds += struct.pack('<HIH', 0, fc, 0)
+    struct.pack_into('<i', word, 0x4C, cps[-1])  # ccpText
+
+    plc = struct.pack(f'<{len(cps)}I', *cps) + pcds
+    clx = b''
+    if property_modifier:
+        clx += b'\x01' + struct.pack('<h', 2) + b'\x00\x00'
+    clx += b'\x02' + struct.pack('<I', len(plc)) + plc
+    struct.pack_into('<II', word, 0x1A2, 0, len(clx))  # fcClx, lcbClx
+    return build_compound_file({'WordDocument': bytes(word), table_stream: clx})
@@ -1,66 +1,85 @@
-import pytest
-from backend.app import app as flask_app, db
-from backend.app import Job, Resume
-import io
-from unittest.mock import patch
-import json
-
-@pytest.fixture
-def app():
-    flask_app.config.update({
-        "TESTING": True,
-        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
-    })
-    with flask_app.app_context():
-        db.create_all()
-        yield flask_app
-        db.drop_all()
-
-@pytest.fixture
-def client(app):
-    return app.test_client()
-
-def test_get_data(client):
-    """Test the /api/data endpoint."""
-    response = client.get('/api/data')
-    assert response.status_code == 200
-    json_data = response.get_json()
-    assert json_data['message'] == 'Hello from the Flask backend!'
-
-@patch("application.analyze_resume_with_advanced_ai")
-def test_analyze_resumes(mock_analyze_resume, client):
-    """Test the /api/analyze endpoint for file upload and DB storage."""
-    # Arrange: Mock the return value of the AI analysis to be a JSON string
-    mock_analysis = {
-        "summary": "Mocked AI Analysis",
-        "matched_skills": ["mocking"],
-        "missing_skills": [],
-        "overall_rating": 10
-    }
-    mock_analyze_resume.return_value = json.dumps(mock_analysis)
-
-    job_desc = "Test Job Description"
-    resume_content = b"This is a test resume."
-    
-    data = {
-        'jobDescription': job_desc,
-        'resumes': (io.BytesIO(resume_content), 'test_resume.txt')
-    }
-
-    response = client.post('/api/analyze', data=data, content_type='multipart/form-data')
-    
-    assert response.status_code == 200
-    json_data = response.get_json()
-    assert json_data["message"] == "Queued 1 resumes for background processing"
-    assert 'job_id' in json_data
-    assert isinstance(json_data['job_id'], int)
-
-    # Verify database content
-    job = Job.query.get(json_data['job_id'])
-    assert job is not None
-    assert job.description == job_desc
-    
-    assert len(job.resumes) == 1
-    resume = job.resumes[0]
-    assert resume.filename == 'test_resume.txt'
-    
+import pytest
+from backend.app import app as flask_app, db
+from backend.app import Job, Resume, socketio
+import io
+import threading
+from unittest.mock import patch
+import json
+
+@pytest.fixture
+def app():
+    flask_app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+    })
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.drop_all()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def test_get_data(client):
+    """Test the /api/data endpoint."""
+    response = client.get('/api/data')
+    assert response.status_code == 200
+    json_data = response.get_json()
+    assert json_data['message'] == 'Hello from the Flask backend!'
+
+@patch("backend.tasks.analyze_resume_with_advanced_ai")
+def test_analyze_resumes(mock_analyze_resume, client):
+    """Test the /api/analyze endpoint for file upload and DB storage."""
+    # Arrange: Mock the return value of the AI analysis to be a JSON string; analysis
+    # blocks until the request has returned, which it must do without waiting for it
+    mock_analysis = {
+        "summary": "Mocked AI Analysis",
+        "matched_skills": ["mocking"],
+        "missing_skills": [],
+        "overall_rating": 10
+    }
+    request_returned = threading.Event()
+
+    def analyze(*args, **kwargs):
+        assert request_returned.wait(timeout=10)
+        return json.dumps(mock_analysis)
+
+    mock_analyze_resume.side_effect = analyze
+    tasks = []
+
+    def start_background_task(target, *args):
+        task = threading.Thread(target=target, args=args)
+        task.start()
+        tasks.append(task)
+        return task
+
+    job_desc = "Test Job Description"
+    resume_content = b"This is a test resume."
+    
+    data = {
+        'jobDescription': job_desc,
+        'resumes': (io.BytesIO(resume_content), 'test_resume.txt')
+    }
+
+    with patch.object(socketio, "start_background_task", side_effect=start_background_task):
+        response = client.post('/api/analyze', data=data, content_type='multipart/form-data')
+    request_returned.set()
+    for task in tasks:
+        task.join(timeout=30)
+    
+    assert response.status_code == 200
+    json_data = response.get_json()
+    assert json_data["message"] == "Queued 1 resumes for background processing"
+    assert 'job_id' in json_data
+    assert isinstance(json_data['job_id'], int)
+
+    # Verify database content
+    job = Job.query.get(json_data['job_id'])
+    assert job is not None
+    assert job.description == job_desc
+    
+    assert len(job.resumes) == 1
+    resume = job.resumes[0]
+    assert resume.filename == 'test_resume.txt'
+    
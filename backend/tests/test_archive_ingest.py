@@ -0,0 +1,154 @@
+import io
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+import application
+from archive_ingest import ArchiveBudget, is_archive, iter_archive_uploads, iter_job_uploads
+from upload_spool import UploadSpool
+
+
+def write_zip(path, entries):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            if name.endswith("/"):
+                archive.writestr(zipfile.ZipInfo(name), b"")
+            else:
+                archive.writestr(name, data)
+    return str(path)
+
+
+def write_tar(path, entries):
+    with tarfile.open(path, "w:gz") as archive:
+        for name, data in entries:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return str(path)
+
+
+def spool_file(spool, path):
+    with open(path, "rb") as f:
+        return spool.store(f)
+
+
+def read_all(spool, path, name, budget=None, skipped=None):
+    skipped = [] if skipped is None else skipped
+    results = []
+    for entry in iter_archive_uploads(spool, path, name, budget or ArchiveBudget(), skipped):
+        with open(entry["upload"].path, "rb") as f:
+            results.append((entry["filename"], f.read()))
+    return results, skipped
+
+
+def test_archive_extensions():
+    assert all(is_archive(name) for name in ("a.zip", "b.TAR", "c.tar.gz", "d.tgz", "e.tar.xz"))
+    assert not any(is_archive(name) for name in ("cv.pdf", "zip.txt"))
+
+
+def test_zip_entries_are_spooled_one_at_a_time_and_released(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    path = write_zip(tmp_path / "cvs.zip", [
+        ("batch/", b""),
+        ("batch/jane.txt", b"Jane Doe Python"),
+        ("batch/john.pdf", b"%PDF-1.4 john"),
+        ("__MACOSX/batch/._jane.txt", b"meta"),
+        ("batch/photo.png", b"png"),
+        ("batch/more.zip", b"PK"),
+    ])
+    seen_references = []
+
+    skipped = []
+    for entry in iter_archive_uploads(spool, path, "cvs.zip", ArchiveBudget(), skipped):
+        seen_references.append(spool.stats()["references"])
+
+    assert seen_references == [1, 1]
+    assert spool.stats()["references"] == 0
+    assert {item["reason"] for item in skipped} == {
+        "Archive metadata", "Unsupported file type", "Nested archives are not expanded"}
+    assert read_all(spool, path, "cvs.zip")[0] == [("jane.txt", b"Jane Doe Python"), ("john.pdf", b"%PDF-1.4 john")]
+
+
+def test_tar_gz_is_read_as_a_stream(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    path = write_tar(tmp_path / "cvs.tar.gz", [("a/jane.txt", b"Jane"), ("a/john.txt", b"John")])
+
+    results, skipped = read_all(spool, path, "cvs.tar.gz")
+
+    assert results == [("jane.txt", b"Jane"), ("john.txt", b"John")] and skipped == []
+
+
+def test_oversized_entry_is_skipped_without_trusting_declared_size(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    path = write_zip(tmp_path / "bomb.zip", [("big.txt", b"0" * (1024 * 1024)), ("small.txt", b"ok")])
+
+    results, skipped = read_all(spool, path, "bomb.zip", ArchiveBudget(max_entry_bytes=64 * 1024))
+
+    assert results == [("small.txt", b"ok")]
+    assert skipped[0]["filename"] == "big.txt" and "larger than" in skipped[0]["reason"]
+    assert spool.stats()["references"] == 0
+
+
+def test_job_budgets_stop_ingest(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    path = write_zip(tmp_path / "cvs.zip", [(f"cv{i}.txt", b"x" * 100) for i in range(5)])
+
+    by_bytes, skipped = read_all(spool, path, "cvs.zip", ArchiveBudget(max_total_bytes=250))
+    assert len(by_bytes) == 2 and "exhausted" in skipped[-1]["reason"]
+
+    by_count, skipped = read_all(spool, path, "cvs.zip", ArchiveBudget(max_entries=3))
+    assert len(by_count) == 3 and "limit of 3" in skipped[-1]["reason"]
+
+
+def test_unreadable_archive_is_reported(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    path = tmp_path / "broken.zip"
+    path.write_bytes(b"not an archive at all")
+
+    results, skipped = read_all(spool, str(path), "broken.zip")
+
+    assert results == [] and skipped[0]["filename"] == "broken.zip"
+
+
+def test_job_uploads_mix_plain_files_and_archives(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    archive = spool_file(spool, write_zip(tmp_path / "cvs.zip", [("b.txt", b"B"), ("c.txt", b"C")]))
+    plain = spool.store(io.BytesIO(b"A"))
+    file_data = [{"filename": "a.txt", "upload": plain}, {"filename": "cvs.zip", "upload": archive}]
+
+    names = [entry["filename"] for entry in iter_job_uploads(spool, file_data, [])]
+
+    assert names == ["a.txt", "b.txt", "c.txt"]
+
+
+def test_background_processing_ingests_archive_entries(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    archive_path = write_zip(tmp_path / "cvs.zip", [(f"cv{i}.txt", f"Candidate {i} Python".encode()) for i in range(40)])
+    file_data = [{"filename": "cvs.zip", "upload": spool_file(spool, archive_path), "job_id": 1}]
+    saved = []
+
+    def save(filename, content, content_hash, analysis_text, job_id, processed_files, skipped_files):
+        saved.append(content)
+
+    with patch("upload_spool.get_upload_spool", return_value=spool), \
+            patch.object(application, "check_system_resources", return_value=(True, "ok")), \
+            patch("async_scoring_engine.SCORING_ENGINE", "threads"), \
+            patch("prescreen.PRESCREEN_ENABLED", False), \
+            patch.object(application, "analyze_resume_with_advanced_ai", return_value="{}"), \
+            patch.object(application, "save_resume_analysis", side_effect=save):
+        application.process_resumes_background(file_data, "Job", 10**9)
+
+    assert saved == [f"Candidate {i} Python" for i in range(40)]
+    assert spool.stats()["references"] == 0
+
+
+def test_same_named_entries_in_different_folders_keep_unique_filenames(tmp_path):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    archive = spool_file(spool, write_zip(tmp_path / "cvs.zip", [
+        ("alice/CV.txt", b"Alice"), ("bob/CV.txt", b"Bob"), ("carol/bob/CV.txt", b"Carol"), ("jane.txt", b"Jane 2")]))
+    file_data = [{"filename": "jane.txt", "upload": spool.store(io.BytesIO(b"Jane"))},
+                 {"filename": "cvs.zip", "upload": archive}]
+
+    names = [entry["filename"] for entry in iter_job_uploads(spool, file_data, [])]
+
+    assert names == ["jane.txt", "CV.txt", "bob/CV.txt", "carol/bob/CV.txt", "jane (2).txt"]
@@ -0,0 +1,81 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+
+from async_scoring_engine import AsyncScoringEngine
+
+
+class FakeAsyncClient:
+    """Stands in for openai.AsyncOpenAI, answers with answer(messages) and records prompts and peak concurrency."""
+
+    def __init__(self, answer, delay=0.0):
+        self.answer = answer
+        self.delay = delay
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.chat = MagicMock()
+        self.chat.completions.create = self.create
+
+    async def create(self, model, messages, **params):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            prompt = messages[-1]["content"]
+            self.prompts.append(prompt)
+            response = MagicMock()
+            response.choices[0].message.content = self.answer(messages)
+            return response
+        finally:
+            self.in_flight -= 1
+
+
+@pytest.fixture
+def make_client(scoring_responses, answer_prompt):
+    return lambda delay=0.0: FakeAsyncClient(lambda messages: answer_prompt(scoring_responses, messages), delay)
+
+
+@pytest.fixture
+def run_engine(make_mock_scorer, scoring_responses):
+    def run_engine(client, resumes, max_concurrency=100):
+        scorer = make_mock_scorer(scoring_responses)
+
+        async def run():
+            async with AsyncScoringEngine(scorer=scorer, max_concurrency=max_concurrency, client=client) as engine:
+                return await engine.score_many("Python developer, 2 years of experience", resumes)
+
+        return asyncio.run(run())
+
+    return run_engine
+
+
+def test_score_many_matches_score_resume_shape(make_client, run_engine):
+    """Each result has the score_resume shape and job-level phases run once per job."""
+    client = make_client()
+    resumes = [f"Python engineer {year}-2024" for year in range(2015, 2020)]
+
+    results = run_engine(client, resumes)
+
+    assert len(results) == len(resumes)
+    for result in results:
+        assert {"job_level", "section_weights", "subfield_scores", "final_score",
+                "candidate_experience", "job_requirements", "phase_timings", "processing_time"} <= set(result)
+        assert result["final_score"]["final_weighted_score"] > 0
+        assert result["candidate_experience"]["total_months"] == 36
+    # Job requirement comes from the rules; one section weights call shared by all resumes, two calls per resume
+    assert sum("years of experience required" in p for p in client.prompts) == 0
+    assert sum("weights to resume sections" in p for p in client.prompts) == 1
+    assert len(client.prompts) == 1 + 2 * len(resumes)
+
+
+def test_semaphore_bounds_in_flight_requests(make_client, run_engine):
+    """No more than max_concurrency requests are in flight at once."""
+    client = make_client(delay=0.01)
+    resumes = [f"Resume number {i}" for i in range(10)]
+
+    results = run_engine(client, resumes, max_concurrency=3)
+
+    assert not any(isinstance(result, Exception) for result in results)
+    assert client.max_in_flight == 3
@@ -0,0 +1,116 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from batch_scoring import BatchPending, BatchScoringJob, LocalBatchBackend, resume_key
+from llm_cache import LLMResponseCache
+
+JOB_DESCRIPTION = "Python developer, 2 years of experience"
+
+
+@pytest.fixture
+def answer(answer_prompt, scoring_responses):
+    return lambda messages: answer_prompt(scoring_responses, messages)
+
+
+@pytest.fixture
+def make_scorer(make_mock_scorer, scoring_responses):
+    return lambda cache: make_mock_scorer(scoring_responses, response_cache=cache)
+
+
+def summary_request(filename, resume_text):
+    return {"model": "gpt-4", "messages": [{"role": "user", "content": f"You are an expert HR recruiter. {resume_text}"}],
+            "temperature": 0.3, "max_tokens": 1000}
+
+
+def test_local_batch_flow_scores_every_resume(tmp_path, answer, make_scorer):
+    """Prompts are serialized to JSONL, answered by the local backend and fanned back per resume."""
+    responder_calls = []
+
+    def responder(body):
+        responder_calls.append(body)
+        return {"choices": [{"message": {"role": "assistant", "content": answer(body["messages"])}}]}
+
+    backend = LocalBatchBackend(directory=str(tmp_path / "backend"), responder=responder)
+    resumes = [("a.pdf", "Python engineer 2019-2024"), ("b.pdf", "Data analyst 2020-2024")]
+    job = BatchScoringJob(JOB_DESCRIPTION, resumes, scorer=make_scorer(LLMResponseCache(path=str(tmp_path / "cache.db"))),
+                          backend=backend, summary_request=summary_request, batch_dir=str(tmp_path / "batches"))
+
+    results = job.run(poll_interval=0)
+
+    assert [r["filename"] for r in results] == ["a.pdf", "b.pdf"]
+    for result in results:
+        assert result["error"] is None
+        assert result["advanced_result"]["final_score"]["final_weighted_score"] > 0
+        assert result["advanced_result"]["candidate_experience"]["total_months"] == 36
+        assert json.loads(result["summary"])["candidate_name"] == "Jane Doe"
+    # Three requests per resume went through the batch; job-level phases did not
+    assert len(responder_calls) == 6
+    output = (tmp_path / "backend" / job.batch_id / "output.jsonl").read_text().splitlines()
+    assert {json.loads(line)["custom_id"] for line in output} == {
+        f"{resume_key(text)}:{request}" for _, text in resumes
+        for request in ("candidate_experience", "subfield_scores", "summary")
+    }
+
+
+def test_unfinished_batch_is_resumed_by_id_instead_of_resubmitted(tmp_path, answer, make_scorer):
+    """run(wait=False) raises while the batch runs; a later job given its id only polls and collects."""
+    backend = LocalBatchBackend(directory=str(tmp_path / "backend"),
+                                responder=lambda body: {"choices": [{"message": {"content": answer(body["messages"])}}]})
+    backend.poll = MagicMock(return_value="in_progress")
+    resumes = [("a.pdf", "Python engineer 2019-2024"), ("b.pdf", "Data analyst 2020-2024")]
+    cache = LLMResponseCache(path=str(tmp_path / "cache.db"))
+
+    first = BatchScoringJob(JOB_DESCRIPTION, resumes, scorer=make_scorer(cache), backend=backend,
+                            batch_dir=str(tmp_path / "batches"))
+    with pytest.raises(BatchPending) as pending:
+        first.run(wait=False)
+    assert pending.value.batch_id == first.batch_id
+
+    del backend.poll  # back to the real poll, which finishes the batch
+    backend.submit = MagicMock()
+    # A restarted worker rebuilds the job with the resumes in a different order
+    resumed = BatchScoringJob(JOB_DESCRIPTION, resumes[::-1], scorer=make_scorer(cache), backend=backend,
+                              batch_dir=str(tmp_path / "batches"), batch_id=first.batch_id)
+    results = resumed.run(wait=False)
+
+    backend.submit.assert_not_called()
+    assert [r["filename"] for r in results] == ["b.pdf", "a.pdf"]
+    assert all(r["advanced_result"]["candidate_experience"]["total_months"] == 36 for r in results)
+
+
+def test_failed_request_is_reported_per_resume(tmp_path, answer, make_scorer):
+    """A failed subfield request marks only that resume as failed."""
+    def responder(body):
+        if "Broken resume" in body["messages"][-1]["content"] and "score each resume section" in body["messages"][-1]["content"]:
+            raise RuntimeError("server error")
+        return {"choices": [{"message": {"role": "assistant", "content": answer(body["messages"])}}]}
+
+    backend = LocalBatchBackend(directory=str(tmp_path / "backend"), responder=responder)
+    resumes = [("ok.pdf", "Python engineer 2019-2024"), ("broken.pdf", "Broken resume")]
+    job = BatchScoringJob(JOB_DESCRIPTION, resumes, scorer=make_scorer(LLMResponseCache(path=str(tmp_path / "cache.db"))),
+                          backend=backend, batch_dir=str(tmp_path / "batches"))
+
+    ok, broken = job.run(poll_interval=0)
+
+    assert ok["advanced_result"] is not None
+    assert broken["advanced_result"] is None
+    assert "server error" in broken["error"]
+
+
+def test_cached_responses_are_not_resubmitted(tmp_path, answer, make_scorer):
+    """A second run over the same resumes is served from the response cache without a batch."""
+    cache = LLMResponseCache(path=str(tmp_path / "cache.db"))
+    backend = LocalBatchBackend(directory=str(tmp_path / "backend"),
+                                responder=lambda body: {"choices": [{"message": {"content": answer(body["messages"])}}]})
+    resumes = [("a.pdf", "Python engineer 2019-2024")]
+
+    BatchScoringJob(JOB_DESCRIPTION, resumes, scorer=make_scorer(cache), backend=backend,
+                    batch_dir=str(tmp_path / "batches")).run(poll_interval=0)
+    second = BatchScoringJob(JOB_DESCRIPTION, resumes, scorer=make_scorer(cache), backend=backend,
+                             batch_dir=str(tmp_path / "batches"))
+    results = second.run(poll_interval=0)
+
+    assert second.batch_id is None
+    assert results[0]["advanced_result"]["final_score"]["final_weighted_score"] > 0
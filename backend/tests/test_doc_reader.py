@@ -0,0 +1,65 @@
+import pytest
+
+from backend.tests.doc_fixtures import build_compound_file, build_word_document
+from doc_reader import DocFormatError, OleFile, read_doc_text
+from text_extraction import extract_text
+
+
+def test_reads_compressed_and_unicode_pieces():
+    data = build_word_document([("Jane Doe\rSenior Engineer\r", True), ("Zoë – Kraków\r", False)])
+
+    assert read_doc_text(data) == "Jane Doe\nSenior Engineer\nZoë – Kraków\n"
+
+
+def test_large_streams_use_regular_sectors_and_0table():
+    body = "Built data pipelines in Python. " * 500
+    data = build_word_document([(body, True), ("Go – Rust\r" * 300, False)], table_stream="0Table")
+
+    text = read_doc_text(data)
+
+    assert text.startswith(body) and text.endswith("Go – Rust\n")
+    assert len(text) == len(body) + 300 * len("Go – Rust\n")
+
+
+def test_field_codes_and_control_characters_are_removed():
+    data = build_word_document(
+        [("See \x13 HYPERLINK \"https://example.com\" \x14my site\x15 now\x01\r"
+          "Skills\x07Python\x07\x07\r", True)],
+        property_modifier=True,
+    )
+
+    assert read_doc_text(data) == "See my site now\nSkills\tPython\t\t\n"
+
+
+def test_streams_are_read_from_mini_and_regular_sectors():
+    ole = OleFile(build_compound_file({"Small": b"tiny stream", "Large": bytes(range(256)) * 40}))
+
+    assert ole.open_stream("small") == b"tiny stream"
+    assert ole.open_stream("Large") == bytes(range(256)) * 40
+    with pytest.raises(DocFormatError):
+        ole.open_stream("Missing")
+
+
+def test_rejects_non_word_files():
+    with pytest.raises(DocFormatError):
+        read_doc_text(b"{\\rtf1 Jane Doe}")
+    with pytest.raises(DocFormatError):
+        read_doc_text(build_compound_file({"Workbook": b"not a document"}))
+    with pytest.raises(DocFormatError):
+        read_doc_text(build_word_document([("secret", True)], encrypted=True))
+
+
+def test_extractor_uses_the_reader_and_falls_back_for_other_files():
+    data = build_word_document([("Jane Doe\rPython developer\r", True)])
+    rtf = b"{\\rtf1\\ansi Jane Doe Python developer}"
+
+    assert extract_text("cv.doc", data)[0] == "Jane Doe\nPython developer\n"
+    assert "Jane Doe Python developer" in extract_text("cv.doc", rtf)[0]
+
+
+def test_extractor_stops_at_the_budget():
+    data = build_word_document([("x" * 20000, True)])
+
+    text, stats = extract_text("cv.doc", data, max_chars=5000)
+
+    assert text == "x" * 5000 and stats["budget_reached"]
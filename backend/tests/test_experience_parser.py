@@ -0,0 +1,70 @@
+from datetime import date
+
+from experience_parser import EXPERIENCE_PARSER_MIN_CONFIDENCE, extract_date_ranges, parse_work_history
+
+TODAY = date(2024, 6, 15)
+
+RESUME = """Jane Doe
+Work Experience
+Senior Engineer, Acme            Jan 2020 – Present
+Engineer, Globex                 03/2018 to 12/2019
+Intern, Initech                  2017.06 - 2017.08
+
+Education
+B.S. Computer Science            2013 - 2017
+"""
+
+
+def test_formats_are_counted_inclusively():
+    ranges = extract_date_ranges("Jan 2020 – Present; 03/2018 to 12/2019; 2017.06 - 2017.08; 2015-2016", TODAY)
+
+    assert [r['end'] - r['start'] + 1 for r in ranges] == [54, 22, 3, 24]
+    assert ranges[0]['current']
+    assert ranges[3]['year_only']
+
+
+def test_digit_runs_are_not_date_ranges():
+    assert extract_date_ranges("Phone 555-2019-2020, ID 12019-2020, fax 2019-2020-4455", TODAY) == []
+    assert [r['text'] for r in extract_date_ranges("Acme (2019-2020)", TODAY)] == ["2019-2020"]
+
+
+def test_year_only_ranges_are_below_the_confidence_threshold():
+    result = parse_work_history("Experience\nAcme 2019 - 2021\nGlobex Jan 2022 - Present\n", today=TODAY)
+
+    assert result["confidence"] < EXPERIENCE_PARSER_MIN_CONFIDENCE
+
+
+def test_parse_work_history_uses_experience_section_only():
+    result = parse_work_history(RESUME, today=TODAY)
+
+    assert result["total_months"] == 54 + 22 + 3
+    assert result["total_years"] == 79 / 12
+    assert result["confidence"] >= 0.9
+    assert result["method"] == "local_parser"
+    assert "2013 - 2017" not in result["calculation_details"]
+
+
+def test_overlaps_count_separately_unless_merged():
+    resume = "Experience\nAcme Jan 2020 - Dec 2020\nGlobex Jul 2020 - Jun 2021\n"
+
+    assert parse_work_history(resume, today=TODAY)["total_months"] == 24
+    assert parse_work_history(resume, today=TODAY, merge_overlaps=True)["total_months"] == 18
+
+
+def test_confident_parse_skips_llm(make_mock_scorer, scoring_responses):
+    scorer = make_mock_scorer(scoring_responses)
+
+    result = scorer._calculate_candidate_experience(RESUME)
+
+    assert result["method"] == "local_parser"
+    scorer.client.chat.completions.create.assert_not_called()
+
+
+def test_low_confidence_falls_back_to_llm(make_mock_scorer, scoring_responses):
+    scorer = make_mock_scorer(scoring_responses)
+
+    result = scorer._calculate_candidate_experience("Python engineer 2021-2024")
+
+    assert result["total_months"] == 36
+    assert result["method"] == "llm"
+    assert scorer.client.chat.completions.create.call_count == 1
@@ -0,0 +1,89 @@
+import io
+from unittest.mock import patch
+
+import fitz
+
+import application
+import extraction_service
+from extraction_cache import ExtractionCache, raw_digest
+from extraction_service import ExtractionService
+
+
+class Upload(io.BytesIO):
+    def __init__(self, data, filename):
+        super().__init__(data)
+        self.filename = filename
+
+
+def make_pdf(text):
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), text)
+    data = pdf.tobytes()
+    pdf.close()
+    return data
+
+
+def test_keys_depend_on_bytes_extension_and_budget(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.db"))
+    digest = raw_digest(b"resume bytes")
+    cache.set_text(digest, "cv.pdf", 50000, "Jane Doe")
+
+    assert digest == raw_digest(io.BytesIO(b"resume bytes"))
+    assert cache.get_text(digest, "other-name.PDF", 50000) == "Jane Doe"
+    assert cache.get_text(digest, "cv.docx", 50000) is None
+    assert cache.get_text(digest, "cv.pdf") is None
+    assert cache.get_text(raw_digest(b"other bytes"), "cv.pdf", 50000) is None
+
+
+def test_empty_text_is_not_cached(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.db"))
+    cache.set_text("abc", "cv.pdf", None, "  \n")
+
+    assert cache.get_text("abc", "cv.pdf") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_entry_count_is_bounded(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.db"), max_entries=3)
+    for i in range(6):
+        cache.set_text(raw_digest(str(i).encode()), "cv.txt", None, f"resume {i}")
+
+    assert cache.stats()["entries"] <= 3
+    assert cache.get_text(raw_digest(b"5"), "cv.txt") == "resume 5"
+
+
+def test_reupload_skips_the_parser(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.db"))
+    data = make_pdf("Jane Doe Python")
+
+    with patch("extraction_cache.get_extraction_cache", return_value=cache):
+        first = application.extract_text_from_file(Upload(data, "jane.pdf"))
+        with patch("fitz.open", side_effect=AssertionError("parser should not run")):
+            second = application.extract_text_from_file(Upload(data, "renamed.pdf"))
+
+    assert "Jane Doe Python" in first and second == first
+    assert cache.stats()["hits"] == 1
+
+
+def test_failed_extraction_is_retried_not_cached(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.db"))
+
+    with patch("extraction_cache.get_extraction_cache", return_value=cache):
+        result = application.extract_text_from_file(Upload(b"not a pdf", "broken.pdf"))
+
+    assert result == "PDF extraction failed for broken.pdf"
+    assert cache.stats()["entries"] == 0
+
+
+def test_extraction_service_serves_cached_files_without_parsing(tmp_path):
+    cache = ExtractionCache(path=str(tmp_path / "cache.db"))
+    service = ExtractionService(max_workers=0)
+    files = [("a.txt", b"first"), ("b.pdf", make_pdf("Second resume"))]
+
+    with patch.object(extraction_service, "get_extraction_cache", return_value=cache):
+        service.extract_many(files)
+        with patch.object(extraction_service, "extract_document", side_effect=AssertionError("parser should not run")):
+            results = service.extract_many(files)
+
+    assert results[0]["text"] == "first" and "Second resume" in results[1]["text"]
+    assert all(result["metadata"]["cached"] for result in results)
@@ -0,0 +1,77 @@
+import io
+import time
+from unittest.mock import patch
+
+import docx
+import fitz
+
+import extraction_service
+from extraction_service import ExtractionService, extract_document
+
+
+def make_pdf(pages):
+    pdf = fitz.open()
+    for text in pages:
+        pdf.new_page().insert_text((72, 72), text)
+    data = pdf.tobytes()
+    pdf.close()
+    return data
+
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+def slow_for_stuck_files(filename, data):
+    if filename.startswith("stuck"):
+        time.sleep(30)
+    return extract_document(filename, data)
+
+
+def test_extract_document_formats_and_metadata():
+    pdf = extract_document("cv.pdf", make_pdf(["Jane Doe", "Python developer"]))
+    word = extract_document("cv.docx", make_docx(["John Roe", "Data analyst"]))
+    text = extract_document("cv.txt", b"Plain resume")
+
+    assert "Jane Doe" in pdf["text"] and "Python developer" in pdf["text"]
+    assert pdf["metadata"]["format"] == "pdf" and pdf["metadata"]["pages"] == 2
+    assert word["text"] == "John Roe\nData analyst\n"
+    assert text["text"] == "Plain resume" and text["error"] is None
+
+
+def test_unreadable_document_reports_error():
+    result = extract_document("broken.pdf", b"not a pdf")
+
+    assert result["text"] == "" and result["error"]
+
+
+def test_process_pool_returns_results_in_input_order():
+    service = ExtractionService(max_workers=2)
+    files = [(f"cv{i}.txt", f"resume {i}".encode()) for i in range(6)] + [("cv.pdf", make_pdf(["Jane Doe"]))]
+    try:
+        results = service.extract_many(files)
+    finally:
+        service.shutdown()
+
+    assert [r["filename"] for r in results] == [name for name, _ in files]
+    assert results[3]["text"] == "resume 3"
+    assert service.stats()["extracted"] == 7
+
+
+def test_stuck_document_times_out_and_the_rest_are_extracted():
+    service = ExtractionService(max_workers=1, timeout=1, start_method="fork")
+    files = [("a.txt", b"first"), ("stuck.txt", b"never"), ("b.txt", b"second")]
+    with patch.object(extraction_service, "extract_document", slow_for_stuck_files):
+        try:
+            results = service.extract_many(files)
+        finally:
+            service.shutdown()
+
+    assert [r["text"] for r in results] == ["first", "", "second"]
+    assert "timed out" in results[1]["error"]
+    assert service.stats()["timeouts"] == 1
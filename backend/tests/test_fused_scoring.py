@@ -0,0 +1,47 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+import application
+
+SUMMARY = {
+    "candidate_name": "Jane Doe",
+    "reasoning": "Strong Python background",
+    "summary_points": ["Python", "APIs", "No cloud"],
+    "skill_matrix": {"matches": ["Python"], "gaps": ["AWS"]},
+    "timeline": [{"period": "2021-2024", "role": "Engineer", "company": "Acme", "details": "APIs"}],
+    "logistics": {"compensation": "Not specified", "notice_period": "Not specified",
+                  "work_authorization": "Not specified", "location": "Remote"},
+}
+
+@pytest.fixture
+def scorer(make_mock_scorer, scoring_responses):
+    # The fused prompt also contains the subfield scoring marker, so its answer goes first
+    fused = {**scoring_responses["score each resume section"], "summary": SUMMARY}
+    return make_mock_scorer({"CANDIDATE SUMMARY": fused, **scoring_responses})
+
+
+def test_fused_score_resume_returns_summary_from_scoring_call(scorer):
+
+    result = scorer.score_resume("Python developer, 2 years of experience", "Python engineer 2021-2024", fused=True)
+
+    assert result["summary"] == SUMMARY
+    assert result["final_score"]["final_weighted_score"] > 0
+    assert "summary" not in result["subfield_scores"]
+    # Section weights, candidate experience and one fused scoring call; no separate summary call
+    assert len(scorer.client.prompts) == 3
+
+
+def test_fused_analysis_keeps_stored_json_shape(scorer):
+    with patch("duplicate_copy_resume_scorer.FUSED_SCORING", True), \
+            patch.object(application, "get_scorer_for_job", return_value=scorer), \
+            patch.object(application, "analyze_resume_with_ai") as legacy_summary:
+        analysis = json.loads(application.analyze_resume_with_advanced_ai(
+            "Python developer, 2 years of experience", "Python engineer 2021-2024", "jane.pdf"))
+
+    legacy_summary.assert_not_called()
+    assert {"candidate_name", "fit_score", "bucket", "reasoning", "summary_points", "skill_matrix",
+            "timeline", "logistics", "advanced_analysis"} <= set(analysis)
+    assert analysis["candidate_name"] == "Jane Doe"
+    assert analysis["fit_score"] == int(analysis["advanced_analysis"]["final_score_details"]["final_weighted_score"])
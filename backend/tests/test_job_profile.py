@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app import app as flask_app, db, Job, JobProfile, User
+from duplicate_copy_resume_scorer import ResumeScorer
+from job_profile import description_hash, get_or_create_job_profile
+
+JOB_DESCRIPTION = "Python developer, 2 years of experience"
+
+PROFILE = {
+    "description_hash": description_hash(JOB_DESCRIPTION),
+    "job_requirement": {"years_required": 2, "job_level": "entry", "extraction_details": "2 years"},
+    "job_level": "entry",
+    "section_weights": {"experience": 0.5, "skills": 0.5},
+}
+
+
+@pytest.fixture
+def app():
+    flask_app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+    })
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app
+        db.drop_all()
+
+
+def test_score_resume_with_profile_makes_only_resume_calls(make_mock_scorer, scoring_responses):
+    scorer = make_mock_scorer(scoring_responses)
+    prompts = scorer.client.prompts
+
+    result = scorer.score_resume(JOB_DESCRIPTION, "Python engineer 2021-2024", job_profile=PROFILE)
+
+    assert result["section_weights"] == PROFILE["section_weights"]
+    assert result["job_level"] == "entry"
+    assert len(prompts) == 2
+    assert not any("weights to resume sections" in p for p in prompts)
+
+
+def test_stale_profile_is_ignored():
+    scorer = ResumeScorer(api_key="test-key", use_persistent_cache=False)
+
+    assert not scorer.apply_job_profile("A different job description", PROFILE)
+    assert scorer.apply_job_profile(JOB_DESCRIPTION, PROFILE)
+
+
+def test_profile_is_stored_and_recomputed_only_when_description_changes(app):
+    user = User(username="profile_user")
+    db.session.add(user)
+    db.session.commit()
+    job = Job(description=JOB_DESCRIPTION, user_id=user.id)
+    db.session.add(job)
+    db.session.commit()
+
+    scorer = MagicMock()
+    scorer._extract_job_experience_requirement.return_value = PROFILE["job_requirement"]
+    scorer.assign_section_weights.return_value = PROFILE["section_weights"]
+
+    first = get_or_create_job_profile(db.session, JobProfile, job, lambda description: scorer)
+    second = get_or_create_job_profile(db.session, JobProfile, job, lambda description: scorer)
+
+    assert first["section_weights"] == second["section_weights"] == PROFILE["section_weights"]
+    assert scorer.assign_section_weights.call_count == 1
+
+    job.description = "Senior Python developer, 8+ years of experience"
+    db.session.commit()
+    third = get_or_create_job_profile(db.session, JobProfile, job, lambda description: scorer)
+
+    assert third["description_hash"] == description_hash(job.description)
+    assert scorer.assign_section_weights.call_count == 2
+    assert JobProfile.query.count() == 1
@@ -0,0 +1,37 @@
+from job_requirement_extractor import extract_job_requirement
+
+
+def test_years_and_title_agree():
+    result = extract_job_requirement("Senior Backend Engineer\nWe need 7+ years of Python experience.")
+
+    assert result["resolved"]
+    assert result["years_required"] == 7
+    assert result["job_level"] == "senior"
+    assert result["method"] == "rules"
+
+
+def test_years_only_and_title_only():
+    years_only = extract_job_requirement("Backend Developer\nRequires 3-5 years of backend experience")
+    title_only = extract_job_requirement("Software Engineering Intern\nSummer internship for students.")
+
+    assert (years_only["resolved"], years_only["years_required"], years_only["job_level"]) == (True, 3, "mid")
+    assert (title_only["resolved"], title_only["years_required"], title_only["job_level"]) == (True, 0, "entry")
+
+
+def test_conflicting_or_missing_signals_are_unresolved():
+    assert not extract_job_requirement("Senior Data Scientist\nMinimum 1 year of experience")["resolved"]
+    assert not extract_job_requirement("Software Engineer\nBuild reliable services.")["resolved"]
+
+
+def test_scorer_uses_rules_and_falls_back_to_llm(make_mock_scorer):
+    scorer = make_mock_scorer({"years of experience required": {"years_required": 4, "job_level": "mid",
+                                                                 "extraction_details": "llm"}})
+
+    rules = scorer._extract_job_experience_requirement("Junior Developer\n1+ years of experience")
+    assert rules["method"] == "rules"
+    scorer.client.chat.completions.create.assert_not_called()
+
+    llm = scorer._extract_job_experience_requirement("Software Engineer\nBuild reliable services.")
+    assert llm["method"] == "llm"
+    assert llm["years_required"] == 4
+    assert scorer.client.chat.completions.create.call_count == 1
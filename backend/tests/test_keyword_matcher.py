@@ -0,0 +1,43 @@
+import random
+
+from duplicate_copy_resume_scorer import CROSS_SECTION_KEYWORDS, ResumeScorer
+from keyword_matcher import KeywordMatcher, search_keywords_per_keyword
+
+RESUME = """Jane Doe
+Team Lead, Acme Corp (2019-2023)
+Led team of 6 engineers; managed team hiring and project management for the data platform.
+Research project on statistical analysis of churn; thesis published in a peer-reviewed journal article.
+Awards: Dean's List, achievement award for academic excellence, scholarship recipient.
+"""
+
+
+def test_overlapping_keywords_are_all_found():
+    matcher = KeywordMatcher(['led', 'led team', 'team lead', 'lead'])
+
+    hits = matcher.occurrences("team lead. led team")
+
+    assert hits == {'team lead': [0], 'lead': [5], 'led': [11], 'led team': [11]}
+
+
+def test_cross_section_content_matches_per_keyword_scan():
+    scorer = ResumeScorer(api_key="test-key", use_persistent_cache=False)
+    text_lower = RESUME.lower()
+
+    result = scorer._extract_cross_section_content(RESUME)
+
+    for section, keywords in CROSS_SECTION_KEYWORDS.items():
+        assert result[section] == search_keywords_per_keyword(text_lower, keywords)
+    assert 'led team' in result['leadership']['found_keywords']
+    assert result['awards']['count'] >= 4
+
+
+def test_random_texts_match_per_keyword_scan():
+    keywords = [kw for kws in CROSS_SECTION_KEYWORDS.values() for kw in kws]
+    matcher = KeywordMatcher(keywords)
+    pieces = keywords + [' ', '\n', 'x' * 60, 'y' * 140, 'ı', 'İ', '.']
+    rng = random.Random(0)
+
+    for _ in range(300):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 60))).lower()
+        for section_keywords in CROSS_SECTION_KEYWORDS.values():
+            assert matcher.search(text, section_keywords) == search_keywords_per_keyword(text, section_keywords)
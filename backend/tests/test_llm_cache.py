@@ -0,0 +1,95 @@
+import json
+import time
+from unittest.mock import MagicMock
+
+from llm_cache import LLMResponseCache
+from duplicate_copy_resume_scorer import ResumeScorer
+
+MESSAGES = [{"role": "user", "content": "Score this resume"}]
+PARAMS = {"temperature": 0, "seed": 42, "max_tokens": 100}
+
+
+def make_scorer(cache):
+    scorer = ResumeScorer(api_key="test-key", response_cache=cache)
+    mock_response = MagicMock()
+    mock_response.choices[0].message.content = json.dumps({"years_required": 5, "job_level": "mid"})
+    scorer.client = MagicMock()
+    scorer.client.chat.completions.create.return_value = mock_response
+    return scorer
+
+
+def test_cache_hit_and_miss_counters(tmp_path):
+    """A stored response is returned on the next lookup and counted as a hit."""
+    cache = LLMResponseCache(path=str(tmp_path / "cache.db"))
+
+    assert cache.get_response("gpt-4o-mini", MESSAGES, PARAMS) is None
+    cache.set_response("gpt-4o-mini", MESSAGES, PARAMS, '{"ok": true}')
+
+    assert cache.get_response("gpt-4o-mini", MESSAGES, PARAMS) == '{"ok": true}'
+    # A different seed or model is a different key
+    assert cache.get_response("gpt-4o-mini", MESSAGES, dict(PARAMS, seed=7)) is None
+    assert cache.get_response("gpt-4o", MESSAGES, PARAMS) is None
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+    assert stats["entries"] == 1
+
+
+def test_cache_survives_new_instance(tmp_path):
+    """Entries are persisted on disk and visible to a fresh cache instance."""
+    path = str(tmp_path / "cache.db")
+    LLMResponseCache(path=path).set_response("gpt-4o-mini", MESSAGES, PARAMS, "persisted")
+
+    assert LLMResponseCache(path=path).get_response("gpt-4o-mini", MESSAGES, PARAMS) == "persisted"
+
+
+def test_cache_evicts_by_size_and_age(tmp_path):
+    """Least recently used entries are evicted past max_entries and expired entries are dropped."""
+    cache = LLMResponseCache(path=str(tmp_path / "cache.db"), max_entries=2, max_age_seconds=60)
+    for i in range(3):
+        cache.set(f"key-{i}", f"value-{i}")
+
+    assert cache.get("key-0") is None
+    assert cache.get("key-2") == "value-2"
+    assert cache.stats()["evictions"] == 1
+
+    cache.max_age_seconds = 0
+    time.sleep(0.01)
+    assert cache.get("key-2") is None
+
+
+def test_cache_bypass_switch(tmp_path):
+    """A disabled cache never stores or serves entries."""
+    cache = LLMResponseCache(path=str(tmp_path / "cache.db"), enabled=False)
+    cache.set("key", "value")
+
+    assert cache.get("key") is None
+    assert cache.stats()["bypassed"] == 1
+
+
+def test_resume_scorer_reuses_persisted_response(tmp_path):
+    """A second scorer instance is served from disk instead of calling the API again."""
+    path = str(tmp_path / "cache.db")
+    first = make_scorer(LLMResponseCache(path=path))
+    first._extract_job_experience_requirement("Python Engineer, see team page for details")
+    assert first.client.chat.completions.create.call_count == 1
+
+    second = make_scorer(LLMResponseCache(path=path))
+    result = second._extract_job_experience_requirement("Python Engineer, see team page for details")
+
+    assert result["years_required"] == 5
+    second.client.chat.completions.create.assert_not_called()
+
+
+def test_clear_cache_keeps_the_shared_response_cache(tmp_path):
+    """Clearing one scorer's caches must not wipe responses other scorers share."""
+    cache = LLMResponseCache(path=str(tmp_path / "cache.db"))
+    cache.set_response("gpt-4o-mini", MESSAGES, PARAMS, "shared")
+    scorer = make_scorer(cache)
+    scorer.subfield_scores_cache["key"] = {"skills": {}}
+
+    scorer.clear_cache()
+
+    assert scorer.subfield_scores_cache == {}
+    assert cache.get_response("gpt-4o-mini", MESSAGES, PARAMS) == "shared"
@@ -0,0 +1,77 @@
+import threading
+import time
+
+import pytest
+
+from phase_executor import PhaseExecutor
+
+
+def test_phases_receive_dependency_results():
+    """A phase is called with the results of the phases it depends on."""
+    executor = PhaseExecutor()
+    executor.add("a", lambda: 2)
+    executor.add("b", lambda: 3)
+    executor.add("product", lambda a, b: a * b, depends_on=["a", "b"])
+
+    results, timings = executor.run()
+
+    assert results == {"a": 2, "b": 3, "product": 6}
+    assert set(timings) == {"a", "b", "product"}
+    assert timings["product"]["started_at"] >= timings["a"]["started_at"]
+
+
+def test_independent_phases_run_concurrently():
+    """Two independent slow phases overlap instead of running back to back."""
+    barrier = threading.Barrier(2, timeout=2)
+
+    def slow(value):
+        # Both phases must be running at the same time to pass the barrier
+        barrier.wait()
+        time.sleep(0.1)
+        return value
+
+    executor = PhaseExecutor()
+    executor.add("left", lambda: slow("left"))
+    executor.add("right", lambda: slow("right"))
+
+    results, timings = executor.run()
+
+    assert results == {"left": "left", "right": "right"}
+    assert timings["right"]["started_at"] < timings["left"]["started_at"] + timings["left"]["duration"]
+
+
+def test_unknown_dependency_and_cycle_are_rejected():
+    executor = PhaseExecutor()
+    executor.add("a", lambda missing: missing, depends_on=["missing"])
+    with pytest.raises(ValueError):
+        executor.run()
+
+    executor = PhaseExecutor()
+    executor.add("a", lambda b: b, depends_on=["b"])
+    executor.add("b", lambda a: a, depends_on=["a"])
+    with pytest.raises(ValueError):
+        executor.run()
+
+
+def test_phase_error_is_raised():
+    def fail():
+        raise RuntimeError("boom")
+
+    executor = PhaseExecutor()
+    executor.add("ok", lambda: 1)
+    executor.add("bad", fail)
+    with pytest.raises(RuntimeError, match="boom"):
+        executor.run()
+
+
+def test_score_resume_reports_phase_timings(make_mock_scorer, scoring_responses):
+    """score_resume returns the usual shape plus per-phase timings."""
+    scorer = make_mock_scorer(scoring_responses)
+
+    result = scorer.score_resume("Python developer, 2 years of experience", "Python engineer 2021-2024")
+
+    assert result["final_score"]["final_weighted_score"] > 0
+    assert result["job_level"] == "entry"
+    assert result["candidate_experience"]["total_months"] == 36
+    assert {"job_requirement", "section_weights", "candidate_experience",
+            "raw_subfield_scores", "subfield_scores", "final_score"} <= set(result["phase_timings"])
@@ -0,0 +1,61 @@
+import json
+
+import application
+from prescreen import BM25Prescreen, normalize_tokens, prescreen_resumes
+from scoring_tiers import ARCHIVE_BUCKET
+
+JOB_DESCRIPTION = "Backend engineer: Python, Django, PostgreSQL, Kubernetes and AWS. Experience with CI/CD pipelines."
+
+MATCH = "Senior backend developer. Built Django services in Python on Postgres, deployed to k8s on AWS with CI/CD."
+PARTIAL = "Java developer with Spring and Oracle. Some Python scripting."
+CHEF = "Head chef with ten years running a busy kitchen, menu design and staff training."
+
+
+def test_normalize_tokens_maps_synonyms_and_drops_stopwords():
+    tokens = normalize_tokens("Experience with k8s, Postgres and JS frameworks")
+
+    assert tokens == ["kubernetes", "postgresql", "javascript", "framework"]
+
+
+def test_scores_rank_resumes_by_overlap_with_job_terms():
+    match, partial, chef = prescreen_resumes(JOB_DESCRIPTION, [MATCH, PARTIAL, CHEF], cutoff=5)
+
+    assert match["score"] > partial["score"] > chef["score"] == 0
+    assert {"python", "django", "postgresql", "kubernetes"} <= set(match["matched_terms"])
+    assert match["passed"] and partial["passed"]
+    assert not chef["passed"]
+
+
+def test_cutoff_is_applied_to_normalized_score():
+    results = BM25Prescreen(JOB_DESCRIPTION).score_batch([MATCH, PARTIAL], cutoff=30)
+
+    assert [r["passed"] for r in results] == [True, False]
+    assert all(0 <= r["score"] <= 100 for r in results)
+
+
+def test_score_does_not_depend_on_the_rest_of_the_batch():
+    alone, = prescreen_resumes(JOB_DESCRIPTION, [PARTIAL])
+    in_batch = prescreen_resumes(JOB_DESCRIPTION, [MATCH, PARTIAL, CHEF] * 20)[1]
+
+    assert alone == in_batch
+
+
+def test_rejects_are_archived_with_prescreen_audit_and_no_llm_call():
+    resumes = [("match.pdf", MATCH, "h1"), ("chef.pdf", CHEF, "h2")]
+    passed, rejected = application.prescreen_resume_batch(JOB_DESCRIPTION, resumes)
+
+    assert [resume[0] for resume, _ in passed] == ["match.pdf"]
+    (resume, prescreen), = rejected
+    analysis = json.loads(application.build_prescreen_analysis(prescreen, resume[0]))
+
+    assert analysis["bucket"] == ARCHIVE_BUCKET
+    assert analysis["scoring_tier"] == "prescreen"
+    assert analysis["prescreen"]["score"] == 0
+    assert analysis["fit_score"] == 0
+
+
+def test_prescreen_is_attached_to_full_analysis():
+    analysis = application.attach_prescreen(json.dumps({"fit_score": 88}), {"score": 61.5, "passed": True})
+
+    assert json.loads(analysis)["prescreen"] == {"score": 61.5, "passed": True}
+    assert application.attach_prescreen("not json", {"score": 1}) == "not json"
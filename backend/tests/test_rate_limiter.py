@@ -0,0 +1,82 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+
+from duplicate_copy_resume_scorer import ResumeScorer
+from rate_limiter import RateLimiter, RateLimitTimeout, estimate_tokens
+
+
+def test_acquire_queues_for_token_capacity():
+    """When the token bucket is drained, callers wait for the refill instead of failing."""
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=600)  # 10 tokens per second
+
+    assert limiter.try_acquire("gpt-4o-mini", 600)
+    assert not limiter.try_acquire("gpt-4o-mini", 100)
+
+    waited = limiter.acquire("gpt-4o-mini", 5)
+
+    assert 0.3 < waited < 2
+    assert limiter.stats()["queued"] == 1
+
+
+def test_acquire_times_out():
+    limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=1000)
+    limiter.acquire("gpt-4", 10)
+
+    with pytest.raises(RateLimitTimeout):
+        limiter.acquire("gpt-4", 10, timeout=0.1)
+
+
+def test_models_have_separate_buckets():
+    limiter = RateLimiter(requests_per_minute=1, tokens_per_minute=1000)
+
+    assert limiter.try_acquire("gpt-4", 10)
+    assert limiter.try_acquire("gpt-4o-mini", 10)
+    assert not limiter.try_acquire("gpt-4", 10)
+
+
+def test_headers_adjust_limits_and_retry_after_blocks():
+    limiter = RateLimiter(requests_per_minute=500, tokens_per_minute=200000)
+    limiter.update_from_headers("gpt-4", {
+        "x-ratelimit-limit-requests": "100",
+        "x-ratelimit-limit-tokens": "10000",
+        "x-ratelimit-remaining-requests": "99",
+        "x-ratelimit-remaining-tokens": "50",
+    })
+
+    model = limiter.stats()["models"]["gpt-4"]
+    assert model["requests_per_minute"] == 100
+    assert model["tokens_per_minute"] == 10000
+    assert model["tokens_available"] < 60
+    assert not limiter.try_acquire("gpt-4", 1000)
+
+    limiter.update_from_headers("gpt-4o", {"retry-after": "30"}, status_code=429)
+    assert not limiter.try_acquire("gpt-4o", 1)
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_usage_reconciles_estimate():
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=1000)
+    limiter.acquire("gpt-4", 100)
+    response = MagicMock()
+    response.usage.total_tokens = 700
+
+    limiter.record_usage("gpt-4", 100, response)
+
+    assert limiter.stats()["models"]["gpt-4"]["tokens_available"] < 310
+
+
+def test_resume_scorer_calls_go_through_limiter():
+    limiter = RateLimiter()
+    scorer = ResumeScorer(api_key="test-key", use_persistent_cache=False, rate_limiter=limiter)
+    response = MagicMock()
+    response.choices[0].message.content = json.dumps({"years_required": 3, "job_level": "mid"})
+    scorer.client = MagicMock()
+    scorer.client.chat.completions.create.return_value = response
+
+    scorer._extract_job_experience_requirement("Software Engineer")
+
+    assert limiter.stats()["acquired"] == 1
+    assert "gpt-4o-mini" in limiter.stats()["models"]
+    assert estimate_tokens([{"role": "user", "content": "x" * 400}], 100) == 204
@@ -0,0 +1,134 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import application
+from job_profile import description_hash, diff_job_profiles
+from upload_spool import UploadSpool
+from work_queue import KIND_RESCORE, STATUS_DONE, STATUS_PENDING, WorkQueueWorker
+
+OLD_DESCRIPTION = "Python developer, 2 years of experience"
+NEW_DESCRIPTION = "Python developer with Django, 2 years of experience"
+
+ARTIFACTS = {
+    "candidate_experience": {"total_months": 36, "total_years": 3.0, "calculation_details": "36 months", "method": "llm"},
+    "cross_section_content": {
+        "leadership": {"found_keywords": ["led"], "evidence": ["led a team"], "count": 1},
+        "research": {"found_keywords": [], "evidence": [], "count": 0},
+        "publications": {"found_keywords": [], "evidence": [], "count": 0},
+        "awards": {"found_keywords": [], "evidence": [], "count": 0},
+    },
+}
+
+
+def make_profile(description, weights):
+    return {
+        "description_hash": description_hash(description),
+        "job_requirement": {"years_required": 2, "job_level": "entry", "extraction_details": "2 years"},
+        "job_level": "entry",
+        "section_weights": weights,
+    }
+
+
+def test_diff_job_profiles():
+    old = make_profile(OLD_DESCRIPTION, {"skills": 1.0})
+    new = make_profile(NEW_DESCRIPTION, {"skills": 1.0})
+
+    assert diff_job_profiles(old, new) == {"description": True, "job_requirement": False, "section_weights": False}
+    assert diff_job_profiles(None, new)["section_weights"]
+
+
+def test_score_resume_reuses_resume_artifacts(make_mock_scorer, scoring_responses):
+    scorer = make_mock_scorer({"score each resume section": scoring_responses["score each resume section"]})
+    prompts = scorer.client.prompts
+    scorer._extract_cross_section_content = MagicMock()
+    profile = make_profile(NEW_DESCRIPTION, {"skills": 1.0})
+
+    result = scorer.score_resume(NEW_DESCRIPTION, "Python engineer 2021-2024", job_profile=profile,
+                                 resume_artifacts=ARTIFACTS)
+
+    assert len(prompts) == 1  # only the job-dependent subfield scoring call
+    assert "TOTAL YEARS" not in prompts[0]
+    scorer._extract_cross_section_content.assert_not_called()
+    assert result["candidate_experience"] == ARTIFACTS["candidate_experience"]
+    assert set(result["skipped_phases"]) == {"job_requirement", "section_weights", "candidate_experience",
+                                             "cross_section_content"}
+
+    # A subfield cache hit still carries the supplied artifacts through, so they are stored again
+    cached = scorer.score_resume(NEW_DESCRIPTION, "Python engineer 2021-2024", job_profile=profile,
+                                 resume_artifacts=ARTIFACTS)
+    assert len(prompts) == 1 and "subfield_scores" in cached["skipped_phases"]
+    assert cached["candidate_experience"] == ARTIFACTS["candidate_experience"]
+
+
+@pytest.fixture
+def stored_job():
+    with application.app.app_context():
+        application.db.create_all()
+        user = application.User.query.filter_by(username="rescore_test_user").first()
+        if user is None:
+            user = application.User(username="rescore_test_user")
+            application.db.session.add(user)
+            application.db.session.commit()
+        job = application.Job(description=OLD_DESCRIPTION, user_id=user.id)
+        application.db.session.add(job)
+        application.db.session.commit()
+        analysis = {"fit_score": 60, "advanced_analysis": {**ARTIFACTS, "subfield_scores": {}}}
+        application.db.session.add(application.Resume(
+            filename="jane.pdf", content="Python engineer 2021-2024", content_hash="rescore-jane",
+            analysis=json.dumps(analysis), job_id=job.id))
+        application.db.session.add(application.JobProfile(
+            job_id=job.id, description_hash=description_hash(OLD_DESCRIPTION),
+            profile=json.dumps(make_profile(OLD_DESCRIPTION, {"skills": 1.0}))))
+        application.db.session.commit()
+        job_id = job.id
+    yield job_id
+    with application.app.app_context():
+        application.app.test_client().delete(f"/api/jobs/{job_id}")
+        application.db.session.delete(application.User.query.filter_by(username="rescore_test_user").first())
+        application.db.session.commit()
+
+
+def test_rescore_job_queues_resumes_and_workers_pass_stored_artifacts(tmp_path, stored_job):
+    new_profile = make_profile(NEW_DESCRIPTION, {"skills": 0.6, "experience": 0.4})
+    rescored = {"fit_score": 75, "advanced_analysis": {"subfield_scores": {"skills": {"alignment": 2}},
+                                                      "skipped_phases": ["candidate_experience", "cross_section_content"]}}
+
+    with patch.object(application, "load_job_profile", return_value=new_profile), \
+            patch.object(application, "check_system_resources", return_value=(True, "ok")), \
+            patch.object(application, "analyze_resume_with_advanced_ai", return_value=json.dumps(rescored)) as analyze:
+        response = application.app.test_client().post(
+            f"/api/jobs/{stored_job}/rescore", json={"description": NEW_DESCRIPTION})
+        data = response.get_json()
+        assert response.status_code == 200
+        assert data["changes"] == {"description": True, "job_requirement": False, "section_weights": True}
+        assert data["queued"] == 1
+        analyze.assert_not_called()  # the request only queues the work
+        with application.app.app_context():
+            item = application.WorkItem.query.filter_by(job_id=stored_job).one()
+            assert (item.kind, item.status, item.upload_digest) == (KIND_RESCORE, STATUS_PENDING, None)
+
+        worker = WorkQueueWorker(application.app, application.db, application.WorkItem, application.process_work_items,
+                                 UploadSpool(str(tmp_path)), threads=1, batch_size=10)
+        assert worker.run_once() == 1
+
+    assert analyze.call_args.args[4] == ARTIFACTS
+    with application.app.app_context():
+        assert application.db.session.get(application.Job, stored_job).description == NEW_DESCRIPTION
+        resume = application.Resume.query.filter_by(job_id=stored_job).one()
+        assert json.loads(resume.analysis)["fit_score"] == 75
+        item = application.WorkItem.query.filter_by(job_id=stored_job).one()
+        assert item.status == STATUS_DONE
+        assert item.result == "Rescored: fit score 75, skipped phases: candidate_experience, cross_section_content"
+
+
+def test_rescore_with_unchanged_description_does_nothing(stored_job):
+    with patch.object(application, "analyze_resume_with_advanced_ai") as analyze:
+        response = application.app.test_client().post(
+            f"/api/jobs/{stored_job}/rescore", json={"description": OLD_DESCRIPTION})
+
+    assert response.get_json()["queued"] == 0
+    with application.app.app_context():
+        assert application.WorkItem.query.filter_by(job_id=stored_job).count() == 0
+    analyze.assert_not_called()
@@ -0,0 +1,135 @@
+import json
+import random
+from array import array
+
+import pytest
+
+from backend.app import app as flask_app, db, Job, Resume, ResumeScoreVector, User
+from duplicate_copy_resume_scorer import ResumeScorer
+from score_matrix import (SECTION_SUBFIELDS, apply_reweight, final_scores, pack_subfield_scores,
+                          unpack_subfield_scores)
+
+
+def random_subfield_scores(rng):
+    return {section: {subfield: rng.choice([0, 1, 2, 1.5]) for subfield in subfields}
+            for section, subfields in SECTION_SUBFIELDS.items() if rng.random() < 0.8}
+
+
+def random_weights(rng):
+    weights = {section: rng.random() for section in SECTION_SUBFIELDS}
+    total = sum(weights.values())
+    return {section: weight / total for section, weight in weights.items()}
+
+
+@pytest.fixture
+def client():
+    flask_app.config.update({
+        "TESTING": True,
+        "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:",
+    })
+    with flask_app.app_context():
+        db.create_all()
+        yield flask_app.test_client()
+        db.drop_all()
+
+
+def test_pack_round_trip():
+    scores = {"experience": {"relevancy": 2, "recency": 1.5, "comment": "text"}, "skills": {"alignment": 1}}
+
+    unpacked = unpack_subfield_scores(pack_subfield_scores(scores))
+
+    assert unpacked["experience"]["relevancy"] == 2
+    assert unpacked["experience"]["recency"] == 1.5
+    assert unpacked["experience"]["depth"] == 0
+    assert unpacked["skills"]["alignment"] == 1
+
+
+def test_matrix_scores_match_compute_final_score():
+    scorer = ResumeScorer(api_key="test-key", use_persistent_cache=False)
+    rng = random.Random(3)
+    rows = [random_subfield_scores(rng) for _ in range(50)]
+    weights = random_weights(rng)
+
+    matrix = array('b', b''.join(pack_subfield_scores(row) for row in rows))
+    expected = [scorer.compute_final_score(weights, row)["final_weighted_score"] for row in rows]
+
+    assert final_scores(matrix, weights) == pytest.approx(expected, abs=0.011)
+
+
+def test_bool_scores_count_as_zero_in_both_paths():
+    scorer = ResumeScorer(api_key="test-key", use_persistent_cache=False)
+    row = {"skills": {"alignment": True, "coverage": 2, "proficiency": False}}
+    weights = {"skills": 1.0}
+
+    expected = scorer.compute_final_score(weights, row)["final_weighted_score"]
+
+    assert expected == pytest.approx(100 * 2 / 3 / 2, abs=0.011)
+    assert final_scores(array('b', pack_subfield_scores(row)), weights) == pytest.approx([expected], abs=0.011)
+
+
+def add_job_with_resumes(rows):
+    user = User.query.filter_by(username="default_user").first()
+    if user is None:
+        user = User(username="default_user")
+        db.session.add(user)
+        db.session.commit()
+    job = Job(description="Data scientist", user_id=user.id)
+    db.session.add(job)
+    db.session.commit()
+    for index, subfield_scores in enumerate(rows):
+        analysis = {"fit_score": 50, "bucket": "old", "advanced_analysis": {"subfield_scores": subfield_scores}}
+        db.session.add(Resume(filename=f"r{index}.pdf", content=f"resume {index}", content_hash=str(index),
+                              analysis=json.dumps(analysis), job_id=job.id))
+    # A pre-screened resume has no subfield scores and is left alone
+    db.session.add(Resume(filename="prescreened.pdf", content="chef", content_hash="p",
+                          analysis=json.dumps({"fit_score": 3, "scoring_tier": "prescreen"}), job_id=job.id))
+    db.session.commit()
+    return job
+
+
+def test_reweight_endpoint_rescores_and_saves(client):
+    strong = {section: {subfield: 2 for subfield in subfields} for section, subfields in SECTION_SUBFIELDS.items()}
+    weak = {"skills": {"alignment": 2, "coverage": 2, "proficiency": 2}}
+    job = add_job_with_resumes([strong, weak])
+
+    response = client.post(f"/api/jobs/{job.id}/reweight", json={"section_weights": {"experience": 0.5, "skills": 0.5}})
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["backfilled"] == 2
+    assert [r["final_weighted_score"] for r in data["resumes"]] == [100.0, 50.0]
+    assert data["resumes"][0]["bucket"] == '🚀 Green-Room Rocket'
+    assert ResumeScoreVector.query.count() == 2
+    assert json.loads(db.session.get(Resume, data["resumes"][1]["resume_id"]).analysis)["fit_score"] == 50
+
+    response = client.post(f"/api/jobs/{job.id}/reweight", json={"section_weights": {"skills": 1.0}, "save": True})
+    data = response.get_json()
+
+    assert data["backfilled"] == 0
+    assert [r["fit_score"] for r in data["resumes"]] == [100, 100]
+    saved = json.loads(db.session.get(Resume, data["resumes"][1]["resume_id"]).analysis)
+    assert saved["fit_score"] == 100
+    assert saved["advanced_analysis"]["section_weights"] == {"skills": 1.0}
+
+
+def test_reweight_rejects_unknown_sections(client):
+    job = add_job_with_resumes([])
+
+    response = client.post(f"/api/jobs/{job.id}/reweight", json={"section_weights": {"hobbies": 1}})
+
+    assert response.status_code == 400
+
+
+def test_apply_reweight_skips_missing_and_corrupt_analyses(client):
+    job = add_job_with_resumes([{"skills": {"alignment": 2}}] * 3)
+    first, null, corrupt = Resume.query.filter_by(job_id=job.id).order_by(Resume.id).limit(3)
+    null.analysis = None
+    corrupt.analysis = "{not json"
+    results = [{"resume_id": resume.id, "final_weighted_score": 40.0, "fit_score": 40, "bucket": "new"}
+               for resume in (first, null, corrupt)]
+
+    apply_reweight(db.session, Resume, results, {"skills": 1.0})
+
+    assert json.loads(first.analysis)["fit_score"] == 40
+    assert null.analysis is None and corrupt.analysis == "{not json"
+    db.session.rollback()
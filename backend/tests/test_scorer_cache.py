@@ -0,0 +1,49 @@
+import threading
+
+from scorer_cache import ScorerCache
+
+
+class FakeScorer:
+    pass
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ScorerCache(max_size=2, factory=FakeScorer)
+
+    first = cache.get("job a")
+    cache.get("job b")
+    assert cache.get("job a") is first  # a is now most recently used
+    cache.get("job c")                  # evicts b
+
+    assert cache.get("job a") is first
+    assert cache.stats() == {'size': 2, 'max_size': 2, 'hits': 2, 'misses': 3, 'evictions': 1, 'hit_rate': 0.4}
+    cache.get("job b")
+    assert cache.stats()["evictions"] == 2
+
+
+def test_concurrent_lookups_create_one_scorer_per_job():
+    cache = ScorerCache(max_size=8, factory=FakeScorer)
+    results = []
+
+    def lookup():
+        results.append(cache.get("same job"))
+
+    threads = [threading.Thread(target=lookup) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len({id(scorer) for scorer in results}) == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_scorers_share_one_openai_client(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    cache = ScorerCache(max_size=4)
+
+    first = cache.get("job a")
+    second = cache.get("job b")
+
+    assert first is not second
+    assert first.client is second.client is cache.shared_client()
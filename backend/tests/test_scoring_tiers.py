@@ -0,0 +1,87 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import application
+from scoring_tiers import assign_bucket, needs_full_analysis
+
+
+def test_assign_bucket_thresholds():
+    assert assign_bucket(95) == '🚀 Green-Room Rocket'
+    assert assign_bucket(90) == '⚡ Book-the-Call'
+    assert assign_bucket(80) == '⚡ Book-the-Call'
+    assert assign_bucket(79) == '🛠️ Bench Prospect'
+    assert assign_bucket(64) == '🗄️ Swipe-Left Archive'
+
+
+def test_only_top_tiers_and_borderline_scores_need_full_analysis():
+    assert needs_full_analysis(85)       # Book-the-Call
+    assert needs_full_analysis(77)       # near the 80 boundary
+    assert needs_full_analysis(62)       # near the 65 boundary
+    assert not needs_full_analysis(71)   # clearly Bench Prospect
+    assert not needs_full_analysis(30)   # clearly archived
+
+
+def make_scorer(triage_score):
+    scorer = MagicMock()
+    scorer.triage_resume.return_value = {"fit_score": triage_score, "reasoning": "No relevant skills", "processing_time": 0.1}
+    return scorer
+
+
+def test_clear_reject_is_stored_from_triage_tier():
+    scorer = make_scorer(20)
+    with patch("scoring_tiers.CASCADE_SCORING", True), \
+            patch.object(application, "get_scorer_for_job", return_value=scorer), \
+            patch.object(application, "analyze_resume_with_ai") as legacy_summary:
+        analysis = json.loads(application.analyze_resume_with_advanced_ai("Job", "Resume", "reject.pdf"))
+
+    scorer.score_resume.assert_not_called()
+    legacy_summary.assert_not_called()
+    assert analysis["scoring_tier"] == "triage"
+    assert analysis["fit_score"] == 20
+    assert analysis["bucket"] == '🗄️ Swipe-Left Archive'
+    assert {"candidate_name", "summary_points", "skill_matrix", "timeline", "logistics"} <= set(analysis)
+
+
+def test_borderline_candidate_gets_full_analysis():
+    scorer = make_scorer(78)
+    scorer.score_resume.return_value = {"final_score": {"final_weighted_score": 82.0}}
+    summary = json.dumps({"candidate_name": "Jane", "fit_score": 70})
+    with patch("scoring_tiers.CASCADE_SCORING", True), \
+            patch.object(application, "get_scorer_for_job", return_value=scorer), \
+            patch.object(application, "analyze_resume_with_ai", return_value=summary):
+        analysis = json.loads(application.analyze_resume_with_advanced_ai("Job", "Resume", "jane.pdf"))
+
+    assert analysis["scoring_tier"] == "full"
+    assert analysis["triage"]["fit_score"] == 78
+    assert analysis["fit_score"] == 82
+
+
+def test_batch_api_path_skips_candidates_settled_by_triage():
+    scorer = MagicMock()
+    scorer.triage_resume.side_effect = lambda job, text: {"fit_score": 20 if text == "Chef" else 85,
+                                                          "reasoning": "triaged", "processing_time": 0.1}
+    summary = json.dumps({"candidate_name": "Jane", "fit_score": 70})
+    batch_result = {"filename": "jane.pdf", "summary": summary, "error": None,
+                    "advanced_result": {"final_score": {"final_weighted_score": 88.0}}}
+    with patch("scoring_tiers.CASCADE_SCORING", True), \
+            patch.object(application, "get_scorer_for_job", return_value=scorer), \
+            patch("batch_scoring.BatchScoringJob") as batch_job:
+        batch_job.return_value.run.return_value = [batch_result]
+        analyses = application.analyze_resumes_with_batch_api("Job", [("chef.pdf", "Chef"), ("jane.pdf", "Jane")])
+
+    assert batch_job.call_args.args[1] == [("jane.pdf", "Jane")]
+    chef, jane = (json.loads(analysis) for analysis in analyses)
+    assert chef["scoring_tier"] == "triage" and chef["fit_score"] == 20
+    assert jane["scoring_tier"] == "full" and jane["triage"]["fit_score"] == 85
+
+
+def test_full_tier_bucket_follows_configured_thresholds():
+    summary = json.dumps({"candidate_name": "Jane", "fit_score": 95, "bucket": '🚀 Green-Room Rocket'})
+    advanced = {"final_score": {"final_weighted_score": 72.0}}
+    thresholds = [(95.0, '🚀 Green-Room Rocket'), (85.0, '⚡ Book-the-Call'), (70.0, '🛠️ Bench Prospect')]
+
+    with patch("scoring_tiers.BUCKET_THRESHOLDS", thresholds):
+        analysis = json.loads(application.build_advanced_analysis(advanced, summary, {}))
+
+    assert analysis["fit_score"] == 72
+    assert analysis["bucket"] == '🛠️ Bench Prospect'
@@ -0,0 +1,87 @@
+import hashlib
+from unittest.mock import patch
+
+import pytest
+
+from backend.app import app as flask_app, db, Job, Resume, ResumeSectionIndex, User
+from duplicate_copy_resume_scorer import ResumeScorer
+from section_index import build_section_index, load_section_index, prompt_text, section_index_for, store_section_index
+
+RESUME = (
+    "Jane Doe\njane@example.com\n\n"
+    "Professional Summary\nBackend engineer.\n\n"
+    "WORK EXPERIENCE\nAcme Corp, Engineer, Jan 2020 - Present\n\n"
+    "Education & Training\nBSc Computer Science\n\n"
+    "Hobbies\nChess\n\n"
+    "References\nAvailable on request\n"
+)
+NO_CROSS_SECTION = {key: {"count": 0, "found_keywords": []} for key in ("leadership", "research", "publications", "awards")}
+
+
+def test_sections_and_offsets():
+    index = build_section_index(RESUME)
+
+    assert [entry["section"] for entry in index["sections"]] == [
+        "header", "summary", "experience", "education", "interests", "references"]
+    experience = index["sections"][2]
+    assert RESUME[experience["heading_start"]:experience["start"]] == "WORK EXPERIENCE\n"
+    assert RESUME[experience["start"]:experience["end"]] == "Acme Corp, Engineer, Jan 2020 - Present\n\n"
+    assert index["sections"][-1]["end"] == len(RESUME) == index["length"]
+
+
+def test_prompt_text_selects_sections_and_falls_back_to_full_text():
+    assert prompt_text(RESUME, include=("experience",)) == "WORK EXPERIENCE\nAcme Corp, Engineer, Jan 2020 - Present\n\n"
+    assert "Available on request" not in prompt_text(RESUME, exclude=("interests", "references"))
+    assert prompt_text(RESUME, include=("projects",)) == RESUME
+    assert prompt_text("Jane Doe, engineer since 2020", include=("experience",)) == "Jane Doe, engineer since 2020"
+    with patch("section_index.SECTION_INDEX_ENABLED", False):
+        assert prompt_text(RESUME, include=("experience",)) == RESUME
+
+
+def test_scorer_prompts_send_only_relevant_sections():
+    scorer = ResumeScorer(api_key="test-key", use_persistent_cache=False)
+
+    experience_prompt = scorer._build_candidate_experience_request(RESUME)["messages"][0]["content"]
+    subfield_prompt = scorer._build_subfield_request("Engineer", RESUME, NO_CROSS_SECTION)["messages"][-1]["content"]
+
+    assert "Acme Corp" in experience_prompt and "BSc" not in experience_prompt and "Jane Doe" not in experience_prompt
+    assert "Acme Corp" in subfield_prompt and "BSc" in subfield_prompt
+    assert "Chess" not in subfield_prompt and "Available on request" not in subfield_prompt
+
+
+def test_stored_index_is_reused_until_the_content_changes():
+    flask_app.config.update({"TESTING": True, "SQLALCHEMY_DATABASE_URI": "sqlite:///:memory:"})
+    with flask_app.app_context():
+        db.create_all()
+        try:
+            user = User.query.filter_by(username="default_user").first() or User(username="default_user")
+            db.session.add(user)
+            db.session.commit()
+            job = Job(description="Engineer", user_id=user.id)
+            db.session.add(job)
+            db.session.commit()
+            resume = Resume(filename="jane.txt", content=RESUME, content_hash=hashlib.sha256(RESUME.encode()).hexdigest(),
+                            job_id=job.id)
+            db.session.add(resume)
+            db.session.flush()
+
+            store_section_index(db.session, ResumeSectionIndex, resume)
+            db.session.commit()
+            assert load_section_index(db.session, ResumeSectionIndex, resume) == section_index_for(RESUME)
+
+            resume.content = "Jane Doe\nSkills\nPython\n"
+            resume.content_hash = "changed"
+            assert load_section_index(db.session, ResumeSectionIndex, resume) is None
+            store_section_index(db.session, ResumeSectionIndex, resume)
+            assert [entry["section"] for entry in load_section_index(db.session, ResumeSectionIndex, resume)["sections"]] == [
+                "header", "skills"]
+        finally:
+            db.session.remove()
+            db.drop_all()
+
+
+@pytest.mark.parametrize("heading", ["Experience", "  PROFESSIONAL EXPERIENCE  ", "Work History:"])
+def test_heading_variants(heading):
+    text = f"Jane\n{heading}\nAcme\n"
+
+    assert [entry["section"] for entry in build_section_index(text)["sections"]] == ["header", "experience"]
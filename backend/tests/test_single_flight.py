@@ -0,0 +1,62 @@
+import threading
+import time
+
+import pytest
+
+from single_flight import SingleFlight
+
+
+def run_concurrently(func, count=10):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(i):
+        barrier.wait()
+        results[i] = func()
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_callers_share_one_call():
+    group = SingleFlight()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"value": 42}
+
+    results = run_concurrently(lambda: group.do("key", slow))
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert group.stats() == {'executed': 1, 'collapsed': 9, 'in_flight': 0}
+
+
+def test_error_is_shared_and_key_released():
+    group = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        group.do("key", fail)
+    assert group.do("key", lambda: "ok") == "ok"
+
+
+def test_scorer_threads_collapse_job_level_calls(make_mock_scorer, scoring_responses):
+    group = SingleFlight()
+    scorer = make_mock_scorer(scoring_responses, delay=0.05, single_flight=group)
+    prompts = scorer.client.prompts
+
+    results = run_concurrently(lambda: scorer.assign_section_weights("Software Engineer\nBuild reliable services."))
+
+    assert all(result == results[0] for result in results)
+    assert sum("years of experience required" in p for p in prompts) == 1
+    assert sum("weights to resume sections" in p for p in prompts) == 1
+    assert group.stats()["collapsed"] >= 9
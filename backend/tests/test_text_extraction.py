@@ -0,0 +1,131 @@
+import io
+
+import docx
+import fitz
+import pytest
+
+import text_extraction
+from text_extraction import doc_binary_text, document_format, extract_text, iter_document_text
+
+
+def make_pdf(pages):
+    pdf = fitz.open()
+    for text in pages:
+        pdf.new_page().insert_text((72, 72), text)
+    data = pdf.tobytes()
+    pdf.close()
+    return data
+
+
+def make_docx(paragraphs):
+    document = docx.Document()
+    for text in paragraphs:
+        document.add_paragraph(text)
+    stream = io.BytesIO()
+    document.save(stream)
+    return stream.getvalue()
+
+
+def test_formats_by_extension():
+    assert [document_format(name) for name in ("a.PDF", "b.docx", "c.doc", "d.txt", "e")] == \
+        ["pdf", "docx", "doc", "text", "text"]
+
+
+def test_pdf_stops_reading_pages_at_the_budget():
+    data = make_pdf([f"Page number {i}" for i in range(10)])
+
+    text, stats = extract_text("cv.pdf", data, max_chars=20)
+
+    assert len(text) == 20 and text.startswith("Page number 0")
+    assert stats["pages"] == 2 and stats["pages_total"] == 10
+    assert stats["budget_reached"] and stats["bytes"] == len(data) and stats["chars"] == 20
+
+
+def test_pdf_from_path_and_stream_match_bytes(tmp_path):
+    data = make_pdf(["Jane Doe", "Python developer"])
+    path = tmp_path / "cv.pdf"
+    path.write_bytes(data)
+
+    from_bytes, stats = extract_text("cv.pdf", data)
+
+    assert extract_text("cv.pdf", str(path))[0] == from_bytes
+    assert extract_text("cv.pdf", io.BytesIO(data))[0] == from_bytes
+    assert "Python developer" in from_bytes and not stats["budget_reached"]
+
+
+def test_docx_yields_paragraphs():
+    data = make_docx(["John Roe", "Data analyst", "Go"])
+
+    assert list(iter_document_text("cv.docx", data)) == ["John Roe\n", "Data analyst\n", "Go\n"]
+    text, stats = extract_text("cv.docx", data, max_chars=12)
+    assert text == "John Roe\nDat" and stats["paragraphs"] == 2
+
+
+def test_plain_text_decodes_across_block_boundaries(monkeypatch):
+    monkeypatch.setattr(text_extraction, "_TEXT_BLOCK_BYTES", 3)
+    data = "Zoë – Python".encode("utf-8")
+
+    text, stats = extract_text("cv.txt", io.BytesIO(data), max_chars=None)
+
+    assert text == "Zoë – Python" and stats["bytes"] == len(data)
+
+
+def test_plain_text_reads_only_blocks_needed_for_the_budget(monkeypatch):
+    monkeypatch.setattr(text_extraction, "_TEXT_BLOCK_BYTES", 4)
+
+    text, stats = extract_text("cv.txt", b"abcdefghijklmnop", max_chars=6)
+
+    assert text == "abcdef" and stats["bytes"] == 8
+
+
+def test_invalid_utf8_raises():
+    with pytest.raises(UnicodeDecodeError):
+        extract_text("cv.txt", b"\xff\xfe resume")
+
+
+def test_doc_binary_fallback_finds_text_runs():
+    data = b"\x00\x01Jane Doe Senior Engineer\x00\x02\x03short\x00"
+
+    assert "Jane Doe Senior Engineer" in doc_binary_text(data)
+    assert "short" not in doc_binary_text(data)
+    assert doc_binary_text(b"\x00\x01") == ""
+    assert extract_text("cv.doc", data)[0] == doc_binary_text(data)
+
+
+def use_page_pool(monkeypatch, min_pages=6):
+    monkeypatch.setattr(text_extraction, "PDF_PARALLEL_MIN_PAGES", min_pages)
+    monkeypatch.setattr(text_extraction, "PDF_PARALLEL_WORKERS", 2)
+    monkeypatch.setattr(text_extraction, "PDF_PAGES_PER_TASK", 3)
+
+
+def test_large_pdf_pages_are_extracted_in_parallel_in_order(monkeypatch, tmp_path):
+    data = make_pdf([f"Page number {i}" for i in range(20)])
+    path = tmp_path / "portfolio.pdf"
+    path.write_bytes(data)
+    serial_text, serial_stats = extract_text("portfolio.pdf", data, max_chars=None)
+    use_page_pool(monkeypatch)
+
+    from_path, stats = extract_text("portfolio.pdf", str(path), max_chars=None)
+    from_bytes, _ = extract_text("portfolio.pdf", data, max_chars=None)
+
+    assert not serial_stats["parallel"] and stats["parallel"]
+    assert from_path == from_bytes == serial_text
+    assert stats["pages"] == stats["pages_total"] == 20
+
+
+def test_parallel_pdf_extraction_respects_the_budget(monkeypatch):
+    data = make_pdf([f"Page number {i}" for i in range(40)])
+    use_page_pool(monkeypatch)
+
+    text, stats = extract_text("portfolio.pdf", data, max_chars=60)
+
+    assert text == extract_text("portfolio.pdf", data, max_chars=None)[0][:60]
+    assert stats["budget_reached"] and stats["pages"] < 40
+
+
+def test_small_pdfs_stay_serial(monkeypatch):
+    use_page_pool(monkeypatch, min_pages=6)
+
+    _, stats = extract_text("cv.pdf", make_pdf(["Jane Doe"] * 5))
+
+    assert not stats["parallel"]
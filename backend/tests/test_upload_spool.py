@@ -0,0 +1,86 @@
+import io
+import os
+from unittest.mock import patch
+
+import fitz
+
+import application
+from upload_spool import UploadSpool
+
+
+def make_pdf(text):
+    pdf = fitz.open()
+    pdf.new_page().insert_text((72, 72), text)
+    data = pdf.tobytes()
+    pdf.close()
+    return data
+
+
+def test_identical_uploads_are_stored_once_and_deleted_after_last_release(tmp_path):
+    spool = UploadSpool(str(tmp_path))
+
+    first = spool.store(io.BytesIO(b"same resume"))
+    second = spool.store(io.BytesIO(b"same resume"))
+
+    assert first.path == second.path and os.path.exists(first.path)
+    assert spool.stats()["deduplicated"] == 1
+    with open(first.path, "rb") as f:
+        assert f.read() == b"same resume"
+
+    first.release()
+    assert os.path.exists(second.path)
+    second.release()
+    assert not os.path.exists(second.path)
+    assert spool.stats()["references"] == 0
+
+
+def test_background_processing_reads_from_the_spool_and_releases(tmp_path):
+    spool = UploadSpool(str(tmp_path))
+    file_data = [
+        {"filename": "jane.pdf", "upload": spool.store(io.BytesIO(make_pdf("Jane Doe Python"))), "job_id": 1},
+        {"filename": "john.txt", "upload": spool.store(io.BytesIO("John Roe – Go".encode())), "job_id": 1},
+    ]
+    saved = {}
+
+    def save(filename, content, content_hash, analysis_text, job_id, processed_files, skipped_files):
+        saved[filename] = content
+
+    with patch("async_scoring_engine.SCORING_ENGINE", "threads"), \
+            patch("prescreen.PRESCREEN_ENABLED", False), \
+            patch.object(application, "analyze_resume_with_advanced_ai", return_value="{}"), \
+            patch.object(application, "save_resume_analysis", side_effect=save):
+        application.process_resumes_background(file_data, "Job", 10**9)
+
+    assert "Jane Doe Python" in saved["jane.pdf"]
+    assert saved["john.txt"] == "John Roe – Go"
+    assert spool.stats()["references"] == 0
+    assert not any(os.path.exists(info["upload"].path) for info in file_data)
+
+
+def test_handed_off_duplicate_survives_a_concurrent_discard(tmp_path):
+    spool = UploadSpool(str(tmp_path))
+    older = spool.store(io.BytesIO(b"same resume"))
+    older.hand_off()
+
+    # A request stores the same bytes again but has not committed its work item yet...
+    newer = spool.store(io.BytesIO(b"same resume"))
+    spool._refs.clear()  # ...and lives in another process
+    # ...while a worker there finishes the older item and discards the file
+    spool.discard(older.digest, still_needed=lambda: False)
+    assert not os.path.exists(newer.path)
+
+    newer.hand_off()
+    with open(newer.path, "rb") as f:
+        assert f.read() == b"same resume"
+    assert sorted(os.listdir(os.path.dirname(newer.path))) == [newer.digest]
+
+
+def test_discard_puts_back_a_file_that_became_needed(tmp_path):
+    spool = UploadSpool(str(tmp_path))
+    upload = spool.store(io.BytesIO(b"resume"))
+    upload.hand_off()
+
+    spool.discard(upload.digest, still_needed=lambda: True)
+    assert os.path.exists(upload.path)
+    spool.discard(upload.digest)
+    assert not os.path.exists(upload.path)
@@ -0,0 +1,266 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import zipfile
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import application
+from batch_scoring import BatchPending
+from upload_spool import UploadSpool
+from work_queue import (KIND_ARCHIVE, KIND_RESUME, STATUS_DONE, STATUS_FAILED, STATUS_PENDING,
+                        WorkQueueWorker, claim_work_items, enqueue_work_item, queue_stats, retry_work_item)
+
+WorkItem = application.WorkItem
+
+
+@pytest.fixture
+def job_id():
+    with application.app.app_context():
+        application.db.create_all()
+        user = application.User.query.filter_by(username="work_queue_test_user").first()
+        if user is None:
+            user = application.User(username="work_queue_test_user")
+            application.db.session.add(user)
+            application.db.session.commit()
+        job = application.Job(description="Python developer", user_id=user.id)
+        application.db.session.add(job)
+        application.db.session.commit()
+        job_id = job.id
+    yield job_id
+    with application.app.app_context():
+        application.app.test_client().delete(f"/api/jobs/{job_id}")
+        application.db.session.delete(application.User.query.filter_by(username="work_queue_test_user").first())
+        application.db.session.commit()
+
+
+def queue_files(spool, job_id, files, kind=KIND_RESUME):
+    with application.app.app_context():
+        for filename, data in files:
+            upload = spool.store(io.BytesIO(data))
+            enqueue_work_item(application.db.session, WorkItem, job_id, kind, filename, upload)
+            application.db.session.commit()
+            upload.hand_off()
+
+
+def item_statuses(job_id):
+    with application.app.app_context():
+        return {item.filename: item.status for item in WorkItem.query.filter_by(job_id=job_id)}
+
+
+def spooled_files(root):
+    return [name for _, _, names in os.walk(root) for name in names]
+
+
+def make_worker(spool, handler=application.process_work_items):
+    return WorkQueueWorker(application.app, application.db, WorkItem, handler, spool, threads=1, batch_size=10)
+
+
+@pytest.fixture
+def scoring():
+    def analyze(job_description, content, filename, job_profile=None, resume_artifacts=None):
+        return json.dumps({"candidate_name": content.split()[0], "fit_score": 70, "bucket": "Strong"})
+
+    with patch.object(application, "check_system_resources", return_value=(True, "ok")), \
+            patch.object(application, "load_job_profile", return_value=None), \
+            patch("async_scoring_engine.SCORING_ENGINE", "threads"), \
+            patch("prescreen.PRESCREEN_ENABLED", False), \
+            patch.object(application, "analyze_resume_with_advanced_ai", side_effect=analyze) as analyze_mock:
+        yield analyze_mock
+
+
+def test_claims_are_leased_and_expired_leases_are_reclaimed(tmp_path, job_id):
+    spool = UploadSpool(str(tmp_path))
+    queue_files(spool, job_id, [("a.txt", b"Jane"), ("b.txt", b"John")])
+
+    with application.app.app_context():
+        session = application.db.session
+        first = claim_work_items(session, WorkItem, limit=10)
+        assert [item["filename"] for item in first] == ["a.txt", "b.txt"]
+        assert claim_work_items(session, WorkItem, limit=10) == []
+
+        # The worker holding the lease died: once the lease expires the items are claimed again
+        WorkItem.query.filter_by(job_id=job_id).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        session.commit()
+        second = claim_work_items(session, WorkItem, limit=10, max_attempts=3)
+        assert [item["attempts"] for item in second] == [2, 2] and second[0]["lease"] != first[0]["lease"]
+
+        WorkItem.query.filter_by(job_id=job_id).update({"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)})
+        session.commit()
+        assert claim_work_items(session, WorkItem, limit=10, max_attempts=2) == []
+        assert queue_stats(session, WorkItem, job_id)[STATUS_FAILED] == 2
+
+
+def test_retry_backs_off_and_gives_up_after_max_attempts(tmp_path, job_id):
+    spool = UploadSpool(str(tmp_path))
+    queue_files(spool, job_id, [("a.txt", b"Jane")])
+
+    with application.app.app_context():
+        session = application.db.session
+        item = claim_work_items(session, WorkItem)[0]
+        assert retry_work_item(session, WorkItem, item, "boom", max_attempts=2) == STATUS_PENDING
+        assert claim_work_items(session, WorkItem) == []  # not available until the backoff has passed
+
+        WorkItem.query.filter_by(job_id=job_id).update({"available_at": datetime.utcnow()})
+        session.commit()
+        item = claim_work_items(session, WorkItem)[0]
+        assert retry_work_item(session, WorkItem, item, "deferred", count_attempt=False, max_attempts=2,
+                               retry_seconds=0) == STATUS_PENDING
+        item = claim_work_items(session, WorkItem)[0]
+        assert item["attempts"] == 2
+        assert retry_work_item(session, WorkItem, item, "boom again", max_attempts=2) == STATUS_FAILED
+        assert WorkItem.query.filter_by(job_id=job_id).one().result == "boom again"
+
+
+def test_worker_analyzes_items_and_discards_their_files(tmp_path, job_id, scoring):
+    spool = UploadSpool(str(tmp_path))
+    queue_files(spool, job_id, [("jane.txt", b"Jane Python"), ("john.txt", b"John Go"), ("empty.txt", b"")])
+
+    with patch("upload_spool.get_upload_spool", return_value=spool):
+        assert make_worker(spool).run_once() == 3
+        assert make_worker(spool).run_once() == 0
+
+    assert item_statuses(job_id) == {"jane.txt": STATUS_DONE, "john.txt": STATUS_DONE, "empty.txt": STATUS_DONE}
+    with application.app.app_context():
+        assert sorted(resume.candidate_name for resume in application.Resume.query.filter_by(job_id=job_id)) == [
+            "Jane", "John"]
+        assert WorkItem.query.filter_by(job_id=job_id, filename="empty.txt").one().result == "Empty file"
+    assert spool.stats()["references"] == 0
+    assert spooled_files(tmp_path) == []
+
+
+def test_failed_batch_is_retried_and_resumes_where_it_stopped(tmp_path, job_id, scoring):
+    spool = UploadSpool(str(tmp_path))
+    queue_files(spool, job_id, [("jane.txt", b"Jane Python"), ("john.txt", b"John Go")])
+
+    def crash_after_first(items):
+        application.process_work_items(items[:1])
+        raise RuntimeError("worker crashed")
+
+    with patch("upload_spool.get_upload_spool", return_value=spool):
+        make_worker(spool, crash_after_first).run_once()
+        assert item_statuses(job_id) == {"jane.txt": STATUS_PENDING, "john.txt": STATUS_PENDING}
+        assert len(spooled_files(tmp_path)) == 2
+
+        with application.app.app_context():
+            WorkItem.query.filter_by(job_id=job_id).update({"available_at": datetime.utcnow()})
+            application.db.session.commit()
+        make_worker(spool).run_once()
+
+    assert item_statuses(job_id) == {"jane.txt": STATUS_DONE, "john.txt": STATUS_DONE}
+    with application.app.app_context():
+        assert WorkItem.query.filter_by(job_id=job_id, filename="jane.txt").one().result == "Duplicate"
+        assert application.Resume.query.filter_by(job_id=job_id).count() == 2
+    # Jane was analyzed once; the retry skipped her as a duplicate before any LLM call
+    assert [call.args[2] for call in scoring.call_args_list] == ["jane.txt", "john.txt"]
+
+
+def test_archive_item_is_expanded_into_resume_items(tmp_path, job_id, scoring):
+    spool = UploadSpool(str(tmp_path / "spool"))
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("cvs/jane.txt", "Jane Python")
+        zf.writestr("cvs/john.txt", "John Go")
+        zf.writestr("cvs/photo.png", "png")
+    queue_files(spool, job_id, [("cvs.zip", archive.getvalue())], kind=KIND_ARCHIVE)
+
+    with patch("upload_spool.get_upload_spool", return_value=spool):
+        worker = make_worker(spool)
+        assert worker.run_once() == 1
+        assert item_statuses(job_id) == {"cvs.zip": STATUS_DONE, "jane.txt": STATUS_PENDING, "john.txt": STATUS_PENDING}
+        assert worker.run_once() == 2
+
+    assert set(item_statuses(job_id).values()) == {STATUS_DONE}
+    with application.app.app_context():
+        assert application.Resume.query.filter_by(job_id=job_id).count() == 2
+    assert spool.stats()["references"] == 0
+
+
+def test_batch_engine_submits_one_batch_per_job_and_polls_it_between_claims(tmp_path, job_id):
+    spool = UploadSpool(str(tmp_path))
+    queue_files(spool, job_id, [(f"{name}.txt", f"{name} Python".encode()) for name in ("Ann", "Bob", "Cy")])
+    backend = MagicMock()
+    backend.poll.return_value = "in_progress"
+
+    def analyze_batch(job_description, resumes, job_profile=None, batch_id=None, wait=True):
+        assert not wait
+        if batch_id is None:
+            raise BatchPending("batch-1")
+        return [json.dumps({"candidate_name": content.split()[0], "fit_score": 70}) for _, content in resumes]
+
+    def make_available():
+        with application.app.app_context():
+            WorkItem.query.filter_by(job_id=job_id).update({"available_at": datetime.utcnow()})
+            application.db.session.commit()
+
+    with patch("upload_spool.get_upload_spool", return_value=spool), \
+            patch("async_scoring_engine.SCORING_ENGINE", "batch"), \
+            patch("prescreen.PRESCREEN_ENABLED", False), \
+            patch("batch_scoring.get_batch_backend", return_value=backend), \
+            patch.object(application, "check_system_resources", return_value=(True, "ok")), \
+            patch.object(application, "load_job_profile", return_value=None), \
+            patch.object(application, "analyze_resumes_with_batch_api", side_effect=analyze_batch) as analyze:
+        worker = WorkQueueWorker(application.app, application.db, WorkItem, application.process_work_items, spool,
+                                 threads=1, batch_size=2, kind_batch_sizes={KIND_RESUME: None})
+        # The whole job is claimed and submitted at once, then handed back to the queue
+        assert worker.run_once() == 3
+        with application.app.app_context():
+            items = WorkItem.query.filter_by(job_id=job_id).all()
+            assert {(item.status, item.batch_id, item.attempts) for item in items} == {(STATUS_PENDING, "batch-1", 0)}
+        assert worker.run_once() == 0  # nothing to do until the poll interval has passed
+
+        # Still running: only the batch is polled, nothing is extracted or submitted again
+        make_available()
+        assert worker.run_once() == 3
+        assert analyze.call_count == 1 and backend.poll.call_args.args == ("batch-1",)
+
+        backend.poll.return_value = "completed"
+        make_available()
+        assert worker.run_once() == 3
+
+    assert analyze.call_args.kwargs["batch_id"] == "batch-1"
+    assert set(item_statuses(job_id).values()) == {STATUS_DONE}
+    with application.app.app_context():
+        assert application.Resume.query.filter_by(job_id=job_id).count() == 3
+    assert spooled_files(tmp_path) == []
+
+
+def test_analyze_endpoint_queues_work_items(tmp_path):
+    spool = UploadSpool(str(tmp_path))
+    data = {"job_description": "Python developer",
+            "resumes": [(io.BytesIO(b"Jane Python"), "jane.txt"), (io.BytesIO(b"PK"), "batch.zip")]}
+
+    with patch("upload_spool.get_upload_spool", return_value=spool), \
+            patch.object(application, "load_job_profile", return_value=None):
+        client = application.app.test_client()
+        response = client.post("/api/analyze", data=data, content_type="multipart/form-data")
+        job_id = response.get_json()["job_id"]
+        try:
+            assert response.status_code == 200
+            with application.app.app_context():
+                items = {item.filename: (item.kind, item.status) for item in WorkItem.query.filter_by(job_id=job_id)}
+            assert items == {"jane.txt": (KIND_RESUME, STATUS_PENDING), "batch.zip": (KIND_ARCHIVE, STATUS_PENDING)}
+            # The queue owns the spooled files now; deleting the job deletes them
+            assert spool.stats()["references"] == 0 and len(spooled_files(tmp_path)) == 2
+            assert client.get(f"/api/jobs/{job_id}").get_json()["queue"][STATUS_PENDING] == 2
+        finally:
+            client.delete(f"/api/jobs/{job_id}")
+    assert spooled_files(tmp_path) == []
+
+
+def test_workers_start_on_the_first_request_not_at_import():
+    # Importing application (as backend/app.py and the spawn process pools do) must not start workers
+    env = {**os.environ, "WORK_QUEUE_AUTOSTART": "true"}
+    threads = subprocess.run(
+        [sys.executable, "-c", "import threading, application; print([t.name for t in threading.enumerate()])"],
+        cwd=os.path.dirname(application.__file__), env=env, capture_output=True, text=True, check=True).stdout
+    assert "work-queue" not in threads
+
+    with patch("work_queue.WORK_QUEUE_AUTOSTART", True), \
+            patch.object(application, "start_work_queue_workers") as start:
+        application.app.test_client().get("/api/test")
+    assert start.called
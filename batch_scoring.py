@@ -0,0 +1,345 @@
+"""
+Offline bulk scoring through the OpenAI Batch API.
+
+For large requisitions every per-resume prompt is serialized into a JSONL
+batch file, submitted as a single batch, polled until it finishes and then
+fanned back out into per-resume results. The result shape matches
+ResumeScorer.score_resume. Batch requests cost half as much and do not count
+against the synchronous rate limits.
+
+A batch can also be run without blocking: run(wait=False) raises BatchPending
+with the batch id while the batch is still running, and a later
+BatchScoringJob over the same resumes, given that batch_id, picks it up
+instead of submitting the prompts again. Requests are keyed by resume
+content, so results always map back to the right resume.
+
+LocalBatchBackend is a file-based stand-in for the batch endpoint. It writes
+the same input/output JSONL files and answers each request through a
+responder callable, so the whole flow can run offline.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import openai
+
+from duplicate_copy_resume_scorer import ResumeScorer
+
+_project_root = os.path.dirname(os.path.abspath(__file__))
+
+# Batch configuration (overridable through environment variables)
+BATCH_BACKEND = os.environ.get('BATCH_BACKEND', 'openai').lower()  # "openai" or "local"
+BATCH_DIR = os.environ.get('BATCH_DIR', os.path.join(_project_root, 'instance', 'batches'))
+BATCH_POLL_INTERVAL_SECONDS = float(os.environ.get('BATCH_POLL_INTERVAL_SECONDS', 30))
+BATCH_TIMEOUT_SECONDS = float(os.environ.get('BATCH_TIMEOUT_SECONDS', 24 * 3600))
+BATCH_COMPLETION_WINDOW = os.environ.get('BATCH_COMPLETION_WINDOW', '24h')
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = {"completed", "failed", "expired", "cancelled"}
+
+
+class BatchPending(Exception):
+    """Raised by BatchScoringJob.run(wait=False) while the submitted batch is still running."""
+
+    def __init__(self, batch_id: str, status: str = "in_progress"):
+        super().__init__(f"Batch {batch_id} is {status}")
+        self.batch_id = batch_id
+        self.status = status
+
+
+def resume_key(resume_text: str) -> str:
+    """Prefix of a resume's batch request custom_ids."""
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()[:16]
+
+
+class OpenAIBatchBackend:
+    """Submits batch files to the OpenAI Batch API."""
+
+    def __init__(self, client=None):
+        self.client = client or openai.OpenAI()
+
+    def submit(self, input_path: str) -> str:
+        with open(input_path, 'rb') as f:
+            batch_file = self.client.files.create(file=f, purpose="batch")
+        batch = self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=BATCH_COMPLETION_WINDOW
+        )
+        return batch.id
+
+    def poll(self, batch_id: str) -> str:
+        return self.client.batches.retrieve(batch_id).status
+
+    def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        """Return the output and error lines of a finished batch."""
+        batch = self.client.batches.retrieve(batch_id)
+        lines = []
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                text = self.client.files.content(file_id).text
+                lines.extend(json.loads(line) for line in text.splitlines() if line.strip())
+        return lines
+
+
+class LocalBatchBackend:
+    """
+    File-based stand-in for the batch endpoint.
+
+    Each batch gets a directory holding input.jsonl, status.json and, once
+    processed, output.jsonl in the Batch API output format. Requests are
+    answered by responder(body) -> chat completion dict. The default
+    responder calls the synchronous chat completions API.
+    """
+
+    def __init__(self, directory: str = BATCH_DIR, responder: Callable[[Dict[str, Any]], Dict[str, Any]] = None):
+        self.directory = directory
+        self.responder = responder or self._openai_responder
+
+    @staticmethod
+    def _openai_responder(body: Dict[str, Any]) -> Dict[str, Any]:
+        return openai.OpenAI().chat.completions.create(**body).model_dump()
+
+    def _batch_dir(self, batch_id: str) -> str:
+        return os.path.join(self.directory, batch_id)
+
+    def _write_status(self, batch_id: str, status: str):
+        with open(os.path.join(self._batch_dir(batch_id), 'status.json'), 'w', encoding='utf-8') as f:
+            json.dump({"id": batch_id, "status": status}, f)
+
+    def submit(self, input_path: str) -> str:
+        batch_id = f"batch_local_{uuid.uuid4().hex}"
+        os.makedirs(self._batch_dir(batch_id), exist_ok=True)
+        shutil.copyfile(input_path, os.path.join(self._batch_dir(batch_id), 'input.jsonl'))
+        self._write_status(batch_id, "in_progress")
+        return batch_id
+
+    def poll(self, batch_id: str) -> str:
+        with open(os.path.join(self._batch_dir(batch_id), 'status.json'), encoding='utf-8') as f:
+            status = json.load(f)["status"]
+        if status == "in_progress":
+            self._process(batch_id)
+            status = "completed"
+        return status
+
+    def _process(self, batch_id: str):
+        """Answer every request in the input file and write the output file."""
+        batch_dir = self._batch_dir(batch_id)
+        with open(os.path.join(batch_dir, 'input.jsonl'), encoding='utf-8') as f:
+            requests = [json.loads(line) for line in f if line.strip()]
+
+        with open(os.path.join(batch_dir, 'output.jsonl'), 'w', encoding='utf-8') as out:
+            for request in requests:
+                line = {"id": f"batch_req_{uuid.uuid4().hex}", "custom_id": request["custom_id"]}
+                try:
+                    line["response"] = {"status_code": 200, "body": self.responder(request["body"])}
+                    line["error"] = None
+                except Exception as e:
+                    line["response"] = None
+                    line["error"] = {"code": type(e).__name__, "message": str(e)}
+                out.write(json.dumps(line, ensure_ascii=False) + '\n')
+        self._write_status(batch_id, "completed")
+
+    def fetch_results(self, batch_id: str) -> List[Dict[str, Any]]:
+        output_path = os.path.join(self._batch_dir(batch_id), 'output.jsonl')
+        if not os.path.exists(output_path):
+            return []
+        with open(output_path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+
+def get_batch_backend():
+    """Return the batch backend selected by BATCH_BACKEND."""
+    if BATCH_BACKEND == 'local':
+        return LocalBatchBackend()
+    return OpenAIBatchBackend()
+
+
+class BatchScoringJob:
+    """
+    Scores many resumes for one job description through a single batch.
+
+    The job requirement and section weights are computed once up front with
+    normal calls, or taken from job_profile when one is given. Every resume
+    then contributes a subfield scoring request, a candidate experience
+    request when the local work-history parser is not confident and,
+    optionally, a summary request built by
+    summary_request(filename, resume_text). Deterministic responses already
+    in the LLM response cache are not resubmitted. Given the batch_id of an
+    earlier submission, the job waits for that batch instead of submitting one.
+    """
+
+    def __init__(self, job_description: str, resumes: List[Tuple[str, str]], scorer: ResumeScorer = None,
+                 backend=None, summary_request: Optional[Callable[[str, str], Optional[Dict[str, Any]]]] = None,
+                 batch_dir: str = BATCH_DIR, job_profile: Optional[Dict[str, Any]] = None, batch_id: str = None):
+        self.job_description = job_description
+        self.resumes = resumes
+        self.scorer = scorer or ResumeScorer()
+        self.backend = backend or get_batch_backend()
+        self.summary_request = summary_request
+        self.batch_dir = batch_dir
+        self.job_profile = job_profile
+        self.batch_id = batch_id
+        self._keys = [resume_key(resume_text) for _, resume_text in resumes]
+        self._requests = {}
+        self._contents = {}
+        self._errors = {}
+        self._cross_section = {}
+        self._local_experience = {}
+
+    def build_requests(self) -> List[Dict[str, Any]]:
+        """Build the per-resume requests and return the batch lines that still need an answer."""
+        scorer = self.scorer
+        lines = []
+        for i, (filename, resume_text) in enumerate(self.resumes):
+            key = self._keys[i]
+            cross_section_content = scorer._extract_cross_section_content(resume_text)
+            self._cross_section[i] = cross_section_content
+
+            requests = {
+                f"{key}:subfield_scores": scorer._build_subfield_request(self.job_description, resume_text, cross_section_content),
+            }
+            local_experience = scorer._local_candidate_experience(resume_text)
+            if local_experience is not None:
+                self._local_experience[i] = local_experience
+            else:
+                requests[f"{key}:candidate_experience"] = scorer._build_candidate_experience_request(resume_text)
+            if self.summary_request is not None:
+                summary = self.summary_request(filename, resume_text)
+                if summary is not None:
+                    requests[f"{key}:summary"] = summary
+
+            for custom_id, body in requests.items():
+                self._requests[custom_id] = body
+                params = {k: v for k, v in body.items() if k not in ("model", "messages")}
+                cached = scorer._get_cached_response(body["model"], body["messages"], params)
+                if cached is not None:
+                    self._contents[custom_id] = cached
+                else:
+                    lines.append({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body})
+        return lines
+
+    def write_batch_file(self, lines: List[Dict[str, Any]]) -> str:
+        """Serialize batch lines to a JSONL file and return its path."""
+        os.makedirs(self.batch_dir, exist_ok=True)
+        path = os.path.join(self.batch_dir, f"input_{uuid.uuid4().hex}.jsonl")
+        with open(path, 'w', encoding='utf-8') as f:
+            for line in lines:
+                f.write(json.dumps(line, ensure_ascii=False) + '\n')
+        return path
+
+    def wait(self, poll_interval: float = BATCH_POLL_INTERVAL_SECONDS, timeout: float = BATCH_TIMEOUT_SECONDS) -> str:
+        """Poll the submitted batch until it reaches a terminal status."""
+        deadline = time.time() + timeout
+        while True:
+            status = self.backend.poll(self.batch_id)
+            print(f"  📦 Batch {self.batch_id}: {status}")
+            if status in TERMINAL_STATUSES:
+                return status
+            if time.time() >= deadline:
+                raise TimeoutError(f"Batch {self.batch_id} did not finish within {timeout} seconds")
+            time.sleep(poll_interval)
+
+    def _collect(self, lines: List[Dict[str, Any]]):
+        """Store the content of each answered request and persist deterministic responses."""
+        for line in lines:
+            custom_id = line.get("custom_id")
+            response = line.get("response") or {}
+            if line.get("error") or response.get("status_code") != 200:
+                self._errors[custom_id] = str(line.get("error") or response.get("body"))
+                continue
+            content = response["body"]["choices"][0]["message"]["content"].strip()
+            self._contents[custom_id] = content
+
+            body = self._requests.get(custom_id)
+            if body is not None:
+                params = {k: v for k, v in body.items() if k not in ("model", "messages")}
+                self.scorer._store_response(body["model"], body["messages"], params, content)
+
+    def _content(self, custom_id: str) -> str:
+        if custom_id not in self._contents:
+            raise Exception(f"No batch result for {custom_id}: {self._errors.get(custom_id, 'missing')}")
+        return self._contents[custom_id]
+
+    def _score(self, i: int, resume_text: str, job_requirement: Dict[str, Any],
+               section_weights: Dict[str, float]) -> Dict[str, Any]:
+        """Assemble a score_resume-shaped result from the batch responses of one resume."""
+        scorer = self.scorer
+        start_time = time.time()
+        candidate_experience = self._local_experience.get(i)
+        if candidate_experience is None:
+            try:
+                candidate_experience = scorer._parse_candidate_experience(
+                    self._content(f"{self._keys[i]}:candidate_experience"), resume_text
+                )
+            except Exception as e:
+                candidate_experience = scorer._fallback_candidate_experience(resume_text, e)
+
+        raw_subfield_scores = scorer._parse_subfield_scores(self._content(f"{self._keys[i]}:subfield_scores"))
+        subfield_scores = scorer._finalize_subfield_scores(
+            raw_subfield_scores, candidate_experience, job_requirement, self._cross_section[i]
+        )
+        scorer.subfield_scores_cache[scorer._subfield_cache_key(self.job_description, resume_text)] = subfield_scores
+        final_score = scorer.compute_final_score(section_weights, subfield_scores)
+
+        job_level = job_requirement.get("job_level", "entry")
+        return {
+            "job_level": job_level,
+            "experience_education_ratio": {"entry": 1.0, "mid": 2.0, "senior": 3.0}.get(job_level, 1.0),
+            "section_weights": section_weights,
+            "subfield_scores": subfield_scores,
+            "final_score": final_score,
+            "candidate_experience": candidate_experience,
+            "cross_section_content": self._cross_section[i],
+            "job_requirements": job_requirement,
+            "phase_timings": {},
+            "processing_time": time.time() - start_time
+        }
+
+    def run(self, poll_interval: float = BATCH_POLL_INTERVAL_SECONDS,
+            timeout: float = BATCH_TIMEOUT_SECONDS, wait: bool = True) -> List[Dict[str, Any]]:
+        """
+        Run the whole flow and return one entry per resume, in input order:
+        {"filename", "advanced_result", "summary", "error"}. advanced_result is
+        None (and error is set) when the resume could not be scored. With
+        wait=False the batch is polled once and BatchPending is raised if it
+        has not finished.
+        """
+        print(f"📦 Preparing batch scoring for {len(self.resumes)} resumes...")
+        if self.job_profile is not None:
+            self.scorer.apply_job_profile(self.job_description, self.job_profile)
+        job_requirement = self.scorer._extract_job_experience_requirement(self.job_description)
+        section_weights = self.scorer.assign_section_weights(self.job_description)
+
+        lines = self.build_requests()
+        if lines:
+            if self.batch_id is None:
+                input_path = self.write_batch_file(lines)
+                self.batch_id = self.backend.submit(input_path)
+                print(f"  📤 Submitted batch {self.batch_id} with {len(lines)} requests")
+            if wait:
+                status = self.wait(poll_interval, timeout)
+            else:
+                status = self.backend.poll(self.batch_id)
+                print(f"  📦 Batch {self.batch_id}: {status}")
+                if status not in TERMINAL_STATUSES:
+                    raise BatchPending(self.batch_id, status)
+            self._collect(self.backend.fetch_results(self.batch_id))
+            print(f"  📥 Batch {self.batch_id} finished with status '{status}'")
+        else:
+            print("  💾 All batch requests served from the response cache")
+
+        results = []
+        for i, (filename, resume_text) in enumerate(self.resumes):
+            entry = {"filename": filename, "advanced_result": None, "summary": self._contents.get(f"{self._keys[i]}:summary"),
+                     "error": None}
+            try:
+                entry["advanced_result"] = self._score(i, resume_text, job_requirement, section_weights)
+            except Exception as e:
+                entry["error"] = f"Error in resume scoring: {str(e)}"
+            results.append(entry)
+        return results
@@ -0,0 +1,72 @@
+"""
+Micro-benchmark: cross-section keyword extraction on large resumes.
+
+Compares the per-keyword scan (substring test + regex findall per keyword)
+with the single-pass KeywordMatcher used by ResumeScorer, checks that both
+produce identical output, and prints the timings.
+
+Run from the repository root:
+    python benchmarks/bench_cross_section_matcher.py [--chars 50000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from duplicate_copy_resume_scorer import CROSS_SECTION_KEYWORDS, _CROSS_SECTION_MATCHER  # noqa: E402
+from keyword_matcher import search_keywords_per_keyword  # noqa: E402
+
+FILLER = (
+    "Designed and maintained backend services in Python and Go. Improved deployment pipelines and "
+    "monitoring for distributed systems. Worked closely with product and design on customer features. "
+).split()
+
+
+def make_resume(chars: int, seed: int = 7) -> str:
+    """Synthetic resume text of about `chars` characters with keywords sprinkled in."""
+    rng = random.Random(seed)
+    keywords = [keyword for keywords in CROSS_SECTION_KEYWORDS.values() for keyword in keywords]
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(keywords) if rng.random() < 0.03 else rng.choice(FILLER)
+        if rng.random() < 0.05:
+            word += '\n'
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:chars]
+
+
+def per_keyword(text_lower):
+    return {section: search_keywords_per_keyword(text_lower, keywords)
+            for section, keywords in CROSS_SECTION_KEYWORDS.items()}
+
+
+def single_pass(text_lower):
+    hits = _CROSS_SECTION_MATCHER.occurrences(text_lower)
+    return {section: _CROSS_SECTION_MATCHER.search(text_lower, keywords, hits)
+            for section, keywords in CROSS_SECTION_KEYWORDS.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--chars', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    text_lower = make_resume(args.chars).lower()
+    assert per_keyword(text_lower) == single_pass(text_lower), "outputs differ"
+
+    old = min(timeit.repeat(lambda: per_keyword(text_lower), number=1, repeat=args.repeat))
+    new = min(timeit.repeat(lambda: single_pass(text_lower), number=1, repeat=args.repeat))
+    print(f"Resume size: {len(text_lower):,} chars, {len(_CROSS_SECTION_MATCHER.keywords)} keywords")
+    print(f"Per-keyword scan: {old * 1000:8.2f} ms")
+    print(f"Single pass:      {new * 1000:8.2f} ms")
+    print(f"Speedup:          {old / new:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
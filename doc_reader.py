@@ -0,0 +1,253 @@
+"""
+Pure-Python text reader for Word 97-2003 (.doc) files.
+
+A .doc file is an OLE2 compound file: a small FAT filesystem of sectors that
+holds named streams. OleFile follows the sector chains to read a stream;
+iter_doc_text then reads the File Information Block (FIB) at the start of
+the WordDocument stream, finds the piece table (Clx) in the table stream, and
+decodes the main document text piece by piece, as 8-bit cp1252 or UTF-16.
+Field codes, object anchors and other control characters are removed, so the
+result is only the text a reader sees.
+
+Reference: [MS-CFB] Compound File Binary File Format, [MS-DOC] Word (.doc)
+Binary File Format.
+"""
+import codecs
+import re
+import struct
+from typing import Dict, Iterator, List
+
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+ENDOFCHAIN = 0xFFFFFFFE
+NOSTREAM = 0xFFFFFFFF
+
+_DIRECTORY_ENTRY_BYTES = 128
+_STREAM, _ROOT = 2, 5
+
+_WORD_IDENT = 0xA5EC
+_FIB_ENCRYPTED = 0x0100
+_FIB_WHICH_TABLE = 0x0200
+_FCLCB_CLX = 33  # index of fcClx/lcbClx in FibRgFcLcb97
+_FC_COMPRESSED = 0x40000000
+_DECODE_BLOCK_CHARS = 4096
+
+# Paragraph, cell and break marks become whitespace; anchors for pictures,
+# footnotes, comments and drawings are dropped
+_CONTROL_CHARACTERS = {
+    '\r': '\n', '\x0b': '\n', '\x0c': '\n', '\x0e': '\n', '\x07': '\t',
+    '\x1e': '-', '\xa0': ' ', '\x1f': '', '\x00': '', '\x01': '',
+    '\x02': '', '\x03': '', '\x04': '', '\x05': '', '\x08': '',
+}
+_CONTROL_PATTERN = re.compile('[' + ''.join(_CONTROL_CHARACTERS) + ']')
+_FIELD_MARKS = re.compile('([\x13\x14\x15])')
+
+
+class DocFormatError(ValueError):
+    """The bytes are not a readable Word 97-2003 compound file."""
+
+
+class OleFile:
+    """Read-only view of the streams in an OLE2 compound file."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        if len(data) < 512 or bytes(self.data[:8]) != OLE_MAGIC:
+            raise DocFormatError("Not an OLE2 compound file")
+        (sector_shift, mini_sector_shift) = struct.unpack_from('<HH', data, 0x1E)
+        (num_fat_sectors, first_dir_sector, _, self.mini_stream_cutoff, first_minifat_sector,
+         num_minifat_sectors, first_difat_sector, num_difat_sectors) = struct.unpack_from('<8I', data, 0x2C)
+        if sector_shift not in (9, 12) or mini_sector_shift != 6:
+            raise DocFormatError("Unsupported compound file sector size")
+        self.sector_size = 1 << sector_shift
+        self.mini_sector_size = 1 << mini_sector_shift
+
+        fat_sectors = list(struct.unpack_from('<109I', data, 0x4C))
+        sector = first_difat_sector
+        per_sector = self.sector_size // 4
+        for _ in range(num_difat_sectors):
+            if sector >= ENDOFCHAIN:
+                break
+            entries = struct.unpack(f'<{per_sector}I', self._sector(sector))
+            fat_sectors.extend(entries[:-1])
+            sector = entries[-1]
+        self.fat = []
+        for sector in fat_sectors[:num_fat_sectors]:
+            if sector >= ENDOFCHAIN:
+                break
+            self.fat.extend(struct.unpack(f'<{per_sector}I', self._sector(sector)))
+
+        self.entries = self._read_directory(bytes(self._chain(first_dir_sector)))
+        root = self.entries[0]
+        self.mini_stream = self._chain(root['start'])[:root['size']] if root['size'] else b''
+        self.minifat = []
+        if num_minifat_sectors:
+            minifat = self._chain(first_minifat_sector)
+            self.minifat = list(struct.unpack(f'<{len(minifat) // 4}I', minifat))
+        self.streams = self._top_level_streams()
+
+    def _sector(self, sector: int) -> memoryview:
+        offset = (sector + 1) * self.sector_size
+        if offset + self.sector_size > len(self.data):
+            raise DocFormatError(f"Sector {sector} is past the end of the file")
+        return self.data[offset:offset + self.sector_size]
+
+    def _chain(self, start: int) -> bytes:
+        parts = []
+        sector = start
+        while sector != ENDOFCHAIN:
+            if sector >= len(self.fat) or len(parts) > len(self.fat):
+                raise DocFormatError("Broken sector chain")
+            parts.append(self._sector(sector))
+            sector = self.fat[sector]
+        return b''.join(parts)
+
+    def _mini_chain(self, start: int, size: int) -> bytes:
+        parts = []
+        sector = start
+        while sector != ENDOFCHAIN:
+            if sector >= len(self.minifat) or len(parts) > len(self.minifat):
+                raise DocFormatError("Broken mini sector chain")
+            offset = sector * self.mini_sector_size
+            parts.append(self.mini_stream[offset:offset + self.mini_sector_size])
+            sector = self.minifat[sector]
+        return b''.join(parts)[:size]
+
+    def _read_directory(self, directory: bytes) -> List[Dict]:
+        entries = []
+        for offset in range(0, len(directory) - _DIRECTORY_ENTRY_BYTES + 1, _DIRECTORY_ENTRY_BYTES):
+            name_bytes, = struct.unpack_from('<H', directory, offset + 64)
+            entry_type = directory[offset + 66]
+            left, right, child = struct.unpack_from('<3I', directory, offset + 68)
+            start, size = struct.unpack_from('<II', directory, offset + 116)
+            name = directory[offset:offset + max(name_bytes - 2, 0)].decode('utf-16-le', 'replace')
+            entries.append({'name': name, 'type': entry_type, 'left': left, 'right': right,
+                            'child': child, 'start': start, 'size': size})
+        if not entries or entries[0]['type'] != _ROOT:
+            raise DocFormatError("Compound file has no root entry")
+        return entries
+
+    def _top_level_streams(self) -> Dict[str, Dict]:
+        """Streams directly under the root storage, by lower-cased name (a walk of the sibling tree)."""
+        streams = {}
+        pending = [self.entries[0]['child']]
+        seen = set()
+        while pending:
+            index = pending.pop()
+            if index == NOSTREAM or index >= len(self.entries) or index in seen:
+                continue
+            seen.add(index)
+            entry = self.entries[index]
+            if entry['type'] == _STREAM:
+                streams[entry['name'].lower()] = entry
+            pending.extend((entry['left'], entry['right']))
+        return streams
+
+    def open_stream(self, name: str) -> bytes:
+        entry = self.streams.get(name.lower())
+        if entry is None:
+            raise DocFormatError(f"Compound file has no {name} stream")
+        if entry['size'] < self.mini_stream_cutoff:
+            return self._mini_chain(entry['start'], entry['size'])
+        return self._chain(entry['start'])[:entry['size']]
+
+
+def _piece_table(table: bytes, fc_clx: int, lcb_clx: int):
+    """(cp_start, cp_end, fc) of each text piece, from the Clx in the table stream."""
+    clx = table[fc_clx:fc_clx + lcb_clx]
+    position = 0
+    while position < len(clx) and clx[position] == 0x01:  # Prc: property modifiers, skipped
+        cb_grpprl, = struct.unpack_from('<h', clx, position + 1)
+        if cb_grpprl < 0:
+            raise DocFormatError("Invalid property modifier in piece table")
+        position += 3 + cb_grpprl
+    if position + 5 > len(clx) or clx[position] != 0x02:
+        raise DocFormatError("Word document has no piece table")
+    lcb, = struct.unpack_from('<I', clx, position + 1)
+    plc = clx[position + 5:position + 5 + lcb]
+    count = (len(plc) - 4) // 12
+    if count <= 0:
+        raise DocFormatError("Word document has an empty piece table")
+    cps = struct.unpack_from(f'<{count + 1}I', plc)
+    pieces = []
+    for i in range(count):
+        fc, = struct.unpack_from('<I', plc, 4 * (count + 1) + 8 * i + 2)
+        pieces.append((cps[i], cps[i + 1], fc))
+    return pieces
+
+
+def _iter_pieces(word: bytes, pieces, ccp_text: int) -> Iterator[str]:
+    """Raw text of the main document, decoded in blocks of at most _DECODE_BLOCK_CHARS."""
+    for cp_start, cp_end, fc in pieces:
+        if cp_start >= ccp_text:
+            break
+        count = min(cp_end, ccp_text) - cp_start
+        if fc & _FC_COMPRESSED:
+            offset = (fc & ~_FC_COMPRESSED) // 2
+            for start in range(0, count, _DECODE_BLOCK_CHARS):
+                yield word[offset + start:offset + min(start + _DECODE_BLOCK_CHARS, count)].decode('cp1252', 'replace')
+        else:
+            decoder = codecs.getincrementaldecoder('utf-16-le')('replace')
+            for start in range(0, count, _DECODE_BLOCK_CHARS):
+                block = word[fc + 2 * start:fc + 2 * min(start + _DECODE_BLOCK_CHARS, count)]
+                yield decoder.decode(block)
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+
+
+def _strip_fields(blocks: Iterator[str]) -> Iterator[str]:
+    """Drop field codes (between field begin and separator) and control characters; keep field results."""
+    fields = []  # one entry per open field: True while its code is being read
+    for block in blocks:
+        kept = []
+        for part in _FIELD_MARKS.split(block):
+            if part == '\x13':
+                fields.append(True)
+            elif part == '\x14':
+                if fields:
+                    fields[-1] = False
+            elif part == '\x15':
+                if fields:
+                    fields.pop()
+            elif part and not any(fields):
+                kept.append(part)
+        text = _CONTROL_PATTERN.sub(lambda match: _CONTROL_CHARACTERS[match.group()], ''.join(kept))
+        if text:
+            yield text
+
+
+def iter_doc_text(data: bytes) -> Iterator[str]:
+    """
+    Main document text of a Word 97-2003 file, block by block. The container and
+    FIB are parsed before returning, so DocFormatError is raised by this call.
+    """
+    ole = OleFile(data)
+    word = ole.open_stream('WordDocument')
+    if len(word) < 0x22 or struct.unpack_from('<H', word, 0)[0] != _WORD_IDENT:
+        raise DocFormatError("Not a Word 97-2003 document")
+    flags, = struct.unpack_from('<H', word, 0x0A)
+    if flags & _FIB_ENCRYPTED:
+        raise DocFormatError("Word document is encrypted")
+    table = ole.open_stream('1Table' if flags & _FIB_WHICH_TABLE else '0Table')
+
+    try:
+        csw, = struct.unpack_from('<H', word, 0x20)
+        position = 0x22 + 2 * csw
+        cslw, = struct.unpack_from('<H', word, position)
+        ccp_text, = struct.unpack_from('<i', word, position + 2 + 12)
+        position += 2 + 4 * cslw
+        cb_fc_lcb, = struct.unpack_from('<H', word, position)
+        if cb_fc_lcb <= _FCLCB_CLX:
+            raise DocFormatError("Word document FIB has no piece table entry")
+        fc_clx, lcb_clx = struct.unpack_from('<II', word, position + 2 + 8 * _FCLCB_CLX)
+    except struct.error:
+        raise DocFormatError("Truncated Word document FIB")
+    try:
+        pieces = _piece_table(table, fc_clx, lcb_clx)
+    except struct.error:
+        raise DocFormatError("Truncated Word document piece table")
+    return _strip_fields(_iter_pieces(word, pieces, ccp_text))
+
+
+def read_doc_text(data: bytes) -> str:
+    return ''.join(iter_doc_text(data))
@@ -4,6 +4,20 @@ import openai
 from typing import Dict, Any, List
 import time
 import hashlib
+from llm_cache import get_llm_cache
+from rate_limiter import estimate_tokens, get_rate_limiter
+from experience_parser import EXPERIENCE_PARSER_ENABLED, EXPERIENCE_PARSER_MIN_CONFIDENCE, parse_work_history
+from job_requirement_extractor import JOB_REQUIREMENT_RULES_ENABLED, extract_job_requirement
+from job_profile import is_profile_current
+from keyword_matcher import KeywordMatcher
+from phase_executor import PhaseExecutor
+from score_matrix import SECTION_SUBFIELDS
+from section_index import (EXPERIENCE_PROMPT_SECTIONS, UNSCORED_SECTIONS, is_index_current, prompt_text,
+                           remember_section_index)
+from single_flight import get_single_flight
+
+# Fused mode: one request returns the subfield scores and the candidate summary together
+FUSED_SCORING = os.environ.get('FUSED_SCORING', 'false').lower() == 'true'
 
 # OpenAI API Configuration
 # OpenAI API Configuration - using environment variable
@@ -560,22 +574,162 @@ Output Format (EXAMPLE)
 
 """
 
+# Appended to the subfield scoring prompt in fused mode
+FUSED_SUMMARY_TEMPLATE = """
+CANDIDATE SUMMARY:
+In the same JSON object, next to the section scores, add a top-level "summary" object:
+{
+    "candidate_name": "Extract name from resume or 'Name Not Found'",
+    "reasoning": "Brief explanation of why this candidate fits or doesn't fit",
+    "summary_points": ["Key strength 1", "Key strength 2", "Key concern 1"],
+    "skill_matrix": {"matches": ["Skill 1", "Skill 2"], "gaps": ["Missing skill 1", "Missing skill 2"]},
+    "timeline": [
+        {"period": "2022-2024", "role": "Software Engineer", "company": "Tech Company", "details": "Brief description of role and achievements"}
+    ],
+    "logistics": {
+        "compensation": "Expected salary range or 'Not specified'",
+        "notice_period": "Notice period or 'Not specified'",
+        "work_authorization": "Visa status or 'Not specified'",
+        "location": "Preferred location or 'Not specified'"
+    }
+}
+
+Return a single valid JSON object containing the section score objects and "summary".
+"""
+
+# Keywords searched across the whole resume by _extract_cross_section_content
+CROSS_SECTION_KEYWORDS = {
+    'leadership': [
+        'led', 'managed', 'supervised', 'coordinated', 'oversaw', 'directed',
+        'team lead', 'project lead', 'leadership', 'management', 'supervision',
+        'coordinated team', 'managed team', 'led team', 'oversaw project',
+        'team management', 'project management', 'people management',
+        'student leader', 'club president', 'committee chair', 'president',
+        'vice president', 'treasurer', 'secretary', 'chair', 'coordinator'
+    ],
+    'research': [
+        'research', 'investigation', 'study', 'analysis', 'experiment',
+        'thesis', 'dissertation', 'capstone', 'independent study',
+        'research project', 'data analysis', 'statistical analysis',
+        'methodology', 'hypothesis', 'experiment', 'investigation',
+        'scholarly', 'academic research', 'empirical study'
+    ],
+    'publications': [
+        'published', 'publication', 'paper', 'journal', 'conference',
+        'article', 'thesis', 'dissertation', 'presentation', 'poster',
+        'academic paper', 'research paper', 'technical paper',
+        'conference paper', 'journal article', 'peer-reviewed',
+        'citation', 'bibliography', 'references'
+    ],
+    'awards': [
+        'award', 'recognition', 'honor', 'achievement', 'excellence',
+        'dean\'s list', 'scholarship', 'fellowship', 'grant',
+        'competition winner', 'award-winning', 'recognized',
+        'honored', 'distinguished', 'outstanding', 'merit',
+        'academic excellence', 'achievement award'
+    ],
+}
+_CROSS_SECTION_MATCHER = KeywordMatcher(
+    [keyword for keywords in CROSS_SECTION_KEYWORDS.values() for keyword in keywords]
+)
+
+# Cheap first-pass prompt used by cascade scoring (see scoring_tiers)
+TRIAGE_TEMPLATE = """You are screening resumes for a job. Estimate how well the candidate fits the job description on a 0-100 scale,
+where 90+ is an outstanding match, 80-89 a strong match, 65-79 a partial match and below 65 a poor match.
+Judge required skills, relevant experience and seniority only.
+
+Return ONLY a JSON object:
+{"fit_score": <integer 0-100>, "reasoning": "<one sentence>"}
+"""
+
 class ResumeScorer:
-    def __init__(self, api_key: str = None):
-        """Initialize the ResumeScorer with OpenAI API key."""
+    def __init__(self, api_key: str = None, response_cache=None, use_persistent_cache: bool = True, rate_limiter=None,
+                 client=None, single_flight=None):
+        """
+        Initialize the ResumeScorer with OpenAI API key.
+        Deterministic LLM responses are persisted in the shared disk cache unless
+        use_persistent_cache is False (or LLM_CACHE_ENABLED=false).
+        API calls queue on the process-wide rate limiter unless one is passed in.
+        An existing openai.OpenAI client can be passed in to share its connection pool.
+        Concurrent identical job-level calls are collapsed by the process-wide
+        single-flight group unless one is passed in.
+        """
         self.api_key = api_key or os.environ.get("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is required")
-        self.client = openai.OpenAI(api_key=self.api_key)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.client = client or openai.OpenAI(api_key=self.api_key, http_client=self.rate_limiter.http_client())
+        self.single_flight = single_flight or get_single_flight()
+        self.response_cache = response_cache if response_cache is not None else (get_llm_cache() if use_persistent_cache else None)
         self.section_weights_cache = {}
         self.subfield_scores_cache = {}
+        self.summary_cache = {}
         self.job_level_cache = {}
     
     def clear_cache(self):
-        """Clear all cached results to force fresh evaluation."""
+        """
+        Clear this scorer's in-memory caches. The persistent response cache is
+        shared with other scorers and processes and is left alone.
+        """
         self.section_weights_cache = {}
         self.subfield_scores_cache = {}
+        self.summary_cache = {}
         self.job_level_cache = {}
+    
+    @staticmethod
+    def _strip_code_fence(content: str) -> str:
+        """Remove markdown code fences around a JSON response."""
+        if content.startswith("```json"):
+            return content[7:-3]
+        elif content.startswith("```"):
+            return content[3:-3]
+        return content
+    
+    def _chat_completion(self, messages: List[Dict[str, str]], model: str = "gpt-4o-mini", **params) -> str:
+        """
+        Run a chat completion and return the stripped message content.
+        Deterministic requests (temperature 0 with a fixed seed) are served from and
+        written to the persistent response cache; only valid JSON responses are stored.
+        """
+        cached = self._get_cached_response(model, messages, params)
+        if cached is not None:
+            return cached
+        
+        estimated_tokens = estimate_tokens(messages, params.get("max_tokens"))
+        self.rate_limiter.acquire(model, estimated_tokens)
+        response = self.client.chat.completions.create(model=model, messages=messages, **params)
+        self.rate_limiter.record_usage(model, estimated_tokens, response)
+        content = response.choices[0].message.content.strip()
+        
+        self._store_response(model, messages, params, content)
+        return content
+    
+    def _is_cacheable(self, params: Dict[str, Any]) -> bool:
+        """Only deterministic requests (temperature 0 with a fixed seed) are cached."""
+        return (
+            self.response_cache is not None
+            and params.get("temperature") == 0
+            and params.get("seed") is not None
+        )
+    
+    def _get_cached_response(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]):
+        """Return the persisted response for a deterministic request, or None."""
+        if not self._is_cacheable(params):
+            return None
+        cached = self.response_cache.get_response(model, messages, params)
+        if cached is not None:
+            print("  💾 Using persisted LLM response...")
+        return cached
+    
+    def _store_response(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any], content: str):
+        """Persist a deterministic response if it is valid JSON."""
+        if not self._is_cacheable(params):
+            return
+        try:
+            json.loads(self._strip_code_fence(content))
+            self.response_cache.set_response(model, messages, params, content)
+        except json.JSONDecodeError:
+            pass
         
     def _get_deterministic_seed(self, job_description: str) -> int:
         """Generate a deterministic seed based on job description hash."""
@@ -605,14 +759,46 @@ class ResumeScorer:
             print(f"  📊 Job level detected: {job_level.upper()}")
 
             # Create comprehensive cache key including job level for deterministic behavior
-            cache_key = hashlib.md5(f"v2_{job_description}_{job_level}".encode()).hexdigest()
+            cache_key = self._section_weights_cache_key(job_description, job_level)
             if cache_key in self.section_weights_cache:
                 print("  ✅ Using cached section weights...")
                 return self.section_weights_cache[cache_key]
             
-            # Step 2: Create context-aware prompt with job level information
-            print("  📝 Creating context-aware prompt...")
-            context_aware_prompt = f"""
+            # Concurrent callers for the same job share one in-flight LLM call
+            adjusted_weights = self.single_flight.do(
+                ("section_weights", cache_key), lambda: self._request_section_weights(job_description, job_level)
+            )
+            
+            # Cache the result
+            self.section_weights_cache[cache_key] = adjusted_weights
+            
+            return adjusted_weights
+            
+        except Exception as e:
+            raise Exception(f"Error in section weight assignment: {str(e)}")
+    
+    def _request_section_weights(self, job_description: str, job_level: str) -> Dict[str, Any]:
+        """Call the LLM for the context-aware section weights of a job description."""
+        # Step 2: Create context-aware prompt with job level information
+        print("  📝 Creating context-aware prompt...")
+        request = self._build_section_weights_request(job_description, job_level)
+        
+        print("  🤖 Calling LLM for section weight analysis...")
+        content = self._chat_completion(**request)
+        
+        print("  📝 Parsing LLM response...")
+        adjusted_weights = self._parse_section_weights(content, job_level)
+        
+        print("  ✅ Section weights assigned successfully!")
+        return adjusted_weights
+    
+    def _section_weights_cache_key(self, job_description: str, job_level: str) -> str:
+        """Cache key for the section weights of a job description at a given job level."""
+        return hashlib.md5(f"v2_{job_description}_{job_level}".encode()).hexdigest()
+    
+    def _build_section_weights_request(self, job_description: str, job_level: str) -> Dict[str, Any]:
+        """Build the chat completion request for the context-aware section weight prompt."""
+        context_aware_prompt = f"""
 {SECTION_WEIGHT_TEMPLATE}
 
 IMPORTANT CONTEXT FOR INTERPRETATION:
@@ -631,68 +817,48 @@ PATTERN MATCHING PRIORITY:
 
 Apply the scoring rubric with this job level context in mind.
 """
-            
-            print("  🤖 Calling LLM for section weight analysis...")
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume evaluator. Provide only valid JSON output."},
-                    {"role": "user", "content": f"{context_aware_prompt}\n\nJob Description:\n{job_description}"}
-                ],
-                temperature=0.0,  # Ensure deterministic output
-                max_tokens=2000,
-                seed=self._get_deterministic_seed(job_description)
-            )
-            
-            print("  📝 Parsing LLM response...")
-            
-            # Parse JSON response
-            content = response.choices[0].message.content.strip()
-            # Extract JSON from the response (handle potential markdown formatting)
-            if content.startswith("```json"):
-                content = content[7:-3]
-            elif content.startswith("```"):
-                content = content[3:-3]
-            
-            response_data = json.loads(content)
-            
-            # Extract weights from the new format
-            if "weights" in response_data:
-                weights = response_data["weights"]
-            else:
-                # Fallback to old format for backward compatibility
-                weights = response_data
-            
-            # Validate weights sum to 1
-            total_weight = sum([
-                weights.get("education", 0),
-                weights.get("experience", 0),
-                weights.get("projects", 0),
-                weights.get("leadership", 0),
-                weights.get("research", 0),
-                weights.get("skills", 0),
-                weights.get("certifications", 0),
-                weights.get("awards", 0),
-                weights.get("publications", 0)
-            ])
-            
-            if abs(total_weight - 1.0) > 0.02:
-                raise ValueError(f"Weights must sum to 1.0, got {total_weight}")
-            
-            # Step 3: Apply dynamic Experience:Education ratio adjustment
-            print("  ⚖️  Applying experience:education ratio adjustment...")
-            adjusted_weights = self._apply_experience_education_ratio(weights, job_level)
-            
-            # Cache the result
-            self.section_weights_cache[cache_key] = adjusted_weights
-            
-            print("  ✅ Section weights assigned successfully!")
-            
-            return adjusted_weights
-            
-        except Exception as e:
-            raise Exception(f"Error in section weight assignment: {str(e)}")
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": "You are an expert resume evaluator. Provide only valid JSON output."},
+                {"role": "user", "content": f"{context_aware_prompt}\n\nJob Description:\n{job_description}"}
+            ],
+            "temperature": 0.0,  # Ensure deterministic output
+            "max_tokens": 2000,
+            "seed": self._get_deterministic_seed(job_description)
+        }
+    
+    def _parse_section_weights(self, content: str, job_level: str) -> Dict[str, float]:
+        """Parse and validate the section weight response, then apply the experience:education ratio."""
+        # Extract JSON from the response (handle potential markdown formatting)
+        response_data = json.loads(self._strip_code_fence(content))
+        
+        # Extract weights from the new format
+        if "weights" in response_data:
+            weights = response_data["weights"]
+        else:
+            # Fallback to old format for backward compatibility
+            weights = response_data
+        
+        # Validate weights sum to 1
+        total_weight = sum([
+            weights.get("education", 0),
+            weights.get("experience", 0),
+            weights.get("projects", 0),
+            weights.get("leadership", 0),
+            weights.get("research", 0),
+            weights.get("skills", 0),
+            weights.get("certifications", 0),
+            weights.get("awards", 0),
+            weights.get("publications", 0)
+        ])
+        
+        if abs(total_weight - 1.0) > 0.02:
+            raise ValueError(f"Weights must sum to 1.0, got {total_weight}")
+        
+        # Step 3: Apply dynamic Experience:Education ratio adjustment
+        print("  ⚖️  Applying experience:education ratio adjustment...")
+        return self._apply_experience_education_ratio(weights, job_level)
     
     def score_subfields(self, job_description: str, resume_text: str, section_weights: Dict[str, float]) -> Dict[str, Any]:
         """
@@ -702,11 +868,8 @@ Apply the scoring rubric with this job level context in mind.
         print("  🔍 Starting subfield scoring...")
         
         try:
-            # Prepare resume data for the prompt
-            resume_text_str = resume_text  # for caching
-            
             # Check cache first for deterministic behavior
-            cache_key = hashlib.md5((job_description + resume_text_str).encode()).hexdigest()
+            cache_key = self._subfield_cache_key(job_description, resume_text)
             if cache_key in self.subfield_scores_cache:
                 print("  ✅ Using cached subfield scores...")
                 return self.subfield_scores_cache[cache_key]
@@ -722,87 +885,14 @@ Apply the scoring rubric with this job level context in mind.
             print(f"  📈 Cross-section analysis completed: {len(cross_section_content)} sections analyzed")
             
             # Step 2: Get other subfield scores from LLM with cross-section analysis
-            print("  🤖 Calling LLM for subfield scoring...")
-            cross_section_info = f"""
-CROSS-SECTION CONTENT ANALYSIS RESULTS:
-Leadership keywords found: {cross_section_content['leadership']['count']} ({', '.join(cross_section_content['leadership']['found_keywords'][:5])})
-Research keywords found: {cross_section_content['research']['count']} ({', '.join(cross_section_content['research']['found_keywords'][:5])})
-Publication keywords found: {cross_section_content['publications']['count']} ({', '.join(cross_section_content['publications']['found_keywords'][:5])})
-Award keywords found: {cross_section_content['awards']['count']} ({', '.join(cross_section_content['awards']['found_keywords'][:5])})
-
-Use this information to enhance your scoring. If keywords are found but sections appear weak, consider the cross-section evidence.
-"""
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[
-                    {"role": "system", "content": "You are an expert resume evaluator. Current Date: September 03, 2025. Provide only valid JSON output following the exact format specified."},
-                    {"role": "user", "content": f"{SUBFIELD_SCORING_TEMPLATE}\n\nJob Description:\n{job_description}\n\nResume Text:\n{resume_text}\n\n{cross_section_info}"}
-                ],
-                temperature=0.0,  # Ensure deterministic output
-                max_tokens=6000,  # Increased for longer comments
-                seed=self._get_deterministic_seed_with_resume(job_description, resume_text_str)
-            )
-            
-            print("  📝 Parsing LLM response...")
-            
-            # Parse JSON response
-            content = response.choices[0].message.content.strip()
-            # Extract JSON from the response (handle potential markdown formatting)
-            if content.startswith("```json"):
-                content = content[7:-3]
-            elif content.startswith("```"):
-                content = content[3:-3]
-            
-            subfield_scores = json.loads(content)
+            raw_subfield_scores = self._request_subfield_scores(job_description, resume_text, cross_section_content)
             
-            # Step 3: Replace experience section with deterministic calculation
-            print("  ⚡ Applying deterministic experience scoring...")
+            # Step 3 & 4: Deterministic experience scoring and cross-section enhancement
             job_requirement = self._extract_job_experience_requirement(job_description)
-            experience_match = self._calculate_experience_match_score(
-                candidate_experience["total_years"], 
-                job_requirement["years_required"]
+            subfield_scores = self._finalize_subfield_scores(
+                raw_subfield_scores, candidate_experience, job_requirement, cross_section_content
             )
             
-            experience_score = experience_match["score"]
-            experience_comment = f"Candidate: {candidate_experience['total_years']:.2f} years ({candidate_experience['total_months']} months). Job requires: {job_requirement['years_required']} years. {experience_match['reason']}. Details: {candidate_experience['calculation_details']}"
-            
-            # Apply cascading rules for experience subfields
-            if experience_score == 0:
-                # All experience subfields must be 0
-                subfield_scores["experience"] = {
-                    "candidate_years_of_experience_vs_role_expectation_match": 0,
-                    "relevancy": 0,
-                    "recency": 0,
-                    "depth": 0,
-                    "impact": 0,
-                    "comment": experience_comment
-                }
-            elif experience_score == 1:
-                # Use our deterministic score for the match, but allow other subfields to be scored independently
-                subfield_scores["experience"]["candidate_years_of_experience_vs_role_expectation_match"] = 1
-                subfield_scores["experience"]["comment"] = experience_comment
-                # Other subfields (relevancy, recency, depth, impact) are scored independently by the LLM
-            else:  # experience_score == 2
-                # Other subfields can be scored independently, but use our deterministic score
-                subfield_scores["experience"]["candidate_years_of_experience_vs_role_expectation_match"] = 2
-                subfield_scores["experience"]["comment"] = experience_comment
-            
-            # Step 4: Enhance comments with cross-section analysis for weak/missing sections
-            print("  🔗 Enhancing comments with cross-section analysis...")
-            subfield_scores = self._enhance_comments_with_cross_section_analysis(
-                subfield_scores, cross_section_content
-            )
-            
-            # Validate that all required sections are present
-            required_sections = ["experience", "education", "projects", "leadership", "research", 
-                               "skills", "certifications", "awards", "publications"]
-            
-            for section in required_sections:
-                if section not in subfield_scores:
-                    # If section is missing, create it with zero scores
-                    subfield_scores[section] = self._get_zero_scores_for_section(section)
-            
             # Cache the result
             self.subfield_scores_cache[cache_key] = subfield_scores
             
@@ -813,79 +903,167 @@ Use this information to enhance your scoring. If keywords are found but sections
         except Exception as e:
             raise Exception(f"Error in subfield scoring: {str(e)}")
     
-    def _extract_cross_section_content(self, resume_text: str) -> Dict[str, Any]:
+    def _subfield_cache_key(self, job_description: str, resume_text: str) -> str:
+        """Cache key for the subfield scores of a job description / resume pair."""
+        return hashlib.md5((job_description + resume_text).encode()).hexdigest()
+    
+    def _request_subfield_scores(self, job_description: str, resume_text: str, cross_section_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the LLM for the raw subfield scores, using cross-section keyword hits as extra context."""
+        print("  🤖 Calling LLM for subfield scoring...")
+        content = self._chat_completion(**self._build_subfield_request(job_description, resume_text, cross_section_content))
+        
+        print("  📝 Parsing LLM response...")
+        return self._parse_subfield_scores(content)
+    
+    def _parse_subfield_scores(self, content: str) -> Dict[str, Any]:
+        # Parse JSON response (handle potential markdown formatting)
+        return json.loads(self._strip_code_fence(content))
+    
+    def _build_subfield_request(self, job_description: str, resume_text: str, cross_section_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the chat completion request for the subfield scoring prompt."""
+        cross_section_info = f"""
+CROSS-SECTION CONTENT ANALYSIS RESULTS:
+Leadership keywords found: {cross_section_content['leadership']['count']} ({', '.join(cross_section_content['leadership']['found_keywords'][:5])})
+Research keywords found: {cross_section_content['research']['count']} ({', '.join(cross_section_content['research']['found_keywords'][:5])})
+Publication keywords found: {cross_section_content['publications']['count']} ({', '.join(cross_section_content['publications']['found_keywords'][:5])})
+Award keywords found: {cross_section_content['awards']['count']} ({', '.join(cross_section_content['awards']['found_keywords'][:5])})
+
+Use this information to enhance your scoring. If keywords are found but sections appear weak, consider the cross-section evidence.
+"""
+        
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "system", "content": "You are an expert resume evaluator. Current Date: September 03, 2025. Provide only valid JSON output following the exact format specified."},
+                {"role": "user", "content": f"{SUBFIELD_SCORING_TEMPLATE}\n\nJob Description:\n{job_description}\n\nResume Text:\n{prompt_text(resume_text, exclude=UNSCORED_SECTIONS)}\n\n{cross_section_info}"}
+            ],
+            "temperature": 0.0,  # Ensure deterministic output
+            "max_tokens": 6000,  # Increased for longer comments
+            "seed": self._get_deterministic_seed_with_resume(job_description, resume_text)
+        }
+    
+    def _build_fused_request(self, job_description: str, resume_text: str, cross_section_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the fused request: the subfield scoring prompt plus the candidate summary fields."""
+        request = self._build_subfield_request(job_description, resume_text, cross_section_content)
+        user_message = request["messages"][-1]
+        request["messages"][-1] = {**user_message, "content": f"{user_message['content']}\n{FUSED_SUMMARY_TEMPLATE}"}
+        request["response_format"] = {"type": "json_object"}
+        request["max_tokens"] = 7500
+        return request
+    
+    def _request_fused_scores(self, job_description: str, resume_text: str, cross_section_content: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the LLM once for the raw subfield scores and the candidate summary."""
+        print("  🤖 Calling LLM for fused subfield scoring and summary...")
+        content = self._chat_completion(**self._build_fused_request(job_description, resume_text, cross_section_content))
+        
+        print("  📝 Parsing LLM response...")
+        return self._parse_fused_response(content)
+    
+    def _parse_fused_response(self, content: str) -> Dict[str, Any]:
+        """Split a fused response into {"subfield_scores": ..., "summary": ...}."""
+        result = json.loads(self._strip_code_fence(content))
+        summary = result.pop("summary", None)
+        if not isinstance(summary, dict):
+            summary = {}
+        return {"subfield_scores": result, "summary": summary}
+    
+    def _build_triage_request(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+        """Build the short, cheap triage request used for the cascade's first pass."""
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [
+                {"role": "user", "content": f"{TRIAGE_TEMPLATE}\nJob Description:\n{job_description[:1500]}\n\nResume Text:\n{prompt_text(resume_text, exclude=UNSCORED_SECTIONS)[:3000]}"}
+            ],
+            "temperature": 0,
+            "seed": self._get_deterministic_seed_with_resume(job_description, resume_text),
+            "max_tokens": 120,
+            "response_format": {"type": "json_object"}
+        }
+    
+    def triage_resume(self, job_description: str, resume_text: str) -> Dict[str, Any]:
         """
-        Extract cross-section content for leadership, research, publications, and awards.
-        Searches all sections for relevant information that might be missed.
+        Cheap first pass for cascade scoring: one short request returning a
+        provisional fit_score (0-100) and a one-sentence reasoning.
         """
-        import re
+        start_time = time.time()
+        print("  🔎 Running triage pass...")
+        content = self._chat_completion(**self._build_triage_request(job_description, resume_text))
+        result = json.loads(self._strip_code_fence(content))
+        fit_score = max(0, min(100, int(result.get("fit_score", 0))))
+        return {
+            "fit_score": fit_score,
+            "reasoning": result.get("reasoning", ""),
+            "processing_time": time.time() - start_time
+        }
+    
+    def _finalize_subfield_scores(self, subfield_scores: Dict[str, Any], candidate_experience: Dict[str, Any],
+                                  job_requirement: Dict[str, Any], cross_section_content: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Replace the experience section with the deterministic experience match, enhance
+        comments with cross-section evidence and fill in any missing sections.
+        """
+        # Step 3: Replace experience section with deterministic calculation
+        print("  ⚡ Applying deterministic experience scoring...")
+        experience_match = self._calculate_experience_match_score(
+            candidate_experience["total_years"], 
+            job_requirement["years_required"]
+        )
         
-        # Use the provided resume text directly
-        text_lower = resume_text.lower()
+        experience_score = experience_match["score"]
+        experience_comment = f"Candidate: {candidate_experience['total_years']:.2f} years ({candidate_experience['total_months']} months). Job requires: {job_requirement['years_required']} years. {experience_match['reason']}. Details: {candidate_experience['calculation_details']}"
         
-        # Define keywords for each section
-        leadership_keywords = [
-            'led', 'managed', 'supervised', 'coordinated', 'oversaw', 'directed',
-            'team lead', 'project lead', 'leadership', 'management', 'supervision',
-            'coordinated team', 'managed team', 'led team', 'oversaw project',
-            'team management', 'project management', 'people management',
-            'student leader', 'club president', 'committee chair', 'president',
-            'vice president', 'treasurer', 'secretary', 'chair', 'coordinator'
-        ]
+        # Apply cascading rules for experience subfields
+        if experience_score == 0:
+            # All experience subfields must be 0
+            subfield_scores["experience"] = {
+                "candidate_years_of_experience_vs_role_expectation_match": 0,
+                "relevancy": 0,
+                "recency": 0,
+                "depth": 0,
+                "impact": 0,
+                "comment": experience_comment
+            }
+        elif experience_score == 1:
+            # Use our deterministic score for the match, but allow other subfields to be scored independently
+            subfield_scores["experience"]["candidate_years_of_experience_vs_role_expectation_match"] = 1
+            subfield_scores["experience"]["comment"] = experience_comment
+            # Other subfields (relevancy, recency, depth, impact) are scored independently by the LLM
+        else:  # experience_score == 2
+            # Other subfields can be scored independently, but use our deterministic score
+            subfield_scores["experience"]["candidate_years_of_experience_vs_role_expectation_match"] = 2
+            subfield_scores["experience"]["comment"] = experience_comment
         
-        research_keywords = [
-            'research', 'investigation', 'study', 'analysis', 'experiment',
-            'thesis', 'dissertation', 'capstone', 'independent study',
-            'research project', 'data analysis', 'statistical analysis',
-            'methodology', 'hypothesis', 'experiment', 'investigation',
-            'scholarly', 'academic research', 'empirical study'
-        ]
+        # Step 4: Enhance comments with cross-section analysis for weak/missing sections
+        print("  🔗 Enhancing comments with cross-section analysis...")
+        subfield_scores = self._enhance_comments_with_cross_section_analysis(
+            subfield_scores, cross_section_content
+        )
         
-        publication_keywords = [
-            'published', 'publication', 'paper', 'journal', 'conference',
-            'article', 'thesis', 'dissertation', 'presentation', 'poster',
-            'academic paper', 'research paper', 'technical paper',
-            'conference paper', 'journal article', 'peer-reviewed',
-            'citation', 'bibliography', 'references'
-        ]
+        # Validate that all required sections are present
+        required_sections = ["experience", "education", "projects", "leadership", "research", 
+                           "skills", "certifications", "awards", "publications"]
         
-        award_keywords = [
-            'award', 'recognition', 'honor', 'achievement', 'excellence',
-            'dean\'s list', 'scholarship', 'fellowship', 'grant',
-            'competition winner', 'award-winning', 'recognized',
-            'honored', 'distinguished', 'outstanding', 'merit',
-            'academic excellence', 'achievement award'
-        ]
+        for section in required_sections:
+            if section not in subfield_scores:
+                # If section is missing, create it with zero scores
+                subfield_scores[section] = self._get_zero_scores_for_section(section)
         
-        # Search for keywords and collect evidence
-        def search_keywords(keywords, section_name):
-            found_keywords = []
-            evidence = []
-            
-            for keyword in keywords:
-                if keyword in text_lower:
-                    found_keywords.append(keyword)
-                    # Find context around the keyword
-                    pattern = rf'.{{0,100}}{re.escape(keyword)}.{{0,100}}'
-                    matches = re.findall(pattern, text_lower, re.IGNORECASE)
-                    # Clean and truncate evidence to avoid overly long strings
-                    for match in matches[:2]:  # Limit to 2 examples
-                        clean_match = match.strip().replace('\n', ' ').replace('  ', ' ')
-                        if len(clean_match) > 150:  # Truncate if too long
-                            clean_match = clean_match[:147] + "..."
-                        evidence.append(clean_match)
-            
-            return {
-                'found_keywords': found_keywords,
-                'evidence': evidence,
-                'count': len(found_keywords)
-            }
+        return subfield_scores
+    
+    def _extract_cross_section_content(self, resume_text: str) -> Dict[str, Any]:
+        """
+        Extract cross-section content for leadership, research, publications, and awards.
+        Searches all sections for relevant information that might be missed.
+        """
+        # Use the provided resume text directly
+        text_lower = resume_text.lower()
         
-        # Search for each section type
-        leadership_info = search_keywords(leadership_keywords, 'leadership')
-        research_info = search_keywords(research_keywords, 'research')
-        publication_info = search_keywords(publication_keywords, 'publications')
-        award_info = search_keywords(award_keywords, 'awards')
+        # One pass finds every keyword hit; each section then reads its own keywords
+        hits = _CROSS_SECTION_MATCHER.occurrences(text_lower)
+        leadership_info = _CROSS_SECTION_MATCHER.search(text_lower, CROSS_SECTION_KEYWORDS['leadership'], hits)
+        research_info = _CROSS_SECTION_MATCHER.search(text_lower, CROSS_SECTION_KEYWORDS['research'], hits)
+        publication_info = _CROSS_SECTION_MATCHER.search(text_lower, CROSS_SECTION_KEYWORDS['publications'], hits)
+        award_info = _CROSS_SECTION_MATCHER.search(text_lower, CROSS_SECTION_KEYWORDS['awards'], hits)
         
         return {
             'leadership': leadership_info,
@@ -1005,15 +1183,39 @@ Use this information to enhance your scoring. If keywords are found but sections
     
     def _calculate_candidate_experience(self, resume_text: str) -> Dict[str, Any]:
         """
-        Calculate total years of professional experience from resume using LLM.
+        Calculate total years of professional experience from resume.
+        Uses the local work-history parser and falls back to the LLM only when
+        the parser's confidence is low.
         """
+        local_experience = self._local_candidate_experience(resume_text)
+        if local_experience is not None:
+            return local_experience
         try:
-            # Get current date dynamically
-            from datetime import datetime
-            current_date = datetime.now()
-            current_month_year = current_date.strftime("%B %Y")
-                        # Create a focused prompt for experience calculation
-            experience_prompt = f"""
+            content = self._chat_completion(**self._build_candidate_experience_request(resume_text))
+            return self._parse_candidate_experience(content, resume_text)
+        except Exception as e:
+            return self._fallback_candidate_experience(resume_text, e)
+    
+    def _local_candidate_experience(self, resume_text: str):
+        """Return the local parser result if it is confident enough, otherwise None."""
+        if not EXPERIENCE_PARSER_ENABLED:
+            return None
+        result = parse_work_history(resume_text)
+        if result["confidence"] >= EXPERIENCE_PARSER_MIN_CONFIDENCE:
+            print(f"  🧮 Experience parsed locally (confidence {result['confidence']:.2f})")
+            return result
+        print(f"  🤖 Local experience parser confidence {result['confidence']:.2f} too low, using LLM...")
+        return None
+    
+    def _build_candidate_experience_request(self, resume_text: str) -> Dict[str, Any]:
+        """Build the chat completion request for the experience calculation prompt."""
+        # Get current date dynamically
+        from datetime import datetime
+        current_date = datetime.now()
+        current_month_year = current_date.strftime("%B %Y")
+        
+        # Create a focused prompt for experience calculation
+        experience_prompt = f"""
             You are an expert at calculating total years of experience from resume text.
             
             IMPORTANT: Use the current date as {current_month_year} for all calculations.
@@ -1050,7 +1252,7 @@ Use this information to enhance your scoring. If keywords are found but sections
                 ⚠️  The example values (23 months, 1.9167 years) are NOT real data - they are just for demonstration.
             
             Resume Text:
-            {resume_text}
+            {prompt_text(resume_text, include=EXPERIENCE_PROMPT_SECTIONS)}
             
             Return ONLY a JSON object with:
             {{
@@ -1059,204 +1261,195 @@ Use this information to enhance your scoring. If keywords are found but sections
                 "calculation_details": "<detailed explanation ending with: Total: X months = X/12 = Y years>"
             }}
             """
-            
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": experience_prompt}],
-                temperature=0,
-                seed=self._get_deterministic_seed_with_resume("", resume_text),
-                max_tokens=1000
-            )
-            
-            content = response.choices[0].message.content.strip()
-            
-            
-            # Extract JSON from the response (handle potential markdown formatting)
-            if content.startswith("```json"):
-                content = content[7:-3]
+        
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": experience_prompt}],
+            "temperature": 0,
+            "seed": self._get_deterministic_seed_with_resume("", resume_text),
+            "max_tokens": 1000
+        }
+    
+    def _parse_candidate_experience(self, content: str, resume_text: str) -> Dict[str, Any]:
+        """Parse the experience calculation response and re-validate its arithmetic."""
+        from datetime import datetime
+        
+        # Extract JSON from the response (handle potential markdown formatting)
+        result = json.loads(self._strip_code_fence(content))
+        
+        # Mathematical validation and recalculation
+        if "calculation_details" in result:
+            import re
+            details = result["calculation_details"]
+            
+            # Extract the sum calculation: "Total: 25 + 2 + 2 + 6 = 35 months"
+            sum_match = re.search(r"Total: ([\d\s\+\=]+) = (\d+) months", details)
+            if sum_match:
+                # Get the sum expression: "25 + 2 + 2 + 6"
+                sum_expression = sum_match.group(1).replace(" ", "").replace("=", "")
                 
-            elif content.startswith("```"):
-                content = content[3:-3]
+                # Calculate the actual sum
+                numbers = [int(x) for x in sum_expression.split("+")]
+                actual_total_months = sum(numbers)
                 
-            
-            
-            result = json.loads(content)
-            
-            # Mathematical validation and recalculation
-            if "calculation_details" in result:
-                import re
-                details = result["calculation_details"]
+                # Calculate correct years
+                actual_total_years = actual_total_months / 12
                 
-                # Extract the sum calculation: "Total: 25 + 2 + 2 + 6 = 35 months"
-                sum_match = re.search(r"Total: ([\d\s\+\=]+) = (\d+) months", details)
-                if sum_match:
-                    # Get the sum expression: "25 + 2 + 2 + 6"
-                    sum_expression = sum_match.group(1).replace(" ", "").replace("=", "")
+                # Override with correct values
+                result["total_months"] = actual_total_months
+                result["total_years"] = actual_total_years
+                print(f"  🔧 Math validation: {actual_total_years:.2f} years ({actual_total_months} months)")
+        # Validation: Check for incorrect "Present" date calculations
+        if "calculation_details" in result:
+            details = result["calculation_details"]
+            if "0 months" in details and "Present" in resume_text:
+                print(f"  ⚠️  WARNING: Detected 0 months for Present date - this may be incorrect")
+                print(f"  📅 Current date used: {datetime.now().strftime('%B %Y')}")
+        result.setdefault("method", "llm")
+        return result
+
+    def _fallback_candidate_experience(self, resume_text: str, e: Exception) -> Dict[str, Any]:
+        """Manual calculation used when the LLM experience calculation fails."""
+        # Fallback: Manual calculation based on the resume data
+        try:
+            total_months = 0
+            calculation_details = []
+            
+            if "experience" in resume_text:
+                for exp in resume_text["experience"]:
+                    duration = exp.get("duration", "")
+                    title = exp.get("title", "")
                     
-                    # Calculate the actual sum
-                    numbers = [int(x) for x in sum_expression.split("+")]
-                    actual_total_months = sum(numbers)
                     
-                    # Calculate correct years
-                    actual_total_years = actual_total_months / 12
                     
-                    # Override with correct values
-                    result["total_months"] = actual_total_months
-                    result["total_years"] = actual_total_years
-                    print(f"  🔧 Math validation: {actual_total_years:.2f} years ({actual_total_months} months)")
-            # Validation: Check for incorrect "Present" date calculations
-            if "calculation_details" in result:
-                details = result["calculation_details"]
-                if "0 months" in details and "Present" in resume_text:
-                    print(f"  ⚠️  WARNING: Detected 0 months for Present date - this may be incorrect")
-                    print(f"  📅 Current date used: {current_month_year}")
-            return result
-
-            
-        except Exception as e:
-            
-            
-            # Fallback: Manual calculation based on the resume data
-            try:
-                total_months = 0
-                calculation_details = []
-                
-                if "experience" in resume_text:
-                    for exp in resume_text["experience"]:
-                        duration = exp.get("duration", "")
-                        title = exp.get("title", "")
-                        
-                        
-                        
-                        # Count all experience (including internships/co-ops as they are relevant experience)
-                        # Only skip if explicitly stated as part-time or unpaid
-                        
-                        # Parse duration dynamically - handle various formats
-                        import re
-                        from datetime import datetime
-                        
-                        # Multiple patterns to handle various duration formats
-                        patterns = [
-                            # "January 2024 - June 2024" or "Jan 2024-Jun 2024"
-                            r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)\s+(\d{4})',
-                            # "January 2024 - June" (same year)
-                            r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)',
-                            # "Jan 2024 - Present" or "Jan 2024 - Current"
-                            r'(\w+)\s+(\d{4})\s*[-–]\s*(present|current|now)',
-                            # "2024 - 2025" (year range)
-                            r'(\d{4})\s*[-–]\s*(\d{4})',
-                            # "Jan 2024 to Jun 2024" or "Jan 2024 to Present"
-                            r'(\w+)\s+(\d{4})\s+to\s+(\w+)\s*(\d{4})?',
-                            # "2024.01 - 2024.06" (YYYY.MM format)
-                            r'(\d{4})\.(\d{2})\s*[-–]\s*(\d{4})\.(\d{2})',
-                            # "01/2024 - 06/2024" (MM/YYYY format)
-                            r'(\d{1,2})/(\d{4})\s*[-–]\s*(\d{1,2})/(\d{4})',
-                        ]
-                        
-                        months_calculated = False
-                        
-                        for pattern in patterns:
-                            match = re.search(pattern, duration, re.IGNORECASE)
-                            if match:
-                                
-                                
-                                groups = match.groups()
+                    # Count all experience (including internships/co-ops as they are relevant experience)
+                    # Only skip if explicitly stated as part-time or unpaid
+                    
+                    # Parse duration dynamically - handle various formats
+                    import re
+                    from datetime import datetime
+                    
+                    # Multiple patterns to handle various duration formats
+                    patterns = [
+                        # "January 2024 - June 2024" or "Jan 2024-Jun 2024"
+                        r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)\s+(\d{4})',
+                        # "January 2024 - June" (same year)
+                        r'(\w+)\s+(\d{4})\s*[-–]\s*(\w+)',
+                        # "Jan 2024 - Present" or "Jan 2024 - Current"
+                        r'(\w+)\s+(\d{4})\s*[-–]\s*(present|current|now)',
+                        # "2024 - 2025" (year range)
+                        r'(\d{4})\s*[-–]\s*(\d{4})',
+                        # "Jan 2024 to Jun 2024" or "Jan 2024 to Present"
+                        r'(\w+)\s+(\d{4})\s+to\s+(\w+)\s*(\d{4})?',
+                        # "2024.01 - 2024.06" (YYYY.MM format)
+                        r'(\d{4})\.(\d{2})\s*[-–]\s*(\d{4})\.(\d{2})',
+                        # "01/2024 - 06/2024" (MM/YYYY format)
+                        r'(\d{1,2})/(\d{4})\s*[-–]\s*(\d{1,2})/(\d{4})',
+                    ]
+                    
+                    months_calculated = False
+                    
+                    for pattern in patterns:
+                        match = re.search(pattern, duration, re.IGNORECASE)
+                        if match:
+                            
+                            
+                            groups = match.groups()
+                            
+                            try:
+                                # Convert month names to numbers
+                                month_map = {
+                                    'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
+                                    'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
+                                    'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
+                                    'november': 11, 'nov': 11, 'december': 12, 'dec': 12
+                                }
                                 
-                                try:
-                                    # Convert month names to numbers
-                                    month_map = {
-                                        'january': 1, 'jan': 1, 'february': 2, 'feb': 2, 'march': 3, 'mar': 3,
-                                        'april': 4, 'apr': 4, 'may': 5, 'june': 6, 'jun': 6, 'july': 7, 'jul': 7,
-                                        'august': 8, 'aug': 8, 'september': 9, 'sep': 9, 'october': 10, 'oct': 10,
-                                        'november': 11, 'nov': 11, 'december': 12, 'dec': 12
-                                    }
-                                    
-                                    # Handle different pattern types
-                                    if len(groups) == 4 and groups[0].isalpha() and groups[2].isalpha():
-                                        # "January 2024 - June 2024"
-                                        start_month, start_year, end_month, end_year = groups
-                                        start_month_num = month_map.get(start_month.lower(), 1)
-                                        end_month_num = month_map.get(end_month.lower(), 1)
-                                        start_date = datetime(int(start_year), start_month_num, 1)
-                                        end_date = datetime(int(end_year), end_month_num, 1)
-                                        
-                                    elif len(groups) == 3 and groups[0].isalpha():
-                                        # "January 2024 - June" or "Jan 2024 - Present"
-                                        start_month, start_year, end_part = groups
-                                        start_month_num = month_map.get(start_month.lower(), 1)
-                                        start_date = datetime(int(start_year), start_month_num, 1)
-                                        
-                                        if end_part.lower() in ['present', 'current', 'now']:
-                                            # Use current date for "Present"
-                                            end_date = datetime.now()
-                                        else:
-                                            # Same year
-                                            end_month_num = month_map.get(end_part.lower(), 1)
-                                            end_date = datetime(int(start_year), end_month_num, 1)
-                                            
-                                    elif len(groups) == 2 and groups[0].isdigit() and len(groups[0]) == 4:
-                                        # "2024 - 2025" (year range)
-                                        start_year, end_year = groups
-                                        start_date = datetime(int(start_year), 1, 1)
-                                        end_date = datetime(int(end_year), 12, 1)
-                                        
-                                    elif len(groups) == 4 and groups[0].isdigit() and len(groups[0]) == 4:
-                                        # "2024.01 - 2024.06" (YYYY.MM format)
-                                        start_year, start_month, end_year, end_month = groups
-                                        start_date = datetime(int(start_year), int(start_month), 1)
-                                        end_date = datetime(int(end_year), int(end_month), 1)
-                                        
-                                    elif len(groups) == 4 and len(groups[0]) <= 2:
-                                        # "01/2024 - 06/2024" (MM/YYYY format)
-                                        start_month, start_year, end_month, end_year = groups
-                                        start_date = datetime(int(start_year), int(start_month), 1)
-                                        end_date = datetime(int(end_year), int(end_month), 1)
-                                    
-                                    # Calculate months difference (inclusive)
-                                    months_diff = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month) + 1
+                                # Handle different pattern types
+                                if len(groups) == 4 and groups[0].isalpha() and groups[2].isalpha():
+                                    # "January 2024 - June 2024"
+                                    start_month, start_year, end_month, end_year = groups
+                                    start_month_num = month_map.get(start_month.lower(), 1)
+                                    end_month_num = month_map.get(end_month.lower(), 1)
+                                    start_date = datetime(int(start_year), start_month_num, 1)
+                                    end_date = datetime(int(end_year), end_month_num, 1)
                                     
+                                elif len(groups) == 3 and groups[0].isalpha():
+                                    # "January 2024 - June" or "Jan 2024 - Present"
+                                    start_month, start_year, end_part = groups
+                                    start_month_num = month_map.get(start_month.lower(), 1)
+                                    start_date = datetime(int(start_year), start_month_num, 1)
                                     
-                                    
-                                    # Ensure positive months and reasonable range
-                                    if 0 < months_diff <= 120:  # Max 10 years per role
-                                        total_months += months_diff
-                                        calculation_details.append(f"Counted {title}: {duration} = {months_diff} months")
-                                        months_calculated = True
-                                        break
+                                    if end_part.lower() in ['present', 'current', 'now']:
+                                        # Use current date for "Present"
+                                        end_date = datetime.now()
                                     else:
-                                        calculation_details.append(f"Skipped {title}: {duration} (unreasonable duration: {months_diff} months)")
-                                        months_calculated = True
-                                        break
+                                        # Same year
+                                        end_month_num = month_map.get(end_part.lower(), 1)
+                                        end_date = datetime(int(start_year), end_month_num, 1)
                                         
-                                except (ValueError, TypeError) as e:
-                                    calculation_details.append(f"Skipped {title}: {duration} (parsing error: {str(e)})")
+                                elif len(groups) == 2 and groups[0].isdigit() and len(groups[0]) == 4:
+                                    # "2024 - 2025" (year range)
+                                    start_year, end_year = groups
+                                    start_date = datetime(int(start_year), 1, 1)
+                                    end_date = datetime(int(end_year), 12, 1)
+                                    
+                                elif len(groups) == 4 and groups[0].isdigit() and len(groups[0]) == 4:
+                                    # "2024.01 - 2024.06" (YYYY.MM format)
+                                    start_year, start_month, end_year, end_month = groups
+                                    start_date = datetime(int(start_year), int(start_month), 1)
+                                    end_date = datetime(int(end_year), int(end_month), 1)
                                     
+                                elif len(groups) == 4 and len(groups[0]) <= 2:
+                                    # "01/2024 - 06/2024" (MM/YYYY format)
+                                    start_month, start_year, end_month, end_year = groups
+                                    start_date = datetime(int(start_year), int(start_month), 1)
+                                    end_date = datetime(int(end_year), int(end_month), 1)
+                                
+                                # Calculate months difference (inclusive)
+                                months_diff = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month) + 1
+                                
+                                
+                                
+                                # Ensure positive months and reasonable range
+                                if 0 < months_diff <= 120:  # Max 10 years per role
+                                    total_months += months_diff
+                                    calculation_details.append(f"Counted {title}: {duration} = {months_diff} months")
+                                    months_calculated = True
+                                    break
+                                else:
+                                    calculation_details.append(f"Skipped {title}: {duration} (unreasonable duration: {months_diff} months)")
                                     months_calculated = True
                                     break
+                                    
+                            except (ValueError, TypeError) as e:
+                                calculation_details.append(f"Skipped {title}: {duration} (parsing error: {str(e)})")
+                                
+                                months_calculated = True
+                                break
+                    
+                    if not months_calculated:
+                        calculation_details.append(f"Skipped {title}: {duration} (could not parse dates)")
                         
-                        if not months_calculated:
-                            calculation_details.append(f"Skipped {title}: {duration} (could not parse dates)")
-                            
-                
-                total_years = total_months / 12.0
-                details = "; ".join(calculation_details) if calculation_details else "No professional experience found"
-                
-                
-                
-                return {
-                    "total_months": total_months,
-                    "total_years": total_years,
-                    "calculation_details": f"Fallback calculation: {details}. Total: {total_months} months = {total_years:.2f} years"
-                }
-                
-            except Exception as fallback_error:
-                
-                return {
-                    "total_months": 0,
-                    "total_years": 0,
-                    "calculation_details": f"Error in calculation: {str(e)}. Fallback also failed: {str(fallback_error)}"
-                }
+            
+            total_years = total_months / 12.0
+            details = "; ".join(calculation_details) if calculation_details else "No professional experience found"
+            
+            
+            
+            return {
+                "total_months": total_months,
+                "total_years": total_years,
+                "calculation_details": f"Fallback calculation: {details}. Total: {total_months} months = {total_years:.2f} years"
+            }
+            
+        except Exception as fallback_error:
+            
+            return {
+                "total_months": 0,
+                "total_years": 0,
+                "calculation_details": f"Error in calculation: {str(e)}. Fallback also failed: {str(fallback_error)}"
+            }
     
     def _parse_calculation_details(self, calculation_details: str) -> Dict[str, float]:
         """
@@ -1308,19 +1501,56 @@ Use this information to enhance your scoring. If keywords are found but sections
     
     def _extract_job_experience_requirement(self, job_description: str) -> Dict[str, Any]:
         """
-        Extract years of experience required and job level from job description using LLM.
-        This is the preferred method as LLM analysis is more sophisticated than regex patterns.
+        Extract years of experience required and job level from job description.
+        Rule-based extraction is used when the years requirement and title cues agree;
+        the LLM is only called when they conflict or are missing.
         """
         try:
             # Check cache first for deterministic behavior
-            cache_key = hashlib.md5(job_description.encode()).hexdigest()
+            cache_key = self._job_requirement_cache_key(job_description)
             if cache_key in self.job_level_cache:
                 print("  ✅ Using cached job level extraction...")
                 return self.job_level_cache[cache_key]
-        
-
-            # Create a focused prompt for job requirement and level extraction
-            requirement_prompt = f"""
+            
+            # Concurrent callers for the same job share one in-flight extraction
+            result = self.single_flight.do(
+                ("job_requirement", cache_key), lambda: self._request_job_requirement(job_description)
+            )
+            
+            # Cache the result for deterministic behavior
+            self.job_level_cache[cache_key] = result
+            return result
+            
+        except Exception as e:
+            return self._fallback_job_requirement(e)
+    
+    def _request_job_requirement(self, job_description: str) -> Dict[str, Any]:
+        """Extract the job requirement with the local rules, or the LLM when they are inconclusive."""
+        result = self._local_job_requirement(job_description)
+        if result is not None:
+            return result
+        content = self._chat_completion(**self._build_job_requirement_request(job_description))
+        return self._parse_job_requirement(content)
+    
+    def _local_job_requirement(self, job_description: str):
+        """Return the rule-based job requirement if its signals agree, otherwise None."""
+        if not JOB_REQUIREMENT_RULES_ENABLED:
+            return None
+        result = extract_job_requirement(job_description)
+        if result.pop("resolved"):
+            print(f"  📏 Job requirement extracted by rules: {result['years_required']} years, {result['job_level']} level")
+            return result
+        print(f"  🤖 Job requirement rules inconclusive ({result['extraction_details']}), using LLM...")
+        return None
+    
+    @staticmethod
+    def _job_requirement_cache_key(job_description: str) -> str:
+        return hashlib.md5(job_description.encode()).hexdigest()
+    
+    def _build_job_requirement_request(self, job_description: str) -> Dict[str, Any]:
+        """Build the chat completion request for job requirement and level extraction."""
+        # Create a focused prompt for job requirement and level extraction
+        requirement_prompt = f"""
             Analyze the job description to extract both the years of experience required and the job level.
             
             Job Description:
@@ -1343,56 +1573,51 @@ Use this information to enhance your scoring. If keywords are found but sections
                 "extraction_details": "<explanation of what was found and level determination>"
             }}
             """
-            
-            response = self.client.chat.completions.create(
-                model="gpt-4o-mini",
-                messages=[{"role": "user", "content": requirement_prompt}],
-                temperature=0,
-                seed=self._get_deterministic_seed(job_description),
-                max_tokens=800
-            )
-            
-            content = response.choices[0].message.content.strip()
-            # Extract JSON from the response (handle potential markdown formatting)
-            if content.startswith("```json"):
-                content = content[7:-3]
-            elif content.startswith("```"):
-                content = content[3:-3]
-            
-            result = json.loads(content)
-            
-            # Mathematical validation and recalculation
-            if "calculation_details" in result:
-                import re
-                details = result["calculation_details"]
+        
+        return {
+            "model": "gpt-4o-mini",
+            "messages": [{"role": "user", "content": requirement_prompt}],
+            "temperature": 0,
+            "seed": self._get_deterministic_seed(job_description),
+            "max_tokens": 800
+        }
+    
+    def _parse_job_requirement(self, content: str) -> Dict[str, Any]:
+        """Parse the job requirement extraction response."""
+        # Extract JSON from the response (handle potential markdown formatting)
+        result = json.loads(self._strip_code_fence(content))
+        
+        # Mathematical validation and recalculation
+        if "calculation_details" in result:
+            import re
+            details = result["calculation_details"]
+            
+            # Extract the sum calculation: "Total: 25 + 2 + 2 + 6 = 35 months"
+            sum_match = re.search(r"Total: ([\d\s\+\=]+) = (\d+) months", details)
+            if sum_match:
+                # Get the sum expression: "25 + 2 + 2 + 6"
+                sum_expression = sum_match.group(1).replace(" ", "").replace("=", "")
                 
-                # Extract the sum calculation: "Total: 25 + 2 + 2 + 6 = 35 months"
-                sum_match = re.search(r"Total: ([\d\s\+\=]+) = (\d+) months", details)
-                if sum_match:
-                    # Get the sum expression: "25 + 2 + 2 + 6"
-                    sum_expression = sum_match.group(1).replace(" ", "").replace("=", "")
-                    
-                    # Calculate the actual sum
-                    numbers = [int(x) for x in sum_expression.split("+")]
-                    actual_total_months = sum(numbers)
-                    
-                    # Calculate correct years
-                    actual_total_years = actual_total_months / 12
-                    
-                    # Override with correct values
-                    result["total_months"] = actual_total_months
-                    result["total_years"] = actual_total_years
-                    
-            # Cache the result for deterministic behavior
-            self.job_level_cache[cache_key] = result
-            return result
-            
-        except Exception as e:
-            return {
-                "years_required": 0,
-                "job_level": "entry",
-                "extraction_details": f"Error in extraction: {str(e)}"
-            }
+                # Calculate the actual sum
+                numbers = [int(x) for x in sum_expression.split("+")]
+                actual_total_months = sum(numbers)
+                
+                # Calculate correct years
+                actual_total_years = actual_total_months / 12
+                
+                # Override with correct values
+                result["total_months"] = actual_total_months
+                result["total_years"] = actual_total_years
+        result.setdefault("method", "llm")
+        return result
+    
+    @staticmethod
+    def _fallback_job_requirement(e: Exception) -> Dict[str, Any]:
+        return {
+            "years_required": 0,
+            "job_level": "entry",
+            "extraction_details": f"Error in extraction: {str(e)}"
+        }
     
     def _calculate_experience_match_score(self, candidate_years: float, required_years: float) -> Dict[str, Any]:
         """
@@ -1444,18 +1669,8 @@ Use this information to enhance your scoring. If keywords are found but sections
             section_scores = {}
             total_weighted_score = 0.0
             
-            # Define the subfield mappings for each section
-            section_subfields = {
-                "experience": ["candidate_years_of_experience_vs_role_expectation_match", "relevancy", "recency", "depth", "impact"],
-                "education": ["alignment", "level", "institution_reputation"],
-                "projects": ["relevance", "complexity", "outcome"],
-                "leadership": ["initiative", "scope", "influence"],
-                "research": ["domain_relevance", "novelty", "publication_impact"],
-                "skills": ["alignment", "coverage", "proficiency"],
-                "certifications": ["relevance", "recognition", "recency"],
-                "awards": ["prestige", "relevance", "selectivity"],
-                "publications": ["venue_quality", "topic_alignment", "impact"]
-            }
+            # Subfield mappings for each section (shared with the stored score matrix)
+            section_subfields = SECTION_SUBFIELDS
             
             print("  📊 Calculating section scores and weighted contributions...")
             
@@ -1467,10 +1682,11 @@ Use this information to enhance your scoring. If keywords are found but sections
                     scores = []
                     
                     for subfield in subfields:
-                        if subfield in section_data and isinstance(section_data[subfield], (int, float)):
-                            scores.append(section_data[subfield])
+                        value = section_data.get(subfield)
+                        if isinstance(value, (int, float)) and not isinstance(value, bool):
+                            scores.append(value)
                         else:
-                            scores.append(0)  # Default to 0 if subfield missing or invalid
+                            scores.append(0)  # Default to 0 if subfield missing or invalid (a bool is not a score)
                     
                     # Calculate average score for this section
                     if scores:
@@ -1520,10 +1736,43 @@ Use this information to enhance your scoring. If keywords are found but sections
         except Exception as e:
             raise Exception(f"Error in final score computation: {str(e)}")
     
-    def score_resume(self, job_description: str, resume_text: str) -> Dict[str, Any]:
+    def apply_job_profile(self, job_description: str, job_profile: Dict[str, Any]) -> bool:
+        """
+        Seed the job-level caches from a precomputed job profile (see job_profile).
+        Returns False, and leaves the caches alone, if the profile belongs to a different description.
+        """
+        if not is_profile_current(job_profile, job_description):
+            print("  ⚠️  Job profile is stale for this job description, recomputing job-level phases...")
+            return False
+        job_requirement = job_profile["job_requirement"]
+        self.job_level_cache[self._job_requirement_cache_key(job_description)] = job_requirement
+        section_weights_key = self._section_weights_cache_key(job_description, job_requirement.get("job_level", "entry"))
+        self.section_weights_cache[section_weights_key] = job_profile["section_weights"]
+        return True
+    
+    def score_resume(self, job_description: str, resume_text: str, job_profile: Dict[str, Any] = None,
+                     fused: bool = False, resume_artifacts: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Main method to score a resume against a job description with real-time streaming output.
         Returns complete scoring breakdown with all phases.
+        
+        Independent phases run concurrently through a PhaseExecutor:
+        job requirement -> section weights, candidate experience and the subfield LLM call
+        only meet when the subfield scores are finalized. Per-phase timings are
+        reported under "phase_timings".
+        
+        With a current job_profile the job requirement and section weights are taken
+        from it, so only resume-dependent calls are made.
+        
+        In fused mode the subfield scoring request also returns the candidate summary
+        (candidate_name, summary_points, skill_matrix, timeline, logistics), which is
+        reported under "summary".
+        
+        resume_artifacts holds job-independent results from an earlier analysis of the
+        same resume ("candidate_experience", "cross_section_content"); those phases are
+        reused instead of rerun. Phases that were not run are listed under "skipped_phases".
+        A stored "section_index" that still matches resume_text is used for prompt
+        trimming instead of segmenting the text again.
         """
         start_time = time.time()
         
@@ -1531,37 +1780,101 @@ Use this information to enhance your scoring. If keywords are found but sections
         print("=" * 80)
         
         try:
-            # Phase 1: Assign section weights
-            print("📊 Phase 1: Assigning section weights...")
-            section_weights = self.assign_section_weights(job_description)
-            
-            print()
-            
-            # Phase 2: Score subfields
-            print("📊 Phase 2: Scoring subfields...")
-            subfield_scores = self.score_subfields(job_description, resume_text, section_weights)
-            
-            print()
+            executor = PhaseExecutor()
+            skipped_phases = []
+            resume_artifacts = resume_artifacts or {}
+            if is_index_current(resume_artifacts.get("section_index"), resume_text):
+                remember_section_index(resume_text, resume_artifacts["section_index"])
+            if job_profile is not None and self.apply_job_profile(job_description, job_profile):
+                print("  ✅ Using precomputed job profile...")
+                executor.add("job_requirement", lambda: job_profile["job_requirement"])
+                executor.add("section_weights", lambda: job_profile["section_weights"])
+                skipped_phases += ["job_requirement", "section_weights"]
+            else:
+                executor.add("job_requirement", lambda: self._extract_job_experience_requirement(job_description))
+                executor.add(
+                    "section_weights",
+                    lambda job_requirement: self.assign_section_weights(job_description),
+                    depends_on=["job_requirement"]
+                )
+            
+            subfield_cache_key = self._subfield_cache_key(job_description, resume_text)
+            cached_subfield_scores = self.subfield_scores_cache.get(subfield_cache_key)
+            cached_summary = self.summary_cache.get(subfield_cache_key)
+            if cached_subfield_scores is not None and (not fused or cached_summary is not None):
+                print("  ✅ Using cached subfield scores...")
+                executor.add("subfield_scores", lambda: cached_subfield_scores)
+                # Keep supplied artifacts so they are saved again and the next rescore can reuse them
+                executor.add("candidate_experience", lambda: resume_artifacts.get("candidate_experience") or {})
+                executor.add("cross_section_content", lambda: resume_artifacts.get("cross_section_content") or {})
+                skipped_phases += ["candidate_experience", "cross_section_content", "raw_subfield_scores", "subfield_scores"]
+                if fused:
+                    executor.add("summary", lambda: cached_summary)
+            else:
+                stored_experience = resume_artifacts.get("candidate_experience")
+                if self._is_reusable_experience(stored_experience):
+                    print("  ✅ Reusing stored candidate experience...")
+                    executor.add("candidate_experience", lambda: stored_experience)
+                    skipped_phases.append("candidate_experience")
+                else:
+                    executor.add("candidate_experience", lambda: self._calculate_candidate_experience(resume_text))
+                stored_cross_section = resume_artifacts.get("cross_section_content")
+                if stored_cross_section and set(CROSS_SECTION_KEYWORDS) <= set(stored_cross_section):
+                    executor.add("cross_section_content", lambda: stored_cross_section)
+                    skipped_phases.append("cross_section_content")
+                else:
+                    executor.add("cross_section_content", lambda: self._extract_cross_section_content(resume_text))
+                if fused:
+                    executor.add(
+                        "fused_response",
+                        lambda cross_section_content: self._request_fused_scores(job_description, resume_text, cross_section_content),
+                        depends_on=["cross_section_content"]
+                    )
+                    executor.add("raw_subfield_scores", lambda fused_response: fused_response["subfield_scores"],
+                                 depends_on=["fused_response"])
+                    executor.add("summary", self._cache_summary(subfield_cache_key), depends_on=["fused_response"])
+                else:
+                    executor.add(
+                        "raw_subfield_scores",
+                        lambda cross_section_content: self._request_subfield_scores(job_description, resume_text, cross_section_content),
+                        depends_on=["cross_section_content"]
+                    )
+                executor.add(
+                    "subfield_scores",
+                    self._finalize_and_cache_subfield_scores(job_description, resume_text),
+                    depends_on=["raw_subfield_scores", "candidate_experience", "job_requirement", "cross_section_content"]
+                )
+            
+            executor.add(
+                "final_score",
+                lambda section_weights, subfield_scores: self.compute_final_score(section_weights, subfield_scores),
+                depends_on=["section_weights", "subfield_scores"]
+            )
             
-            # Phase 3: Compute final score
-            print("📊 Phase 3: Computing final score...")
-            final_score = self.compute_final_score(section_weights, subfield_scores)
+            print("📊 Running scoring phases (independent phases in parallel)...")
+            results, phase_timings = executor.run()
             
             print()
             
-            # Get job level for transparency (using LLM-based analysis)
-            job_requirement = self._extract_job_experience_requirement(job_description)
+            job_requirement = results["job_requirement"]
             job_level = job_requirement.get("job_level", "entry")
             
             # Compile complete result
             result = {
                 "job_level": job_level,
                 "experience_education_ratio": {"entry": 1.0, "mid": 2.0, "senior": 3.0}.get(job_level, 1.0),
-                "section_weights": section_weights,
-                "subfield_scores": subfield_scores,
-                "final_score": final_score,
+                "section_weights": results["section_weights"],
+                "subfield_scores": results["subfield_scores"],
+                "final_score": results["final_score"],
+                "candidate_experience": results["candidate_experience"],
+                "cross_section_content": results["cross_section_content"],
+                "job_requirements": job_requirement,
+                "phase_timings": phase_timings,
+                "skipped_phases": skipped_phases,
                 "processing_time": time.time() - start_time
             }
+            if fused:
+                result["summary"] = results["summary"]
             
             print(f"⏱️  Total processing time: {result['processing_time']:.2f} seconds")
             print("=" * 80)
@@ -1570,6 +1883,28 @@ Use this information to enhance your scoring. If keywords are found but sections
             
         except Exception as e:
             raise Exception(f"Error in resume scoring: {str(e)}")
+    
+    @staticmethod
+    def _is_reusable_experience(candidate_experience: Dict[str, Any]) -> bool:
+        """True for a stored experience calculation from the local parser or the LLM (not an error fallback)."""
+        return bool(candidate_experience) and candidate_experience.get("method") in ("local_parser", "llm")
+    
+    def _finalize_and_cache_subfield_scores(self, job_description: str, resume_text: str):
+        """Build the phase function that finalizes subfield scores and stores them in the cache."""
+        def finalize(raw_subfield_scores, candidate_experience, job_requirement, cross_section_content):
+            subfield_scores = self._finalize_subfield_scores(
+                raw_subfield_scores, candidate_experience, job_requirement, cross_section_content
+            )
+            self.subfield_scores_cache[self._subfield_cache_key(job_description, resume_text)] = subfield_scores
+            return subfield_scores
+        return finalize
+    
+    def _cache_summary(self, cache_key: str):
+        """Build the phase function that takes the summary from a fused response and caches it."""
+        def store(fused_response):
+            self.summary_cache[cache_key] = fused_response["summary"]
+            return fused_response["summary"]
+        return store
 
 def main():
     """Example usage of the ResumeScorer."""
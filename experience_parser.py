@@ -0,0 +1,189 @@
+"""
+Deterministic work-history parser.
+
+Finds employment date ranges in resume text ("Jan 2020 – Present",
+"2019-2021", "03/2018 to 11/2019", "2020.01 - 2021.06", ...), restricted to the
+work experience section when one can be found, and totals them in months.
+
+Months are counted inclusively, as in the scorer's experience prompt:
+"November 2020 - May 2021" is 7 months. Overlapping ranges are counted as
+separate experiences by default, matching the existing scoring rule. With
+merge_overlaps=True each calendar month is counted once.
+
+The result carries a confidence value. The scorer only trusts it above
+EXPERIENCE_PARSER_MIN_CONFIDENCE and otherwise falls back to the LLM.
+"""
+import os
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+EXPERIENCE_PARSER_ENABLED = os.environ.get('EXPERIENCE_PARSER_ENABLED', 'true').lower() == 'true'
+EXPERIENCE_PARSER_MIN_CONFIDENCE = float(os.environ.get('EXPERIENCE_PARSER_MIN_CONFIDENCE', 0.7))
+EXPERIENCE_MERGE_OVERLAPS = os.environ.get('EXPERIENCE_MERGE_OVERLAPS', 'false').lower() == 'true'
+
+MONTHS = {
+    'jan': 1, 'january': 1, 'feb': 2, 'february': 2, 'mar': 3, 'march': 3, 'apr': 4, 'april': 4,
+    'may': 5, 'jun': 6, 'june': 6, 'jul': 7, 'july': 7, 'aug': 8, 'august': 8,
+    'sep': 9, 'sept': 9, 'september': 9, 'oct': 10, 'october': 10, 'nov': 11, 'november': 11,
+    'dec': 12, 'december': 12,
+}
+
+# Section headers that start and end the work experience section
+EXPERIENCE_HEADERS = (
+    'work experience', 'professional experience', 'employment history', 'employment',
+    'work history', 'career history', 'relevant experience', 'experience',
+)
+OTHER_HEADERS = (
+    'education', 'projects', 'academic projects', 'personal projects', 'skills', 'technical skills',
+    'certifications', 'certificates', 'awards', 'honors', 'publications', 'research', 'leadership',
+    'volunteer', 'volunteering', 'activities', 'extracurricular activities', 'interests', 'languages',
+    'references', 'summary', 'objective', 'profile', 'coursework', 'achievements',
+)
+
+_MONTH_NAME = r'(?P<{p}mon>' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?,?'
+_YEAR = r'(?P<{p}year>(?:19|20)\d{{2}})'
+
+
+def _date_pattern(prefix: str) -> str:
+    """Regex for one date, with group names prefixed so start and end can share a pattern."""
+    p = prefix
+    return (
+        r'(?:'
+        + _MONTH_NAME.format(p=p) + r"\s*'?" + _YEAR.format(p=p)                      # Jan 2020, Sept. 2019
+        + r'|(?P<{p}mm>0?[1-9]|1[0-2])\s*/\s*(?P<{p}mmyear>(?:19|20)\d{{2}})'.format(p=p)  # 01/2020
+        + r'|(?P<{p}ymyear>(?:19|20)\d{{2}})[./-](?P<{p}ymmm>0[1-9]|1[0-2])(?!\d)'.format(p=p)  # 2020-01, 2020.01
+        + r'|(?P<{p}onlyyear>(?:19|20)\d{{2}})(?![\d/.])'.format(p=p)                    # 2019
+        + r')'
+    )
+
+
+_PRESENT = r'(?P<present>present|current(?:ly)?|now|today|ongoing|to\s+date|date)'
+_END_MONTH_ONLY = r'(?P<endmononly>' + '|'.join(sorted(MONTHS, key=len, reverse=True)) + r')\.?(?![a-z])'
+_SEPARATOR = r'\s*(?:-|–|—|~|\bto\b|\buntil\b|\btill\b|\bthrough\b|\bthru\b)\s*'
+
+# Not preceded by a letter, digit or "-" and not followed by "-<digit>", so digit
+# runs such as phone numbers ("555-2019-2020") are not read as ranges
+DATE_RANGE_RE = re.compile(
+    r'(?<![\w/.-])' + _date_pattern('s_') + _SEPARATOR
+    + r'(?:' + _PRESENT + r'|' + _date_pattern('e_') + r'|' + _END_MONTH_ONLY + r')(?!-\d)',
+    re.IGNORECASE
+)
+
+
+def _month_index(year: int, month: int) -> int:
+    return year * 12 + (month - 1)
+
+
+def _read_date(match: re.Match, prefix: str) -> Optional[Tuple[int, int, bool]]:
+    """Return (year, month, year_only) for the start ('s_') or end ('e_') date of a match."""
+    g = match.groupdict()
+    if g.get(prefix + 'mon'):
+        return int(g[prefix + 'year']), MONTHS[g[prefix + 'mon'].lower().rstrip('.')], False
+    if g.get(prefix + 'mm'):
+        return int(g[prefix + 'mmyear']), int(g[prefix + 'mm']), False
+    if g.get(prefix + 'ymyear'):
+        return int(g[prefix + 'ymyear']), int(g[prefix + 'ymmm']), False
+    if g.get(prefix + 'onlyyear'):
+        return int(g[prefix + 'onlyyear']), None, True
+    return None
+
+
+def find_experience_section(resume_text: str) -> Optional[str]:
+    """Return the text of the work experience section, or None if no header is found."""
+    lines = resume_text.splitlines()
+    start = None
+    for i, line in enumerate(lines):
+        heading = re.sub(r'[^a-z ]', '', line.strip().lower()).strip()
+        if start is None:
+            if heading in EXPERIENCE_HEADERS:
+                start = i + 1
+        elif heading in OTHER_HEADERS:
+            return '\n'.join(lines[start:i])
+    if start is None:
+        return None
+    return '\n'.join(lines[start:])
+
+
+def extract_date_ranges(text: str, today: date = None) -> List[Dict[str, Any]]:
+    """Find date ranges in text and return them as inclusive month spans."""
+    today = today or date.today()
+    current = _month_index(today.year, today.month)
+    ranges = []
+    for match in DATE_RANGE_RE.finditer(text):
+        start_year, start_month, start_year_only = _read_date(match, 's_')
+        start_month = start_month or 1
+
+        if match.group('present'):
+            end, end_year_only, is_current = current, False, True
+        elif match.group('endmononly'):
+            end_month = MONTHS[match.group('endmononly').lower().rstrip('.')]
+            end, end_year_only, is_current = _month_index(start_year, end_month), False, False
+        else:
+            end_year, end_month, end_year_only = _read_date(match, 'e_')
+            end, is_current = _month_index(end_year, end_month or 12), False
+
+        start = _month_index(start_year, start_month)
+        ranges.append({
+            'text': re.sub(r'\s+', ' ', match.group(0).strip()),
+            'start': start,
+            'end': min(end, current),
+            'current': is_current,
+            'year_only': start_year_only or end_year_only,
+            'valid': start <= min(end, current) and start <= current,
+        })
+    return ranges
+
+
+def _merged_months(ranges: List[Dict[str, Any]]) -> int:
+    months = set()
+    for r in ranges:
+        months.update(range(r['start'], r['end'] + 1))
+    return len(months)
+
+
+def parse_work_history(resume_text: str, today: date = None, merge_overlaps: bool = EXPERIENCE_MERGE_OVERLAPS) -> Dict[str, Any]:
+    """
+    Compute total professional experience from resume text.
+    Returns the same keys as the LLM experience calculation (total_months,
+    total_years, calculation_details) plus confidence and method.
+    """
+    section = find_experience_section(resume_text)
+    ranges = extract_date_ranges(section if section is not None else resume_text, today)
+    valid = [r for r in ranges if r['valid']]
+
+    # Confidence: an explicit experience section with well-formed month ranges is trusted;
+    # missing sections, year-only ranges and malformed ranges lower it. A year-only range
+    # can be off by up to 11 months at each end, so it drops below the default threshold.
+    if section is None:
+        confidence = 0.4 if valid else 0.2
+    elif not valid:
+        confidence = 0.5
+    else:
+        confidence = 0.95
+        if any(r['year_only'] for r in valid):
+            confidence -= 0.3
+        if len(valid) < len(ranges):
+            confidence -= 0.2
+
+    durations = [r['end'] - r['start'] + 1 for r in valid]
+    total_months = _merged_months(valid) if merge_overlaps else sum(durations)
+    overlap_months = sum(durations) - _merged_months(valid)
+    total_years = total_months / 12
+
+    parts = [f"{r['text']} = {months} months" for r, months in zip(valid, durations)]
+    skipped = [f"Skipped {r['text']} (end before start or in the future)" for r in ranges if not r['valid']]
+    if merge_overlaps and overlap_months:
+        parts.append(f"{overlap_months} overlapping months counted once")
+    elif overlap_months:
+        parts.append(f"{overlap_months} overlapping months counted as separate experience")
+    summation = f"{' + '.join(str(m) for m in durations)} = " if len(durations) > 1 else ''
+    details = '; '.join(parts + skipped) or 'No employment date ranges found'
+
+    return {
+        "total_months": total_months,
+        "total_years": total_years,
+        "calculation_details": f"{details}. Total: {summation}{total_months} months = {total_months}/12 = {total_years:.4f} years",
+        "confidence": round(max(confidence, 0.0), 2),
+        "method": "local_parser",
+    }
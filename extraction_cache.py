@@ -0,0 +1,75 @@
+"""
+Persistent cache of extracted document text keyed on the raw uploaded bytes.
+
+Recruiters re-upload the same files across jobs and after failed runs. Every
+extraction path hashes the raw bytes (SHA-256) first and looks the text up
+here before any parser runs. Entries are keyed on the hash, the file
+extension (which picks the parser), the character budget and
+EXTRACTION_CACHE_VERSION, which is bumped whenever a parser changes its
+output. Storage and eviction reuse the SQLite-backed PersistentCache from
+llm_cache.
+"""
+import hashlib
+import os
+import threading
+from typing import Optional
+
+from llm_cache import PersistentCache
+
+_project_root = os.path.dirname(os.path.abspath(__file__))
+
+EXTRACTION_CACHE_PATH = os.environ.get('EXTRACTION_CACHE_PATH', os.path.join(_project_root, 'instance', 'extraction_cache.db'))
+EXTRACTION_CACHE_ENABLED = os.environ.get('EXTRACTION_CACHE_ENABLED', 'true').lower() == 'true'
+EXTRACTION_CACHE_MAX_ENTRIES = int(os.environ.get('EXTRACTION_CACHE_MAX_ENTRIES', 20000))
+EXTRACTION_CACHE_MAX_BYTES = int(os.environ.get('EXTRACTION_CACHE_MAX_BYTES', 500 * 1024 * 1024))  # 500MB
+# 2: text_extraction cuts every path at exactly the character budget
+# 3: .doc files are read by doc_reader
+EXTRACTION_CACHE_VERSION = 3
+
+_HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def raw_digest(data) -> str:
+    """SHA-256 of raw bytes, or of a binary stream read in chunks from its current position."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return hashlib.sha256(data).hexdigest()
+    sha256 = hashlib.sha256()
+    for chunk in iter(lambda: data.read(_HASH_CHUNK_BYTES), b''):
+        sha256.update(chunk)
+    return sha256.hexdigest()
+
+
+class ExtractionCache(PersistentCache):
+    """Extracted text keyed on raw-bytes hash + extension + character budget."""
+
+    def __init__(self, path: str = EXTRACTION_CACHE_PATH, max_entries: int = EXTRACTION_CACHE_MAX_ENTRIES,
+                 max_bytes: int = EXTRACTION_CACHE_MAX_BYTES, enabled: bool = EXTRACTION_CACHE_ENABLED):
+        super().__init__(path, max_entries=max_entries, max_bytes=max_bytes, enabled=enabled, table='extracted_text')
+
+    @staticmethod
+    def make_key(digest: str, filename: str, max_chars: Optional[int] = None) -> str:
+        extension = os.path.splitext(filename.lower())[1]
+        return f"{digest}:{extension}:{max_chars or 0}:v{EXTRACTION_CACHE_VERSION}"
+
+    def get_text(self, digest: str, filename: str, max_chars: Optional[int] = None) -> Optional[str]:
+        return self.get(self.make_key(digest, filename, max_chars))
+
+    def set_text(self, digest: str, filename: str, max_chars: Optional[int], text: str):
+        """Store successfully extracted text; empty results are not cached."""
+        if text and text.strip():
+            self.set(self.make_key(digest, filename, max_chars), text)
+
+
+# Global extraction cache instance, initialized to None.
+_extraction_cache = None
+_extraction_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> ExtractionCache:
+    """Return the process-wide extraction cache, creating it on first use."""
+    global _extraction_cache
+    if _extraction_cache is None:
+        with _extraction_cache_lock:
+            if _extraction_cache is None:
+                _extraction_cache = ExtractionCache()
+    return _extraction_cache
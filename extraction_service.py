@@ -0,0 +1,149 @@
+"""
+Document extraction service backed by a process pool.
+
+PDF and DOCX parsing is CPU-bound and holds the GIL, so upload handlers hand
+raw bytes to this service instead of parsing inline. Each document is parsed
+in a worker process and comes back as text plus metadata. Worker count and
+per-document timeout are configurable; EXTRACTION_WORKERS=0 parses in the
+calling thread.
+"""
+import multiprocessing
+import os
+import threading
+from typing import Any, Dict, List, Tuple
+
+from extraction_cache import get_extraction_cache, raw_digest
+from text_extraction import EXTRACTION_MAX_CHARS, extract_text, new_extraction_stats
+
+EXTRACTION_WORKERS = int(os.environ.get('EXTRACTION_WORKERS', os.cpu_count() or 1))
+EXTRACTION_TIMEOUT_SECONDS = float(os.environ.get('EXTRACTION_TIMEOUT_SECONDS', 30))
+# spawn, so workers never inherit locks held by the web server's threads
+EXTRACTION_START_METHOD = os.environ.get('EXTRACTION_START_METHOD', 'spawn')
+
+
+def extract_document(filename: str, data: bytes) -> Dict[str, Any]:
+    """
+    Parse one document's raw bytes up to the character budget. Runs in a worker process.
+    Returns {"filename", "text", "metadata": extraction stats, "error"}.
+    """
+    try:
+        text, metadata = extract_text(filename, data)
+        error = None
+    except Exception as e:
+        text = ''
+        metadata = dict(new_extraction_stats(filename), bytes=len(data))
+        error = str(e)
+    return {'filename': filename, 'text': text, 'metadata': metadata, 'error': error}
+
+
+def _failed(filename: str, data: bytes, error: str) -> Dict[str, Any]:
+    return {'filename': filename, 'text': '', 'metadata': {'bytes': len(data), 'chars': 0}, 'error': error}
+
+
+class ExtractionService:
+    """Parses uploaded documents across worker processes."""
+
+    def __init__(self, max_workers: int = EXTRACTION_WORKERS, timeout: float = EXTRACTION_TIMEOUT_SECONDS,
+                 start_method: str = EXTRACTION_START_METHOD):
+        self.max_workers = max(max_workers, 0)
+        self.timeout = timeout
+        self._context = multiprocessing.get_context(start_method)
+        self._pool = None
+        self._lock = threading.Lock()
+        self.extracted = 0
+        self.failed = 0
+        self.timeouts = 0
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = self._context.Pool(processes=self.max_workers)
+            return self._pool
+
+    def _restart_pool(self, pool):
+        """Kill a pool with a stuck worker; pending documents are resubmitted by the caller."""
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.terminate()
+
+    def extract_many(self, files: List[Tuple[str, bytes]]) -> List[Dict[str, Any]]:
+        """
+        Extract (filename, raw bytes) pairs; results come back in input order.
+        Files whose bytes were extracted before are served from the extraction cache.
+        """
+        extraction_cache = get_extraction_cache()
+        digests = [raw_digest(data) for _, data in files]
+        results = [None] * len(files)
+        pending = []
+        for i, (filename, data) in enumerate(files):
+            cached_text = extraction_cache.get_text(digests[i], filename, EXTRACTION_MAX_CHARS)
+            if cached_text is None:
+                pending.append(i)
+            else:
+                results[i] = {'filename': filename, 'text': cached_text, 'error': None,
+                              'metadata': {'bytes': len(data), 'chars': len(cached_text), 'cached': True}}
+
+        if self.max_workers == 0:
+            for i in pending:
+                results[i] = extract_document(*files[i])
+        else:
+            while pending:
+                pool = self._get_pool()
+                handles = [(i, pool.apply_async(extract_document, files[i])) for i in pending]
+                pending = []
+                for position, (i, handle) in enumerate(handles):
+                    filename, data = files[i]
+                    try:
+                        results[i] = handle.get(timeout=self.timeout)
+                    except multiprocessing.TimeoutError:
+                        print(f"⏱️  Extraction of {filename} timed out after {self.timeout}s")
+                        with self._lock:
+                            self.timeouts += 1
+                        results[i] = _failed(filename, data, f"Extraction timed out after {self.timeout}s")
+                        self._restart_pool(pool)
+                        pending = [j for j, _ in handles[position + 1:]]
+                        break
+                    except Exception as e:
+                        results[i] = _failed(filename, data, str(e))
+
+        for i, result in enumerate(results):
+            if not result['error'] and not result['metadata'].get('cached'):
+                extraction_cache.set_text(digests[i], result['filename'], EXTRACTION_MAX_CHARS, result['text'])
+
+        failed = sum(1 for result in results if result['error'])
+        with self._lock:
+            self.failed += failed
+            self.extracted += len(results) - failed
+        return results
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.max_workers,
+            'timeout_seconds': self.timeout,
+            'extracted': self.extracted,
+            'failed': self.failed,
+            'timeouts': self.timeouts,
+        }
+
+
+# Global extraction service instance, initialized to None.
+_extraction_service = None
+_extraction_service_lock = threading.Lock()
+
+
+def get_extraction_service() -> ExtractionService:
+    """Return the process-wide extraction service, creating it on first use."""
+    global _extraction_service
+    if _extraction_service is None:
+        with _extraction_service_lock:
+            if _extraction_service is None:
+                _extraction_service = ExtractionService()
+    return _extraction_service
@@ -0,0 +1,80 @@
+"""
+Job profile: the job-level scoring artifacts (job requirement, job level and
+section weights) computed once per job description.
+
+The profile is stored alongside the Job (JobProfile table in both apps) and
+passed into ResumeScorer.score_resume, so resume workers only make
+resume-dependent calls. A stored profile is keyed by the hash of the job
+description and is recomputed only when the description changes.
+"""
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+def description_hash(job_description: str) -> str:
+    return hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+
+
+def is_profile_current(job_profile: Optional[Dict[str, Any]], job_description: str) -> bool:
+    """True if the profile was computed from this exact job description."""
+    return bool(job_profile) and job_profile.get("description_hash") == description_hash(job_description)
+
+
+def compute_job_profile(job_description: str, scorer) -> Dict[str, Any]:
+    """Run the job-level scoring phases once and return them as a profile dict."""
+    job_requirement = scorer._extract_job_experience_requirement(job_description)
+    if str(job_requirement.get("extraction_details", "")).startswith("Error in extraction"):
+        # Do not persist the error fallback; the next load retries
+        raise ValueError(job_requirement["extraction_details"])
+    section_weights = scorer.assign_section_weights(job_description)
+    return {
+        "description_hash": description_hash(job_description),
+        "job_requirement": job_requirement,
+        "job_level": job_requirement.get("job_level", "entry"),
+        "section_weights": section_weights,
+        "computed_at": datetime.utcnow().isoformat(),
+    }
+
+
+def get_or_create_job_profile(session, profile_model, job, get_scorer) -> Optional[Dict[str, Any]]:
+    """
+    Return the stored profile for job, computing and saving it if it is missing
+    or was computed from a different description. get_scorer(job_description)
+    returns the ResumeScorer to compute with. Returns None if the profile could
+    not be computed; callers then score without one.
+    """
+    current_hash = description_hash(job.description)
+    row = session.get(profile_model, job.id)
+    if row is not None and row.description_hash == current_hash:
+        return json.loads(row.profile)
+
+    print(f"🧾 Computing job profile for job {job.id}...")
+    try:
+        job_profile = compute_job_profile(job.description, get_scorer(job.description))
+    except Exception as e:
+        print(f"Job profile computation failed for job {job.id}: {e}")
+        return None
+
+    if row is None:
+        row = profile_model(job_id=job.id)
+        session.add(row)
+    row.description_hash = current_hash
+    row.profile = json.dumps(job_profile)
+    session.commit()
+    return job_profile
+
+
+def diff_job_profiles(old_profile: Optional[Dict[str, Any]], new_profile: Optional[Dict[str, Any]]) -> Dict[str, bool]:
+    """Which job-level inputs of resume scoring changed between two profiles (missing profiles count as changed)."""
+    if not old_profile or not new_profile:
+        return {"description": True, "job_requirement": True, "section_weights": True}
+    old_requirement = old_profile.get("job_requirement", {})
+    new_requirement = new_profile.get("job_requirement", {})
+    return {
+        "description": old_profile.get("description_hash") != new_profile.get("description_hash"),
+        "job_requirement": any(old_requirement.get(key) != new_requirement.get(key)
+                               for key in ("years_required", "job_level")),
+        "section_weights": old_profile.get("section_weights") != new_profile.get("section_weights"),
+    }
@@ -0,0 +1,151 @@
+"""
+Rule-based job requirement and level extraction.
+
+Reads the years-of-experience requirement ("5+ years", "minimum 3 years",
+"2-4 years of experience") and seniority cues from the job title ("Senior",
+"Staff", "Junior", "Intern") or explicit level phrases ("entry-level",
+"new grad"). The result has the same years_required / job_level /
+extraction_details keys as the LLM extraction.
+
+The rules only resolve a job description when the signals agree. When they
+conflict or are missing, resolved is False and the scorer falls back to the LLM.
+"""
+import os
+import re
+from typing import Any, Dict, List
+
+JOB_REQUIREMENT_RULES_ENABLED = os.environ.get('JOB_REQUIREMENT_RULES_ENABLED', 'true').lower() == 'true'
+
+NUMBER_WORDS = {
+    'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6, 'seven': 7, 'eight': 8,
+    'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'fifteen': 15, 'twenty': 20,
+}
+_NUMBER = r'\b(\d{1,2}|' + '|'.join(NUMBER_WORDS) + r')'
+_YEARS = r'\s*(?:\(\d{1,2}\)\s*)?(?:years?|yrs?)\b'
+
+# Each pattern captures the minimum years required
+YEARS_PATTERNS = [
+    re.compile(_NUMBER + r'\s*(?:-|–|—|to)\s*' + _NUMBER + _YEARS, re.IGNORECASE),        # 3-5 years
+    re.compile(_NUMBER + r'\s*\+' + _YEARS, re.IGNORECASE),                               # 5+ years
+    re.compile(r'(?:minimum|at\s+least|min\.?)\s+(?:of\s+)?' + _NUMBER + r'\s*\+?' + _YEARS, re.IGNORECASE),
+    re.compile(_NUMBER + r'\s*(?:or\s+more\s+)?' + _YEARS
+               + r'\s+(?:of\s+)?(?:\w+\s+){0,3}?(?:experience|exp\b)', re.IGNORECASE),     # 4 years of relevant experience
+]
+
+# Seniority cues in the job title
+TITLE_CUES = [
+    ('senior', re.compile(r'\b(?:senior|sr\.?|staff|principal|lead|head\s+of|director|architect)\b', re.IGNORECASE)),
+    ('mid', re.compile(r'\b(?:mid[-\s]?level|intermediate|ii)\b', re.IGNORECASE)),
+    ('entry', re.compile(r'\b(?:junior|jr\.?|intern(?:ship)?|entry[-\s]?level|graduate|new\s+grad|trainee|apprentice|associate|co-?op)\b', re.IGNORECASE)),
+]
+
+# Explicit level phrases that count anywhere in the description
+LEVEL_PHRASES = [
+    ('senior', re.compile(r'\bsenior[-\s]level\b', re.IGNORECASE)),
+    ('mid', re.compile(r'\bmid[-\s]level\b', re.IGNORECASE)),
+    ('entry', re.compile(r'\b(?:entry[-\s]level|new\s+grad(?:uate)?s?|recent\s+graduates?|no\s+(?:prior\s+)?experience\s+(?:is\s+)?required)\b', re.IGNORECASE)),
+]
+
+_TITLE_LINE_RE = re.compile(r'^\s*(?:job\s+title|title|position|role)\s*[:\-]\s*(.+)$', re.IGNORECASE | re.MULTILINE)
+_HIRING_RE = re.compile(r'\b(?:hiring|looking\s+for|seeking)\s+(?:an?\s+)?((?:[\w./-]+\s+){0,4}?(?:engineer|developer|scientist|analyst|designer|manager|intern|architect|specialist|consultant))\b', re.IGNORECASE)
+
+# Years ranges each level is compatible with; outside them the signals conflict
+LEVEL_YEARS = {
+    'entry': (0, 2),
+    'mid': (2, 6),
+    'senior': (5, 99),
+}
+
+
+def _to_int(value: str) -> int:
+    return NUMBER_WORDS.get(value.lower(), None) or int(value)
+
+
+def find_years_required(job_description: str) -> List[int]:
+    """Return every minimum years-of-experience requirement mentioned in the text."""
+    years = []
+    taken = []
+    for pattern in YEARS_PATTERNS:
+        for match in pattern.finditer(job_description):
+            if any(start <= match.start() < end for start, end in taken):
+                continue
+            taken.append(match.span())
+            value = _to_int(match.group(1))
+            if value <= 30:
+                years.append(value)
+    return years
+
+
+def level_from_years(years: int) -> str:
+    """Map a years requirement to a level, as described in the LLM extraction prompt."""
+    if years <= 2:
+        return 'entry'
+    if years <= 6:
+        return 'mid'
+    return 'senior'
+
+
+def _title_text(job_description: str) -> List[str]:
+    """Lines that name the role: explicit title lines, the first line and 'looking for a ...' phrases."""
+    titles = [m.group(1) for m in _TITLE_LINE_RE.finditer(job_description)]
+    first_line = next((line.strip() for line in job_description.splitlines() if line.strip()), '')
+    if first_line and len(first_line) <= 80:
+        titles.append(first_line)
+    titles.extend(m.group(1) for m in _HIRING_RE.finditer(job_description))
+    return titles
+
+
+def find_level_cues(job_description: str) -> List[str]:
+    """Return the distinct seniority levels suggested by the job title and level phrases."""
+    cues = []
+    for title in _title_text(job_description):
+        for level, pattern in TITLE_CUES:
+            if pattern.search(title) and level not in cues:
+                cues.append(level)
+    for level, pattern in LEVEL_PHRASES:
+        if pattern.search(job_description) and level not in cues:
+            cues.append(level)
+    return cues
+
+
+def extract_job_requirement(job_description: str) -> Dict[str, Any]:
+    """
+    Extract years_required and job_level with rules.
+    resolved is False when the signals conflict or are missing; job_level and
+    years_required are then best guesses only.
+    """
+    years = find_years_required(job_description)
+    cues = find_level_cues(job_description)
+    years_required = max(years) if years else 0
+
+    found = []
+    if years:
+        found.append(f"years mentioned: {', '.join(str(y) for y in years)} (using highest: {years_required})")
+    if cues:
+        found.append(f"level cues: {', '.join(cues)}")
+
+    resolved = True
+    if not years and not cues:
+        job_level, resolved, reason = 'entry', False, 'no years requirement or level cue found'
+    elif len(cues) > 1:
+        job_level, resolved, reason = level_from_years(years_required), False, 'conflicting level cues'
+    elif cues and years:
+        low, high = LEVEL_YEARS[cues[0]]
+        job_level = cues[0]
+        if low <= years_required <= high:
+            reason = f"{years_required} years is consistent with a {job_level} title"
+        else:
+            resolved, reason = False, f"{years_required} years conflicts with a {job_level} title"
+    elif cues:
+        job_level, reason = cues[0], 'level from title, no years mentioned'
+    else:
+        job_level = level_from_years(years_required)
+        reason = f"level from {years_required} years required"
+
+    return {
+        "years_required": years_required,
+        "job_level": job_level,
+        "extraction_details": '; '.join(found + [reason]),
+        "method": "rules",
+        "resolved": resolved,
+    }
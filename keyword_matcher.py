@@ -0,0 +1,141 @@
+"""
+Single-pass multi-keyword matcher with context windows.
+
+All keywords are compiled into one trie-shaped regex inside a lookahead, so a
+single finditer over the text reports every position where any keyword
+starts, including overlapping hits ("led" inside "led team"). Context windows
+are then cut from those positions with the same semantics as the per-keyword
+re.findall(r'.{0,100}<kw>.{0,100}') scan the scorer used before, so
+found_keywords and evidence are unchanged.
+"""
+import re
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Sequence
+
+CONTEXT_CHARS = 100
+MAX_EVIDENCE_PER_KEYWORD = 2
+MAX_EVIDENCE_LENGTH = 150
+
+
+def _trie_pattern(keywords: Sequence[str]) -> str:
+    """Regex matching the longest keyword at a position, with shared prefixes factored out."""
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node):
+        terminal = '' in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if terminal:
+            # Greedy optional group: prefer the longer keyword, fall back to this one
+            return '(?:' + body + ')?'
+        return body
+
+    return build(trie)
+
+
+def clean_evidence(match: str) -> str:
+    clean_match = match.strip().replace('\n', ' ').replace('  ', ' ')
+    if len(clean_match) > MAX_EVIDENCE_LENGTH:
+        clean_match = clean_match[:MAX_EVIDENCE_LENGTH - 3] + "..."
+    return clean_match
+
+
+class KeywordMatcher:
+    """Finds a fixed set of keywords and their context windows in one pass over a text."""
+
+    def __init__(self, keywords: Sequence[str], context: int = CONTEXT_CHARS):
+        self.keywords = list(dict.fromkeys(keywords))
+        self.context = context
+        self._regex = re.compile('(?=(' + _trie_pattern(self.keywords) + '))', re.IGNORECASE)
+        # Keywords that are a prefix of each keyword: they match wherever it matches
+        self._prefixes = {
+            keyword: [other for other in self.keywords if keyword.startswith(other)]
+            for keyword in self.keywords
+        }
+        self._by_lower = {keyword.lower(): keyword for keyword in self.keywords}
+
+    def occurrences(self, text: str) -> Dict[str, List[int]]:
+        """Start positions of every keyword hit (case-insensitive, overlapping), in text order."""
+        hits = {}
+        for match in self._regex.finditer(text):
+            longest = self._by_lower.get(match.group(1).lower())
+            if longest is None:
+                # Non-ASCII case folding (e.g. dotless i); find which keyword matched
+                longest = next(kw for kw in self.keywords if re.fullmatch(re.escape(kw), match.group(1), re.IGNORECASE))
+            for keyword in self._prefixes[longest]:
+                hits.setdefault(keyword, []).append(match.start())
+        return hits
+
+    def _windows(self, text: str, keyword: str, positions: List[int], newlines: List[int], limit: int) -> List[str]:
+        """
+        Context windows for one keyword, reproducing successive non-overlapping
+        matches of '.{0,N}keyword.{0,N}' ('.' stops at newlines).
+        """
+        windows = []
+        search_from = 0
+        index = 0
+        while len(windows) < limit:
+            index = bisect_left(positions, search_from, index)
+            if index == len(positions):
+                break
+            first = positions[index]
+            line = bisect_right(newlines, first - 1)
+            line_start = newlines[line - 1] + 1 if line else 0
+            line_end = newlines[line] if line < len(newlines) else len(text)
+            start = max(search_from, line_start, first - self.context)
+            # Greedy leading context: the last hit reachable from start on this line
+            last = bisect_right(positions, min(start + self.context, line_end - 1)) - 1
+            hit = positions[last]
+            end = min(hit + len(keyword) + self.context, line_end)
+            windows.append(text[start:end])
+            search_from = end
+        return windows
+
+    def search(self, text: str, keywords: Sequence[str] = None, hits: Dict[str, List[int]] = None) -> Dict[str, Any]:
+        """
+        Return {'found_keywords', 'evidence', 'count'} for keywords (default: all,
+        in order; duplicates are reported twice, like the per-keyword scan).
+        """
+        if hits is None:
+            hits = self.occurrences(text)
+        newlines = [match.start() for match in re.finditer('\n', text)] if hits else []
+        found_keywords = []
+        evidence = []
+        for keyword in self.keywords if keywords is None else keywords:
+            positions = hits.get(keyword)
+            # Keyword presence is an exact substring test; case-folded hits only add evidence
+            if not positions or not any(text.startswith(keyword, position) for position in positions):
+                continue
+            found_keywords.append(keyword)
+            for window in self._windows(text, keyword, positions, newlines, MAX_EVIDENCE_PER_KEYWORD):
+                evidence.append(clean_evidence(window))
+        return {
+            'found_keywords': found_keywords,
+            'evidence': evidence,
+            'count': len(found_keywords)
+        }
+
+
+def search_keywords_per_keyword(text: str, keywords: Sequence[str]) -> Dict[str, Any]:
+    """Reference per-keyword scan (one substring test and one regex findall per keyword)."""
+    found_keywords = []
+    evidence = []
+    for keyword in keywords:
+        if keyword in text:
+            found_keywords.append(keyword)
+            pattern = rf'.{{0,{CONTEXT_CHARS}}}{re.escape(keyword)}.{{0,{CONTEXT_CHARS}}}'
+            matches = re.findall(pattern, text, re.IGNORECASE)
+            for match in matches[:MAX_EVIDENCE_PER_KEYWORD]:
+                evidence.append(clean_evidence(match))
+    return {
+        'found_keywords': found_keywords,
+        'evidence': evidence,
+        'count': len(found_keywords)
+    }
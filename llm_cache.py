@@ -0,0 +1,195 @@
+"""
+Persistent, disk-backed cache for deterministic LLM responses.
+
+Responses are stored in SQLite so they survive restarts and are shared by
+every ResumeScorer instance (and every worker process) on the host.
+Entries are keyed on model + prompt hash + seed and are evicted by age and
+by total size.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_project_root = os.path.dirname(os.path.abspath(__file__))
+
+# Cache configuration (overridable through environment variables)
+LLM_CACHE_PATH = os.environ.get('LLM_CACHE_PATH', os.path.join(_project_root, 'instance', 'llm_cache.db'))
+LLM_CACHE_ENABLED = os.environ.get('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_MAX_ENTRIES = int(os.environ.get('LLM_CACHE_MAX_ENTRIES', 20000))
+LLM_CACHE_MAX_BYTES = int(os.environ.get('LLM_CACHE_MAX_BYTES', 200 * 1024 * 1024))  # 200MB
+LLM_CACHE_MAX_AGE_SECONDS = int(os.environ.get('LLM_CACHE_MAX_AGE_SECONDS', 30 * 24 * 3600))  # 30 days
+
+
+class PersistentCache:
+    """SQLite-backed key/value store with size- and age-based eviction."""
+
+    def __init__(self, path: str, max_entries: int = 10000, max_bytes: int = 100 * 1024 * 1024,
+                 max_age_seconds: Optional[int] = None, enabled: bool = True, table: str = 'cache_entries'):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age_seconds = max_age_seconds
+        self.enabled = enabled
+        self.table = table
+        self._lock = threading.Lock()
+        self._conn = None
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.bypassed = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the SQLite database lazily and create the table if needed."""
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)')
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss."""
+        if not self.enabled:
+            self.bypassed += 1
+            return None
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.max_age_seconds is not None and now - row[1] > self.max_age_seconds:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                conn.commit()
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute(f'UPDATE {self.table} SET accessed_at = ? WHERE key = ?', (now, key))
+            conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def set(self, key: str, value: str):
+        """Store value under key and evict old entries if limits are exceeded."""
+        if not self.enabled:
+            return
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, value, len(value.encode('utf-8')), now, now)
+            )
+            conn.commit()
+            self.writes += 1
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        """Drop expired entries, then least-recently-used entries until within limits."""
+        if self.max_age_seconds is not None:
+            cursor = conn.execute(f'DELETE FROM {self.table} WHERE created_at < ?', (now - self.max_age_seconds,))
+            self.evictions += max(cursor.rowcount, 0)
+
+        count, total_size = conn.execute(f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}').fetchone()
+        if count > self.max_entries or total_size > self.max_bytes:
+            rows = conn.execute(f'SELECT key, size FROM {self.table} ORDER BY accessed_at ASC, rowid ASC').fetchall()
+            stale_keys = []
+            for key, size in rows:
+                if count <= self.max_entries and total_size <= self.max_bytes:
+                    break
+                stale_keys.append((key,))
+                count -= 1
+                total_size -= size
+            conn.executemany(f'DELETE FROM {self.table} WHERE key = ?', stale_keys)
+            self.evictions += len(stale_keys)
+        conn.commit()
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f'DELETE FROM {self.table}')
+            conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current cache size."""
+        entries, size_bytes = 0, 0
+        if self.enabled:
+            with self._lock:
+                entries, size_bytes = self._connection().execute(
+                    f'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}'
+                ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'enabled': self.enabled,
+            'path': self.path,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            'writes': self.writes,
+            'evictions': self.evictions,
+            'bypassed': self.bypassed,
+            'entries': entries,
+            'size_bytes': size_bytes,
+        }
+
+
+class LLMResponseCache(PersistentCache):
+    """Cache of chat completion contents keyed on model + prompt hash + seed."""
+
+    def __init__(self, path: str = LLM_CACHE_PATH, max_entries: int = LLM_CACHE_MAX_ENTRIES,
+                 max_bytes: int = LLM_CACHE_MAX_BYTES, max_age_seconds: Optional[int] = LLM_CACHE_MAX_AGE_SECONDS,
+                 enabled: bool = LLM_CACHE_ENABLED):
+        super().__init__(path, max_entries=max_entries, max_bytes=max_bytes,
+                         max_age_seconds=max_age_seconds, enabled=enabled, table='llm_responses')
+
+    @staticmethod
+    def make_key(model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> str:
+        """Build the cache key from the model, a hash of the prompt and the sampling parameters."""
+        prompt_hash = hashlib.sha256(json.dumps(messages, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+        key_data = {
+            'model': model,
+            'prompt_hash': prompt_hash,
+            'seed': params.get('seed'),
+            'params': {k: v for k, v in sorted(params.items()) if k != 'seed'},
+        }
+        return hashlib.sha256(json.dumps(key_data, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def get_response(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any]) -> Optional[str]:
+        return self.get(self.make_key(model, messages, params))
+
+    def set_response(self, model: str, messages: List[Dict[str, str]], params: Dict[str, Any], content: str):
+        self.set(self.make_key(model, messages, params), content)
+
+
+# Global cache instance, initialized to None.
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache, creating it on first use."""
+    global _llm_cache
+    if _llm_cache is None:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = LLMResponseCache()
+    return _llm_cache
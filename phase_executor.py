@@ -0,0 +1,98 @@
+"""
+Dependency-aware executor for the phases of a scoring pipeline.
+
+Each phase declares the phases it depends on. Phases whose dependencies are
+satisfied run concurrently on a thread pool (the work is dominated by network
+calls to the LLM), and the wall-clock timing of every phase is recorded.
+"""
+import concurrent.futures
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Tuple
+
+PHASE_EXECUTOR_MAX_WORKERS = int(os.environ.get('PHASE_EXECUTOR_MAX_WORKERS', 4))
+
+
+class PhaseExecutor:
+    """Runs named phases as soon as the phases they depend on have finished."""
+
+    def __init__(self, max_workers: int = PHASE_EXECUTOR_MAX_WORKERS):
+        self.max_workers = max_workers
+        self._phases = {}
+
+    def add(self, name: str, func: Callable[..., Any], depends_on: Iterable[str] = ()):
+        """
+        Register a phase. The function is called with the results of its
+        dependencies as keyword arguments named after those phases.
+        """
+        if name in self._phases:
+            raise ValueError(f"Phase '{name}' is already registered")
+        self._phases[name] = (func, tuple(depends_on))
+        return self
+
+    def _validate(self):
+        """Reject unknown dependencies and dependency cycles."""
+        for name, (_, depends_on) in self._phases.items():
+            for dependency in depends_on:
+                if dependency not in self._phases:
+                    raise ValueError(f"Phase '{name}' depends on unknown phase '{dependency}'")
+
+        visiting, visited = set(), set()
+
+        def visit(name):
+            if name in visited:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at phase '{name}'")
+            visiting.add(name)
+            for dependency in self._phases[name][1]:
+                visit(dependency)
+            visiting.discard(name)
+            visited.add(name)
+
+        for name in self._phases:
+            visit(name)
+
+    def run(self) -> Tuple[Dict[str, Any], Dict[str, Dict[str, float]]]:
+        """
+        Execute all phases and return (results, timings).
+        Timings map each phase to its start offset and duration in seconds.
+        The first exception raised by a phase is re-raised after running phases finish.
+        """
+        self._validate()
+        results = {}
+        timings = {}
+        pending = dict(self._phases)
+        run_start = time.time()
+
+        def timed(name, func, kwargs):
+            started = time.time()
+            try:
+                return func(**kwargs)
+            finally:
+                timings[name] = {
+                    'started_at': round(started - run_start, 4),
+                    'duration': round(time.time() - started, 4),
+                }
+
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+            while pending or running:
+                # Submit every phase whose dependencies are complete
+                for name, (func, depends_on) in list(pending.items()):
+                    if all(dependency in results for dependency in depends_on):
+                        kwargs = {dependency: results[dependency] for dependency in depends_on}
+                        running[executor.submit(timed, name, func, kwargs)] = name
+                        del pending[name]
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is not None:
+                        for other in running:
+                            other.cancel()
+                        raise error
+                    results[name] = future.result()
+
+        return results, timings
@@ -0,0 +1,110 @@
+"""
+Local lexical pre-screen: BM25 over normalized skill tokens from the job description.
+
+Every resume in a batch is scored against the JD terms in one pass before any
+LLM call. Term weights come from the JD alone (terms it repeats weigh more) and
+resume length is normalized against a fixed PRESCREEN_REFERENCE_LENGTH, not
+against the batch: a resume's score does not depend on which other resumes
+share its batch, so a work-queue batch of 50 scores it the same as the whole
+job would. Scores are normalized to 0-100, where 100 means every JD term
+appears in a reference-length resume, so an operator can set PRESCREEN_CUTOFF
+once per deployment; resumes below it are archived without calling the LLM.
+The pre-screen result is stored in the analysis JSON under "prescreen" for auditing.
+"""
+import math
+import os
+import re
+from collections import Counter
+from typing import Any, Dict, List
+
+PRESCREEN_ENABLED = os.environ.get('PRESCREEN_ENABLED', 'false').lower() == 'true'
+PRESCREEN_CUTOFF = float(os.environ.get('PRESCREEN_CUTOFF', 5))
+PRESCREEN_BM25_K1 = float(os.environ.get('PRESCREEN_BM25_K1', 1.5))
+PRESCREEN_BM25_B = float(os.environ.get('PRESCREEN_BM25_B', 0.75))
+# Normalized token count of a typical resume; BM25's average document length
+PRESCREEN_REFERENCE_LENGTH = float(os.environ.get('PRESCREEN_REFERENCE_LENGTH', 300))
+
+# Tokens keep the characters that matter in skill names: c++, c#, node.js, ci/cd
+_TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]*(?:[./][a-z0-9+#]+)*')
+
+# Common spellings mapped to one canonical skill token
+SKILL_SYNONYMS = {
+    'js': 'javascript', 'ts': 'typescript', 'py': 'python', 'golang': 'go', 'k8s': 'kubernetes',
+    'postgres': 'postgresql', 'psql': 'postgresql', 'mongo': 'mongodb', 'node': 'node.js', 'nodejs': 'node.js',
+    'react.js': 'react', 'reactjs': 'react', 'vue.js': 'vue', 'vuejs': 'vue', 'amazon': 'aws', 'gcp': 'google-cloud',
+    'ml': 'machine-learning', 'ai': 'artificial-intelligence', 'nlp': 'natural-language-processing',
+    'tf': 'tensorflow', 'sklearn': 'scikit-learn', 'ci/cd': 'cicd', 'ci': 'cicd', 'cd': 'cicd',
+}
+
+STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be because been being below between both but by can
+could did do does doing down during each few for from further had has have having he her here hers him his how
+i if in into is it its itself just me more most my no nor not now of off on once only or other our ours out over
+own same she should so some such than that the their theirs them then there these they this those through to too
+under until up very was we were what when where which while who whom why will with would you your yours
+ability able candidate candidates company role position job team teams work working experience experienced
+years year strong excellent good great plus preferred required requirements responsibilities including
+knowledge skills skill understanding looking join us well new etc must one two three four five using use
+""".split())
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase, tokenize, map synonyms, drop stopwords and numbers, strip simple plurals."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        token = token.rstrip('.')
+        token = SKILL_SYNONYMS.get(token, token)
+        if token in STOPWORDS or token[0].isdigit() or len(token) < 2 and token not in ('c', 'r'):
+            continue
+        if len(token) > 4 and token.endswith('s') and not token.endswith(('ss', 'es', 'us', 'is')):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class BM25Prescreen:
+    """Scores a batch of resumes against the normalized terms of one job description."""
+
+    def __init__(self, job_description: str, k1: float = PRESCREEN_BM25_K1, b: float = PRESCREEN_BM25_B,
+                 reference_length: float = PRESCREEN_REFERENCE_LENGTH):
+        self.k1 = k1
+        self.b = b
+        self.reference_length = reference_length or 1.0
+        jd_counts = Counter(normalize_tokens(job_description))
+        self.query_terms = list(jd_counts)
+        # Stands in for idf: fixed per JD, so scores are comparable across batches
+        self.term_weights = {term: 1 + math.log(count) for term, count in jd_counts.items()}
+        # Reference score: every JD term present once in a reference-length resume scores 100
+        self.reference_score = sum(self.term_weights.values()) or 1.0
+
+    def score_batch(self, resume_texts: List[str], cutoff: float = PRESCREEN_CUTOFF) -> List[Dict[str, Any]]:
+        """
+        Return one result per resume, in input order:
+        {"score" (0-100), "raw_score", "matched_terms", "cutoff", "passed"}.
+        """
+        results = []
+        for text in resume_texts:
+            counts = Counter(normalize_tokens(text))
+            length = sum(counts.values())
+            norm = self.k1 * (1 - self.b + self.b * length / self.reference_length)
+            contributions = {}
+            for term in self.query_terms:
+                tf = counts.get(term)
+                if tf:
+                    contributions[term] = self.term_weights[term] * tf * (self.k1 + 1) / (tf + norm)
+            raw_score = sum(contributions.values())
+            score = round(min(100 * raw_score / self.reference_score, 100.0), 2)
+            results.append({
+                "score": score,
+                "raw_score": round(raw_score, 4),
+                "matched_terms": sorted(contributions, key=contributions.get, reverse=True)[:15],
+                "query_terms": len(self.query_terms),
+                "cutoff": cutoff,
+                "passed": score >= cutoff,
+            })
+        return results
+
+
+def prescreen_resumes(job_description: str, resume_texts: List[str], cutoff: float = PRESCREEN_CUTOFF) -> List[Dict[str, Any]]:
+    """Score resume texts against a job description; see BM25Prescreen.score_batch."""
+    return BM25Prescreen(job_description).score_batch(resume_texts, cutoff)
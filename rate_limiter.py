@@ -0,0 +1,261 @@
+"""
+Token-aware rate limiter shared by every LLM caller in the process.
+
+Each model gets two token buckets that refill continuously over a minute:
+one for requests and one for (estimated) prompt + completion tokens. Callers
+queue for capacity with acquire() instead of failing fast. After each call the
+estimate is reconciled with the reported usage. The buckets also follow the
+provider's x-ratelimit-* response headers, which are observed through an
+httpx event hook on the OpenAI clients.
+"""
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import openai
+
+# Rate limit configuration (overridable through environment variables).
+# These are starting values; provider headers take precedence once seen.
+LLM_RATE_LIMIT_RPM = float(os.environ.get('LLM_RATE_LIMIT_RPM', 500))
+LLM_RATE_LIMIT_TPM = float(os.environ.get('LLM_RATE_LIMIT_TPM', 200000))
+LLM_RATE_LIMIT_MAX_WAIT_SECONDS = float(os.environ.get('LLM_RATE_LIMIT_MAX_WAIT_SECONDS', 600))
+
+DEFAULT_COMPLETION_TOKENS = 1000
+
+
+class RateLimitTimeout(TimeoutError):
+    """Raised when capacity did not become available within the allowed wait."""
+
+
+def estimate_tokens(messages: List[Dict[str, str]], max_tokens: Optional[int] = None) -> int:
+    """Rough token estimate: ~4 characters per prompt token plus the completion budget."""
+    prompt_tokens = sum(len(str(message.get("content", ""))) // 4 + 4 for message in messages)
+    return prompt_tokens + (max_tokens or DEFAULT_COMPLETION_TOKENS)
+
+
+def _parse_reset(value: str) -> Optional[float]:
+    """Parse reset durations such as '1s', '6m0s' or '20ms' into seconds."""
+    if not value:
+        return None
+    total = 0.0
+    for amount, unit in re.findall(r'([\d.]+)(ms|s|m|h)', value):
+        total += float(amount) * {'ms': 0.001, 's': 1, 'm': 60, 'h': 3600}[unit]
+    return total
+
+
+class TokenBucket:
+    """Bucket holding up to `capacity` units, refilled at `capacity` per minute."""
+
+    def __init__(self, capacity: float, now: float):
+        self.capacity = capacity
+        self.level = capacity
+        self.updated_at = now
+
+    def refill(self, now: float):
+        elapsed = max(now - self.updated_at, 0.0)
+        self.level = min(self.capacity, self.level + elapsed * self.capacity / 60.0)
+        self.updated_at = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` units are available (requests larger than capacity wait for a full bucket)."""
+        deficit = min(amount, self.capacity) - self.level
+        return max(deficit, 0.0) * 60.0 / self.capacity
+
+
+class RateLimiter:
+    """Per-model request and token buckets with blocking and asyncio acquisition."""
+
+    def __init__(self, requests_per_minute: float = LLM_RATE_LIMIT_RPM, tokens_per_minute: float = LLM_RATE_LIMIT_TPM,
+                 max_wait_seconds: float = LLM_RATE_LIMIT_MAX_WAIT_SECONDS, clock=time.monotonic):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_wait_seconds = max_wait_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._models = {}
+        self._http_client = None
+        self.acquired = 0
+        self.queued = 0
+        self.waited_seconds = 0.0
+        self.throttled = 0
+        self.header_updates = 0
+
+    def _limits(self, model: str) -> Dict[str, Any]:
+        limits = self._models.get(model)
+        if limits is None:
+            now = self._clock()
+            limits = {
+                'requests': TokenBucket(self.requests_per_minute, now),
+                'tokens': TokenBucket(self.tokens_per_minute, now),
+                'blocked_until': 0.0,
+            }
+            self._models[model] = limits
+        return limits
+
+    def _reserve(self, model: str, tokens: int) -> float:
+        """Take capacity if available and return 0, otherwise return the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            limits = self._limits(model)
+            limits['requests'].refill(now)
+            limits['tokens'].refill(now)
+            wait = max(
+                limits['blocked_until'] - now,
+                limits['requests'].wait_time(1),
+                limits['tokens'].wait_time(tokens),
+            )
+            if wait > 0:
+                return wait
+            limits['requests'].level -= 1
+            limits['tokens'].level -= min(tokens, limits['tokens'].capacity)
+            self.acquired += 1
+            return 0.0
+
+    def try_acquire(self, model: str, tokens: int = 0) -> bool:
+        """Take capacity without waiting; returns False if the caller would have to queue."""
+        return self._reserve(model, tokens) == 0
+
+    def acquire(self, model: str, tokens: int = 0, timeout: Optional[float] = None) -> float:
+        """Block until capacity is available and return the seconds spent waiting."""
+        timeout = self.max_wait_seconds if timeout is None else timeout
+        start = self._clock()
+        wait = self._reserve(model, tokens)
+        if wait > 0:
+            self.queued += 1
+        while wait > 0:
+            if self._clock() - start + wait > timeout:
+                raise RateLimitTimeout(f"Rate limit capacity for {model} not available within {timeout} seconds")
+            time.sleep(wait)
+            wait = self._reserve(model, tokens)
+        waited = self._clock() - start
+        self.waited_seconds += waited
+        return waited
+
+    async def acquire_async(self, model: str, tokens: int = 0, timeout: Optional[float] = None) -> float:
+        """asyncio version of acquire()."""
+        timeout = self.max_wait_seconds if timeout is None else timeout
+        start = self._clock()
+        wait = self._reserve(model, tokens)
+        if wait > 0:
+            self.queued += 1
+        while wait > 0:
+            if self._clock() - start + wait > timeout:
+                raise RateLimitTimeout(f"Rate limit capacity for {model} not available within {timeout} seconds")
+            await asyncio.sleep(wait)
+            wait = self._reserve(model, tokens)
+        waited = self._clock() - start
+        self.waited_seconds += waited
+        return waited
+
+    def record_usage(self, model: str, estimated_tokens: int, response: Any):
+        """Correct the token bucket with the usage reported on a completion response."""
+        usage = getattr(response, 'usage', None)
+        actual = getattr(usage, 'total_tokens', None)
+        if not isinstance(actual, int):
+            return
+        with self._lock:
+            bucket = self._limits(model)['tokens']
+            bucket.level = min(bucket.capacity, bucket.level - (actual - estimated_tokens))
+
+    def update_from_headers(self, model: str, headers, status_code: int = 200):
+        """Adopt the provider's limits and remaining capacity from x-ratelimit-* headers."""
+        def number(name):
+            try:
+                return float(headers.get(name))
+            except (TypeError, ValueError):
+                return None
+
+        with self._lock:
+            now = self._clock()
+            limits = self._limits(model)
+            updated = False
+            for kind in ('requests', 'tokens'):
+                bucket = limits[kind]
+                bucket.refill(now)
+                limit = number(f'x-ratelimit-limit-{kind}')
+                if limit and limit != bucket.capacity:
+                    bucket.capacity = limit
+                    bucket.level = min(bucket.level, limit)
+                    updated = True
+                remaining = number(f'x-ratelimit-remaining-{kind}')
+                if remaining is not None and remaining < bucket.level:
+                    bucket.level = remaining
+                    updated = True
+
+            if status_code == 429:
+                self.throttled += 1
+                retry_after = number('retry-after')
+                if retry_after is None:
+                    retry_after = max(
+                        _parse_reset(headers.get('x-ratelimit-reset-requests')) or 0.0,
+                        _parse_reset(headers.get('x-ratelimit-reset-tokens')) or 0.0,
+                    ) or 1.0
+                limits['blocked_until'] = max(limits['blocked_until'], now + retry_after)
+                updated = True
+            if updated:
+                self.header_updates += 1
+
+    def _observe_response(self, response):
+        """httpx response hook: feed rate limit headers back into the buckets."""
+        if 'x-ratelimit-limit-requests' not in response.headers and response.status_code != 429:
+            return
+        try:
+            model = json.loads(response.request.content or b'{}').get('model')
+        except (ValueError, AttributeError):
+            model = None
+        if model:
+            self.update_from_headers(model, response.headers, response.status_code)
+
+    def http_client(self):
+        """Shared httpx client for openai.OpenAI that reports response headers to this limiter."""
+        if self._http_client is None:
+            self._http_client = openai.DefaultHttpxClient(event_hooks={'response': [self._observe_response]})
+        return self._http_client
+
+    def async_http_client(self):
+        """httpx client for openai.AsyncOpenAI; create one per event loop."""
+        async def observe(response):
+            self._observe_response(response)
+        return openai.DefaultAsyncHttpxClient(event_hooks={'response': [observe]})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self._clock()
+            models = {}
+            for model, limits in self._models.items():
+                limits['requests'].refill(now)
+                limits['tokens'].refill(now)
+                models[model] = {
+                    'requests_per_minute': limits['requests'].capacity,
+                    'tokens_per_minute': limits['tokens'].capacity,
+                    'requests_available': round(limits['requests'].level, 2),
+                    'tokens_available': round(limits['tokens'].level, 2),
+                    'blocked_for_seconds': round(max(limits['blocked_until'] - now, 0.0), 2),
+                }
+        return {
+            'acquired': self.acquired,
+            'queued': self.queued,
+            'waited_seconds': round(self.waited_seconds, 2),
+            'throttled': self.throttled,
+            'header_updates': self.header_updates,
+            'models': models,
+        }
+
+
+# Global rate limiter instance, initialized to None.
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Return the process-wide rate limiter, creating it on first use."""
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter()
+    return _rate_limiter
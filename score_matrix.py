@@ -0,0 +1,180 @@
+"""
+Compact score matrix: raw subfield scores per resume, re-weighted without the LLM.
+
+compute_final_score is pure arithmetic over subfield_scores and
+section_weights, so every analyzed resume also gets a fixed-layout int8 row
+(one byte per subfield, in SUBFIELD_COLUMNS order) in the ResumeScoreVector
+table. Loading a job's rows gives an n x 30 int8 matrix; new final scores for
+a weight vector are one matrix-vector product, with no LLM calls.
+"""
+import json
+import time
+from array import array
+from operator import mul
+from typing import Any, Dict, List, Optional, Tuple
+
+from scoring_tiers import assign_bucket
+
+# Subfields scored for each section, in column order
+SECTION_SUBFIELDS = {
+    "experience": ["candidate_years_of_experience_vs_role_expectation_match", "relevancy", "recency", "depth", "impact"],
+    "education": ["alignment", "level", "institution_reputation"],
+    "projects": ["relevance", "complexity", "outcome"],
+    "leadership": ["initiative", "scope", "influence"],
+    "research": ["domain_relevance", "novelty", "publication_impact"],
+    "skills": ["alignment", "coverage", "proficiency"],
+    "certifications": ["relevance", "recognition", "recency"],
+    "awards": ["prestige", "relevance", "selectivity"],
+    "publications": ["venue_quality", "topic_alignment", "impact"]
+}
+SUBFIELD_COLUMNS = [(section, subfield) for section, subfields in SECTION_SUBFIELDS.items() for subfield in subfields]
+
+# Scores are 0-2; store tenths so fractional scores survive the int8 encoding
+SCORE_SCALE = 10
+
+
+def pack_subfield_scores(subfield_scores: Dict[str, Any]) -> bytes:
+    """Encode subfield scores as one int8 per column; missing or invalid scores are 0, as in compute_final_score."""
+    row = array('b')
+    for section, subfield in SUBFIELD_COLUMNS:
+        value = (subfield_scores.get(section) or {}).get(subfield)
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            value = 0
+        row.append(max(-128, min(127, round(value * SCORE_SCALE))))
+    return row.tobytes()
+
+
+def unpack_subfield_scores(blob: bytes) -> Dict[str, Dict[str, float]]:
+    row = array('b', blob)
+    scores = {}
+    for (section, subfield), value in zip(SUBFIELD_COLUMNS, row):
+        scores.setdefault(section, {})[subfield] = value / SCORE_SCALE
+    return scores
+
+
+def subfield_scores_from_analysis(analysis: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Subfield scores of a stored analysis, or None for tiers that did not produce any (pre-screen, triage, fallback)."""
+    subfield_scores = (analysis.get("advanced_analysis") or {}).get("subfield_scores")
+    if isinstance(subfield_scores, str):
+        try:
+            subfield_scores = json.loads(subfield_scores)
+        except ValueError:
+            return None
+    return subfield_scores if isinstance(subfield_scores, dict) and subfield_scores else None
+
+
+def weight_vector(section_weights: Dict[str, float]) -> List[float]:
+    """
+    Per-column coefficients such that row . vector equals compute_final_score's
+    sum(avg(section) / 2 * weight) * 100.
+    """
+    return [
+        100.0 * float(section_weights.get(section, 0.0)) / (2.0 * len(SECTION_SUBFIELDS[section]) * SCORE_SCALE)
+        for section, _ in SUBFIELD_COLUMNS
+    ]
+
+
+def final_scores(matrix: array, section_weights: Dict[str, float]) -> List[float]:
+    """Final weighted scores (0-100) for every row of a flat int8 matrix."""
+    vector = weight_vector(section_weights)
+    width = len(SUBFIELD_COLUMNS)
+    return [
+        min(round(sum(map(mul, matrix[offset:offset + width], vector)), 2), 100.0)
+        for offset in range(0, len(matrix), width)
+    ]
+
+
+def store_score_vector(session, vector_model, resume, analysis: Dict[str, Any]) -> bool:
+    """Add (or replace) the score row for a saved resume; the caller commits. False if the analysis has no subfield scores."""
+    subfield_scores = subfield_scores_from_analysis(analysis)
+    if subfield_scores is None:
+        return False
+    row = session.get(vector_model, resume.id)
+    if row is None:
+        row = vector_model(resume_id=resume.id, job_id=resume.job_id)
+        session.add(row)
+    row.scores = pack_subfield_scores(subfield_scores)
+    return True
+
+
+def backfill_score_vectors(session, resume_model, vector_model, job_id: int) -> int:
+    """Create missing score rows for a job's resumes from their stored analyses."""
+    missing = (session.query(resume_model)
+               .outerjoin(vector_model, vector_model.resume_id == resume_model.id)
+               .filter(resume_model.job_id == job_id, vector_model.resume_id.is_(None))
+               .all())
+    added = 0
+    for resume in missing:
+        try:
+            analysis = json.loads(resume.analysis) if resume.analysis else {}
+        except ValueError:
+            continue
+        added += store_score_vector(session, vector_model, resume, analysis)
+    if added:
+        session.commit()
+    return added
+
+
+def load_score_matrix(session, vector_model, job_id: int) -> Tuple[List[int], array]:
+    """Resume ids and the flat int8 matrix of a job's score rows."""
+    resume_ids = []
+    matrix = array('b')
+    for resume_id, scores in (session.query(vector_model.resume_id, vector_model.scores)
+                              .filter(vector_model.job_id == job_id)
+                              .order_by(vector_model.resume_id)):
+        resume_ids.append(resume_id)
+        matrix.frombytes(scores)
+    return resume_ids, matrix
+
+
+def reweight_job(session, resume_model, vector_model, job_id: int, section_weights: Dict[str, float]) -> Dict[str, Any]:
+    """Recompute final scores and buckets for all scored resumes of a job under new section weights."""
+    backfilled = backfill_score_vectors(session, resume_model, vector_model, job_id)
+    start_time = time.time()
+    resume_ids, matrix = load_score_matrix(session, vector_model, job_id)
+    scores = final_scores(matrix, section_weights)
+    results = [
+        {"resume_id": resume_id, "final_weighted_score": score, "fit_score": int(score), "bucket": assign_bucket(int(score))}
+        for resume_id, score in zip(resume_ids, scores)
+    ]
+    return {
+        "job_id": job_id,
+        "section_weights": section_weights,
+        "resumes": results,
+        "backfilled": backfilled,
+        "elapsed_ms": round((time.time() - start_time) * 1000, 3),
+    }
+
+
+def apply_reweight(session, resume_model, results: List[Dict[str, Any]], section_weights: Dict[str, float]):
+    """Write re-weighted scores and buckets back into the stored analyses; the caller commits. Missing or corrupt analyses are skipped."""
+    by_id = {result["resume_id"]: result for result in results}
+    for resume in session.query(resume_model).filter(resume_model.id.in_(list(by_id))):
+        try:
+            analysis = json.loads(resume.analysis) if resume.analysis else None
+        except ValueError:
+            analysis = None
+        if not isinstance(analysis, dict):
+            continue
+        result = by_id[resume.id]
+        analysis["fit_score"] = result["fit_score"]
+        analysis["bucket"] = result["bucket"]
+        advanced = analysis.setdefault("advanced_analysis", {})
+        advanced["section_weights"] = section_weights
+        details = advanced.setdefault("final_score_details", {})
+        if isinstance(details, dict):
+            details["final_weighted_score"] = result["final_weighted_score"]
+        resume.analysis = json.dumps(analysis)
+
+
+def validate_section_weights(section_weights: Any) -> Optional[str]:
+    """Error message for an invalid weight mapping, or None."""
+    if not isinstance(section_weights, dict) or not section_weights:
+        return "section_weights must be a non-empty object"
+    unknown = sorted(set(section_weights) - set(SECTION_SUBFIELDS))
+    if unknown:
+        return f"Unknown sections: {', '.join(unknown)}"
+    for section, weight in section_weights.items():
+        if not isinstance(weight, (int, float)) or isinstance(weight, bool) or weight < 0:
+            return f"Weight for {section} must be a non-negative number"
+    return None
@@ -0,0 +1,104 @@
+"""
+Bounded, thread-safe LRU of job-scoped ResumeScorer instances.
+
+Each job description gets its own scorer so its in-memory caches (job level,
+section weights, subfield scores) stay deterministic for that job. All scorers
+share one openai.OpenAI client, and so one pooled HTTP client with TLS
+connection reuse across jobs. The least recently used scorer is evicted once
+SCORER_CACHE_SIZE jobs are held.
+"""
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict
+
+import openai
+
+from rate_limiter import get_rate_limiter
+
+SCORER_CACHE_SIZE = int(os.environ.get('SCORER_CACHE_SIZE', 64))
+
+
+class ScorerCache:
+    """LRU of scorers keyed by job description hash."""
+
+    def __init__(self, max_size: int = SCORER_CACHE_SIZE, factory: Callable[..., Any] = None):
+        self.max_size = max(max_size, 1)
+        self._factory = factory
+        self._scorers = OrderedDict()
+        self._lock = threading.Lock()
+        self._client = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def job_key(job_description: str) -> str:
+        return hashlib.md5(job_description.encode()).hexdigest()
+
+    def shared_client(self):
+        """The openai.OpenAI client shared by every scorer in the cache."""
+        if self._client is None:
+            self._client = openai.OpenAI(
+                api_key=os.environ.get("OPENAI_API_KEY"), http_client=get_rate_limiter().http_client()
+            )
+        return self._client
+
+    def _create(self):
+        if self._factory is not None:
+            return self._factory()
+        from duplicate_copy_resume_scorer import ResumeScorer
+        return ResumeScorer(client=self.shared_client())
+
+    def get(self, job_description: str):
+        """Return the scorer for a job description, creating it (and evicting the LRU entry) if needed."""
+        job_hash = self.job_key(job_description)
+        with self._lock:
+            scorer = self._scorers.get(job_hash)
+            if scorer is not None:
+                self._scorers.move_to_end(job_hash)
+                self.hits += 1
+                print(f"  ✅ Reusing cached ResumeScorer for job hash: {job_hash[:8]}...")
+                return scorer
+
+            scorer = self._create()
+            self._scorers[job_hash] = scorer
+            self.misses += 1
+            print(f"  📊 Created new ResumeScorer for job hash: {job_hash[:8]}...")
+            while len(self._scorers) > self.max_size:
+                evicted_hash, _ = self._scorers.popitem(last=False)
+                self.evictions += 1
+                print(f"  🗑️  Evicted ResumeScorer for job hash: {evicted_hash[:8]}...")
+            return scorer
+
+    def clear(self):
+        with self._lock:
+            self._scorers.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._scorers),
+                'max_size': self.max_size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+# Global scorer cache instance, initialized to None.
+_scorer_cache = None
+_scorer_cache_lock = threading.Lock()
+
+
+def get_scorer_cache() -> ScorerCache:
+    """Return the process-wide scorer cache, creating it on first use."""
+    global _scorer_cache
+    if _scorer_cache is None:
+        with _scorer_cache_lock:
+            if _scorer_cache is None:
+                _scorer_cache = ScorerCache()
+    return _scorer_cache
@@ -0,0 +1,53 @@
+"""
+Fit score buckets and the tiered (cascade) scoring policy.
+
+Buckets are defined by minimum fit scores, configurable through
+BUCKET_THRESHOLDS ("rocket,book,bench", default "91,80,65"); anything below
+the last threshold is archived.
+
+In cascade mode every resume first gets a cheap triage pass that produces a
+provisional fit_score. Only candidates in the top tiers or within
+CASCADE_MARGIN points of a bucket boundary go on to the full ResumeScorer
+analysis; the rest are stored with the triage result. Each stored analysis
+records the tier that produced it under "scoring_tier" ("prescreen" for
+resumes archived by the local pre-screen, see prescreen.py).
+"""
+import os
+from typing import List, Tuple
+
+BUCKET_LABELS = ('🚀 Green-Room Rocket', '⚡ Book-the-Call', '🛠️ Bench Prospect')
+ARCHIVE_BUCKET = '🗄️ Swipe-Left Archive'
+
+
+def _parse_thresholds(value: str) -> List[Tuple[float, str]]:
+    scores = [float(part) for part in value.split(',') if part.strip()]
+    if len(scores) != len(BUCKET_LABELS) or scores != sorted(scores, reverse=True):
+        raise ValueError(f"BUCKET_THRESHOLDS must be {len(BUCKET_LABELS)} descending scores, got {value!r}")
+    return list(zip(scores, BUCKET_LABELS))
+
+
+BUCKET_THRESHOLDS = _parse_thresholds(os.environ.get('BUCKET_THRESHOLDS', '91,80,65'))
+
+CASCADE_SCORING = os.environ.get('CASCADE_SCORING', 'false').lower() == 'true'
+CASCADE_MARGIN = float(os.environ.get('CASCADE_MARGIN', 5))
+# Provisional buckets that always get the full analysis
+CASCADE_FULL_BUCKETS = BUCKET_LABELS[:2]
+
+TIER_PRESCREEN = 'prescreen'
+TIER_TRIAGE = 'triage'
+TIER_FULL = 'full'
+
+
+def assign_bucket(fit_score: float) -> str:
+    """Bucket label for a 0-100 fit score."""
+    for minimum, label in BUCKET_THRESHOLDS:
+        if fit_score >= minimum:
+            return label
+    return ARCHIVE_BUCKET
+
+
+def needs_full_analysis(provisional_score: float, margin: float = CASCADE_MARGIN) -> bool:
+    """True if a triage score is in a top tier or close enough to a boundary to need the full analysis."""
+    if assign_bucket(provisional_score) in CASCADE_FULL_BUCKETS:
+        return True
+    return any(abs(provisional_score - minimum) < margin for minimum, _ in BUCKET_THRESHOLDS)
@@ -0,0 +1,161 @@
+"""
+Resume section index: where each section (experience, education, skills, ...)
+starts and ends in the resume text.
+
+build_section_index finds heading lines locally, with no LLM call, and
+records each section's heading and body as character offsets. The scorer uses
+the index to send each LLM call only the sections it needs: the experience
+prompt gets the work and research history, the subfield and triage prompts leave out
+references and interests, and the legacy summary prompt gets the header,
+summary, skills, experience and education. When a prompt's sections are not
+found, the full text is sent as before.
+
+Indexes are kept in a small in-process memo keyed by the text, so every phase
+of one analysis shares one index. They are also stored per resume in the
+ResumeSectionIndex table (both apps), where rescoring reads them back.
+"""
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from experience_parser import EXPERIENCE_HEADERS
+
+SECTION_INDEX_ENABLED = os.environ.get('SECTION_INDEX_ENABLED', 'true').lower() == 'true'
+SECTION_INDEX_VERSION = 1
+SECTION_INDEX_MEMO_SIZE = 256
+
+# Normalized heading text -> canonical section name
+SECTION_HEADINGS = {
+    'summary': ('summary', 'professional summary', 'career summary', 'profile', 'professional profile',
+                'objective', 'career objective', 'about me'),
+    'experience': EXPERIENCE_HEADERS + ('experience and employment', 'internships', 'internship experience'),
+    'education': ('education', 'academic background', 'education and training', 'academic qualifications',
+                  'qualifications'),
+    'skills': ('skills', 'technical skills', 'core competencies', 'key skills', 'competencies', 'skills and tools',
+               'technologies', 'tools and technologies'),
+    'projects': ('projects', 'academic projects', 'personal projects', 'key projects', 'selected projects'),
+    'certifications': ('certifications', 'certificates', 'licenses and certifications', 'certifications and licenses',
+                       'licenses'),
+    'awards': ('awards', 'honors', 'honors and awards', 'awards and honors', 'achievements'),
+    'publications': ('publications', 'selected publications', 'papers'),
+    'research': ('research', 'research experience', 'research interests'),
+    'leadership': ('leadership', 'leadership experience', 'volunteer', 'volunteering', 'volunteer experience',
+                   'activities', 'extracurricular activities'),
+    'coursework': ('coursework', 'relevant coursework'),
+    'languages': ('languages',),
+    'interests': ('interests', 'hobbies', 'hobbies and interests'),
+    'references': ('references',),
+}
+_HEADING_TO_SECTION = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+_MAX_HEADING_CHARS = 50
+_LINE = re.compile(r'[^\n]*\n?')
+
+# Sections each prompt needs; 'header' is the text before the first heading (name, contact details)
+EXPERIENCE_PROMPT_SECTIONS = ('experience', 'research')
+SUMMARY_PROMPT_SECTIONS = ('header', 'summary', 'skills', 'experience', 'education')
+UNSCORED_SECTIONS = ('interests', 'references')
+
+
+def _normalize_heading(line: str) -> str:
+    heading = line.strip().lower().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z ]', '', heading).split())
+
+
+def build_section_index(resume_text: str) -> Dict[str, Any]:
+    """
+    {"version", "length", "sections": [{"section", "heading_start", "start", "end"}]}
+    in document order. heading_start is the offset of the heading line, start..end
+    the section body. Text before the first heading is the "header" section.
+    """
+    sections = []
+    for match in _LINE.finditer(resume_text):
+        line = match.group()
+        if not line:
+            break
+        if len(line) > _MAX_HEADING_CHARS + 1:
+            continue
+        section = _HEADING_TO_SECTION.get(_normalize_heading(line))
+        if section is None:
+            continue
+        if sections:
+            sections[-1]['end'] = match.start()
+        elif resume_text[:match.start()].strip():
+            sections.append({'section': 'header', 'heading_start': 0, 'start': 0, 'end': match.start()})
+        sections.append({'section': section, 'heading_start': match.start(), 'start': match.end(), 'end': len(resume_text)})
+    return {'version': SECTION_INDEX_VERSION, 'length': len(resume_text), 'sections': sections}
+
+
+_memo = OrderedDict()
+_memo_lock = threading.Lock()
+
+
+def remember_section_index(resume_text: str, index: Dict[str, Any]):
+    with _memo_lock:
+        _memo[resume_text] = index
+        _memo.move_to_end(resume_text)
+        while len(_memo) > SECTION_INDEX_MEMO_SIZE:
+            _memo.popitem(last=False)
+
+
+def section_index_for(resume_text: str) -> Dict[str, Any]:
+    """The section index of resume_text, built once per process (callers must not modify it)."""
+    with _memo_lock:
+        index = _memo.get(resume_text)
+        if index is not None:
+            _memo.move_to_end(resume_text)
+            return index
+    index = build_section_index(resume_text)
+    remember_section_index(resume_text, index)
+    return index
+
+
+def is_index_current(index: Optional[Dict[str, Any]], resume_text: str) -> bool:
+    return bool(index) and index.get('version') == SECTION_INDEX_VERSION and index.get('length') == len(resume_text)
+
+
+def section_text(resume_text: str, index: Dict[str, Any], include: Optional[Iterable[str]] = None,
+                 exclude: Iterable[str] = ()) -> str:
+    """Headings and bodies of the selected sections, in document order ('' if none match)."""
+    include = set(include) if include is not None else None
+    exclude = set(exclude)
+    return ''.join(
+        resume_text[entry['heading_start']:entry['end']] for entry in index['sections']
+        if (include is None or entry['section'] in include) and entry['section'] not in exclude
+    )
+
+
+def prompt_text(resume_text: str, include: Optional[Iterable[str]] = None, exclude: Iterable[str] = ()) -> str:
+    """Resume text for an LLM prompt, restricted to the selected sections; the full text if none of them were found."""
+    if not SECTION_INDEX_ENABLED:
+        return resume_text
+    index = section_index_for(resume_text)
+    if not index['sections']:
+        return resume_text
+    text = section_text(resume_text, index, include, exclude)
+    return text if text.strip() else resume_text
+
+
+def store_section_index(session, index_model, resume) -> Dict[str, Any]:
+    """Add or refresh the stored section index of a saved resume; the caller commits."""
+    index = section_index_for(resume.content or '')
+    row = session.get(index_model, resume.id)
+    if row is None:
+        row = index_model(resume_id=resume.id, job_id=resume.job_id)
+        session.add(row)
+    elif row.content_hash == resume.content_hash and is_index_current(json.loads(row.sections), resume.content or ''):
+        return index
+    row.content_hash = resume.content_hash
+    row.sections = json.dumps(index)
+    return index
+
+
+def load_section_index(session, index_model, resume) -> Optional[Dict[str, Any]]:
+    """The stored section index of a resume if it matches the resume's current content, else None."""
+    row = session.get(index_model, resume.id)
+    if row is None or row.content_hash != resume.content_hash:
+        return None
+    index = json.loads(row.sections)
+    return index if is_index_current(index, resume.content or '') else None
@@ -0,0 +1,78 @@
+"""
+Single-flight deduplication of concurrent identical calls.
+
+The first caller for a key runs the function; callers that ask for the same
+key while it is in flight wait for it and share its result (or exception)
+instead of issuing a duplicate LLM request. Once the call finishes the key is
+released, so later callers go back to the regular caches.
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executed = 0
+        self.collapsed = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+                self.executed += 1
+            else:
+                self.collapsed += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'executed': self.executed,
+                'collapsed': self.collapsed,
+                'in_flight': len(self._calls),
+            }
+
+
+# Global single-flight instance, initialized to None.
+_single_flight = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """Return the process-wide single-flight group, creating it on first use."""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                _single_flight = SingleFlight()
+    return _single_flight
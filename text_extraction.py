@@ -0,0 +1,252 @@
+"""
+Incremental text extraction shared by every upload path.
+
+iter_document_text yields a document's text one unit at a time: a PDF page, a
+DOCX paragraph, a block of .doc text (doc_reader) or a decoded block of plain
+text. extract_text collects units until the character budget is filled and
+then stops, so later pages are never parsed and the text is never rebuilt by
+repeated string concatenation. PDFs of PDF_PARALLEL_MIN_PAGES pages or more
+are extracted in page ranges across a process pool and reassembled in order.
+Sources can be raw bytes, a path on disk or a readable binary stream.
+"""
+import codecs
+import concurrent.futures
+import io
+import multiprocessing
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import deque
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import closing
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from doc_reader import DocFormatError, iter_doc_text
+
+EXTRACTION_MAX_CHARS = int(os.environ.get('EXTRACTION_MAX_CHARS', 50000))
+# PDFs with at least this many pages are split into page ranges across worker processes
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', 16))
+PDF_PARALLEL_WORKERS = int(os.environ.get('PDF_PARALLEL_WORKERS', min(4, os.cpu_count() or 1)))
+PDF_PAGES_PER_TASK = int(os.environ.get('PDF_PAGES_PER_TASK', 4))
+
+_TEXT_BLOCK_BYTES = 64 * 1024
+_FORMATS = {'.pdf': 'pdf', '.docx': 'docx', '.doc': 'doc'}
+
+# Runs of printable characters in a legacy .doc binary
+_DOC_TEXT_RUN = re.compile(r'[A-Za-z0-9\s\.\,\;\:\!\?\-\(\)\[\]\{\}\@\#\$\%\&\*\+\=\_\|\~\`\'\"]{10,}')
+_DOC_UNPRINTABLE = re.compile(r'[^\w\s\.\,\;\:\!\?\-\(\)\[\]\{\}\@\#\$\%\&\*\+\=\_\|\~\`\'\"]')
+
+
+def document_format(filename: str) -> str:
+    """'pdf', 'docx' or 'doc' by extension; anything else is read as UTF-8 text."""
+    return _FORMATS.get(os.path.splitext(filename.lower())[1], 'text')
+
+
+def _read_bytes(source) -> bytes:
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            return f.read()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return bytes(source)
+    return source.read()
+
+
+def extract_pdf_pages(path: str, start: int, stop: int) -> List[str]:
+    """Text of pages [start, stop) of a PDF on disk. Runs in a page worker process."""
+    import fitz
+    with fitz.open(path, filetype='pdf') as pdf_doc:
+        return [pdf_doc[number].get_text() for number in range(start, stop)]
+
+
+# Global page worker pool, initialized to None.
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def _get_page_pool() -> concurrent.futures.ProcessPoolExecutor:
+    global _page_pool
+    if _page_pool is None:
+        with _page_pool_lock:
+            if _page_pool is None:
+                # spawn, so workers never inherit locks held by the web server's threads
+                _page_pool = concurrent.futures.ProcessPoolExecutor(
+                    max_workers=PDF_PARALLEL_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+    return _page_pool
+
+
+def _reset_page_pool(pool):
+    global _page_pool
+    with _page_pool_lock:
+        if _page_pool is pool:
+            _page_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _use_parallel_pages(page_count: int) -> bool:
+    # Pool workers (e.g. the extraction service's) are daemonic and cannot start processes
+    return (PDF_PARALLEL_WORKERS > 1 and page_count >= PDF_PARALLEL_MIN_PAGES
+            and not multiprocessing.current_process().daemon)
+
+
+def _iter_pdf_parallel(path: str, page_count: int, stats: Dict[str, Any]) -> Iterator[str]:
+    """
+    Pages of a PDF in order, extracted in page ranges by the page pool. Only a
+    window of ranges is in flight, so when the consumer stops at the character
+    budget the pending ranges are cancelled rather than extracted.
+    """
+    pool = _get_page_pool()
+    ranges = deque((start, min(start + PDF_PAGES_PER_TASK, page_count))
+                   for start in range(0, page_count, PDF_PAGES_PER_TASK))
+    in_flight = deque()
+    try:
+        while ranges or in_flight:
+            while ranges and len(in_flight) < 2 * PDF_PARALLEL_WORKERS:
+                start, stop = ranges.popleft()
+                in_flight.append(pool.submit(extract_pdf_pages, path, start, stop))
+            for text in in_flight.popleft().result():
+                stats['pages'] += 1
+                yield text
+    except BrokenProcessPool as e:
+        print(f"PDF page pool failed ({e}), extracting the remaining pages serially")
+        _reset_page_pool(pool)
+        in_flight.clear()
+        for text in extract_pdf_pages(path, stats['pages'], page_count):
+            stats['pages'] += 1
+            yield text
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def _iter_pdf(source, stats: Dict[str, Any]) -> Iterator[str]:
+    import fitz
+    data = None
+    if isinstance(source, str):
+        stats['bytes'] = os.path.getsize(source)
+        pdf_doc = fitz.open(source, filetype='pdf')
+    else:
+        data = _read_bytes(source)
+        stats['bytes'] = len(data)
+        pdf_doc = fitz.open(stream=data, filetype='pdf')
+    with pdf_doc:
+        stats['pages_total'] = pdf_doc.page_count
+        if not _use_parallel_pages(pdf_doc.page_count):
+            for page in pdf_doc:
+                stats['pages'] += 1
+                yield page.get_text()
+            return
+
+    stats['parallel'] = True
+    if data is None:
+        yield from _iter_pdf_parallel(source, stats['pages_total'], stats)
+        return
+    # Workers open the document from disk instead of each receiving a copy of the bytes
+    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp_file:
+        temp_file.write(data)
+    try:
+        yield from _iter_pdf_parallel(temp_file.name, stats['pages_total'], stats)
+    finally:
+        os.unlink(temp_file.name)
+
+
+def _iter_docx(source, stats: Dict[str, Any]) -> Iterator[str]:
+    import docx
+    if isinstance(source, str):
+        stats['bytes'] = os.path.getsize(source)
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        stats['bytes'] = len(source)
+        source = io.BytesIO(source)
+    document = docx.Document(source)
+    for paragraph in document.paragraphs:
+        stats['paragraphs'] += 1
+        yield paragraph.text + '\n'
+
+
+def doc_binary_text(data: bytes) -> str:
+    """Printable runs in the repr of a file's bytes ('' if none); the fallback for .doc files doc_reader cannot parse."""
+    text_chunks = _DOC_TEXT_RUN.findall(str(data))
+    if not text_chunks:
+        return ''
+    content = re.sub(r'\s+', ' ', ' '.join(text_chunks))
+    return _DOC_UNPRINTABLE.sub(' ', content).strip()
+
+
+def _iter_doc(source, stats: Dict[str, Any]) -> Iterator[str]:
+    data = _read_bytes(source)
+    stats['bytes'] = len(data)
+    try:
+        blocks = iter_doc_text(data)
+    except DocFormatError as e:
+        # Not a Word 97-2003 binary (e.g. RTF or HTML saved as .doc); keep the printable runs
+        print(f"Native .doc reader failed ({e}), scanning for text runs")
+        text = doc_binary_text(data)
+        if text:
+            yield text
+        return
+    yield from blocks
+
+
+def _iter_plain_text(source, stats: Dict[str, Any]) -> Iterator[str]:
+    if isinstance(source, str):
+        stream = open(source, 'rb')
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        stream = io.BytesIO(source)
+    else:
+        stream = source
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        while True:
+            block = stream.read(_TEXT_BLOCK_BYTES)
+            if not block:
+                break
+            stats['bytes'] += len(block)
+            text = decoder.decode(block)
+            if text:
+                yield text
+        text = decoder.decode(b'', final=True)
+        if text:
+            yield text
+    finally:
+        if stream is not source:
+            stream.close()
+
+
+_ITERATORS = {'pdf': _iter_pdf, 'docx': _iter_docx, 'doc': _iter_doc, 'text': _iter_plain_text}
+
+
+def new_extraction_stats(filename: str) -> Dict[str, Any]:
+    return {'format': document_format(filename), 'bytes': 0, 'pages': 0, 'pages_total': 0,
+            'paragraphs': 0, 'chars': 0, 'budget_reached': False, 'parallel': False, 'elapsed': 0.0}
+
+
+def iter_document_text(filename: str, source, stats: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+    """Yield the document's text unit by unit; parsing errors propagate from the iterator."""
+    if stats is None:
+        stats = new_extraction_stats(filename)
+    return _ITERATORS[document_format(filename)](source, stats)
+
+
+def extract_text(filename: str, source, max_chars: Optional[int] = EXTRACTION_MAX_CHARS) -> Tuple[str, Dict[str, Any]]:
+    """
+    Text of a document, at most max_chars characters (None for no limit), and
+    stats {format, bytes, pages, pages_total, paragraphs, chars, budget_reached, parallel, elapsed}.
+    """
+    start_time = time.time()
+    stats = new_extraction_stats(filename)
+    parts = []
+    remaining = max_chars
+    with closing(iter_document_text(filename, source, stats)) as units:
+        for unit in units:
+            if remaining is not None and len(unit) >= remaining:
+                parts.append(unit[:remaining])
+                stats['budget_reached'] = True
+                break
+            parts.append(unit)
+            if remaining is not None:
+                remaining -= len(unit)
+    text = ''.join(parts)
+    stats['chars'] = len(text)
+    stats['elapsed'] = round(time.time() - start_time, 4)
+    return text, stats
@@ -0,0 +1,180 @@
+"""
+Content-addressed disk spool for uploaded resumes.
+
+analyze_resumes streams each upload to UPLOAD_SPOOL_DIR in chunks, under the
+SHA-256 of its bytes, and queues only the references. The worker reads each
+file from its path when it gets to it, so
+resident memory per job is bounded by the document being extracted, not by
+the size of the upload. Identical files are stored once; each reference is
+released when its resume has been processed and the file is deleted when no
+job needs it any more.
+
+Uploads queued in the durable work queue (work_queue.py) outlive the process
+that spooled them: the request hands its reference off, keeping the file,
+and the worker that processes the item reopens it by digest and discards the
+file once no unfinished work item needs it. Another process may discard a
+file between a store that found it already spooled and the commit of the
+work item that needs it, so such a store keeps its own copy until the
+reference is handed off and puts it back if the file is gone by then.
+"""
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+UPLOAD_SPOOL_DIR = os.environ.get('UPLOAD_SPOOL_DIR', os.path.join(tempfile.gettempdir(), 'resume_upload_spool'))
+UPLOAD_SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+class SpooledUpload:
+    """Reference to one spooled upload."""
+
+    def __init__(self, spool, digest: str, path: str, size: int, copy_path: Optional[str] = None):
+        self.spool = spool
+        self.digest = digest
+        self.path = path
+        self.size = size
+        self.copy_path = copy_path  # this store's own copy when the file was already spooled
+        self.released = False
+
+    def release(self):
+        if not self.released:
+            self.released = True
+            self._drop_copy(restore=False)
+            self.spool.release(self.digest)
+
+    def hand_off(self):
+        """Release this reference but keep the file (the work queue owns it from now on)."""
+        if not self.released:
+            self.released = True
+            self._drop_copy(restore=True)
+            self.spool.release(self.digest, keep_file=True)
+
+    def _drop_copy(self, restore: bool):
+        if self.copy_path is None:
+            return
+        if restore and not os.path.exists(self.path):
+            os.replace(self.copy_path, self.path)
+        else:
+            os.unlink(self.copy_path)
+        self.copy_path = None
+
+
+class UploadSpool:
+    """Stores uploads on disk by content hash, with in-process reference counts."""
+
+    def __init__(self, root: str = UPLOAD_SPOOL_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        self._refs = {}
+        self.stored = 0
+        self.deduplicated = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def store(self, stream) -> SpooledUpload:
+        """Copy a readable binary stream into the spool in chunks and return a reference to it."""
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as temp_file:
+                while True:
+                    chunk = stream.read(UPLOAD_SPOOL_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    sha256.update(chunk)
+                    size += len(chunk)
+                    temp_file.write(chunk)
+            digest = sha256.hexdigest()
+            path = self._path(digest)
+            copy_path = None
+            with self._lock:
+                if os.path.exists(path):
+                    # Kept until the reference is released or handed off (see the module docstring)
+                    copy_path = temp_path
+                    self.deduplicated += 1
+                else:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    os.replace(temp_path, path)
+                    self.stored += 1
+                self._refs[digest] = self._refs.get(digest, 0) + 1
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+        return SpooledUpload(self, digest, path, size, copy_path)
+
+    def reopen(self, digest: str) -> SpooledUpload:
+        """A new reference to a file spooled earlier, possibly by another process; FileNotFoundError if it is gone."""
+        path = self._path(digest)
+        with self._lock:
+            size = os.path.getsize(path)
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+        return SpooledUpload(self, digest, path, size)
+
+    def release(self, digest: str, keep_file: bool = False):
+        """Drop one reference; the file is deleted once nothing references it, unless keep_file."""
+        with self._lock:
+            count = self._refs.get(digest, 0) - 1
+            if count > 0:
+                self._refs[digest] = count
+                return
+            self._refs.pop(digest, None)
+            if not keep_file:
+                self._unlink(digest)
+
+    def discard(self, digest: str, still_needed: Callable[[], bool] = None):
+        """
+        Delete a handed-off file unless this process still references it. The file is
+        moved aside first and still_needed() asked again, so a work item committed by
+        another process in the meantime gets its file back.
+        """
+        path = self._path(digest)
+        doomed = f'{path}.{uuid.uuid4().hex}.discard'
+        with self._lock:
+            if digest in self._refs:
+                return
+            try:
+                os.replace(path, doomed)
+            except FileNotFoundError:
+                return
+        if still_needed is not None and still_needed():
+            os.replace(doomed, path)
+        else:
+            os.unlink(doomed)
+
+    def _unlink(self, digest: str):
+        try:
+            os.unlink(self._path(digest))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'root': self.root,
+                'files_referenced': len(self._refs),
+                'references': sum(self._refs.values()),
+                'stored': self.stored,
+                'deduplicated': self.deduplicated,
+            }
+
+
+# Global upload spool instance, initialized to None.
+_upload_spool = None
+_upload_spool_lock = threading.Lock()
+
+
+def get_upload_spool() -> UploadSpool:
+    """Return the process-wide upload spool, creating it on first use."""
+    global _upload_spool
+    if _upload_spool is None:
+        with _upload_spool_lock:
+            if _upload_spool is None:
+                _upload_spool = UploadSpool()
+    return _upload_spool
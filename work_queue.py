@@ -0,0 +1,394 @@
+"""
+Durable work queue for resume analysis, stored in the application database.
+
+analyze_resumes records one WorkItem per uploaded file and returns. Worker
+threads (WorkQueueWorker) claim items under a time-limited lease, process
+them and mark them done. They are started by a serving process's first
+request, never at import, or run in separate processes with
+`python application.py --worker`. A claim is a conditional UPDATE, so any
+number of threads and processes can share the table without claiming the
+same item twice, and throughput scales with the number of workers.
+
+An item whose worker dies is claimed again once its lease expires, and an
+item whose processing fails is retried with exponential backoff until
+WORK_QUEUE_MAX_ATTEMPTS, so a restart resumes a job where it stopped instead
+of losing it. Resumes already saved by an earlier attempt are skipped as
+duplicates before any LLM call, which keeps retries cheap.
+
+ZIP/TAR uploads are queued as "archive" items; processing one spools its
+entries and queues each of them as a "resume" item of the same job, so the
+entries of one archive are analyzed by all workers in parallel. Re-scoring a
+job after its description changes queues one "rescore" item per stored
+resume; those have no spooled file. Spooled files
+belong to the queue: the worker deletes an item's file once no unfinished
+item refers to it.
+
+With the Batch API engine a worker claims all of a job's pending resume items
+at once and submits them as one batch. The handler records the batch id on
+the items and defers them instead of waiting; each later claim polls the batch,
+and the claim after it finishes saves the results. Workers stay free for other jobs
+meanwhile, and a restart resumes the submitted batch instead of paying for it again.
+"""
+import os
+import socket
+import threading
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func, or_
+
+WORK_QUEUE_WORKERS = int(os.environ.get('WORK_QUEUE_WORKERS', 2))
+# Whether serving processes also run workers (set to false when only --worker processes should)
+WORK_QUEUE_AUTOSTART = os.environ.get('WORK_QUEUE_AUTOSTART', 'true').lower() == 'true'
+WORK_QUEUE_LEASE_SECONDS = int(os.environ.get('WORK_QUEUE_LEASE_SECONDS', 600))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.environ.get('WORK_QUEUE_MAX_ATTEMPTS', 3))
+WORK_QUEUE_RETRY_SECONDS = int(os.environ.get('WORK_QUEUE_RETRY_SECONDS', 30))  # doubled after each attempt
+WORK_QUEUE_POLL_SECONDS = float(os.environ.get('WORK_QUEUE_POLL_SECONDS', 2.0))
+# Resume items claimed together when the scoring engine works on batches (async, batch, pre-screen)
+WORK_QUEUE_BATCH_SIZE = int(os.environ.get('WORK_QUEUE_BATCH_SIZE', 50))
+
+STATUS_PENDING = 'pending'
+STATUS_LEASED = 'leased'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUSES = (STATUS_PENDING, STATUS_LEASED, STATUS_DONE, STATUS_FAILED)
+
+KIND_RESUME = 'resume'
+KIND_ARCHIVE = 'archive'
+KIND_RESCORE = 'rescore'
+
+
+class WorkDeferred(Exception):
+    """
+    Raised by a handler to put its items back without using up an attempt (e.g. the host
+    is short on memory), or returned as the result of single items; they become claimable
+    again after retry_seconds.
+    """
+
+    def __init__(self, message: str = '', retry_seconds: int = None):
+        super().__init__(message)
+        self.retry_seconds = retry_seconds
+
+
+def enqueue_work_item(session, item_model, job_id: int, kind: str, filename: str, upload, parent_id: int = None):
+    """
+    Add a pending item for a spooled upload; the caller commits and then hands the
+    upload off. An archive entry that was already queued by an earlier attempt at
+    expanding its archive is not queued again.
+    """
+    if parent_id is not None:
+        existing = session.query(item_model).filter_by(
+            parent_id=parent_id, filename=filename, upload_digest=upload.digest).first()
+        if existing is not None:
+            return existing
+    item = item_model(job_id=job_id, parent_id=parent_id, kind=kind, filename=filename, upload_digest=upload.digest,
+                      upload_size=upload.size, status=STATUS_PENDING, attempts=0, available_at=datetime.utcnow())
+    session.add(item)
+    return item
+
+
+def enqueue_rescore_item(session, item_model, resume):
+    """Add a pending rescore item for a stored resume unless one is already waiting; the caller commits."""
+    existing = session.query(item_model).filter(
+        item_model.kind == KIND_RESCORE, item_model.resume_id == resume.id, item_model.status == STATUS_PENDING
+    ).first()
+    if existing is not None:
+        return existing
+    item = item_model(job_id=resume.job_id, resume_id=resume.id, kind=KIND_RESCORE, filename=resume.filename,
+                      upload_size=0, status=STATUS_PENDING, attempts=0, available_at=datetime.utcnow())
+    session.add(item)
+    return item
+
+
+def _claimable(item_model, now: datetime):
+    return or_(item_model.status == STATUS_PENDING,
+               and_(item_model.status == STATUS_LEASED, item_model.lease_expires_at < now))
+
+
+def _as_dict(item, lease: str) -> Dict[str, Any]:
+    return {
+        'id': item.id,
+        'job_id': item.job_id,
+        'parent_id': item.parent_id,
+        'resume_id': item.resume_id,
+        'batch_id': item.batch_id,
+        'kind': item.kind,
+        'filename': item.filename,
+        'upload_digest': item.upload_digest,
+        'upload_size': item.upload_size,
+        'attempts': item.attempts,
+        'lease': lease,
+    }
+
+
+def claim_work_items(session, item_model, limit: int = 1, lease_seconds: int = WORK_QUEUE_LEASE_SECONDS,
+                     max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+                     kind_limits: Dict[str, Optional[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Lease up to limit claimable items of one job and kind, oldest first, and return
+    them as dicts carrying the lease token. kind_limits overrides limit per kind
+    (None claims all of them). An archive item is always claimed on its own.
+    """
+    now = datetime.utcnow()
+    # Items whose worker died on every attempt are given up instead of claimed again
+    session.query(item_model).filter(
+        item_model.status == STATUS_LEASED, item_model.lease_expires_at < now, item_model.attempts >= max_attempts
+    ).update({item_model.status: STATUS_FAILED, item_model.lease_owner: None,
+              item_model.result: f'Worker lost the lease on all {max_attempts} attempts'}, synchronize_session=False)
+
+    available = and_(_claimable(item_model, now), item_model.available_at <= now)
+    first = session.query(item_model.id, item_model.job_id, item_model.kind).filter(available).order_by(item_model.id).first()
+    if first is None:
+        session.commit()
+        return []
+    if first.kind == KIND_ARCHIVE:
+        ids = [first.id]
+    else:
+        ids = [row.id for row in session.query(item_model.id).filter(
+            available, item_model.job_id == first.job_id, item_model.kind == first.kind
+        ).order_by(item_model.id).limit((kind_limits or {}).get(first.kind, limit))]
+
+    lease = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+    # The claimable condition is checked again by the UPDATE itself, so concurrent claims cannot overlap
+    claimed = session.query(item_model).filter(item_model.id.in_(ids), _claimable(item_model, now)).update(
+        {item_model.status: STATUS_LEASED, item_model.lease_owner: lease,
+         item_model.lease_expires_at: now + timedelta(seconds=lease_seconds),
+         item_model.attempts: item_model.attempts + 1},
+        synchronize_session=False)
+    session.commit()
+    if not claimed:
+        return []
+    items = session.query(item_model).filter(item_model.lease_owner == lease).order_by(item_model.id).all()
+    return [_as_dict(item, lease) for item in items]
+
+
+def renew_lease(session, item_model, lease: str, lease_seconds: int = WORK_QUEUE_LEASE_SECONDS) -> int:
+    """Extend the lease of every item still held under a lease token; returns how many were renewed."""
+    renewed = session.query(item_model).filter(
+        item_model.lease_owner == lease, item_model.status == STATUS_LEASED
+    ).update({item_model.lease_expires_at: datetime.utcnow() + timedelta(seconds=lease_seconds)},
+             synchronize_session=False)
+    session.commit()
+    return renewed
+
+
+def _finish(session, item_model, item: Dict[str, Any], values: Dict[str, Any]) -> bool:
+    """Update an item only while its lease is still held; False if the lease was lost."""
+    updated = session.query(item_model).filter(
+        item_model.id == item['id'], item_model.lease_owner == item['lease'], item_model.status == STATUS_LEASED
+    ).update({**values, item_model.lease_owner: None, item_model.lease_expires_at: None}, synchronize_session=False)
+    session.commit()
+    return bool(updated)
+
+
+def complete_work_item(session, item_model, item: Dict[str, Any], result: str = '') -> bool:
+    return _finish(session, item_model, item, {item_model.status: STATUS_DONE, item_model.result: result[:1000]})
+
+
+def retry_work_item(session, item_model, item: Dict[str, Any], error: str, count_attempt: bool = True,
+                    max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS, retry_seconds: int = WORK_QUEUE_RETRY_SECONDS) -> str:
+    """Put a leased item back with backoff, or mark it failed once its attempts are used up; returns the new status."""
+    attempts = item['attempts'] if count_attempt else item['attempts'] - 1
+    if attempts >= max_attempts:
+        status, values = STATUS_FAILED, {item_model.status: STATUS_FAILED}
+    else:
+        delay = retry_seconds * 2 ** max(attempts - 1, 0)
+        status, values = STATUS_PENDING, {item_model.status: STATUS_PENDING, item_model.attempts: attempts,
+                                          item_model.available_at: datetime.utcnow() + timedelta(seconds=delay)}
+    values[item_model.result] = error[:1000]
+    return status if _finish(session, item_model, item, values) else STATUS_LEASED
+
+
+def record_batch_id(session, item_model, items: List[Dict[str, Any]], batch_id: str) -> int:
+    """Save the Batch API batch submitted for leased items, so any later claim polls it instead of resubmitting."""
+    updated = 0
+    for item in items:
+        updated += session.query(item_model).filter(
+            item_model.id == item['id'], item_model.lease_owner == item['lease'], item_model.status == STATUS_LEASED
+        ).update({item_model.batch_id: batch_id}, synchronize_session=False)
+        item['batch_id'] = batch_id
+    session.commit()
+    return updated
+
+
+def upload_still_queued(session, item_model, digest: str) -> bool:
+    """True while an unfinished item needs the spooled file with this digest."""
+    return session.query(item_model.id).filter(
+        item_model.upload_digest == digest, item_model.status.in_((STATUS_PENDING, STATUS_LEASED))
+    ).first() is not None
+
+
+def archive_entries_queued(session, item_model, job_id: int, exclude_parent_id: int = None) -> Tuple[int, int]:
+    """(entries, bytes) queued from a job's archives, for the job-wide archive budget."""
+    query = session.query(func.count(item_model.id), func.coalesce(func.sum(item_model.upload_size), 0)).filter(
+        item_model.job_id == job_id, item_model.parent_id.isnot(None))
+    if exclude_parent_id is not None:
+        query = query.filter(item_model.parent_id != exclude_parent_id)
+    entries, total_bytes = query.one()
+    return entries, int(total_bytes)
+
+
+def queued_resume_filenames(session, item_model, job_id: int, exclude_parent_id: int = None) -> set:
+    """Filenames of a job's resume items, so archive entries can be given names not used in the job yet."""
+    query = session.query(item_model.filename).filter(item_model.job_id == job_id, item_model.kind == KIND_RESUME)
+    if exclude_parent_id is not None:
+        query = query.filter(or_(item_model.parent_id.is_(None), item_model.parent_id != exclude_parent_id))
+    return {row.filename for row in query}
+
+
+def delete_job_work_items(session, item_model, job_id: int) -> List[str]:
+    """Delete a job's items (the caller commits); returns the digests of unfinished items' spooled files."""
+    digests = [row.upload_digest for row in session.query(item_model.upload_digest).filter(
+        item_model.job_id == job_id, item_model.status.in_((STATUS_PENDING, STATUS_LEASED)),
+        item_model.upload_digest.isnot(None)).distinct()]
+    session.query(item_model).filter(item_model.job_id == job_id).delete(synchronize_session=False)
+    return digests
+
+
+def queue_stats(session, item_model, job_id: int = None) -> Dict[str, int]:
+    """Item counts by status, for one job or the whole queue."""
+    query = session.query(item_model.status, func.count(item_model.id))
+    if job_id is not None:
+        query = query.filter(item_model.job_id == job_id)
+    stats = {status: 0 for status in STATUSES}
+    stats.update(dict(query.group_by(item_model.status).all()))
+    stats['total'] = sum(stats[status] for status in STATUSES)
+    return stats
+
+
+class WorkQueueWorker:
+    """
+    Worker threads that claim work items and pass each claimed batch to
+    handler(items) -> {item_id: result}. Items missing from the result, or all of
+    them if the handler raises, are retried; WorkDeferred, raised or as an item's
+    result, puts them back without using up an attempt. Leases are renewed while
+    the handler runs. kind_batch_sizes overrides batch_size per kind (None: all of a job's items).
+    """
+
+    def __init__(self, app, db, item_model, handler: Callable[[List[Dict[str, Any]]], Dict[int, Any]], spool,
+                 threads: int = WORK_QUEUE_WORKERS, batch_size: int = 1, lease_seconds: int = WORK_QUEUE_LEASE_SECONDS,
+                 poll_seconds: float = WORK_QUEUE_POLL_SECONDS, kind_batch_sizes: Dict[str, Optional[int]] = None):
+        self.app = app
+        self.db = db
+        self.item_model = item_model
+        self.handler = handler
+        self.spool = spool
+        self.threads = threads
+        self.batch_size = batch_size
+        self.kind_batch_sizes = kind_batch_sizes or {}
+        self.lease_seconds = lease_seconds
+        self.poll_seconds = poll_seconds
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._workers = []
+        self.claimed = 0
+        self.completed = 0
+        self.retried = 0
+        self.failed = 0
+
+    def start(self):
+        """Start the worker threads (no-op if they are already running)."""
+        with self._lock:
+            if self._workers:
+                return
+            self._stop.clear()
+            for index in range(self.threads):
+                worker = threading.Thread(target=self._run, name=f'work-queue-{index}', daemon=True)
+                worker.start()
+                self._workers.append(worker)
+        print(f"🧵 Work queue: {self.threads} worker thread(s) started (batch size {self.batch_size})")
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        with self._lock:
+            workers, self._workers = self._workers, []
+        for worker in workers:
+            worker.join(timeout)
+
+    def join(self):
+        for worker in list(self._workers):
+            worker.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                claimed = self.run_once()
+            except Exception as e:
+                print(f"Work queue worker error: {e}")
+                claimed = 0
+            if not claimed:
+                self._stop.wait(self.poll_seconds)
+
+    def _keep_lease(self, lease: str, done: threading.Event):
+        while not done.wait(self.lease_seconds / 3):
+            with self.app.app_context():
+                try:
+                    renew_lease(self.db.session, self.item_model, lease, self.lease_seconds)
+                except Exception as e:
+                    print(f"Work queue lease renewal failed: {e}")
+                finally:
+                    self.db.session.remove()
+
+    def run_once(self) -> int:
+        """Claim and process one batch; returns the number of items claimed."""
+        with self.app.app_context():
+            session = self.db.session
+            try:
+                items = claim_work_items(session, self.item_model, self.batch_size, self.lease_seconds,
+                                         kind_limits=self.kind_batch_sizes)
+                if not items:
+                    return 0
+                with self._lock:
+                    self.claimed += len(items)
+                print(f"📥 Claimed {len(items)} work item(s) of job {items[0]['job_id']} (attempt {items[0]['attempts']})")
+
+                done = threading.Event()
+                keeper = threading.Thread(target=self._keep_lease, args=(items[0]['lease'], done), daemon=True)
+                keeper.start()
+                results, error, deferred = {}, '', None
+                try:
+                    results = self.handler(items) or {}
+                except WorkDeferred as e:
+                    deferred = e
+                except Exception as e:
+                    print(f"Work queue handler failed for job {items[0]['job_id']}: {e}")
+                    error = str(e)
+                finally:
+                    done.set()
+                    keeper.join()
+                    session.rollback()
+
+                for item in items:
+                    result = results.get(item['id'], deferred)
+                    if isinstance(result, WorkDeferred):
+                        status = retry_work_item(session, self.item_model, item, f'Deferred: {result}', count_attempt=False,
+                                                 retry_seconds=result.retry_seconds or WORK_QUEUE_RETRY_SECONDS)
+                    elif item['id'] in results:
+                        finished = complete_work_item(session, self.item_model, item, result)
+                        status = STATUS_DONE if finished else STATUS_LEASED
+                    else:
+                        status = retry_work_item(session, self.item_model, item, error or 'Not processed')
+                    with self._lock:
+                        self.completed += status == STATUS_DONE
+                        self.retried += status == STATUS_PENDING
+                        self.failed += status == STATUS_FAILED
+                    digest = item['upload_digest']
+                    if digest and status in (STATUS_DONE, STATUS_FAILED) and not upload_still_queued(
+                            session, self.item_model, digest):
+                        self.spool.discard(digest, lambda: upload_still_queued(session, self.item_model, digest))
+                return len(items)
+            finally:
+                session.remove()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'threads': len(self._workers),
+                'batch_size': self.batch_size,
+                'kind_batch_sizes': self.kind_batch_sizes,
+                'claimed': self.claimed,
+                'completed': self.completed,
+                'retried': self.retried,
+                'failed': self.failed,
+            }